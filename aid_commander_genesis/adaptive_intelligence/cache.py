@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Analysis Cache
+
+Content-addressed memoization of complexity analyses and development
+recommendations. Keys are stable digests of the inputs, entries are bounded by
+LRU eviction and can optionally be persisted under ~/.aid_genesis so repeated
+CLI invocations over an unchanged concept skip the analysis entirely.
+"""
+
+import json
+import time
+import shutil
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Type
+
+import structlog
+from pydantic import BaseModel
+
+from .models import ComplexityAnalysis, DevelopmentRecommendation, ProjectContext
+from ..storage import atomic_write_json, file_lock
+
+logger = structlog.get_logger(__name__)
+
+
+# Default location of the persisted cache
+ANALYSIS_CACHE_PATH = Path.home() / ".aid_genesis" / "analysis_cache"
+
+# Default number of cached entries
+DEFAULT_CACHE_SIZE = 256
+
+# Seconds without reads or writes after which another configuration's entries are removed
+STALE_FINGERPRINT_SECONDS = 7 * 24 * 3600
+
+# Bookkeeping fields that do not affect analysis results
+VOLATILE_FIELDS = frozenset({"created_at", "last_updated", "updated_at"})
+
+# Model types that may be stored in the cache
+CACHEABLE_MODELS: Dict[str, Type[BaseModel]] = {
+    "ComplexityAnalysis": ComplexityAnalysis,
+    "DevelopmentRecommendation": DevelopmentRecommendation,
+    "ProjectContext": ProjectContext
+}
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a value to plain JSON data with volatile fields removed."""
+
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {
+            str(key): _canonical(item)
+            for key, item in value.items()
+            if key not in VOLATILE_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    return value
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    Stable digest of models, dicts and plain values.
+
+    Timestamps recording when a document was created or edited are ignored, so
+    a re-saved but otherwise unchanged concept maps to the same key.
+    """
+
+    payload = json.dumps([_canonical(part) for part in parts], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def patterns_revision(patterns: Iterable[Any]) -> str:
+    """Digest identifying the current set of cross-project patterns."""
+    return content_hash([
+        (pattern.pattern_id, pattern.pattern_version, pattern.last_updated.isoformat())
+        for pattern in patterns
+    ])
+
+
+class AnalysisCache:
+    """
+    Bounded LRU cache of analysis results keyed by content hash.
+
+    Every entry belongs to a configuration fingerprint (analysis version,
+    weights, thresholds). When the fingerprint changes the cache is cleared;
+    persisted entries for other fingerprints are kept while other processes may
+    still use them and removed once they go unused for a week. Persisted entries
+    are stored one file per key and loaded lazily on first access.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        persist_path: Optional[Path] = None
+    ):
+        self.max_entries = max_entries
+        self.persist_path = persist_path
+        self.logger = logger.bind(component="AnalysisCache")
+
+        self.fingerprint: Optional[str] = None
+        # Values are None for persisted entries not yet read from disk
+        self._entries: "OrderedDict[str, Optional[BaseModel]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def validate(self, fingerprint: str):
+        """Clear the cache if the configuration fingerprint changed."""
+
+        if fingerprint == self.fingerprint:
+            return
+
+        if self.fingerprint is not None:
+            self.invalidations += 1
+            self.logger.info("Analysis cache invalidated", previous=self.fingerprint, current=fingerprint)
+
+        self.fingerprint = fingerprint
+        self._entries.clear()
+
+        if self.persist_path is not None:
+            self._open_persisted()
+
+    def get(self, key: str) -> Optional[BaseModel]:
+        """Return a copy of the cached value, or None on a miss."""
+
+        if key not in self._entries:
+            self.misses += 1
+            return None
+
+        value = self._entries[key]
+        if value is None:
+            value = self._read_entry(key)
+            if value is None:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries[key] = value
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        if self.persist_path is not None:
+            self._touch_entry(key)
+        return value.model_copy(deep=True)
+
+    def put(self, key: str, value: BaseModel):
+        """Store a copy of value under key, evicting the least recently used entry."""
+
+        self._entries[key] = value.model_copy(deep=True)
+        self._entries.move_to_end(key)
+
+        if self.persist_path is not None:
+            self._write_entry(key, value)
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            if self.persist_path is not None:
+                self._entry_file(evicted_key).unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop all entries, including persisted ones."""
+
+        if self.persist_path is not None:
+            for key in self._entries:
+                self._entry_file(key).unlink(missing_ok=True)
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for health checks."""
+
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "persistent": self.persist_path is not None
+        }
+
+    def _fingerprint_dir(self) -> Path:
+        return self.persist_path / self.fingerprint
+
+    def _entry_file(self, key: str) -> Path:
+        return self._fingerprint_dir() / f"{key}.json"
+
+    def _open_persisted(self):
+        """Index persisted entries for the current fingerprint, oldest first."""
+
+        try:
+            self.persist_path.mkdir(parents=True, exist_ok=True)
+
+            # Processes running another configuration may still be using their entries
+            with file_lock(self.persist_path):
+                cutoff = time.time() - STALE_FINGERPRINT_SECONDS
+                for other_dir in self.persist_path.iterdir():
+                    if other_dir.is_dir() and other_dir.name != self.fingerprint:
+                        if self._last_used(other_dir) < cutoff:
+                            shutil.rmtree(other_dir, ignore_errors=True)
+
+                fingerprint_dir = self._fingerprint_dir()
+                fingerprint_dir.mkdir(exist_ok=True)
+
+                entry_files = sorted(fingerprint_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+                for entry_file in entry_files[-self.max_entries:]:
+                    self._entries[entry_file.stem] = None
+                for entry_file in entry_files[:-self.max_entries]:
+                    entry_file.unlink(missing_ok=True)
+
+        except Exception as e:
+            self.logger.warning("Failed to open persisted analysis cache", path=str(self.persist_path), error=str(e))
+
+    @staticmethod
+    def _last_used(directory: Path) -> float:
+        """Most recent write or touch of a fingerprint directory or its entries."""
+        last_used = directory.stat().st_mtime
+        for entry_file in directory.glob("*.json"):
+            try:
+                last_used = max(last_used, entry_file.stat().st_mtime)
+            except OSError:
+                pass
+        return last_used
+
+    def _read_entry(self, key: str) -> Optional[BaseModel]:
+        entry_file = self._entry_file(key)
+        try:
+            with open(entry_file, 'r') as f:
+                entry = json.load(f)
+            model = CACHEABLE_MODELS[entry["type"]]
+            return model.model_validate(entry["data"])
+        except Exception as e:
+            self.logger.warning("Failed to load cached analysis", file=str(entry_file), error=str(e))
+            entry_file.unlink(missing_ok=True)
+            return None
+
+    def _touch_entry(self, key: str):
+        """Refresh on-disk recency so the next process keeps hot entries."""
+        try:
+            self._entry_file(key).touch()
+        except OSError:
+            pass
+
+    def _write_entry(self, key: str, value: BaseModel):
+        try:
+            # Other processes may read the entry at any time; a lost entry is only a cache miss
+            atomic_write_json(
+                self._entry_file(key),
+                {"type": type(value).__name__, "data": value.model_dump(mode="json")},
+                durable=False
+            )
+        except Exception as e:
+            self.logger.warning("Failed to persist cached analysis", key=key, error=str(e))
+
+
+__all__ = [
+    "ANALYSIS_CACHE_PATH",
+    "DEFAULT_CACHE_SIZE",
+    "AnalysisCache",
+    "content_hash",
+    "patterns_revision"
+]
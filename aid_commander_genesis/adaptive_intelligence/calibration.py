@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Weight Calibration
+
+Fits the complexity weights and the complexity band thresholds of mode
+selection to recorded decision outcomes. A decision agrees with a configuration
+when the band its recomputed complexity score falls into names the mode the
+user chose and the project succeeded, or names another mode and it failed.
+
+Candidate weight vectors are evaluated together: scores of every decision under
+a chunk of candidates form one array, are binned against the threshold grid and
+counted per (band, outcome) with a single bincount, and cumulative counts give
+the agreement of every threshold pair at once. Thousands of decisions times
+thousands of candidates take seconds. Results are written as numbered JSON
+artifacts the engine loads at startup.
+"""
+
+import json
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .models import ExecutionMode
+from .matrix import MODE_CODES, OUTCOME_FAILURE, OUTCOME_SUCCESS, DecisionMatrix
+from ..storage import atomic_write_json
+
+logger = structlog.get_logger(__name__)
+
+
+# Directory of versioned calibration artifacts
+CALIBRATION_PATH = Path.home() / ".aid_genesis" / "calibration"
+
+# Version of the artifact layout
+CALIBRATION_FORMAT_VERSION = 1
+
+# Complexity dimensions in weight vector order (the complexity_weights keys)
+WEIGHTED_DIMENSIONS: Tuple[str, ...] = (
+    "stakeholder_complexity",
+    "technical_complexity",
+    "business_complexity",
+    "integration_complexity",
+    "uncertainty_level"
+)
+
+# Modes selected by complexity band, from the lowest band up; creative mode depends on innovation instead
+BAND_MODES: Tuple[ExecutionMode, ...] = (
+    ExecutionMode.LIGHTWEIGHT,
+    ExecutionMode.HYBRID,
+    ExecutionMode.KNOWLEDGE_GRAPH
+)
+
+# Candidate band thresholds; a threshold pair needs lightweight < hybrid
+THRESHOLD_GRID = np.round(np.arange(2.0, 9.0 + 0.125, 0.25), 2)
+
+# Weight vectors evaluated per calibration
+DEFAULT_CANDIDATES = 4096
+
+# Share of candidates sampled near the current weights; the rest cover the whole simplex
+LOCAL_CANDIDATE_SHARE = 0.5
+
+# Dirichlet concentration of the local candidates (higher stays closer to the current weights)
+LOCAL_CONCENTRATION = 100.0
+
+# Weights are whole multiples of 1 / WEIGHT_RESOLUTION summing to one
+WEIGHT_RESOLUTION = 100
+
+# Upper bound of every complexity dimension and of the complexity score
+MAX_COMPLEXITY_SCORE = 10.0
+
+# Decision-candidate score cells evaluated per chunk, bounding memory to a few arrays of this size
+CANDIDATE_CHUNK_CELLS = 2 ** 22
+
+# Fewest decisions with a known outcome worth calibrating on
+MIN_CALIBRATION_OUTCOMES = 30
+
+
+@dataclass(frozen=True)
+class CalibrationResult:
+    """Best weights and thresholds found, with outcome agreement before and after."""
+
+    complexity_weights: Dict[str, float]
+    lightweight_max_complexity: float
+    hybrid_max_complexity: float
+    agreement: float
+    baseline_agreement: float
+    decisions: int
+    candidates: int
+    elapsed_seconds: float
+
+    @property
+    def improved(self) -> bool:
+        return self.agreement > self.baseline_agreement
+
+    def to_artifact(self, version: int) -> Dict[str, Any]:
+        """JSON artifact of this result under a calibration version."""
+
+        return {
+            "format_version": CALIBRATION_FORMAT_VERSION,
+            "version": version,
+            "calibrated_at": datetime.now().isoformat(),
+            "complexity_weights": self.complexity_weights,
+            "mode_thresholds": {
+                ExecutionMode.LIGHTWEIGHT.value: {"max_complexity": self.lightweight_max_complexity},
+                ExecutionMode.HYBRID.value: {"max_complexity": self.hybrid_max_complexity}
+            },
+            "agreement": self.agreement,
+            "baseline_agreement": self.baseline_agreement,
+            "decisions": self.decisions,
+            "candidates": self.candidates
+        }
+
+
+def calibration_data(matrix: DecisionMatrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Dimension scores, chosen band and success of decisions usable for calibration.
+
+    Keeps decisions with a known outcome whose chosen mode is selected by
+    complexity band. Dimension scores are stored as float32 in the matrix, so
+    recomputed complexity scores match the engine's to float32 precision.
+    """
+
+    records = matrix.records
+    band_of_mode = np.full(256, -1, dtype=np.int64)
+    for band, mode in enumerate(BAND_MODES):
+        band_of_mode[MODE_CODES[mode]] = band
+
+    bands = band_of_mode[records["user_choice"]]
+    outcomes = records["project_success"]
+    usable = (bands >= 0) & ((outcomes == OUTCOME_SUCCESS) | (outcomes == OUTCOME_FAILURE))
+
+    dimensions = np.column_stack([
+        records[dimension][usable].astype(np.float64) for dimension in WEIGHTED_DIMENSIONS
+    ]) if usable.any() else np.empty((0, len(WEIGHTED_DIMENSIONS)))
+    return dimensions, bands[usable], outcomes[usable] == OUTCOME_SUCCESS
+
+
+def weight_vector(complexity_weights: Mapping[str, float]) -> np.ndarray:
+    return np.array([complexity_weights[dimension] for dimension in WEIGHTED_DIMENSIONS], dtype=np.float64)
+
+
+def complexity_scores(dimensions: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    Complexity scores of N decisions under C weight vectors, shape (N, C).
+
+    Accumulates in the engine's order so scores on band thresholds compare
+    exactly as they do in the analysis.
+    """
+
+    weights = np.atleast_2d(weights)
+    scores = dimensions[:, :1] * weights[:, 0]
+    for column in range(1, len(WEIGHTED_DIMENSIONS)):
+        scores = scores + dimensions[:, column:column + 1] * weights[:, column]
+    return scores
+
+
+def outcome_agreement(
+    scores: np.ndarray,
+    bands: np.ndarray,
+    success: np.ndarray,
+    lightweight_max_complexity: float,
+    hybrid_max_complexity: float
+) -> int:
+    """Decisions agreeing with one threshold pair; the reference for the vectorized search."""
+
+    implied = np.where(
+        scores <= lightweight_max_complexity, 0,
+        np.where(scores <= hybrid_max_complexity, 1, 2)
+    )
+    return int(np.sum((implied == bands) == success))
+
+
+def candidate_weights(
+    complexity_weights: Mapping[str, float],
+    count: int,
+    rng: np.random.Generator
+) -> np.ndarray:
+    """
+    Distinct candidate weight vectors, shape (C, 5), the current weights first.
+
+    Dirichlet samples near the current weights and across the simplex are
+    rounded to WEIGHT_RESOLUTION units with largest remainders, so every
+    candidate sums to one. Candidates whose float sum would score a concept
+    with every dimension at 10 above 10 are dropped, since ComplexityAnalysis
+    rejects such scores.
+    """
+
+    current = weight_vector(complexity_weights)
+    current = current / current.sum()
+    local_count = int((count - 1) * LOCAL_CANDIDATE_SHARE)
+
+    raw = np.vstack([
+        current,
+        rng.dirichlet(np.maximum(current * LOCAL_CONCENTRATION, 1e-3), size=local_count),
+        rng.dirichlet(np.ones(len(WEIGHTED_DIMENSIONS)), size=max(count - 1 - local_count, 0))
+    ]) * WEIGHT_RESOLUTION
+
+    units = np.floor(raw)
+    missing = WEIGHT_RESOLUTION - units.sum(axis=1)
+    remainder_rank = np.argsort(np.argsort(units - raw, axis=1), axis=1)
+    units += remainder_rank < missing[:, None]
+
+    _, first = np.unique(units, axis=0, return_index=True)
+    weights = units[np.sort(first)] / WEIGHT_RESOLUTION
+
+    # Float addition is monotone, so the all-maximum concept bounds every score
+    highest = complexity_scores(np.full((1, len(WEIGHTED_DIMENSIONS)), MAX_COMPLEXITY_SCORE), weights)[0]
+    keep = highest <= MAX_COMPLEXITY_SCORE
+    keep[0] = True
+    return weights[keep]
+
+
+def threshold_agreement(
+    dimensions: np.ndarray,
+    bands: np.ndarray,
+    success: np.ndarray,
+    weights: np.ndarray,
+    grid: np.ndarray = THRESHOLD_GRID
+) -> np.ndarray:
+    """
+    Agreement counts of every candidate and threshold pair, shape (C, G, G).
+
+    Entry [c, a, b] counts the decisions agreeing with weights[c] and
+    thresholds (grid[a], grid[b]); pairs with grid[a] >= grid[b] are -1.
+    """
+
+    grid_size = len(grid)
+    categories = bands * 2 + success.astype(np.int64)
+    category_count = len(BAND_MODES) * 2
+    chunk = max(1, CANDIDATE_CHUNK_CELLS // max(len(dimensions), 1))
+    agreement = np.empty((len(weights), grid_size, grid_size), dtype=np.int64)
+
+    for start in range(0, len(weights), chunk):
+        block = weights[start:start + chunk]
+        # Bin b holds scores in (grid[b - 1], grid[b]], so prefix sums count scores <= grid[b]
+        bins = np.searchsorted(grid, complexity_scores(dimensions, block), side="left")
+        cells = (np.arange(len(block)) * (grid_size + 1) + bins) * category_count + categories[:, None]
+        counts = np.bincount(cells.ravel(), minlength=len(block) * (grid_size + 1) * category_count)
+        prefix = np.cumsum(counts.reshape(len(block), grid_size + 1, category_count), axis=1)
+
+        total = prefix[:, -1]
+        below = prefix[:, :-1]
+
+        def agreeing(counts: np.ndarray, band: int) -> np.ndarray:
+            # Successes of the band's mode plus failures of every other mode
+            failures = counts[..., 0::2].sum(axis=-1)
+            return counts[..., band * 2 + 1] + failures - counts[..., band * 2]
+
+        # Agreement is additive over the three band regions, so it separates into the two thresholds
+        lightweight_part = agreeing(below, 0) - agreeing(below, 1)
+        hybrid_part = agreeing(below, 1) - agreeing(below, 2)
+        agreement[start:start + len(block)] = (
+            lightweight_part[:, :, None] + hybrid_part[:, None, :] + agreeing(total, 2)[:, None, None]
+        )
+
+    agreement[:, ~(grid[:, None] < grid[None, :])] = -1
+    return agreement
+
+
+def fit_calibration(
+    matrix: DecisionMatrix,
+    complexity_weights: Mapping[str, float],
+    lightweight_max_complexity: float,
+    hybrid_max_complexity: float,
+    candidates: int = DEFAULT_CANDIDATES,
+    seed: Optional[int] = None
+) -> CalibrationResult:
+    """
+    Weights and thresholds maximizing outcome agreement over a decision matrix.
+
+    The current configuration is kept unless a candidate agrees with strictly
+    more decisions.
+    """
+
+    started = time.perf_counter()
+    dimensions, bands, success = calibration_data(matrix)
+    if len(dimensions) < MIN_CALIBRATION_OUTCOMES:
+        raise ValueError(
+            f"Calibration needs at least {MIN_CALIBRATION_OUTCOMES} decisions with known outcomes, "
+            f"found {len(dimensions)}"
+        )
+
+    current = weight_vector(complexity_weights)
+    baseline = outcome_agreement(
+        complexity_scores(dimensions, current)[:, 0], bands, success,
+        lightweight_max_complexity, hybrid_max_complexity
+    )
+
+    weights = candidate_weights(complexity_weights, candidates, np.random.default_rng(seed))
+    agreement = threshold_agreement(dimensions, bands, success, weights)
+    best, lightweight_index, hybrid_index = np.unravel_index(np.argmax(agreement), agreement.shape)
+
+    fitted_weights = dict(zip(WEIGHTED_DIMENSIONS, (float(weight) for weight in current)))
+    fitted_thresholds = (lightweight_max_complexity, hybrid_max_complexity)
+    fitted = baseline
+    if agreement[best, lightweight_index, hybrid_index] > baseline:
+        fitted_weights = dict(zip(WEIGHTED_DIMENSIONS, (float(weight) for weight in weights[best])))
+        fitted_thresholds = (float(THRESHOLD_GRID[lightweight_index]), float(THRESHOLD_GRID[hybrid_index]))
+        fitted = int(agreement[best, lightweight_index, hybrid_index])
+
+    result = CalibrationResult(
+        complexity_weights=fitted_weights,
+        lightweight_max_complexity=fitted_thresholds[0],
+        hybrid_max_complexity=fitted_thresholds[1],
+        agreement=fitted / len(dimensions),
+        baseline_agreement=baseline / len(dimensions),
+        decisions=len(dimensions),
+        candidates=len(weights) * int(np.sum(agreement[0] >= 0)),
+        elapsed_seconds=time.perf_counter() - started
+    )
+
+    logger.info(
+        "Calibration fitted",
+        decisions=result.decisions,
+        candidates=result.candidates,
+        agreement=result.agreement,
+        baseline_agreement=result.baseline_agreement,
+        elapsed_seconds=result.elapsed_seconds
+    )
+    return result
+
+
+def _artifact_paths(directory: Path) -> List[Tuple[int, Path]]:
+    versions = []
+    for path in directory.glob("calibration-v*.json"):
+        try:
+            versions.append((int(path.stem.rsplit("-v", 1)[1]), path))
+        except ValueError:
+            continue
+    return sorted(versions)
+
+
+def save_calibration(result: CalibrationResult, directory: Path = CALIBRATION_PATH) -> Dict[str, Any]:
+    """Write a result as the next artifact version and return the artifact."""
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    while True:
+        existing = _artifact_paths(directory)
+        version = existing[-1][0] + 1 if existing else 1
+        artifact = result.to_artifact(version)
+        path = directory / f"calibration-v{version:04d}.json"
+        try:
+            atomic_write_json(path, artifact, overwrite=False, indent=2)
+            break
+        except FileExistsError:
+            # Another process published this version first
+            continue
+
+    logger.info("Calibration saved", version=version, path=str(path))
+    return artifact
+
+
+def load_calibration(directory: Path = CALIBRATION_PATH) -> Optional[Dict[str, Any]]:
+    """Latest readable calibration artifact, or None if there is none."""
+
+    directory = Path(directory)
+    if not directory.exists():
+        return None
+
+    for version, path in reversed(_artifact_paths(directory)):
+        try:
+            with open(path, 'r') as f:
+                artifact = json.load(f)
+            if artifact.get("format_version") != CALIBRATION_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {artifact.get('format_version')}")
+            return artifact
+        except Exception as e:
+            logger.warning("Failed to load calibration", path=str(path), error=str(e))
+    return None
+
+
+__all__ = [
+    "CALIBRATION_PATH",
+    "DEFAULT_CANDIDATES",
+    "THRESHOLD_GRID",
+    "WEIGHTED_DIMENSIONS",
+    "CalibrationResult",
+    "calibration_data",
+    "candidate_weights",
+    "complexity_scores",
+    "fit_calibration",
+    "load_calibration",
+    "outcome_agreement",
+    "save_calibration",
+    "threshold_agreement"
+]
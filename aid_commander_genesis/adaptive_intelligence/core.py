@@ -6,18 +6,17 @@ Contextual intelligence system that analyzes project complexity and determines
 optimal development approaches with cross-project learning.
 """
 
-import asyncio
 import uuid
+import asyncio
+import threading
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import BinaryIO, Callable, Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 import logging
 
 import structlog
 import numpy as np
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
 from .models import (
     ExecutionMode,
@@ -31,11 +30,79 @@ from .models import (
     AdaptiveDecision
 )
 
+from .features import ConceptFeatures, extract_concept_features
+from .lexicon import build_keyword_automaton
+from .incremental import IncrementalComplexityAnalysis
+from .scoring import MODE_ORDER, CompiledModeScoring, mode_scoring_rules
+from .policy import ModePolicyTable, compile_mode_policy, load_mode_policy, save_mode_policy
+from .patterns import PatternIndex
+from .decision_log import DecisionLog
+from .history import DecisionHistory
+from .loader import DEFAULT_CHUNK_SIZE, HistoryLoadResult, load_history
+from .matrix import DecisionMatrix, decision_row, outcome_code
+from .mining import PATTERN_UPDATE_DECISIONS, IncrementalPatternMiner
+from .persister import DecisionPersister
+from .narrative import NarrativeCoherence, analyze_narrative_coherence
+from .ingest import STREAM_CHUNK_BYTES, stream_concept_features
+from .session import AnalysisSession
+from .calibration import (
+    DEFAULT_CANDIDATES,
+    CalibrationResult,
+    fit_calibration,
+    load_calibration,
+    save_calibration
+)
+from .replay import ReplayResult, replay_decisions
+from .retention import RetentionPolicy, RetentionResult, success_rates
+from .monitoring import DEFAULT_BASELINE_WINDOWS, DRIFT_THRESHOLD, DistributionMonitor, DriftAlert
+from .forecast import (
+    DEFAULT_FORECAST_DRAWS,
+    TimelineForecast,
+    forecast_timeline
+)
+from .similarity import SimilarProjectIndex, complexity_vector
+from .sweep import DEFAULT_SWEEP_GRID, DecisionSurface, sweep_mode_scores
+from .cache import (
+    ANALYSIS_CACHE_PATH,
+    DEFAULT_CACHE_SIZE,
+    AnalysisCache,
+    content_hash,
+    patterns_revision
+)
+
 # Import ConceptCraft models for analysis
 from ..conceptcraft.models import ConceptDocument
 
 logger = structlog.get_logger(__name__)
 
+# Column layout of the feature matrix used by batch complexity analysis
+DIMENSION_INPUT_COLUMNS = (
+    "stakeholder_count",
+    "stakeholder_type_count",
+    "challenge_count",
+    "avg_story_confidence",
+    "concept_maturity",
+    "enhancement_complexity",
+    "tech_requirements",
+    "value_proposition_count",
+    "has_differentiation",
+    "differentiation_words",
+    "success_metric_count",
+    "business_challenge_complexity",
+    "integration_complexity",
+    "narrative_confidence",
+    "innovation_mentions",
+    "story_richness",
+    "validation_confidence"
+)
+
+# Validation level contribution to analysis confidence
+VALIDATION_CONFIDENCE = {
+    "foundation": 0.6,
+    "stress_tested": 0.8,
+    "enhanced": 1.0
+}
+
 
 class AdaptiveIntelligenceEngine:
     """
@@ -45,7 +112,7 @@ class AdaptiveIntelligenceEngine:
     to recommend optimal development approaches with high confidence.
     """
     
-    def __init__(self):
+    def __init__(self, cache_size: int = DEFAULT_CACHE_SIZE, persist_cache: bool = False):
         self.logger = logger.bind(component="AdaptiveIntelligenceEngine")
         self.decision_storage = Path.home() / ".aid_genesis" / "adaptive_decisions"
         self.pattern_storage = Path.home() / ".aid_genesis" / "cross_project_patterns"
@@ -63,6 +130,9 @@ class AdaptiveIntelligenceEngine:
             "uncertainty_level": 0.10
         }
         
+        # Compiled keyword lexicons (defaults plus ~/.aid_genesis/lexicons.json)
+        self.keyword_automaton = build_keyword_automaton()
+        
         # Mode selection thresholds
         self.mode_thresholds = {
             ExecutionMode.LIGHTWEIGHT: {"max_complexity": 4.0, "min_confidence": 0.7},
@@ -71,41 +141,295 @@ class AdaptiveIntelligenceEngine:
             ExecutionMode.CREATIVE: {"innovation_threshold": 0.7, "min_confidence": 0.6}
         }
         
-        # Cross-project learning
-        self.patterns: List[CrossProjectPattern] = []
-        self.decisions: List[AdaptiveDecision] = []
+        # Declarative mode scoring rules compiled for vectorized evaluation
+        self.mode_scoring = CompiledModeScoring()
+        
+        # Lookup table of the current scoring rules (~/.aid_genesis/mode_policy), loaded on first recommendation
+        self._mode_policy: Optional[ModePolicyTable] = None
+        self._mode_policy_loaded = False
+        
+        # Weights and thresholds fitted to decision outcomes (latest calibration artifact)
+        self.calibration_version: Optional[int] = None
+        calibration = load_calibration()
+        if calibration is not None:
+            self.apply_calibration(calibration)
         
-        # Load historical data
-        asyncio.create_task(self._load_historical_data())
+        # Memoized analyses keyed by content hash (optionally persisted)
+        self.analysis_cache = AnalysisCache(
+            max_entries=cache_size,
+            persist_path=ANALYSIS_CACHE_PATH if persist_cache else None
+        )
+        
+        # Cross-project learning (history is loaded lazily on first use)
+        self._history_lock = threading.RLock()
+        self._patterns_loaded = False
+        self._decision_log: Optional[DecisionLog] = None
+        self.patterns: List[CrossProjectPattern] = []
+        self.pattern_index = PatternIndex()
+        self._pattern_positions: Dict[str, int] = {}
+        self._patterns_revision = 0
+        self._patterns_digest: Optional[Tuple[int, str]] = None
+        self.decisions = DecisionHistory(lambda: self.decision_log, self.decision_storage)
+        self._decision_matrix: Optional[DecisionMatrix] = None
+        self._decision_matrix_revision: Optional[int] = None
+        
+        # Incremental pattern mining over stored decisions, started by initialize()
+        self.pattern_miner = IncrementalPatternMiner()
+        self._mining_started = False
+        self._mining_history_run = False
+        self._pending_mining: List[AdaptiveDecision] = []
+        
+        # Write-behind decision persistence keeps disk latency out of requests
+        self.decision_persister = DecisionPersister(lambda: self.decision_log)
+        
+        # Nearest-neighbour index of past projects, built off the event loop by initialize()
+        self._similar_projects: Optional[SimilarProjectIndex] = None
+        self._similar_projects_pending: Optional[List[AdaptiveDecision]] = None
+        
+        # Full decision records are kept for a window; older ones are rolled into aggregates
+        self.retention_policy = RetentionPolicy()
+        
+        # Per-window distributions of recommended analyses, merged across processes
+        self.distribution_monitor = DistributionMonitor()
     
     async def initialize(self) -> bool:
         """Initialize the Adaptive Intelligence Engine."""
         try:
             self.logger.info("Initializing Adaptive Intelligence Engine")
             await self._load_historical_data()
+            await self.build_similar_projects()
             await self._update_cross_project_patterns()
             return True
         except Exception as e:
             self.logger.error("Adaptive Intelligence initialization failed", error=str(e))
             return False
     
+    async def flush_decisions(self):
+        """
+        Wait until every stored decision is written to the decision log and synced.
+        
+        Raises:
+            RuntimeError: If the decision log keeps rejecting writes
+        """
+        await self.decision_persister.flush()
+    
+    async def shutdown(self):
+        """Flush queued decisions and stop the background decision writer."""
+        try:
+            await self.decision_persister.close()
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, self.distribution_monitor.flush)
+        self.logger.info("Adaptive Intelligence Engine shut down", **self.decision_persister.stats())
+    
+    @property
+    def decision_log(self) -> DecisionLog:
+        """Append-only decision storage, opened on first use."""
+        if self._decision_log is None:
+            with self._history_lock:
+                if self._decision_log is None:
+                    self._decision_log = DecisionLog()
+        return self._decision_log
+    
     def health_check(self) -> Dict[str, Any]:
         """Perform health check on Adaptive Intelligence Engine."""
+        
+        # Report history only as far as it has been loaded; never trigger a load here
+        decision_log_opened = self._decision_log is not None
+        
         return {
             "status": "available",
             "decision_storage": str(self.decision_storage),
             "pattern_storage": str(self.pattern_storage),
             "loaded_patterns": len(self.patterns),
-            "historical_decisions": len(self.decisions),
-            "storage_accessible": self.decision_storage.exists() and self.pattern_storage.exists()
+            "historical_decisions": len(self.decisions) if decision_log_opened else None,
+            "history_loaded": {"patterns": self._patterns_loaded, "decisions": decision_log_opened},
+            "storage_accessible": self.decision_storage.exists() and self.pattern_storage.exists(),
+            "analysis_cache": self.analysis_cache.stats(),
+            "pattern_index": self.pattern_index.stats(),
+            "pattern_miner": self.pattern_miner.stats(),
+            "similar_projects": self._similar_projects.stats() if self._similar_projects is not None else None,
+            "decision_log": self._decision_log.stats() if decision_log_opened else None,
+            "decision_persister": self.decision_persister.stats(),
+            "calibration_version": self.calibration_version,
+            "mode_policy": self._mode_policy.fingerprint if self._mode_policy is not None else None,
+            "retention": self.retention_policy.stats(),
+            "distribution_monitor": self.distribution_monitor.stats()
+        }
+    
+    def apply_calibration(self, artifact: Dict[str, Any]):
+        """Use the complexity weights and mode thresholds of a calibration artifact."""
+        
+        self.complexity_weights = {
+            dimension: float(artifact["complexity_weights"][dimension])
+            for dimension in self.complexity_weights
         }
+        for mode, thresholds in artifact["mode_thresholds"].items():
+            self.mode_thresholds[ExecutionMode(mode)].update(thresholds)
+        
+        self.mode_scoring = CompiledModeScoring(mode_scoring_rules(
+            self.mode_thresholds[ExecutionMode.LIGHTWEIGHT]["max_complexity"],
+            self.mode_thresholds[ExecutionMode.HYBRID]["max_complexity"]
+        ))
+        self._mode_policy = None
+        self._mode_policy_loaded = False
+        self.calibration_version = artifact.get("version")
+        self.logger.info(
+            "Calibration applied",
+            version=self.calibration_version,
+            complexity_weights=self.complexity_weights
+        )
+    
+    @property
+    def mode_policy(self) -> Optional[ModePolicyTable]:
+        """Compiled lookup table of the current mode scoring rules, if one has been compiled."""
+        if not self._mode_policy_loaded:
+            self._mode_policy = load_mode_policy(self.mode_scoring.tables)
+            self._mode_policy_loaded = True
+        return self._mode_policy
+    
+    def compile_mode_policy(self, save: bool = True) -> ModePolicyTable:
+        """
+        Compile the current mode scoring rules into a lookup table.
+        
+        The table is verified cell by cell against the _score_*_mode methods
+        before it is used or saved for other processes to memory-map.
+        
+        Raises:
+            ValueError: If the table disagrees with the reference scorers
+        """
+        
+        table = compile_mode_policy(self.mode_scoring.tables)
+        mismatches = table.verify({
+            mode: getattr(self, f"_score_{mode.value}_mode")
+            for mode in MODE_ORDER
+        })
+        if mismatches:
+            raise ValueError(f"Compiled mode policy disagrees with the reference scorers in {mismatches} cells")
+        
+        if save:
+            save_mode_policy(table)
+        self._mode_policy = table
+        self._mode_policy_loaded = True
+        self.logger.info("Mode policy compiled", fingerprint=table.fingerprint, cells=table.cells)
+        return table
+    
+    async def record_outcome(
+        self,
+        decision_id: str,
+        success: bool,
+        metrics: Optional[Dict[str, float]] = None,
+        lessons: Optional[List[str]] = None
+    ) -> AdaptiveDecision:
+        """
+        Record the outcome of a stored decision for learning.
+        
+        The updated decision is stored again, replacing the earlier record in
+        the decision log, the similar project index and pattern mining, so
+        calibration, replay and retention statistics see the outcome.
+        
+        Raises:
+            ValueError: If no decision with this id is stored
+        """
+        
+        # The decision may still be queued for writing
+        await self.flush_decisions()
+        decision = self.decisions.get(decision_id)
+        if decision is None:
+            raise ValueError(f"No stored decision with id {decision_id}")
+        
+        decision.update_outcome(success, metrics or {}, lessons or [])
+        await self._store_decision(decision)
+        self.logger.info("Decision outcome recorded", decision_id=decision_id, success=success)
+        return decision
+    
+    async def latest_decision_id(self, project_name: str) -> Optional[str]:
+        """Id of the most recent stored decision for a project, or None."""
+        
+        await self.flush_decisions()
+        matrix = self.decision_matrix()
+        rows = np.flatnonzero(matrix.decoded("project_name") == project_name)
+        if not len(rows):
+            return None
+        return matrix.decision_id(int(rows[np.argmax(matrix.column("decision_timestamp")[rows])]))
     
-    async def analyze_concept_complexity(self, concept_document: ConceptDocument) -> ComplexityAnalysis:
+    async def calibrate(
+        self,
+        candidates: int = DEFAULT_CANDIDATES,
+        seed: Optional[int] = None,
+        save: bool = True
+    ) -> CalibrationResult:
+        """
+        Fit complexity weights and mode thresholds to recorded decision outcomes.
+        
+        An improved fit is saved as the next calibration artifact, which later
+        engines load at startup, and applied to this engine. Cached analyses are
+        invalidated through the configuration fingerprint.
+        """
+        
+        await self.flush_decisions()
+        result = fit_calibration(
+            self.decision_matrix(),
+            self.complexity_weights,
+            self.mode_thresholds[ExecutionMode.LIGHTWEIGHT]["max_complexity"],
+            self.mode_thresholds[ExecutionMode.HYBRID]["max_complexity"],
+            candidates=candidates,
+            seed=seed
+        )
+        
+        if save and result.improved:
+            self.apply_calibration(save_calibration(result))
+        return result
+    
+    async def replay_decisions(
+        self,
+        calibration: Optional[Dict[str, Any]] = None,
+        scoring: Optional[CompiledModeScoring] = None,
+        workers: Optional[int] = None
+    ) -> ReplayResult:
+        """
+        Re-score the stored decision history under a candidate configuration.
+        
+        Args:
+            calibration: Calibration artifact whose weights and thresholds are replayed;
+                complexity scores are then recomputed from the stored dimensions
+            scoring: Candidate mode scoring rules, overriding the artifact's thresholds
+            workers: Parallel chunk workers (defaults to the CPU count)
+            
+        Returns:
+            Confusion matrix of recorded versus replayed recommended mode; without
+            arguments the engine's current rules are replayed on recorded scores
+        """
+        
+        await self.flush_decisions()
+        
+        complexity_weights = None
+        if calibration is not None:
+            complexity_weights = {**self.complexity_weights, **calibration.get("complexity_weights", {})}
+            thresholds = calibration.get("mode_thresholds", {})
+            if scoring is None:
+                scoring = CompiledModeScoring(mode_scoring_rules(*(
+                    thresholds.get(mode.value, {}).get("max_complexity", self.mode_thresholds[mode]["max_complexity"])
+                    for mode in (ExecutionMode.LIGHTWEIGHT, ExecutionMode.HYBRID)
+                )))
+        
+        return replay_decisions(
+            self.decision_matrix(workers=workers),
+            scoring or self.mode_scoring,
+            complexity_weights=complexity_weights,
+            workers=workers
+        )
+    
+    async def analyze_concept_complexity(
+        self,
+        concept_document: ConceptDocument,
+        session: Optional[AnalysisSession] = None
+    ) -> ComplexityAnalysis:
         """
         Analyze complexity of a concept document across multiple dimensions.
         
         Args:
             concept_document: ConceptDocument from ConceptCraft AI
+            session: Analysis session of the current planning flow
             
         Returns:
             ComplexityAnalysis with dimensional scores and overall assessment
@@ -113,26 +437,159 @@ class AdaptiveIntelligenceEngine:
         
         self.logger.info("Analyzing concept complexity", concept_name=concept_document.concept_name)
         
+        self.analysis_cache.validate(self._cache_fingerprint())
+        return self._session_complexity(self._session_for(concept_document, session))
+    
+    async def analyze_concept_stream(
+        self,
+        source: Union[str, Path, BinaryIO],
+        chunk_bytes: int = STREAM_CHUNK_BYTES
+    ) -> ComplexityAnalysis:
+        """
+        Analyze the complexity of ConceptDocument JSON without loading the document.
+        
+        For imported concepts too large to materialize: stories, challenges and
+        enhancements are parsed one at a time and fed to the feature
+        accumulators, so peak memory is bounded by the largest single record.
+        The result equals analyze_concept_complexity() of the parsed document.
+        Streamed analyses bypass the analysis cache, which is keyed by document
+        content.
+        
+        Args:
+            source: Path of a ConceptDocument JSON file, or a binary file object
+            chunk_bytes: Bytes read at a time
+            
+        Returns:
+            ComplexityAnalysis with dimensional scores and overall assessment
+        """
+        
+        features = stream_concept_features(source, self.keyword_automaton, chunk_bytes)
+        self.logger.info("Analyzing streamed concept complexity", concept_name=features.concept_name)
+        return self._analyze_features(features, self._estimate_innovation_level(features))
+    
+    async def analyze_narrative_coherence(
+        self,
+        concept_document: ConceptDocument,
+        session: Optional[AnalysisSession] = None
+    ) -> NarrativeCoherence:
+        """
+        Analyze story coherence across all stakeholders of a concept.
+        
+        Args:
+            concept_document: ConceptDocument from ConceptCraft AI
+            session: Analysis session of the current planning flow
+            
+        Returns:
+            NarrativeCoherence with the pairwise story similarity matrix,
+            story-to-concept similarities and the coherence score
+        """
+        
+        session = self._session_for(concept_document, session)
+        return session.memoize("narrative", lambda: self._narrative_structure(self._session_features(session)))
+    
+    def create_analysis_session(self, concept_document: ConceptDocument) -> AnalysisSession:
+        """
+        Start an analysis session for one planning flow over a concept document.
+        
+        Passing the session to analyze_concept_complexity, determine_execution_mode
+        and generate_development_recommendation computes the document hash,
+        concept features, complexity analysis, project context and recommendation
+        once for the whole flow instead of once per call.
+        
+        Args:
+            concept_document: ConceptDocument being planned
+            
+        Returns:
+            AnalysisSession bound to the document's current revision
+        """
+        
+        return AnalysisSession(concept_document)
+    
+    def _session_for(
+        self,
+        concept_document: ConceptDocument,
+        session: Optional[AnalysisSession]
+    ) -> AnalysisSession:
+        """The caller's session if it covers the document, otherwise a single-call one."""
+        
+        if session is None:
+            return AnalysisSession(concept_document)
+        if not session.covers(concept_document):
+            self.logger.warning(
+                "Analysis session does not match concept document",
+                concept_name=concept_document.concept_name
+            )
+            return AnalysisSession(concept_document)
+        return session
+    
+    def _session_features(self, session: AnalysisSession) -> ConceptFeatures:
+        return session.memoize(
+            "features", lambda: extract_concept_features(session.concept_document, self.keyword_automaton)
+        )
+    
+    def _session_innovation_level(self, session: AnalysisSession, features: ConceptFeatures) -> float:
+        return session.memoize("innovation_level", lambda: self._estimate_innovation_level(features))
+    
+    def _session_complexity(self, session: AnalysisSession) -> ComplexityAnalysis:
+        """Complexity analysis of the session document, from the session, the cache or fresh."""
+        
+        def analyze() -> ComplexityAnalysis:
+            cache_key = content_hash("complexity", session.revision)
+            complexity_analysis = self.analysis_cache.get(cache_key)
+            if complexity_analysis is None:
+                features = self._session_features(session)
+                complexity_analysis = self._analyze_features(features, self._session_innovation_level(session, features))
+                self.analysis_cache.put(cache_key, complexity_analysis)
+            return complexity_analysis
+        
+        return session.memoize("complexity", analyze)
+    
+    def create_incremental_analysis(self, concept_document: ConceptDocument) -> IncrementalComplexityAnalysis:
+        """
+        Start an incremental analysis of a concept under active development.
+        
+        The returned analysis is updated through change events (added challenges,
+        enhancements, stories or edited fields) and recomputes only the dimensions
+        depending on the changed fields, for live feedback on every conversation turn.
+        
+        Args:
+            concept_document: ConceptDocument being developed
+            
+        Returns:
+            IncrementalComplexityAnalysis tracking the document
+        """
+        
+        self.logger.info("Starting incremental complexity analysis", concept_name=concept_document.concept_name)
+        
+        return IncrementalComplexityAnalysis(self, concept_document)
+    
+    def _analyze_features(
+        self,
+        features: ConceptFeatures,
+        innovation_level: Optional[float] = None
+    ) -> ComplexityAnalysis:
+        """Build a ComplexityAnalysis from pre-extracted concept features."""
+        
         # Stakeholder complexity analysis
-        stakeholder_complexity = self._analyze_stakeholder_complexity(concept_document)
+        stakeholder_complexity = self._analyze_stakeholder_complexity(features)
         
         # Technical complexity estimation
-        technical_complexity = self._estimate_technical_complexity(concept_document)
+        technical_complexity = self._estimate_technical_complexity(features)
         
         # Business complexity analysis
-        business_complexity = self._analyze_business_complexity(concept_document)
+        business_complexity = self._analyze_business_complexity(features)
         
         # Integration complexity
-        integration_complexity = self._estimate_integration_complexity(concept_document)
+        integration_complexity = self._estimate_integration_complexity(features)
         
         # Story and narrative analysis
-        story_richness = self._analyze_story_richness(concept_document)
-        narrative_coherence = self._analyze_narrative_coherence(concept_document)
-        stakeholder_alignment = self._analyze_stakeholder_alignment(concept_document)
+        story_richness = self._analyze_story_richness(features)
+        narrative_coherence = self._analyze_narrative_coherence(features)
+        stakeholder_alignment = self._analyze_stakeholder_alignment(features)
         
         # Uncertainty and risk analysis
-        uncertainty_level = self._analyze_uncertainty_level(concept_document)
-        risk_factors = self._identify_risk_factors(concept_document)
+        uncertainty_level = self._analyze_uncertainty_level(features)
+        risk_factors = self._identify_risk_factors(features, innovation_level)
         
         # Calculate overall complexity score
         complexity_score = (
@@ -145,7 +602,7 @@ class AdaptiveIntelligenceEngine:
         
         # Determine analysis confidence
         analysis_confidence = self._calculate_analysis_confidence(
-            concept_document, stakeholder_complexity, story_richness
+            features, stakeholder_complexity, story_richness
         )
         
         complexity_analysis = ComplexityAnalysis(
@@ -171,11 +628,156 @@ class AdaptiveIntelligenceEngine:
         
         return complexity_analysis
     
+    async def analyze_concepts_batch(self, concept_documents: List[ConceptDocument]) -> List[ComplexityAnalysis]:
+        """
+        Analyze complexity of many concept documents in one vectorized pass.
+        
+        Dimension inputs for every document are extracted into a single feature
+        matrix, then scaling clamps and complexity weights are applied as array
+        operations. Scores are numerically identical to analyze_concept_complexity.
+        
+        Args:
+            concept_documents: ConceptDocuments from ConceptCraft AI
+            
+        Returns:
+            ComplexityAnalysis for each document, in input order
+        """
+        
+        if not concept_documents:
+            return []
+        
+        self.logger.info("Analyzing concept complexity batch", batch_size=len(concept_documents))
+        
+        features = [extract_concept_features(document, self.keyword_automaton) for document in concept_documents]
+        feature_matrix = np.array(
+            [self._extract_dimension_inputs(concept_features) for concept_features in features],
+            dtype=np.float64
+        )
+        dimension_scores = self._score_dimension_matrix(feature_matrix)
+        story_richness = feature_matrix[:, DIMENSION_INPUT_COLUMNS.index("story_richness")]
+        
+        complexity_analyses = []
+        for row, concept_features in enumerate(features):
+            complexity_analyses.append(ComplexityAnalysis(
+                complexity_score=float(dimension_scores["complexity_score"][row]),
+                stakeholder_complexity=float(dimension_scores["stakeholder_complexity"][row]),
+                technical_complexity=float(dimension_scores["technical_complexity"][row]),
+                business_complexity=float(dimension_scores["business_complexity"][row]),
+                integration_complexity=float(dimension_scores["integration_complexity"][row]),
+                story_richness=float(story_richness[row]),
+                narrative_coherence=self._analyze_narrative_coherence(concept_features),
+                stakeholder_alignment=self._analyze_stakeholder_alignment(concept_features),
+                uncertainty_level=float(dimension_scores["uncertainty_level"][row]),
+                risk_factors=self._identify_risk_factors(concept_features),
+                analysis_confidence=float(dimension_scores["analysis_confidence"][row])
+            ))
+        
+        self.logger.info(
+            "Batch complexity analysis complete",
+            batch_size=len(complexity_analyses),
+            mean_complexity=float(dimension_scores["complexity_score"].mean())
+        )
+        
+        return complexity_analyses
+    
+    def _extract_dimension_inputs(self, features: ConceptFeatures) -> List[float]:
+        """Extract one feature matrix row (see DIMENSION_INPUT_COLUMNS) from concept features."""
+        
+        avg_alignment = features.avg_story_confidence
+        
+        return [
+            features.stakeholders.stakeholder_count,
+            features.stakeholders.stakeholder_type_count,
+            features.challenges.challenge_count,
+            avg_alignment if avg_alignment is not None else 0.5,
+            features.concept_maturity,
+            features.enhancements.enhancement_complexity,
+            features.core_stories.tech_requirements,
+            features.core_stories.value_proposition_count,
+            float(features.has_differentiation),
+            features.differentiation_words,
+            features.success_metric_count,
+            features.challenges.business_challenge_complexity,
+            features.integration_complexity,
+            features.narrative_confidence,
+            features.core_stories.novelty_mentions,
+            self._analyze_story_richness(features),
+            VALIDATION_CONFIDENCE.get(features.validation_level, 0.5)
+        ]
+    
+    def _score_dimension_matrix(self, feature_matrix: np.ndarray) -> Dict[str, np.ndarray]:
+        """Vectorized counterpart of the per-dimension analyzers over a feature matrix."""
+        
+        column = {name: feature_matrix[:, index] for index, name in enumerate(DIMENSION_INPUT_COLUMNS)}
+        
+        stakeholder_complexity = np.minimum(
+            np.minimum(column["stakeholder_count"] / 3.0, 3.0) +
+            np.minimum(column["stakeholder_type_count"] / 2.0, 2.0) +
+            np.minimum(column["challenge_count"] / 2.0, 2.0) +
+            (1.0 - column["avg_story_confidence"]) * 3.0,
+            10.0
+        )
+        
+        technical_complexity = np.minimum(
+            (1.0 - column["concept_maturity"]) * 3.0 +
+            np.minimum(column["enhancement_complexity"], 4.0) +
+            np.minimum(column["tech_requirements"], 3.0),
+            10.0
+        )
+        
+        market_complexity = np.where(
+            column["has_differentiation"] > 0.0,
+            np.minimum(column["differentiation_words"] / 20.0, 2.0),
+            1.0
+        )
+        business_complexity = np.minimum(
+            np.minimum(column["value_proposition_count"] / 2.0, 3.0) +
+            market_complexity +
+            np.minimum(column["success_metric_count"] / 3.0, 2.0) +
+            np.minimum(column["business_challenge_complexity"], 3.0),
+            10.0
+        )
+        
+        integration_complexity = np.minimum(column["integration_complexity"], 10.0)
+        
+        uncertainty_level = (1.0 - column["concept_maturity"]) * 3.0
+        uncertainty_level = uncertainty_level + np.where(column["challenge_count"] < 2, 2.0, 0.0)
+        uncertainty_level = uncertainty_level + (1.0 - column["narrative_confidence"]) * 2.0
+        uncertainty_level = uncertainty_level + np.minimum(column["innovation_mentions"] * 0.5, 3.0)
+        uncertainty_level = np.minimum(uncertainty_level, 10.0)
+        
+        # Accumulate in the same order as the single-document weighted sum
+        complexity_score = stakeholder_complexity * self.complexity_weights["stakeholder_complexity"]
+        complexity_score = complexity_score + technical_complexity * self.complexity_weights["technical_complexity"]
+        complexity_score = complexity_score + business_complexity * self.complexity_weights["business_complexity"]
+        complexity_score = complexity_score + integration_complexity * self.complexity_weights["integration_complexity"]
+        complexity_score = complexity_score + uncertainty_level * self.complexity_weights["uncertainty_level"]
+        
+        confidence_factors = np.column_stack([
+            column["story_richness"] / 10.0,
+            column["concept_maturity"],
+            column["validation_confidence"],
+            np.minimum(column["challenge_count"] / 3.0, 1.0),
+            column["narrative_confidence"]
+        ])
+        analysis_confidence = np.minimum(np.mean(confidence_factors, axis=1), 1.0)
+        
+        return {
+            "complexity_score": complexity_score,
+            "stakeholder_complexity": stakeholder_complexity,
+            "technical_complexity": technical_complexity,
+            "business_complexity": business_complexity,
+            "integration_complexity": integration_complexity,
+            "uncertainty_level": uncertainty_level,
+            "analysis_confidence": analysis_confidence
+        }
+    
     async def determine_execution_mode(
         self,
         concept_document: ConceptDocument,
         user_preferences: UserPreferences,
-        project_constraints: Dict[str, Any] = None
+        project_constraints: Dict[str, Any] = None,
+        session: Optional[AnalysisSession] = None
     ) -> ExecutionMode:
         """
         Determine optimal execution mode based on concept complexity and user preferences.
@@ -184,20 +786,16 @@ class AdaptiveIntelligenceEngine:
             concept_document: ConceptDocument from ConceptCraft AI
             user_preferences: User preferences and constraints
             project_constraints: Additional project constraints
+            session: Analysis session of the current planning flow
             
         Returns:
             Recommended ExecutionMode
         """
         
-        # Analyze complexity
-        complexity_analysis = await self.analyze_concept_complexity(concept_document)
-        
-        # Create project context
-        project_context = self._create_project_context(concept_document, project_constraints or {})
-        
-        # Generate recommendation
-        recommendation = await self._generate_mode_recommendation(
-            complexity_analysis, user_preferences, project_context
+        # Analyze complexity, create project context and recommend
+        self.logger.info("Analyzing concept complexity", concept_name=concept_document.concept_name)
+        complexity_analysis, project_context, recommendation = await self._recommend(
+            concept_document, user_preferences, project_constraints or {}, session
         )
         
         # Store decision for learning
@@ -219,7 +817,8 @@ class AdaptiveIntelligenceEngine:
         self,
         concept_document: ConceptDocument,
         user_preferences: UserPreferences,
-        project_constraints: Dict[str, Any] = None
+        project_constraints: Dict[str, Any] = None,
+        session: Optional[AnalysisSession] = None
     ) -> DevelopmentRecommendation:
         """
         Generate comprehensive development recommendation with rationale.
@@ -228,309 +827,317 @@ class AdaptiveIntelligenceEngine:
             concept_document: ConceptDocument from ConceptCraft AI
             user_preferences: User preferences and constraints
             project_constraints: Additional project constraints
+            session: Analysis session of the current planning flow
             
         Returns:
             DevelopmentRecommendation with detailed guidance
         """
         
-        # Analyze complexity
-        complexity_analysis = await self.analyze_concept_complexity(concept_document)
+        # Analyze complexity, create project context and recommend
+        self.logger.info("Analyzing concept complexity", concept_name=concept_document.concept_name)
+        _, _, recommendation = await self._recommend(
+            concept_document, user_preferences, project_constraints or {}, session
+        )
         
-        # Create project context
-        project_context = self._create_project_context(concept_document, project_constraints or {})
+        return recommendation
+    
+    async def _recommend(
+        self,
+        concept_document: ConceptDocument,
+        user_preferences: UserPreferences,
+        constraints: Dict[str, Any],
+        session: Optional[AnalysisSession]
+    ) -> Tuple[ComplexityAnalysis, ProjectContext, DevelopmentRecommendation]:
+        """Analysis, project context and recommendation, each computed once per session."""
+        
+        session = self._session_for(concept_document, session)
+        complexity_analysis, project_context, recommendation_key = self._analyze_with_cache(
+            concept_document, user_preferences, constraints, session
+        )
         
-        # Generate comprehensive recommendation
-        recommendation = await self._generate_mode_recommendation(
-            complexity_analysis, user_preferences, project_context
+        recommendation = session.get("recommendation", recommendation_key)
+        if recommendation is None:
+            recommendation = self.analysis_cache.get(recommendation_key)
+            if recommendation is None:
+                recommendation = await self._generate_mode_recommendation(
+                    complexity_analysis, user_preferences, project_context
+                )
+                self.analysis_cache.put(recommendation_key, recommendation)
+            session.put("recommendation", recommendation, recommendation_key)
+            # Counted once per planning flow, however often the flow asks for it
+            self.distribution_monitor.record(recommendation.recommended_mode, complexity_analysis)
+        
+        return complexity_analysis, project_context, recommendation
+    
+    async def sweep_user_preferences(
+        self,
+        concept_document: ConceptDocument,
+        user_preferences: UserPreferences,
+        grid: Optional[Dict[str, List[Any]]] = None,
+        project_constraints: Dict[str, Any] = None,
+        session: Optional[AnalysisSession] = None
+    ) -> DecisionSurface:
+        """
+        Evaluate the recommended mode over a grid of user preference values.
+        
+        The concept is analyzed once (through the analysis cache) and all mode
+        scores for every preference combination are computed in one vectorized
+        pass. Each grid point's mode and confidence equal those
+        generate_development_recommendation returns for the same preferences.
+        
+        Args:
+            concept_document: ConceptDocument from ConceptCraft AI
+            user_preferences: Baseline preferences for fields that are not swept
+            grid: Values per swept UserPreferences field; defaults to
+                speed_vs_quality, risk_tolerance, team_size and confidence_threshold
+            project_constraints: Additional project constraints
+            session: Analysis session of the current planning flow
+            
+        Returns:
+            DecisionSurface with one axis per swept preference
+        """
+        
+        complexity_analysis, project_context, _ = self._analyze_with_cache(
+            concept_document, user_preferences, project_constraints or {}, session
         )
         
-        return recommendation
+        surface = sweep_mode_scores(
+            self.mode_scoring,
+            complexity_analysis,
+            user_preferences,
+            project_context,
+            DEFAULT_SWEEP_GRID if grid is None else grid
+        )
+        
+        self.logger.info(
+            "Preference sweep evaluated",
+            concept_name=concept_document.concept_name,
+            parameters=list(surface.parameters),
+            grid_points=int(np.prod(surface.shape))
+        )
+        return surface
     
-    def _analyze_stakeholder_complexity(self, concept_document: ConceptDocument) -> float:
-        """Analyze stakeholder ecosystem complexity."""
+    def _cache_fingerprint(self) -> str:
+        """Digest of the configuration that analysis results depend on."""
+        return content_hash(
+            ComplexityAnalysis.model_fields["analysis_version"].default,
+            DevelopmentRecommendation.model_fields["recommender_version"].default,
+            self.complexity_weights,
+            {mode.value: thresholds for mode, thresholds in self.mode_thresholds.items()},
+            self.keyword_automaton.fingerprint()
+        )
+    
+    def _analyze_with_cache(
+        self,
+        concept_document: ConceptDocument,
+        user_preferences: UserPreferences,
+        constraints: Dict[str, Any],
+        session: Optional[AnalysisSession] = None
+    ) -> Tuple[ComplexityAnalysis, ProjectContext, str]:
+        """
+        Return the complexity analysis and project context for a concept, reusing
+        session and cached results, together with the cache key of its recommendation.
+        """
+        
+        self.analysis_cache.validate(self._cache_fingerprint())
+        self._ensure_patterns_loaded()
         
-        stakeholder_count = len(concept_document.stakeholders.all())
-        stakeholder_types = len({s.stakeholder_type for s in concept_document.stakeholders.all()})
+        session = self._session_for(concept_document, session)
+        constraints_hash = content_hash(constraints)
+        recommendation_key = content_hash(
+            "recommendation", session.revision, user_preferences, constraints_hash, self._patterns_key()
+        )
+        
+        complexity_analysis = self._session_complexity(session)
+        
+        def create_context() -> ProjectContext:
+            context_key = content_hash("context", session.revision, constraints_hash)
+            project_context = self.analysis_cache.get(context_key)
+            if project_context is None:
+                project_context = self._create_project_context(
+                    concept_document, constraints, self._session_features(session), session
+                )
+                self.analysis_cache.put(context_key, project_context)
+            return project_context
+        
+        project_context = session.memoize("context", create_context, constraints_hash)
+        
+        # History fields change with every stored decision, so they are filled outside the cache
+        project_context = self._with_similar_projects(project_context, complexity_analysis)
+        
+        return complexity_analysis, project_context, recommendation_key
+    
+    def _analyze_stakeholder_complexity(self, features: ConceptFeatures) -> float:
+        """Analyze stakeholder ecosystem complexity."""
         
         # Base complexity from count
-        count_complexity = min(stakeholder_count / 3.0, 3.0)  # Scale 0-3
+        count_complexity = min(features.stakeholders.stakeholder_count / 3.0, 3.0)  # Scale 0-3
         
         # Additional complexity from type diversity
-        type_complexity = min(stakeholder_types / 2.0, 2.0)  # Scale 0-2
+        type_complexity = min(features.stakeholders.stakeholder_type_count / 2.0, 2.0)  # Scale 0-2
         
         # Challenge resolution complexity
-        challenge_complexity = min(len(concept_document.challenges_resolved) / 2.0, 2.0)  # Scale 0-2
+        challenge_complexity = min(features.challenges.challenge_count / 2.0, 2.0)  # Scale 0-2
         
         # Stakeholder alignment complexity (inverse of alignment)
-        alignment_scores = [story.story_confidence for story in concept_document.core_stories]
-        avg_alignment = np.mean(alignment_scores) if alignment_scores else 0.5
+        avg_alignment = features.avg_story_confidence
+        if avg_alignment is None:
+            avg_alignment = 0.5
         alignment_complexity = (1.0 - avg_alignment) * 3.0  # Scale 0-3
         
         total_complexity = count_complexity + type_complexity + challenge_complexity + alignment_complexity
         
         return min(total_complexity, 10.0)
     
-    def _estimate_technical_complexity(self, concept_document: ConceptDocument) -> float:
+    def _estimate_technical_complexity(self, features: ConceptFeatures) -> float:
         """Estimate technical implementation complexity."""
         
         # Base complexity from concept maturity
-        base_complexity = (1.0 - concept_document.concept_maturity) * 3.0
+        base_complexity = (1.0 - features.concept_maturity) * 3.0
         
         # Complexity from enhancements (network effects, integrations)
-        enhancement_complexity = 0.0
-        for enhancement in concept_document.enhancements:
-            if "network" in enhancement.enhancement_type.lower():
-                enhancement_complexity += 1.5
-            elif "integration" in enhancement.enhancement_type.lower():
-                enhancement_complexity += 1.0
-            else:
-                enhancement_complexity += 0.5
-        
-        enhancement_complexity = min(enhancement_complexity, 4.0)
+        enhancement_complexity = min(features.enhancements.enhancement_complexity, 4.0)
         
         # Complexity from stakeholder technology requirements
-        tech_requirements = 0.0
-        for story in concept_document.core_stories:
-            if any(tech_word in story.enhanced_experience.lower() 
-                  for tech_word in ["ai", "machine learning", "real-time", "api", "integration"]):
-                tech_requirements += 0.5
-        
-        tech_requirements = min(tech_requirements, 3.0)
+        tech_requirements = min(features.core_stories.tech_requirements, 3.0)
         
         total_complexity = base_complexity + enhancement_complexity + tech_requirements
         
         return min(total_complexity, 10.0)
     
-    def _analyze_business_complexity(self, concept_document: ConceptDocument) -> float:
+    def _analyze_business_complexity(self, features: ConceptFeatures) -> float:
         """Analyze business logic and model complexity."""
         
         # Complexity from multiple value propositions
-        value_complexity = len(set(story.value_delivered for story in concept_document.core_stories))
-        value_complexity = min(value_complexity / 2.0, 3.0)  # Scale 0-3
+        value_complexity = min(features.core_stories.value_proposition_count / 2.0, 3.0)  # Scale 0-3
         
         # Market positioning complexity
         market_complexity = 1.0  # Default moderate complexity
-        if concept_document.competitive_differentiation:
+        if features.has_differentiation:
             # More differentiation = more complex positioning
-            market_complexity = min(len(concept_document.competitive_differentiation.split()) / 20.0, 2.0)
+            market_complexity = min(features.differentiation_words / 20.0, 2.0)
         
         # Success metrics complexity
-        metrics_complexity = min(len(concept_document.success_metrics) / 3.0, 2.0)
+        metrics_complexity = min(features.success_metric_count / 3.0, 2.0)
         
         # Challenge resolution business impact
-        business_challenge_complexity = 0.0
-        for challenge in concept_document.challenges_resolved:
-            if any(biz_word in challenge.solution_approach.lower()
-                  for biz_word in ["business model", "revenue", "pricing", "market", "competition"]):
-                business_challenge_complexity += 0.5
-        
-        business_challenge_complexity = min(business_challenge_complexity, 3.0)
+        business_challenge_complexity = min(features.challenges.business_challenge_complexity, 3.0)
         
         total_complexity = value_complexity + market_complexity + metrics_complexity + business_challenge_complexity
         
         return min(total_complexity, 10.0)
     
-    def _estimate_integration_complexity(self, concept_document: ConceptDocument) -> float:
+    def _estimate_integration_complexity(self, features: ConceptFeatures) -> float:
         """Estimate system integration complexity."""
         
-        integration_complexity = 0.0
-        
-        # Look for integration keywords in stories and enhancements
-        integration_keywords = [
-            "api", "integration", "connect", "sync", "import", "export",
-            "third-party", "platform", "system", "database", "crm", "erp"
-        ]
-        
-        # Check stakeholder stories for integration needs
-        for story in concept_document.core_stories:
-            text = f"{story.enhanced_experience} {story.value_delivered}".lower()
-            integration_mentions = sum(1 for keyword in integration_keywords if keyword in text)
-            integration_complexity += min(integration_mentions * 0.5, 2.0)
-        
-        # Check enhancements for integration requirements
-        for enhancement in concept_document.enhancements:
-            text = f"{enhancement.description} {enhancement.implementation_approach}".lower()
-            integration_mentions = sum(1 for keyword in integration_keywords if keyword in text)
-            integration_complexity += min(integration_mentions * 0.3, 1.5)
-        
-        # Challenge resolutions that involve integration
-        for challenge in concept_document.challenges_resolved:
-            text = f"{challenge.solution_approach} {challenge.concept_evolution}".lower()
-            integration_mentions = sum(1 for keyword in integration_keywords if keyword in text)
-            integration_complexity += min(integration_mentions * 0.2, 1.0)
-        
-        return min(integration_complexity, 10.0)
+        # Stories, enhancements and challenge resolutions mentioning integrations
+        return min(features.integration_complexity, 10.0)
     
-    def _analyze_story_richness(self, concept_document: ConceptDocument) -> float:
+    def _analyze_story_richness(self, features: ConceptFeatures) -> float:
         """Analyze richness and depth of stakeholder stories."""
         
-        if not concept_document.core_stories:
+        if not features.core_stories.story_count:
             return 0.0
         
-        story_scores = []
-        for story in concept_document.core_stories:
-            # Story completeness score
-            completeness = 0.0
-            if story.current_situation: completeness += 1.0
-            if story.pain_points: completeness += min(len(story.pain_points) / 3.0, 1.0)
-            if story.enhanced_experience: completeness += 1.0
-            if story.value_delivered: completeness += 1.0
-            if story.success_indicators: completeness += min(len(story.success_indicators) / 2.0, 1.0)
-            
-            # Story depth score (length and detail)
-            detail_score = 0.0
-            text_length = len(f"{story.current_situation} {story.enhanced_experience} {story.value_delivered}")
-            detail_score = min(text_length / 200.0, 2.0)  # Scale based on text length
-            
-            story_score = (completeness + detail_score) / 2.0
-            story_scores.append(story_score)
-        
-        avg_story_richness = np.mean(story_scores)
+        avg_story_richness = np.mean(features.core_stories.richness_scores)
         
         # Scale to 0-10
         return min(avg_story_richness * 2.0, 10.0)
     
-    def _analyze_narrative_coherence(self, concept_document: ConceptDocument) -> float:
+    def _analyze_narrative_coherence(self, features: ConceptFeatures) -> float:
         """Analyze coherence and consistency across stakeholder stories."""
+        if features.narrative_score is not None:
+            # Accumulated while streaming; story texts were not retained
+            return features.narrative_score
+        return self._narrative_structure(features).score
+    
+    def _narrative_structure(self, features: ConceptFeatures) -> NarrativeCoherence:
+        """Similarity structure of the full stakeholder ecosystem, or of the core stories without one."""
         
-        if len(concept_document.core_stories) < 2:
-            return 5.0  # Default moderate score for single story
-        
-        # Check value alignment across stories
-        value_keywords = []
-        for story in concept_document.core_stories:
-            story_keywords = story.value_delivered.lower().split()
-            value_keywords.extend(story_keywords)
-        
-        # Calculate keyword overlap (simple coherence measure)
-        unique_keywords = set(value_keywords)
-        total_keywords = len(value_keywords)
-        
-        if total_keywords == 0:
-            return 3.0
-        
-        # Higher overlap = higher coherence
-        overlap_ratio = (total_keywords - len(unique_keywords)) / total_keywords
-        coherence_score = overlap_ratio * 10.0
-        
-        # Check if concept description aligns with stories
-        concept_words = set(concept_document.concept_description.lower().split())
-        story_words = set()
-        for story in concept_document.core_stories:
-            story_words.update(story.value_delivered.lower().split())
-        
-        alignment_ratio = len(concept_words.intersection(story_words)) / max(len(concept_words), 1)
-        alignment_score = alignment_ratio * 10.0
-        
-        # Average coherence and alignment
-        final_score = (coherence_score + alignment_score) / 2.0
-        
-        return min(final_score, 10.0)
+        stories = features.stakeholders if features.stakeholders.stakeholder_count else features.core_stories
+        return analyze_narrative_coherence(stories.stakeholder_names, stories.story_texts, features.concept_text)
     
-    def _analyze_stakeholder_alignment(self, concept_document: ConceptDocument) -> float:
+    def _analyze_stakeholder_alignment(self, features: ConceptFeatures) -> float:
         """Analyze alignment between stakeholder goals and concept value."""
         
-        if not concept_document.core_stories:
+        if not features.core_stories.story_count:
             return 5.0
         
-        alignment_scores = []
-        for story in concept_document.core_stories:
-            # Use story confidence as proxy for alignment
-            alignment_scores.append(story.story_confidence)
+        # Use story confidence as proxy for alignment
+        avg_alignment = features.avg_story_confidence
         
-        avg_alignment = np.mean(alignment_scores)
-        
-        # Check for conflicting stakeholder needs in challenges
-        conflict_penalty = 0.0
-        for challenge in concept_document.challenges_resolved:
-            if any(conflict_word in challenge.challenge_scenario.lower()
-                  for conflict_word in ["conflict", "disagree", "oppose", "resist", "against"]):
-                conflict_penalty += 0.1
+        # Penalize conflicting stakeholder needs in challenges
+        conflict_penalty = features.challenges.conflict_penalty
         
         final_alignment = max(avg_alignment - conflict_penalty, 0.0)
         
         return min(final_alignment * 10.0, 10.0)
     
-    def _analyze_uncertainty_level(self, concept_document: ConceptDocument) -> float:
+    def _analyze_uncertainty_level(self, features: ConceptFeatures) -> float:
         """Analyze project uncertainty and risk level."""
         
         uncertainty_factors = 0.0
         
         # Low concept maturity = high uncertainty
-        maturity_uncertainty = (1.0 - concept_document.concept_maturity) * 3.0
+        maturity_uncertainty = (1.0 - features.concept_maturity) * 3.0
         uncertainty_factors += maturity_uncertainty
         
         # Unresolved challenges = uncertainty
-        if len(concept_document.challenges_resolved) < 2:
+        if features.challenges.challenge_count < 2:
             uncertainty_factors += 2.0
         
         # Low narrative confidence = uncertainty
-        confidence_uncertainty = (1.0 - concept_document.narrative_confidence) * 2.0
+        confidence_uncertainty = (1.0 - features.narrative_confidence) * 2.0
         uncertainty_factors += confidence_uncertainty
         
         # Innovation level = uncertainty
-        innovation_keywords = ["new", "novel", "innovative", "first", "revolutionary", "breakthrough"]
-        innovation_mentions = 0
-        for story in concept_document.core_stories:
-            text = f"{story.enhanced_experience} {story.value_delivered}".lower()
-            innovation_mentions += sum(1 for keyword in innovation_keywords if keyword in text)
-        
-        innovation_uncertainty = min(innovation_mentions * 0.5, 3.0)
+        innovation_uncertainty = min(features.core_stories.novelty_mentions * 0.5, 3.0)
         uncertainty_factors += innovation_uncertainty
         
         return min(uncertainty_factors, 10.0)
     
-    def _identify_risk_factors(self, concept_document: ConceptDocument) -> List[str]:
+    def _identify_risk_factors(
+        self,
+        features: ConceptFeatures,
+        innovation_level: Optional[float] = None
+    ) -> List[str]:
         """Identify potential risk factors from concept analysis."""
         
         risks = []
         
         # Stakeholder complexity risks
-        if len(concept_document.stakeholders.all()) > 5:
+        if features.stakeholders.stakeholder_count > 5:
             risks.append("High stakeholder complexity - coordination challenges")
         
         # Technical risks
-        if concept_document.technical_complexity > 7:
+        if features.technical_complexity > 7:
             risks.append("High technical complexity - implementation challenges")
         
         # Market risks
-        if not concept_document.competitive_differentiation:
+        if not features.has_differentiation:
             risks.append("Unclear competitive differentiation")
         
         # Validation risks
-        if len(concept_document.challenges_resolved) < 2:
+        if features.challenges.challenge_count < 2:
             risks.append("Insufficient challenge stress-testing")
         
         # Success metrics risks
-        if not concept_document.success_metrics:
+        if not features.success_metric_count:
             risks.append("Undefined success metrics")
         
         # Innovation risks
-        innovation_level = self._estimate_innovation_level(concept_document)
+        if innovation_level is None:
+            innovation_level = self._estimate_innovation_level(features)
         if innovation_level > 7:
             risks.append("High innovation risk - unproven approach")
         
         return risks
     
-    def _estimate_innovation_level(self, concept_document: ConceptDocument) -> float:
+    def _estimate_innovation_level(self, features: ConceptFeatures) -> float:
         """Estimate innovation level of the concept."""
         
-        innovation_keywords = [
-            "new", "novel", "innovative", "first", "revolutionary", "breakthrough",
-            "disrupted", "transform", "reinvent", "unprecedented"
-        ]
-        
-        innovation_score = 0.0
-        text_corpus = f"{concept_document.concept_description} "
-        
-        for story in concept_document.core_stories:
-            text_corpus += f"{story.enhanced_experience} {story.value_delivered} "
-        
-        for enhancement in concept_document.enhancements:
-            text_corpus += f"{enhancement.description} "
-        
-        text_corpus = text_corpus.lower()
-        innovation_mentions = sum(1 for keyword in innovation_keywords if keyword in text_corpus)
+        # Distinct innovation keywords across description, stories and enhancements
+        innovation_mentions = features.innovation_mentions
         
         # Scale innovation score
         innovation_score = min(innovation_mentions / 3.0, 1.0) * 10.0
@@ -539,7 +1146,7 @@ class AdaptiveIntelligenceEngine:
     
     def _calculate_analysis_confidence(
         self,
-        concept_document: ConceptDocument,
+        features: ConceptFeatures,
         stakeholder_complexity: float,
         story_richness: float
     ) -> float:
@@ -552,23 +1159,18 @@ class AdaptiveIntelligenceEngine:
         confidence_factors.append(story_completeness)
         
         # Concept maturity factor
-        confidence_factors.append(concept_document.concept_maturity)
+        confidence_factors.append(features.concept_maturity)
         
         # Validation level factor
-        validation_scores = {
-            "foundation": 0.6,
-            "stress_tested": 0.8,
-            "enhanced": 1.0
-        }
-        validation_confidence = validation_scores.get(concept_document.validation_level.value, 0.5)
+        validation_confidence = VALIDATION_CONFIDENCE.get(features.validation_level, 0.5)
         confidence_factors.append(validation_confidence)
         
         # Challenge resolution factor
-        challenge_confidence = min(len(concept_document.challenges_resolved) / 3.0, 1.0)
+        challenge_confidence = min(features.challenges.challenge_count / 3.0, 1.0)
         confidence_factors.append(challenge_confidence)
         
         # Narrative confidence factor
-        confidence_factors.append(concept_document.narrative_confidence)
+        confidence_factors.append(features.narrative_confidence)
         
         # Calculate weighted average
         overall_confidence = np.mean(confidence_factors)
@@ -578,22 +1180,106 @@ class AdaptiveIntelligenceEngine:
     def _create_project_context(
         self,
         concept_document: ConceptDocument,
-        constraints: Dict[str, Any]
+        constraints: Dict[str, Any],
+        features: Optional[ConceptFeatures] = None,
+        session: Optional[AnalysisSession] = None
     ) -> ProjectContext:
         """Create project context from concept document and constraints."""
         
+        if features is None:
+            features = extract_concept_features(concept_document, self.keyword_automaton)
+        if session is not None:
+            innovation_level = self._session_innovation_level(session, features)
+        else:
+            innovation_level = self._estimate_innovation_level(features)
+        
         return ProjectContext(
             project_name=concept_document.concept_name,
             project_description=concept_document.concept_description,
-            stakeholder_count=len(concept_document.stakeholders.all()),
-            stakeholder_types=[s.stakeholder_type.value for s in concept_document.stakeholders.all()],
-            technical_complexity=int(concept_document.technical_complexity),
-            innovation_level=self._estimate_innovation_level(concept_document) / 10.0,
+            stakeholder_count=max(1, features.stakeholders.stakeholder_count),
+            stakeholder_types=list(features.stakeholders.stakeholder_types),
+            technical_complexity=min(max(1, int(features.technical_complexity)), 10),
+            innovation_level=innovation_level / 10.0,
             timeline_constraints=constraints.get("timeline"),
             regulatory_requirements=constraints.get("regulatory", []),
             scalability_requirements=constraints.get("scalability", "moderate")
         )
     
+    @property
+    def similar_projects(self) -> SimilarProjectIndex:
+        """Similar project index over stored decisions, built synchronously on first use."""
+        if self._similar_projects is None:
+            with self._history_lock:
+                if self._similar_projects is None:
+                    self._similar_projects = self._build_similar_project_index()
+        return self._similar_projects
+    
+    async def build_similar_projects(self) -> Optional[SimilarProjectIndex]:
+        """
+        Build the similar project index in an executor without blocking the event loop.
+        
+        Recommendations fill history fields from the index once it is ready and
+        leave them at their defaults until then. Returns None while another
+        build is in progress.
+        """
+        
+        if self._similar_projects is not None:
+            return self._similar_projects
+        
+        if self._similar_projects_pending is None:
+            self._similar_projects_pending = []
+            try:
+                # The index is built from the log, which must include queued decisions
+                await self.decision_persister.flush()
+                index = await asyncio.get_running_loop().run_in_executor(None, self._build_similar_project_index)
+                # Decisions stored while the index was being built
+                for decision in self._similar_projects_pending:
+                    self._index_similar_project(index, decision)
+                self._similar_projects = index
+            finally:
+                self._similar_projects_pending = None
+        
+        return self._similar_projects
+    
+    def _build_similar_project_index(self) -> SimilarProjectIndex:
+        index = SimilarProjectIndex()
+        with self._history_lock:
+            index.add_matrix(self.decision_matrix())
+        return index
+    
+    @staticmethod
+    def _index_similar_project(index: SimilarProjectIndex, decision: AdaptiveDecision):
+        index.add(
+            decision.decision_id,
+            complexity_vector(decision.complexity_analysis),
+            outcome_code(decision.project_success),
+            decision.project_context.project_name
+        )
+    
+    def _with_similar_projects(
+        self,
+        project_context: ProjectContext,
+        complexity_analysis: ComplexityAnalysis
+    ) -> ProjectContext:
+        """Copy of a project context with its history fields filled from similar past projects."""
+        
+        # Loading the history is too slow for a request; the index is built by initialize()
+        if self._similar_projects is None:
+            return project_context
+        
+        try:
+            similar = self._similar_projects.similar_projects(
+                complexity_analysis, exclude_project=project_context.project_name
+            )
+        except Exception as e:
+            self.logger.warning("Similar project lookup failed", error=str(e))
+            return project_context
+        
+        return project_context.model_copy(update={
+            "similar_projects_count": similar["count"],
+            "previous_success_rate": similar["success_rate"]
+        })
+    
     async def _generate_mode_recommendation(
         self,
         complexity_analysis: ComplexityAnalysis,
@@ -602,32 +1288,12 @@ class AdaptiveIntelligenceEngine:
     ) -> DevelopmentRecommendation:
         """Generate development mode recommendation with detailed rationale."""
         
-        # Calculate mode scores
-        mode_scores = {}
-        
-        # Lightweight mode scoring
-        lightweight_score = self._score_lightweight_mode(
-            complexity_analysis, user_preferences, project_context
-        )
-        mode_scores[ExecutionMode.LIGHTWEIGHT] = lightweight_score
-        
-        # Knowledge graph mode scoring
-        kg_score = self._score_knowledge_graph_mode(
-            complexity_analysis, user_preferences, project_context
-        )
-        mode_scores[ExecutionMode.KNOWLEDGE_GRAPH] = kg_score
-        
-        # Hybrid mode scoring
-        hybrid_score = self._score_hybrid_mode(
-            complexity_analysis, user_preferences, project_context
-        )
-        mode_scores[ExecutionMode.HYBRID] = hybrid_score
-        
-        # Creative mode scoring
-        creative_score = self._score_creative_mode(
-            complexity_analysis, user_preferences, project_context
-        )
-        mode_scores[ExecutionMode.CREATIVE] = creative_score
+        # Look up mode scores in the compiled policy table; score in Python without one
+        mode_scores = None
+        if self.mode_policy is not None:
+            mode_scores = self.mode_policy.mode_scores(complexity_analysis, user_preferences, project_context)
+        if mode_scores is None:
+            mode_scores = self._score_modes(complexity_analysis, user_preferences, project_context)
         
         # Select best mode
         recommended_mode = max(mode_scores, key=mode_scores.get)
@@ -650,8 +1316,8 @@ class AdaptiveIntelligenceEngine:
             recommended_mode, complexity_analysis
         )
         
-        # Estimate timeline
-        estimated_timeline = self._estimate_timeline(
+        # Forecast timeline; the median gives the timeline description
+        timeline_forecast = self.forecast_timeline(
             recommended_mode, complexity_analysis, project_context
         )
         
@@ -671,7 +1337,8 @@ class AdaptiveIntelligenceEngine:
             rationale=rationale,
             alternative_modes=alternative_modes,
             validation_requirements=validation_requirements,
-            estimated_timeline=estimated_timeline,
+            estimated_timeline=timeline_forecast.description,
+            timeline_forecast=timeline_forecast.percentiles(),
             identified_risks=risks,
             mitigation_strategies=mitigations,
             success_factors=success_factors,
@@ -680,6 +1347,65 @@ class AdaptiveIntelligenceEngine:
         
         return recommendation
     
+    def _score_modes(
+        self,
+        complexity_analysis: ComplexityAnalysis,
+        user_preferences: UserPreferences,
+        project_context: ProjectContext
+    ) -> Dict[ExecutionMode, float]:
+        """Score every execution mode with the reference scoring methods."""
+        
+        mode_scores = {}
+        
+        # Lightweight mode scoring
+        lightweight_score = self._score_lightweight_mode(
+            complexity_analysis, user_preferences, project_context
+        )
+        mode_scores[ExecutionMode.LIGHTWEIGHT] = lightweight_score
+        
+        # Knowledge graph mode scoring
+        kg_score = self._score_knowledge_graph_mode(
+            complexity_analysis, user_preferences, project_context
+        )
+        mode_scores[ExecutionMode.KNOWLEDGE_GRAPH] = kg_score
+        
+        # Hybrid mode scoring
+        hybrid_score = self._score_hybrid_mode(
+            complexity_analysis, user_preferences, project_context
+        )
+        mode_scores[ExecutionMode.HYBRID] = hybrid_score
+        
+        # Creative mode scoring
+        creative_score = self._score_creative_mode(
+            complexity_analysis, user_preferences, project_context
+        )
+        mode_scores[ExecutionMode.CREATIVE] = creative_score
+        
+        return mode_scores
+    
+    def score_modes_batch(
+        self,
+        complexity_analyses: List[ComplexityAnalysis],
+        user_preferences: List[UserPreferences],
+        project_contexts: List[ProjectContext]
+    ) -> np.ndarray:
+        """
+        Score every execution mode for many (analysis, preferences, context) triples.
+        
+        Evaluates the compiled mode scoring rule table in one vectorized pass; the
+        _score_*_mode methods are the reference implementation it matches.
+        
+        Args:
+            complexity_analyses: Complexity analysis per project
+            user_preferences: User preferences per project
+            project_contexts: Project context per project
+            
+        Returns:
+            Array of shape (N, 4) with mode scores in MODE_ORDER column order
+        """
+        
+        return self.mode_scoring.score(complexity_analyses, user_preferences, project_contexts)
+    
     def _score_lightweight_mode(
         self,
         complexity_analysis: ComplexityAnalysis,
@@ -691,7 +1417,7 @@ class AdaptiveIntelligenceEngine:
         score = 0.5  # Base score
         
         # Favor for low complexity
-        if complexity_analysis.complexity_score <= 4.0:
+        if complexity_analysis.complexity_score <= self.mode_thresholds[ExecutionMode.LIGHTWEIGHT]["max_complexity"]:
             score += 0.3
         elif complexity_analysis.complexity_score <= 6.0:
             score += 0.1
@@ -727,7 +1453,7 @@ class AdaptiveIntelligenceEngine:
         score = 0.3  # Lower base score (more resource intensive)
         
         # Strong favor for high complexity
-        if complexity_analysis.complexity_score >= 7.0:
+        if complexity_analysis.complexity_score >= self.mode_thresholds[ExecutionMode.HYBRID]["max_complexity"]:
             score += 0.4
         elif complexity_analysis.complexity_score >= 5.0:
             score += 0.2
@@ -767,7 +1493,9 @@ class AdaptiveIntelligenceEngine:
         score = 0.6  # Higher base score (balanced approach)
         
         # Favor for moderate complexity
-        if 4.0 <= complexity_analysis.complexity_score <= 7.0:
+        lightweight_max = self.mode_thresholds[ExecutionMode.LIGHTWEIGHT]["max_complexity"]
+        hybrid_max = self.mode_thresholds[ExecutionMode.HYBRID]["max_complexity"]
+        if lightweight_max <= complexity_analysis.complexity_score <= hybrid_max:
             score += 0.3
         
         # Favor for balanced preferences
@@ -879,19 +1607,37 @@ class AdaptiveIntelligenceEngine:
     ) -> List[CrossProjectPattern]:
         """Get relevant cross-project patterns for current context."""
         
-        relevant_patterns = []
+        self._ensure_patterns_loaded()
         
-        for pattern in self.patterns:
-            # Check complexity range
-            complexity_range = pattern.complexity_range
-            if (complexity_range[0] <= complexity_analysis.complexity_score <= complexity_range[1] and
-                mode in pattern.applicable_modes):
-                relevant_patterns.append(pattern)
+        # Top 3 most successful patterns covering this complexity for the mode
+        return self.pattern_index.query(complexity_analysis.complexity_score, mode, k=3)
+    
+    def add_pattern(self, pattern: CrossProjectPattern):
+        """Add or replace a cross-project pattern and update the pattern index."""
+        
+        self._ensure_patterns_loaded()
+        self._index_pattern(pattern)
+    
+    def _index_pattern(self, pattern: CrossProjectPattern):
+        """Insert or replace a pattern in the pattern list and index."""
         
-        # Sort by success rate
-        relevant_patterns.sort(key=lambda p: p.success_rate, reverse=True)
+        position = self._pattern_positions.get(pattern.pattern_id)
+        if position is None:
+            self._pattern_positions[pattern.pattern_id] = len(self.patterns)
+            self.patterns.append(pattern)
+        else:
+            self.patterns[position] = pattern
         
-        return relevant_patterns[:3]  # Top 3 most relevant patterns
+        self.pattern_index.add(pattern)
+        self._patterns_revision += 1
+    
+    def _patterns_key(self) -> str:
+        """Digest of the pattern library, recomputed only after the library changes."""
+        
+        # The revision counter is per process; persisted recommendations need the digest itself
+        if self._patterns_digest is None or self._patterns_digest[0] != self._patterns_revision:
+            self._patterns_digest = (self._patterns_revision, patterns_revision(self.patterns))
+        return self._patterns_digest[1]
     
     def _generate_validation_requirements(
         self,
@@ -943,41 +1689,22 @@ class AdaptiveIntelligenceEngine:
         
         return requirements
     
-    def _estimate_timeline(
+    def forecast_timeline(
         self,
         mode: ExecutionMode,
         complexity_analysis: ComplexityAnalysis,
-        project_context: ProjectContext
-    ) -> str:
-        """Estimate development timeline based on mode and complexity."""
-        
-        # Base timeline by mode
-        base_timelines = {
-            ExecutionMode.LIGHTWEIGHT: 5,      # days
-            ExecutionMode.HYBRID: 10,          # days
-            ExecutionMode.KNOWLEDGE_GRAPH: 20, # days
-            ExecutionMode.CREATIVE: 15         # days
-        }
-        
-        base_days = base_timelines[mode]
-        
-        # Adjust for complexity
-        complexity_multiplier = 1.0 + (complexity_analysis.complexity_score / 10.0)
-        adjusted_days = base_days * complexity_multiplier
-        
-        # Adjust for stakeholder count
-        if project_context.stakeholder_count > 5:
-            adjusted_days *= 1.2
-        
-        # Convert to timeline description
-        if adjusted_days <= 7:
-            return "5-7 days"
-        elif adjusted_days <= 14:
-            return "1-2 weeks"
-        elif adjusted_days <= 30:
-            return "2-4 weeks"
-        else:
-            return "1-2 months"
+        project_context: ProjectContext,
+        draws: int = DEFAULT_FORECAST_DRAWS
+    ) -> TimelineForecast:
+        """Monte Carlo development timeline forecast with P50/P80/P95 durations in days."""
+        
+        return forecast_timeline(
+            mode,
+            complexity_analysis.complexity_score,
+            complexity_analysis.uncertainty_level,
+            project_context.stakeholder_count,
+            draws=draws
+        )
     
     def _identify_risks_and_mitigations(
         self,
@@ -1071,28 +1798,10 @@ class AdaptiveIntelligenceEngine:
         return success_factors
     
     async def _load_historical_data(self):
-        """Load historical decisions and patterns for learning."""
+        """Load historical patterns; decisions are paged in from the decision log on demand."""
         try:
-            # Load decisions
-            for decision_file in self.decision_storage.glob("*.json"):
-                try:
-                    with open(decision_file, 'r') as f:
-                        decision_data = json.load(f)
-                        decision = AdaptiveDecision(**decision_data)
-                        self.decisions.append(decision)
-                except Exception as e:
-                    self.logger.warning("Failed to load decision", file=str(decision_file), error=str(e))
+            self._ensure_patterns_loaded()
             
-            # Load patterns
-            for pattern_file in self.pattern_storage.glob("*.json"):
-                try:
-                    with open(pattern_file, 'r') as f:
-                        pattern_data = json.load(f)
-                        pattern = CrossProjectPattern(**pattern_data)
-                        self.patterns.append(pattern)
-                except Exception as e:
-                    self.logger.warning("Failed to load pattern", file=str(pattern_file), error=str(e))
-                    
             self.logger.info(
                 "Historical data loaded",
                 decisions_count=len(self.decisions),
@@ -1102,24 +1811,219 @@ class AdaptiveIntelligenceEngine:
         except Exception as e:
             self.logger.error("Failed to load historical data", error=str(e))
     
+    def _ensure_patterns_loaded(self):
+        """Load stored cross-project patterns exactly once, on first use."""
+        
+        if self._patterns_loaded:
+            return
+        
+        with self._history_lock:
+            if self._patterns_loaded:
+                return
+            
+            for pattern_file in sorted(self.pattern_storage.glob("*.json")):
+                try:
+                    with open(pattern_file, 'r') as f:
+                        pattern_data = json.load(f)
+                        self._index_pattern(CrossProjectPattern(**pattern_data))
+                except Exception as e:
+                    self.logger.warning("Failed to load pattern", file=str(pattern_file), error=str(e))
+            
+            self._patterns_loaded = True
+    
+    def load_full_history(
+        self,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        transform: Optional[Callable[[AdaptiveDecision], Any]] = None
+    ) -> HistoryLoadResult:
+        """
+        Bulk load every stored decision and pattern for training and analytics.
+        
+        Parsing runs on a process pool; the result carries records per second.
+        Patterns are indexed if they have not been loaded yet. Decisions still
+        queued for writing are not included; await flush_decisions() first.
+        """
+        
+        result = load_history(
+            self.decision_log,
+            self.decision_storage,
+            self.pattern_storage,
+            workers=workers,
+            chunk_size=chunk_size,
+            transform=transform
+        )
+        
+        with self._history_lock:
+            if not self._patterns_loaded:
+                for pattern in result.patterns:
+                    self._index_pattern(pattern)
+                self._patterns_loaded = True
+        
+        return result
+    
+    async def apply_retention(
+        self,
+        retention_days: Optional[int] = None,
+        now: Optional[datetime] = None
+    ) -> RetentionResult:
+        """
+        Roll decisions older than the retention window into aggregates and remove them.
+        
+        Args:
+            retention_days: Window in days for this run (defaults to the policy's)
+            now: Reference time of the window (defaults to the current time)
+        """
+        
+        await self.flush_decisions()
+        result = self.retention_policy.apply(
+            self.decision_matrix(),
+            self.decision_log,
+            legacy_directory=self.decision_storage,
+            now=now,
+            retention_days=retention_days
+        )
+        
+        self.decisions.refresh()
+        # Rebuilt from the retained decisions
+        if self._similar_projects is not None:
+            self._similar_projects = None
+            await self.build_similar_projects()
+        return result
+    
+    def decision_statistics(self) -> Dict[str, Any]:
+        """
+        Decision, outcome and success counts per mode and complexity band.
+        
+        Covers retained decisions and rolled-up aggregates, so the counts equal
+        those of the full history; layout as DecisionMatrix.success_rate_by_mode_and_band().
+        """
+        
+        retained = self.decision_matrix().success_rate_by_mode_and_band()
+        rolled_up = self.retention_policy.aggregates.success_rate_by_mode_and_band()
+        counts = {name: retained[name] + rolled_up[name] for name in ("decisions", "outcomes", "successes")}
+        return {
+            "modes": retained["modes"],
+            "bands": retained["bands"],
+            **counts,
+            "success_rate": success_rates(counts["successes"], counts["outcomes"])
+        }
+    
+    def analysis_distributions(self, windows: int = 1) -> List[Dict[str, Any]]:
+        """
+        Distributions of recommended analyses over the latest time windows.
+        
+        Per window and recommended mode: analysis counts, complexity and
+        confidence level counts, and quantiles of complexity_score,
+        uncertainty_level and analysis_confidence, across all processes.
+        """
+        return self.distribution_monitor.summary(windows)
+    
+    def check_distribution_drift(
+        self,
+        baseline_windows: int = DEFAULT_BASELINE_WINDOWS,
+        threshold: float = DRIFT_THRESHOLD
+    ) -> List[DriftAlert]:
+        """
+        Compare the current window's analysis distributions with the windows before it.
+        
+        Args:
+            baseline_windows: Preceding windows merged into the baseline
+            threshold: Kolmogorov-Smirnov distance (or mode share distance) that raises an alert
+            
+        Returns:
+            An alert per drifted metric and mode, also logged as warnings
+        """
+        
+        # Analyses this process recorded are included without waiting for a flush
+        return self.distribution_monitor.check_drift(baseline_windows=baseline_windows, threshold=threshold)
+    
+    def decision_matrix(self, workers: Optional[int] = None) -> DecisionMatrix:
+        """Columnar matrix of all stored decisions, rebuilt when the decision log changes."""
+        
+        # Decisions other worker processes appended since the last build
+        self.decision_log.refresh()
+        revision = self.decision_log.revision
+        if self._decision_matrix is None or self._decision_matrix_revision != revision:
+            result = self.load_full_history(workers=workers, transform=decision_row)
+            self._decision_matrix = DecisionMatrix.from_rows(result.decisions)
+            self._decision_matrix_revision = revision
+            self.logger.info(
+                "Decision matrix built",
+                decisions=len(self._decision_matrix),
+                nbytes=self._decision_matrix.nbytes
+            )
+        return self._decision_matrix
+    
     async def _store_decision(self, decision: AdaptiveDecision):
         """Store decision for cross-project learning."""
         try:
-            decision_file = self.decision_storage / f"{decision.decision_id}.json"
-            with open(decision_file, 'w') as f:
-                json.dump(decision.dict(), f, indent=2, default=str)
-            
-            self.decisions.append(decision)
+            # Written behind by the persister; self.decisions picks it up once it reaches the log
+            await self.decision_persister.submit(decision)
             self.logger.info("Decision stored", decision_id=decision.decision_id)
             
+            if self._similar_projects is not None:
+                self._index_similar_project(self._similar_projects, decision)
+            elif self._similar_projects_pending is not None:
+                self._similar_projects_pending.append(decision)
+            
+            # Until initialize() has mined the stored history, that first run covers new decisions
+            if self._mining_started or self._mining_history_run:
+                self._pending_mining.append(decision)
+            if self._mining_started and len(self._pending_mining) >= PATTERN_UPDATE_DECISIONS:
+                await self._update_cross_project_patterns()
+            
         except Exception as e:
             self.logger.error("Failed to store decision", error=str(e))
     
     async def _update_cross_project_patterns(self):
         """Update cross-project patterns based on historical decisions."""
-        # This would implement machine learning analysis of decisions
-        # to identify successful patterns - placeholder for now
-        self.logger.info("Cross-project patterns updated")
+        try:
+            if not self._mining_started:
+                if self._mining_history_run:
+                    return
+                
+                # First run clusters the stored history off the event loop, including queued decisions
+                self._mining_history_run = True
+                try:
+                    await self.decision_persister.flush()
+                    observed = await asyncio.get_running_loop().run_in_executor(None, self._mine_stored_history)
+                    self._mining_started = True
+                finally:
+                    self._mining_history_run = False
+                # Decisions stored meanwhile stay pending; observing one twice replaces its contribution
+            else:
+                observed = self.pattern_miner.observe(DecisionMatrix.from_decisions(self._pending_mining))
+                self._pending_mining = []
+            
+            # Only publish changed patterns so cached recommendations stay valid otherwise
+            updated = 0
+            for pattern in self.pattern_miner.patterns():
+                position = self._pattern_positions.get(pattern.pattern_id)
+                if position is not None and self._same_pattern_statistics(self.patterns[position], pattern):
+                    continue
+                self.add_pattern(pattern)
+                updated += 1
+            
+            self.logger.info(
+                "Cross-project patterns updated",
+                observed_decisions=observed,
+                updated_patterns=updated,
+                patterns_count=len(self.patterns)
+            )
+            
+        except Exception as e:
+            self.logger.error("Failed to update cross-project patterns", error=str(e))
+    
+    def _mine_stored_history(self) -> int:
+        with self._history_lock:
+            return self.pattern_miner.observe(self.decision_matrix())
+    
+    @staticmethod
+    def _same_pattern_statistics(current: CrossProjectPattern, mined: CrossProjectPattern) -> bool:
+        """Whether a mined pattern only differs from the current one in timestamps."""
+        volatile = {"first_observed", "last_updated"}
+        return current.model_dump(exclude=volatile) == mined.model_dump(exclude=volatile)
 
 
 # Export main classes
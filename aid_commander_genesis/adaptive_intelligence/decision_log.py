@@ -0,0 +1,863 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Decision Log
+
+Append-only, segmented storage for AdaptiveDecision records. Decisions are
+written as length-prefixed records to a small number of segment files, each
+with an offset index, instead of one JSON file per decision. Re-appending a
+decision supersedes the earlier record; sealed segments holding mostly
+superseded records are compacted in the background.
+
+Several processes may share one log directory. Each appends to a segment of
+its own, created and flock()ed before it becomes visible, through an O_APPEND
+descriptor with one write per batch, so writers never contend with each other.
+Sequence numbers are a hybrid logical clock (wall-clock nanoseconds, always
+above every sequence seen), ordering versions of a decision written by
+different processes; refresh() picks up records other processes appended.
+Compaction only rewrites segments it can lock, i.e. that no process writes.
+
+Record layout (little endian):
+    payload length (u32) | crc32 (u32) | flags (u8) | sequence (u64) | key length (u16) | key | payload
+
+Index entry layout:
+    sequence (u64) | offset (u64) | flags (u8) | key length (u16) | key
+"""
+
+import os
+import json
+import time
+import uuid
+import zlib
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+import structlog
+
+from .models import AdaptiveDecision
+from ..storage import open_append, try_lock, write_all
+
+logger = structlog.get_logger(__name__)
+
+
+# Default location of the decision log
+DECISION_LOG_PATH = Path.home() / ".aid_genesis" / "decision_log"
+
+# Segments roll over once they reach this size
+DEFAULT_SEGMENT_BYTES = 16 * 1024 * 1024
+
+# Compact sealed segments once this fraction of their records is superseded
+DEFAULT_COMPACTION_THRESHOLD = 0.5
+
+RECORD_HEADER = struct.Struct("<IIBQH")
+INDEX_ENTRY = struct.Struct("<QQBH")
+CRC_FIELDS = struct.Struct("<BQH")
+
+FLAG_PUT = 0
+FLAG_TOMBSTONE = 1
+
+
+class RecordLocation(NamedTuple):
+    """Position of the latest record for a key."""
+
+    segment: int
+    offset: int
+    sequence: int
+    flags: int
+
+
+def _segment_name(segment: int) -> str:
+    return f"segment-{segment:08d}"
+
+
+class DecisionLog:
+    """
+    Segmented append-only log of adaptive decisions with random access by id.
+
+    All decision ids are held in an in-memory index built from the per-segment
+    offset indexes on open, so lookups cost one positioned read. The active
+    segment is the one this instance appends to and holds locked; segments no
+    process holds are sealed and immutable until compaction rewrites them.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DECISION_LOG_PATH,
+        segment_max_bytes: int = DEFAULT_SEGMENT_BYTES,
+        compaction_threshold: float = DEFAULT_COMPACTION_THRESHOLD,
+        background_compaction: bool = True
+    ):
+        self.directory = Path(directory)
+        self.segment_max_bytes = segment_max_bytes
+        self.compaction_threshold = compaction_threshold
+        self.background_compaction = background_compaction
+        self.logger = logger.bind(component="DecisionLog")
+
+        self._lock = threading.RLock()
+        self._compaction_lock = threading.Lock()
+        self._locations: Dict[str, RecordLocation] = {}
+        self._segment_records: Dict[int, int] = {}
+        self._segment_live: Dict[int, int] = {}
+        # Lowest sequence and applied index bytes per segment
+        self._segment_first: Dict[int, int] = {}
+        self._index_sizes: Dict[int, int] = {}
+        # Segments other processes held at the last compaction, and compaction outputs in progress
+        self._busy_segments: Set[int] = set()
+        self._writing_segments: Set[int] = set()
+        self._read_fds: Dict[int, int] = {}
+        self._active_segment: Optional[int] = None
+        self._active_fd: Optional[int] = None
+        self._active_index_fd: Optional[int] = None
+        self._active_size = 0
+        self._live_count = 0
+        self._sequence = 0
+        self._revision = 0
+        self._next_segment = 1
+        self._compaction_thread: Optional[threading.Thread] = None
+        self.compactions = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open()
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __contains__(self, decision_id: str) -> bool:
+        with self._lock:
+            location = self._locations.get(decision_id)
+            return location is not None and location.flags == FLAG_PUT
+
+    @property
+    def revision(self) -> int:
+        """Counter of applied records; changes whenever decisions change."""
+        return self._revision
+
+    def decision_ids(self) -> List[str]:
+        """Ids of all live decisions in write order."""
+        with self._lock:
+            live = [(location.sequence, key) for key, location in self._locations.items() if location.flags == FLAG_PUT]
+        return [key for _, key in sorted(live)]
+
+    def live_records(self) -> List[Tuple[str, Path, int]]:
+        """(decision_id, segment path, offset) of all live decisions in write order."""
+        with self._lock:
+            live = [
+                (location.sequence, key, location.segment, location.offset)
+                for key, location in self._locations.items() if location.flags == FLAG_PUT
+            ]
+        paths = {segment: self._segment_path(segment) for segment in {entry[2] for entry in live}}
+        return [(key, paths[segment], offset) for _, key, segment, offset in sorted(live)]
+
+    def append(self, decision: AdaptiveDecision) -> RecordLocation:
+        """Append a decision, superseding any earlier record with the same id."""
+        payload = decision.model_dump_json().encode("utf-8")
+        return self._append(decision.decision_id, payload, FLAG_PUT)
+
+    def append_batch(self, decisions: Sequence[AdaptiveDecision]) -> List[RecordLocation]:
+        """Append several decisions with one write to the segment and one to its index."""
+        records = [(decision.decision_id, decision.model_dump_json().encode("utf-8")) for decision in decisions]
+        return self._append_many(records, FLAG_PUT)
+
+    def sync(self):
+        """fsync the active segment and its index so appended records survive a crash."""
+        with self._lock:
+            for fd in (self._active_fd, self._active_index_fd):
+                if fd is not None:
+                    os.fsync(fd)
+
+    def delete(self, decision_id: str) -> bool:
+        """Record a tombstone for a decision; returns whether it existed."""
+        if decision_id not in self:
+            return False
+        self._append(decision_id, b"", FLAG_TOMBSTONE)
+        return True
+
+    def delete_batch(self, decision_ids: Sequence[str]) -> int:
+        """Tombstone several decisions with one write; returns how many existed."""
+        with self._lock:
+            existing = [(decision_id, b"") for decision_id in dict.fromkeys(decision_ids) if decision_id in self]
+            if existing:
+                self._append_many(existing, FLAG_TOMBSTONE)
+        return len(existing)
+
+    def get(self, decision_id: str) -> Optional[AdaptiveDecision]:
+        """Random access to the latest version of a decision."""
+
+        for attempt in range(2):
+            with self._lock:
+                location = self._locations.get(decision_id)
+                if location is None or location.flags != FLAG_PUT:
+                    return None
+                record = self._read_record(location.segment, location.offset)
+            if record is not None:
+                return AdaptiveDecision.model_validate_json(record[3])
+            # Another process may have compacted the segment away since it was indexed
+            if attempt or not self.refresh():
+                break
+
+        self.logger.warning("Decision record unreadable", decision_id=decision_id, segment=location.segment)
+        return None
+
+    def iter_decisions(self) -> Iterator[AdaptiveDecision]:
+        """Iterate live decisions in write order."""
+        for decision_id in self.decision_ids():
+            decision = self.get(decision_id)
+            if decision is not None:
+                yield decision
+
+    def refresh(self) -> bool:
+        """
+        Pick up records other processes appended since they were last read.
+
+        Returns whether any decision changed. Segments compacted away by
+        another process make the whole index reload from disk.
+        """
+
+        with self._lock:
+            revision = self._revision
+            segments = self._segments_on_disk()
+            on_disk = set(segments)
+            if any(segment not in on_disk for segment in self._segment_records):
+                self._reload()
+                return True
+
+            for segment in segments:
+                if segment == self._active_segment or segment in self._writing_segments:
+                    continue
+                try:
+                    entries, index_size = self._load_segment(segment, start=self._index_sizes.get(segment, 0))
+                except FileNotFoundError:
+                    self._reload()
+                    return True
+                self._apply_entries(segment, entries, index_size)
+
+            if segments:
+                self._next_segment = max(self._next_segment, segments[-1] + 1)
+            return self._revision != revision
+
+    def stats(self) -> Dict[str, Any]:
+        """Record and segment counts for health checks."""
+
+        with self._lock:
+            total_records = sum(self._segment_records.values())
+            live_records = sum(self._segment_live.values())
+            return {
+                "directory": str(self.directory),
+                "decisions": self._live_count,
+                "segments": len(self._segment_records),
+                "records": total_records,
+                "dead_records": total_records - live_records,
+                "compactions": self.compactions
+            }
+
+    def compact(self, seal_active: bool = False) -> int:
+        """
+        Rewrite all sealed segments keeping only the latest live records.
+
+        Returns the number of records dropped. Appends may continue while
+        compaction copies records; only the final index swap holds the lock.
+        seal_active rolls a non-empty active segment first so its records
+        (e.g. fresh tombstones) are compacted too. Segments another process
+        is appending to or compacting are left alone.
+        """
+
+        with self._compaction_lock:
+            if seal_active:
+                with self._lock:
+                    if self._active_size:
+                        self._roll()
+            return self._compact()
+
+    def _compact(self) -> int:
+        with self._lock:
+            candidates = sorted(segment for segment in self._segment_records if segment != self._active_segment)
+            self._busy_segments.clear()
+
+        # Locking a segment keeps other processes from reusing or compacting it
+        held: Dict[int, int] = {}
+        for segment in candidates:
+            fd = self._lock_segment(segment)
+            if fd is None:
+                self._busy_segments.add(segment)
+            else:
+                held[segment] = fd
+
+        try:
+            if not held:
+                return 0
+            # See every record of the locked segments and any newer version elsewhere
+            self.refresh()
+
+            with self._lock:
+                sealed = sorted(segment for segment in held if segment in self._segment_records)
+                if not sealed:
+                    return 0
+                sealed_set = set(sealed)
+                # Tombstones must outlive older records of their key in segments left alone
+                horizon = min(
+                    (first for segment, first in self._segment_first.items() if segment not in sealed_set),
+                    default=None
+                )
+                survivors = sorted(
+                    (location.sequence, key, location)
+                    for key, location in self._locations.items()
+                    if location.segment in sealed_set and (
+                        location.flags == FLAG_PUT or (horizon is not None and location.sequence > horizon)
+                    )
+                )
+                dropped = sum(self._segment_records[segment] for segment in sealed) - len(survivors)
+
+            # Copy surviving records into fresh segments (sealed segments are immutable)
+            moved: List[Tuple[str, RecordLocation, RecordLocation]] = []
+            outputs: Dict[int, int] = {}
+            output = None
+            try:
+                for sequence, key, location in survivors:
+                    record = self._read_record(location.segment, location.offset)
+                    if record is None:
+                        continue
+                    encoded = self._encode(key, record[3], location.flags, sequence)
+                    if output is None or output[2] + len(encoded) > self.segment_max_bytes:
+                        if output is not None:
+                            outputs[output[0]] = self._finish_output(output)
+                        output = self._new_output()
+                    segment, (segment_fd, index_fd), offset, index_size = output
+                    index_entry = self._encode_index(key, sequence, offset, location.flags)
+                    write_all(segment_fd, encoded)
+                    write_all(index_fd, index_entry)
+                    moved.append((key, location, RecordLocation(segment, offset, sequence, location.flags)))
+                    output = (segment, (segment_fd, index_fd), offset + len(encoded), index_size + len(index_entry))
+                if output is not None:
+                    outputs[output[0]] = self._finish_output(output)
+            except Exception:
+                if output is not None:
+                    self._finish_output(output)
+                with self._lock:
+                    self._writing_segments.clear()
+                raise
+
+            with self._lock:
+                for segment, index_size in outputs.items():
+                    self._writing_segments.discard(segment)
+                    self._index_sizes[segment] = index_size
+                    self._segment_records.setdefault(segment, 0)
+                    self._segment_live.setdefault(segment, 0)
+
+                for key, old_location, new_location in moved:
+                    self._segment_records[new_location.segment] += 1
+                    self._segment_first[new_location.segment] = min(
+                        self._segment_first.get(new_location.segment, new_location.sequence), new_location.sequence
+                    )
+                    if self._locations.get(key) == old_location:
+                        self._locations[key] = new_location
+                        self._segment_live[new_location.segment] += 1
+
+                for segment in sealed:
+                    self._drop_segment(segment)
+                for key in [key for key, location in self._locations.items() if location.segment in sealed_set]:
+                    # Tombstones whose shadowed records were all compacted away
+                    del self._locations[key]
+
+                self.compactions += 1
+
+        finally:
+            for fd in held.values():
+                os.close(fd)
+
+        self.logger.info("Decision log compacted", segments=len(sealed), dropped_records=dropped, kept_records=len(moved))
+        return dropped
+
+    def close(self):
+        """Wait for background compaction and release file handles (and the active segment)."""
+
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            for fd in (self._active_fd, self._active_index_fd):
+                if fd is not None:
+                    os.close(fd)
+            self._active_fd = self._active_index_fd = None
+            for fd in self._read_fds.values():
+                os.close(fd)
+            self._read_fds.clear()
+
+    def _append(self, key: str, payload: bytes, flags: int) -> RecordLocation:
+        return self._append_many([(key, payload)], flags)[0]
+
+    def _append_many(self, records: Sequence[Tuple[str, bytes]], flags: int) -> List[RecordLocation]:
+        locations = []
+        with self._lock:
+            pending: List[Tuple[str, bytes, bytes, RecordLocation]] = []
+            for key, payload in records:
+                encoded = self._encode(key, payload, flags, self._next_sequence())
+
+                if self._active_size and self._active_size + len(encoded) > self.segment_max_bytes:
+                    self._write_active(pending)
+                    self._roll()
+
+                location = RecordLocation(self._active_segment, self._active_size, self._sequence, flags)
+                pending.append((key, encoded, self._encode_index(key, location.sequence, location.offset, flags), location))
+                self._active_size += len(encoded)
+                locations.append(location)
+
+            self._write_active(pending)
+
+        self._maybe_compact()
+        return locations
+
+    def _write_active(self, pending: List[Tuple[str, bytes, bytes, RecordLocation]]):
+        """Write pending records to the active segment, then index them (caller holds the lock)."""
+
+        if not pending:
+            return
+        index_entries = b"".join(entry[2] for entry in pending)
+        # Records before index entries, so a crash leaves at most unindexed records
+        write_all(self._active_fd, b"".join(entry[1] for entry in pending))
+        write_all(self._active_index_fd, index_entries)
+        self._index_sizes[self._active_segment] = self._index_sizes.get(self._active_segment, 0) + len(index_entries)
+
+        for key, _, _, location in pending:
+            self._record(key, location)
+        pending.clear()
+
+    def _next_sequence(self) -> int:
+        """Hybrid logical clock tick (caller holds the lock)."""
+        self._sequence = max(self._sequence + 1, time.time_ns())
+        return self._sequence
+
+    def _record(self, key: str, location: RecordLocation):
+        """Apply a record to the in-memory index (caller holds the lock)."""
+
+        previous = self._locations.get(key)
+        if previous == location:
+            return
+
+        self._segment_records[location.segment] = self._segment_records.get(location.segment, 0) + 1
+        self._segment_live.setdefault(location.segment, 0)
+        self._segment_first[location.segment] = min(
+            self._segment_first.get(location.segment, location.sequence), location.sequence
+        )
+
+        if previous is not None:
+            if previous.sequence > location.sequence:
+                return
+            self._segment_live[previous.segment] -= 1
+            if previous.flags == FLAG_PUT:
+                self._live_count -= 1
+        self._locations[key] = location
+        self._segment_live[location.segment] += 1
+        if location.flags == FLAG_PUT:
+            self._live_count += 1
+        self._revision += 1
+
+    def _apply_entries(self, segment: int, entries: List[Tuple[str, RecordLocation]], index_size: int):
+        """Apply index entries read from disk (caller holds the lock)."""
+
+        self._segment_records.setdefault(segment, 0)
+        self._segment_live.setdefault(segment, 0)
+        self._index_sizes[segment] = index_size
+        for key, location in entries:
+            self._record(key, location)
+            self._sequence = max(self._sequence, location.sequence)
+
+    def _open(self):
+        """Load segment indexes and take over the newest segment unless another process holds it."""
+
+        segments = self._load_all()
+        if not segments or not self._reuse_active(segments[-1]):
+            self._roll()
+
+        self.logger.info(
+            "Decision log opened",
+            directory=str(self.directory),
+            segments=len(self._segment_records),
+            decisions=len(self)
+        )
+
+    def _load_all(self) -> List[int]:
+        """Index every segment on disk, recovering those no process holds (caller holds the lock)."""
+
+        segments = self._segments_on_disk()
+        for segment in segments:
+            if segment in self._writing_segments:
+                continue
+            lock_fd = None if segment == self._active_segment else self._lock_segment(segment)
+            try:
+                entries, index_size = self._load_segment(segment, recover=lock_fd is not None)
+            except FileNotFoundError:
+                # Compacted away by another process meanwhile
+                continue
+            finally:
+                if lock_fd is not None:
+                    os.close(lock_fd)
+            self._apply_entries(segment, entries, index_size)
+
+        if segments:
+            self._next_segment = max(self._next_segment, segments[-1] + 1)
+        return segments
+
+    def _reload(self):
+        """Rebuild the in-memory index from disk (caller holds the lock)."""
+
+        for fd in self._read_fds.values():
+            os.close(fd)
+        self._read_fds.clear()
+        self._locations.clear()
+        self._segment_records.clear()
+        self._segment_live.clear()
+        self._segment_first.clear()
+        self._index_sizes.clear()
+        self._live_count = 0
+
+        self._load_all()
+        self._segment_records.setdefault(self._active_segment, 0)
+        self._segment_live.setdefault(self._active_segment, 0)
+        self._revision += 1
+        self.logger.info("Decision log reloaded", segments=len(self._segment_records), decisions=len(self))
+
+    def _segments_on_disk(self) -> List[int]:
+        return sorted(
+            int(path.stem.split("-")[1])
+            for path in self.directory.glob("segment-*.log")
+        )
+
+    def _load_segment(
+        self,
+        segment: int,
+        start: int = 0,
+        recover: bool = False
+    ) -> Tuple[List[Tuple[str, RecordLocation]], int]:
+        """
+        Read a segment index from byte start; returns its entries and the index size they end at.
+
+        Entries are only written after their records, so every complete entry
+        points at a complete record. With recover (a full read of a segment the
+        caller holds locked), a stale index tail is dropped and records written
+        but not yet indexed when their writer stopped are indexed.
+        """
+
+        segment_path = self._segment_path(segment)
+        index_path = self._index_path(segment)
+
+        data = b""
+        if index_path.exists():
+            with open(index_path, 'rb') as f:
+                f.seek(start)
+                data = f.read()
+        # Sized after reading the index, so it covers every entry read
+        segment_size = segment_path.stat().st_size
+
+        entries: List[Tuple[str, RecordLocation]] = []
+        entry_ends: List[int] = []
+        position = 0
+        while position + INDEX_ENTRY.size <= len(data):
+            sequence, offset, flags, key_length = INDEX_ENTRY.unpack_from(data, position)
+            key_end = position + INDEX_ENTRY.size + key_length
+            if key_end > len(data) or offset >= segment_size:
+                break
+            key = data[position + INDEX_ENTRY.size:key_end].decode("utf-8")
+            entries.append((key, RecordLocation(segment, offset, sequence, flags)))
+            entry_ends.append(key_end)
+            position = key_end
+
+        if not recover:
+            # An incomplete tail entry is still being written
+            return entries, start + (entry_ends[-1] if entry_ends else 0)
+
+        # Entries are written after their records, so only the tail can be stale
+        indexed_end = 0
+        while entries:
+            record = self._read_record(segment, entries[-1][1].offset)
+            if record is not None and record[2] == entries[-1][0]:
+                indexed_end = entries[-1][1].offset + record[4]
+                break
+            entries.pop()
+            entry_ends.pop()
+
+        valid_length = entry_ends[-1] if entry_ends else 0
+        if valid_length != len(data):
+            # Drop a torn index tail; it is rebuilt from the segment below
+            with open(index_path, 'r+b') as f:
+                f.truncate(valid_length)
+
+        # Records written but not yet indexed when their writer stopped
+        offset = indexed_end
+        recovered = []
+        while offset < segment_size:
+            record = self._read_record(segment, offset)
+            if record is None:
+                self.logger.warning("Truncating torn decision log record", segment=segment, offset=offset)
+                with open(segment_path, 'r+b') as f:
+                    f.truncate(offset)
+                break
+            flags, sequence, key, _, length = record
+            recovered.append((key, RecordLocation(segment, offset, sequence, flags)))
+            offset += length
+
+        if recovered:
+            index_entries = b"".join(
+                self._encode_index(key, location.sequence, location.offset, location.flags)
+                for key, location in recovered
+            )
+            with open(index_path, 'ab') as f:
+                f.write(index_entries)
+            entries.extend(recovered)
+            valid_length += len(index_entries)
+
+        return entries, valid_length
+
+    def _read_record(self, segment: int, offset: int) -> Optional[Tuple[int, int, str, bytes, int]]:
+        """Read and verify the record at offset; returns (flags, sequence, key, payload, length)."""
+
+        fd = self._read_fds.get(segment)
+        if fd is None:
+            with self._lock:
+                fd = self._read_fds.get(segment)
+                if fd is None:
+                    try:
+                        fd = os.open(self._segment_path(segment), os.O_RDONLY)
+                    except OSError:
+                        return None
+                    self._read_fds[segment] = fd
+
+        header = os.pread(fd, RECORD_HEADER.size, offset)
+        if len(header) < RECORD_HEADER.size:
+            return None
+        payload_length, crc, flags, sequence, key_length = RECORD_HEADER.unpack(header)
+        body = os.pread(fd, key_length + payload_length, offset + RECORD_HEADER.size)
+        if len(body) < key_length + payload_length:
+            return None
+        if zlib.crc32(body, zlib.crc32(CRC_FIELDS.pack(flags, sequence, key_length))) != crc:
+            return None
+        key = body[:key_length].decode("utf-8")
+        return flags, sequence, key, body[key_length:], RECORD_HEADER.size + key_length + payload_length
+
+    @staticmethod
+    def _encode(key: str, payload: bytes, flags: int, sequence: int) -> bytes:
+        key_bytes = key.encode("utf-8")
+        body = key_bytes + payload
+        crc = zlib.crc32(body, zlib.crc32(CRC_FIELDS.pack(flags, sequence, len(key_bytes))))
+        return RECORD_HEADER.pack(len(payload), crc, flags, sequence, len(key_bytes)) + body
+
+    @staticmethod
+    def _encode_index(key: str, sequence: int, offset: int, flags: int) -> bytes:
+        key_bytes = key.encode("utf-8")
+        return INDEX_ENTRY.pack(sequence, offset, flags, len(key_bytes)) + key_bytes
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{_segment_name(segment)}.log"
+
+    def _index_path(self, segment: int) -> Path:
+        return self.directory / f"{_segment_name(segment)}.idx"
+
+    def _lock_segment(self, segment: int) -> Optional[int]:
+        """Descriptor holding a segment's lock, or None if another process holds it or it is gone."""
+
+        try:
+            fd = os.open(self._segment_path(segment), os.O_RDONLY)
+        except FileNotFoundError:
+            return None
+        # A compacting process may have unlinked the segment before releasing it
+        if not try_lock(fd) or os.fstat(fd).st_nlink == 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def _create_segment(self) -> Tuple[int, int, int]:
+        """
+        Create the next free segment; returns it with O_APPEND descriptors of
+        the segment (holding its lock) and of its empty index.
+
+        The file is created and locked under a temporary name and then linked
+        into place, so no other process ever sees it unlocked; link() fails if
+        another process took the segment number first.
+        """
+
+        with self._lock:
+            temporary = self.directory / f".segment-{uuid.uuid4().hex}.tmp"
+            fd = open_append(temporary, exclusive=True)
+            try:
+                try_lock(fd)
+                while True:
+                    segment = self._next_segment
+                    self._next_segment += 1
+                    try:
+                        os.link(temporary, self._segment_path(segment))
+                    except FileExistsError:
+                        continue
+                    # An index left behind by a crashed compaction is stale
+                    index_fd = open_append(self._index_path(segment))
+                    os.ftruncate(index_fd, 0)
+                    return segment, fd, index_fd
+            except BaseException:
+                os.close(fd)
+                raise
+            finally:
+                temporary.unlink(missing_ok=True)
+
+    def _reuse_active(self, segment: int) -> bool:
+        """Take over an existing segment for appends if no process holds it (caller holds the lock)."""
+
+        try:
+            fd = open_append(self._segment_path(segment), create=False)
+        except FileNotFoundError:
+            return False
+        if not try_lock(fd) or os.fstat(fd).st_nlink == 0 or os.fstat(fd).st_size >= self.segment_max_bytes:
+            os.close(fd)
+            return False
+        self._set_active(segment, fd, open_append(self._index_path(segment)))
+        return True
+
+    def _set_active(self, segment: int, fd: int, index_fd: int):
+        self._active_segment = segment
+        self._active_fd = fd
+        self._active_index_fd = index_fd
+        self._active_size = os.fstat(fd).st_size
+        self._segment_records.setdefault(segment, 0)
+        self._segment_live.setdefault(segment, 0)
+        self._index_sizes.setdefault(segment, 0)
+
+    def _roll(self):
+        """Seal the active segment and start a new one (caller holds the lock)."""
+        if self._active_fd is not None:
+            for fd in (self._active_fd, self._active_index_fd):
+                os.fsync(fd)
+                os.close(fd)
+            self._active_fd = self._active_index_fd = None
+        self._set_active(*self._create_segment())
+
+    def _new_output(self):
+        segment, segment_fd, index_fd = self._create_segment()
+        with self._lock:
+            self._writing_segments.add(segment)
+        return segment, (segment_fd, index_fd), 0, 0
+
+    @staticmethod
+    def _finish_output(output) -> int:
+        """Persist and release a compaction output; returns its index size."""
+        _, (segment_fd, index_fd), _, index_size = output
+        for fd in (segment_fd, index_fd):
+            os.fsync(fd)
+            os.close(fd)
+        return index_size
+
+    def _drop_segment(self, segment: int):
+        """Delete a compacted segment (caller holds the lock)."""
+        fd = self._read_fds.pop(segment, None)
+        if fd is not None:
+            os.close(fd)
+        self._segment_path(segment).unlink(missing_ok=True)
+        self._index_path(segment).unlink(missing_ok=True)
+        self._segment_records.pop(segment, None)
+        self._segment_live.pop(segment, None)
+        self._segment_first.pop(segment, None)
+        self._index_sizes.pop(segment, None)
+
+    def _needs_compaction(self) -> bool:
+        with self._lock:
+            sealed = [
+                segment for segment in self._segment_records
+                if segment != self._active_segment and segment not in self._busy_segments
+            ]
+            records = sum(self._segment_records[segment] for segment in sealed)
+            if not records:
+                return False
+            live = sum(self._segment_live[segment] for segment in sealed)
+            return (records - live) / records >= self.compaction_threshold
+
+    def _maybe_compact(self):
+        if not self.background_compaction or not self._needs_compaction():
+            return
+        with self._lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                return
+            self._compaction_thread = threading.Thread(
+                target=self._compact_in_background, name="decision-log-compaction", daemon=True
+            )
+            self._compaction_thread.start()
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            self.logger.error("Decision log compaction failed", error=str(e))
+
+
+def read_record_payload(segment_file, offset: int) -> Optional[bytes]:
+    """
+    Read and verify one PUT record directly from a segment file.
+
+    Returns None when the record is missing, torn or fails its checksum (e.g.
+    because compaction rewrote the segment in the meantime).
+    """
+
+    segment_file.seek(offset)
+    header = segment_file.read(RECORD_HEADER.size)
+    if len(header) < RECORD_HEADER.size:
+        return None
+    payload_length, crc, flags, sequence, key_length = RECORD_HEADER.unpack(header)
+    body = segment_file.read(key_length + payload_length)
+    if len(body) < key_length + payload_length or flags != FLAG_PUT:
+        return None
+    if zlib.crc32(body, zlib.crc32(CRC_FIELDS.pack(flags, sequence, key_length))) != crc:
+        return None
+    return body[key_length:]
+
+
+def migrate_json_directory(
+    source_directory: Path,
+    decision_log: DecisionLog,
+    remove_source: bool = False
+) -> Dict[str, int]:
+    """
+    Migrate one-file-per-decision JSON storage into a decision log.
+
+    Decisions are appended in decision_timestamp order; ids already present in
+    the log are skipped, so an interrupted migration can simply be re-run.
+    Source files are only removed (when requested) after all appends succeed.
+
+    Returns:
+        Counts of migrated, skipped and failed files
+    """
+
+    source_directory = Path(source_directory)
+    results = {"migrated": 0, "skipped": 0, "failed": 0}
+    loaded: List[Tuple[AdaptiveDecision, Path]] = []
+
+    for decision_file in source_directory.glob("*.json"):
+        try:
+            with open(decision_file, 'r') as f:
+                decision = AdaptiveDecision(**json.load(f))
+            loaded.append((decision, decision_file))
+        except Exception as e:
+            results["failed"] += 1
+            logger.warning("Failed to migrate decision", file=str(decision_file), error=str(e))
+
+    loaded.sort(key=lambda item: (item[0].decision_timestamp, item[0].decision_id))
+
+    migrated_files = []
+    for decision, decision_file in loaded:
+        if decision.decision_id in decision_log:
+            results["skipped"] += 1
+        else:
+            decision_log.append(decision)
+            results["migrated"] += 1
+        migrated_files.append(decision_file)
+
+    if remove_source:
+        for decision_file in migrated_files:
+            decision_file.unlink(missing_ok=True)
+
+    logger.info("Decision migration complete", source=str(source_directory), **results)
+    return results
+
+
+__all__ = [
+    "DECISION_LOG_PATH",
+    "DecisionLog",
+    "RecordLocation",
+    "migrate_json_directory",
+    "read_record_payload"
+]
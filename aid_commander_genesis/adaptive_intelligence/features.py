@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Feature Extraction
+
+Single-pass extraction of the text and count features read by the complexity
+analyzers. Every text field of a concept is lowercased once and scanned once by
+the compiled keyword automaton; the analyzers then work from the resulting
+immutable feature objects.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .lexicon import KeywordAutomaton, DEFAULT_AUTOMATON
+from .narrative import NarrativeAccumulator, narrative_text
+from ..conceptcraft.models import (
+    ConceptDocument,
+    StakeholderStory,
+    ChallengeResolution,
+    Enhancement
+)
+
+
+@dataclass(frozen=True)
+class StakeholderFeatures:
+    """Counts over the full stakeholder ecosystem."""
+
+    stakeholder_count: int
+    stakeholder_types: Tuple[str, ...]
+    stakeholder_names: Tuple[str, ...]
+    story_texts: Tuple[str, ...]
+
+    @property
+    def stakeholder_type_count(self) -> int:
+        return len(set(self.stakeholder_types))
+
+
+@dataclass(frozen=True)
+class CoreStoryFeatures:
+    """Aggregated features of the core stakeholder stories."""
+
+    story_count: int
+    story_confidences: Tuple[float, ...]
+    richness_scores: Tuple[float, ...]
+    tech_requirements: float
+    value_proposition_count: int
+    integration_complexity: float
+    novelty_mentions: int
+    innovation_keywords: FrozenSet[str]
+    value_token_count: int
+    value_tokens: FrozenSet[str]
+    stakeholder_names: Tuple[str, ...]
+    story_texts: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ChallengeFeatures:
+    """Aggregated features of resolved challenges."""
+
+    challenge_count: int
+    business_challenge_complexity: float
+    integration_complexity: float
+    conflict_penalty: float
+
+
+@dataclass(frozen=True)
+class EnhancementFeatures:
+    """Aggregated features of enhancement opportunities."""
+
+    enhancement_count: int
+    enhancement_complexity: float
+    integration_complexity: float
+    innovation_keywords: FrozenSet[str]
+
+
+@dataclass(frozen=True)
+class ConceptFeatures:
+    """Immutable per-document features shared by all complexity analyzers."""
+
+    concept_name: str
+    concept_maturity: float
+    narrative_confidence: float
+    validation_level: str
+    technical_complexity: int
+    has_differentiation: bool
+    differentiation_words: int
+    success_metric_count: int
+    concept_text: str
+    concept_tokens: FrozenSet[str]
+    concept_innovation_keywords: FrozenSet[str]
+    stakeholders: StakeholderFeatures
+    core_stories: CoreStoryFeatures
+    challenges: ChallengeFeatures
+    enhancements: EnhancementFeatures
+    # Set when story texts were accumulated instead of retained (streaming ingestion)
+    narrative_score: Optional[float] = None
+
+    @property
+    def avg_story_confidence(self) -> Optional[float]:
+        """Mean core story confidence, or None without core stories."""
+        if not self.core_stories.story_confidences:
+            return None
+        return np.mean(self.core_stories.story_confidences)
+
+    @property
+    def integration_complexity(self) -> float:
+        """Sum of per-item integration contributions across collections."""
+        return (
+            self.core_stories.integration_complexity +
+            self.enhancements.integration_complexity +
+            self.challenges.integration_complexity
+        )
+
+    @property
+    def innovation_mentions(self) -> int:
+        """Distinct innovation keywords across description, stories and enhancements."""
+        return len(
+            self.concept_innovation_keywords |
+            self.core_stories.innovation_keywords |
+            self.enhancements.innovation_keywords
+        )
+
+
+class StakeholderAccumulator:
+    """
+    Accumulate stakeholder features one story at a time.
+
+    With a narrative accumulator, story texts and names are fed to it instead
+    of being retained.
+    """
+
+    def __init__(self, narrative: Optional[NarrativeAccumulator] = None):
+        self.narrative = narrative
+        self.stakeholder_types: List[str] = []
+        self.stakeholder_names: List[str] = []
+        self.story_texts: List[str] = []
+
+    def add(self, story: StakeholderStory):
+        self.stakeholder_types.append(story.stakeholder_type.value)
+        if self.narrative is not None:
+            self.narrative.add(narrative_text(story))
+        else:
+            self.stakeholder_names.append(story.stakeholder_name)
+            self.story_texts.append(narrative_text(story))
+
+    def freeze(self) -> StakeholderFeatures:
+        return StakeholderFeatures(
+            stakeholder_count=len(self.stakeholder_types),
+            stakeholder_types=tuple(self.stakeholder_types),
+            stakeholder_names=tuple(self.stakeholder_names),
+            story_texts=tuple(self.story_texts)
+        )
+
+
+class CoreStoryAccumulator:
+    """
+    Accumulate core story features one story at a time.
+
+    With a narrative accumulator, story texts and names are fed to it instead
+    of being retained.
+    """
+
+    def __init__(
+        self,
+        automaton: KeywordAutomaton = DEFAULT_AUTOMATON,
+        narrative: Optional[NarrativeAccumulator] = None
+    ):
+        self.automaton = automaton
+        self.narrative = narrative
+        self.story_confidences: List[float] = []
+        self.richness_scores: List[float] = []
+        self.tech_requirements = 0.0
+        self.values: Set[str] = set()
+        self.integration_complexity = 0.0
+        self.novelty_mentions = 0
+        self.innovation_keywords: Set[str] = set()
+        self.value_token_count = 0
+        self.value_tokens: Set[str] = set()
+        self.stakeholder_names: List[str] = []
+        self.story_texts: List[str] = []
+
+    def add(self, story: StakeholderStory):
+        experience = story.enhanced_experience.lower()
+        value = story.value_delivered.lower()
+
+        experience_hits = self.automaton.scan(experience)
+        value_hits = self.automaton.scan(value)
+
+        self.story_confidences.append(story.story_confidence)
+        self.richness_scores.append(_story_richness_score(story))
+
+        if experience_hits["technology"]:
+            self.tech_requirements += 0.5
+
+        self.values.add(story.value_delivered)
+
+        integration_mentions = len(experience_hits["integration"] | value_hits["integration"])
+        self.integration_complexity += min(integration_mentions * 0.5, 2.0)
+
+        self.novelty_mentions += len(experience_hits["novelty"] | value_hits["novelty"])
+        self.innovation_keywords |= experience_hits["innovation"] | value_hits["innovation"]
+
+        value_tokens = value.split()
+        self.value_token_count += len(value_tokens)
+        self.value_tokens.update(value_tokens)
+
+        if self.narrative is not None:
+            self.narrative.add(narrative_text(story))
+        else:
+            self.stakeholder_names.append(story.stakeholder_name)
+            self.story_texts.append(narrative_text(story))
+
+    def freeze(self) -> CoreStoryFeatures:
+        return CoreStoryFeatures(
+            story_count=len(self.story_confidences),
+            story_confidences=tuple(self.story_confidences),
+            richness_scores=tuple(self.richness_scores),
+            tech_requirements=self.tech_requirements,
+            value_proposition_count=len(self.values),
+            integration_complexity=self.integration_complexity,
+            novelty_mentions=self.novelty_mentions,
+            innovation_keywords=frozenset(self.innovation_keywords),
+            value_token_count=self.value_token_count,
+            value_tokens=frozenset(self.value_tokens),
+            stakeholder_names=tuple(self.stakeholder_names),
+            story_texts=tuple(self.story_texts)
+        )
+
+
+class ChallengeAccumulator:
+    """Accumulate challenge resolution features one challenge at a time."""
+
+    def __init__(self, automaton: KeywordAutomaton = DEFAULT_AUTOMATON):
+        self.automaton = automaton
+        self.challenge_count = 0
+        self.business_challenge_complexity = 0.0
+        self.integration_complexity = 0.0
+        self.conflict_penalty = 0.0
+
+    def add(self, challenge: ChallengeResolution):
+        solution = challenge.solution_approach.lower()
+        evolution = challenge.concept_evolution.lower()
+        scenario = challenge.challenge_scenario.lower()
+
+        solution_hits = self.automaton.scan(solution)
+        evolution_hits = self.automaton.scan(evolution)
+        scenario_hits = self.automaton.scan(scenario)
+
+        self.challenge_count += 1
+
+        if solution_hits["business"]:
+            self.business_challenge_complexity += 0.5
+
+        integration_mentions = len(solution_hits["integration"] | evolution_hits["integration"])
+        self.integration_complexity += min(integration_mentions * 0.2, 1.0)
+
+        if scenario_hits["conflict"]:
+            self.conflict_penalty += 0.1
+
+    def freeze(self) -> ChallengeFeatures:
+        return ChallengeFeatures(
+            challenge_count=self.challenge_count,
+            business_challenge_complexity=self.business_challenge_complexity,
+            integration_complexity=self.integration_complexity,
+            conflict_penalty=self.conflict_penalty
+        )
+
+
+class EnhancementAccumulator:
+    """Accumulate enhancement features one enhancement at a time."""
+
+    def __init__(self, automaton: KeywordAutomaton = DEFAULT_AUTOMATON):
+        self.automaton = automaton
+        self.enhancement_count = 0
+        self.enhancement_complexity = 0.0
+        self.integration_complexity = 0.0
+        self.innovation_keywords: Set[str] = set()
+
+    def add(self, enhancement: Enhancement):
+        enhancement_type = enhancement.enhancement_type.lower()
+        description = enhancement.description.lower()
+        approach = enhancement.implementation_approach.lower()
+
+        description_hits = self.automaton.scan(description)
+        approach_hits = self.automaton.scan(approach)
+
+        self.enhancement_count += 1
+
+        if "network" in enhancement_type:
+            self.enhancement_complexity += 1.5
+        elif "integration" in enhancement_type:
+            self.enhancement_complexity += 1.0
+        else:
+            self.enhancement_complexity += 0.5
+
+        integration_mentions = len(description_hits["integration"] | approach_hits["integration"])
+        self.integration_complexity += min(integration_mentions * 0.3, 1.5)
+
+        self.innovation_keywords |= description_hits["innovation"]
+
+    def freeze(self) -> EnhancementFeatures:
+        return EnhancementFeatures(
+            enhancement_count=self.enhancement_count,
+            enhancement_complexity=self.enhancement_complexity,
+            integration_complexity=self.integration_complexity,
+            innovation_keywords=frozenset(self.innovation_keywords)
+        )
+
+
+def _story_richness_score(story: StakeholderStory) -> float:
+    """Score completeness and depth of a single story (0-2.5 scale)."""
+
+    completeness = 0.0
+    if story.current_situation: completeness += 1.0
+    if story.pain_points: completeness += min(len(story.pain_points) / 3.0, 1.0)
+    if story.enhanced_experience: completeness += 1.0
+    if story.value_delivered: completeness += 1.0
+    if story.success_indicators: completeness += min(len(story.success_indicators) / 2.0, 1.0)
+
+    # Length of "situation experience value" without building the joined string
+    text_length = len(story.current_situation) + len(story.enhanced_experience) + len(story.value_delivered) + 2
+    detail_score = min(text_length / 200.0, 2.0)
+
+    return (completeness + detail_score) / 2.0
+
+
+def extract_stakeholder_features(stories: Iterable[StakeholderStory]) -> StakeholderFeatures:
+    """Extract features over all stakeholders."""
+    accumulator = StakeholderAccumulator()
+    for story in stories:
+        accumulator.add(story)
+    return accumulator.freeze()
+
+
+def extract_core_story_features(
+    stories: Iterable[StakeholderStory],
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON
+) -> CoreStoryFeatures:
+    """Extract features over core stories."""
+    accumulator = CoreStoryAccumulator(automaton)
+    for story in stories:
+        accumulator.add(story)
+    return accumulator.freeze()
+
+
+def extract_challenge_features(
+    challenges: Iterable[ChallengeResolution],
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON
+) -> ChallengeFeatures:
+    """Extract features over resolved challenges."""
+    accumulator = ChallengeAccumulator(automaton)
+    for challenge in challenges:
+        accumulator.add(challenge)
+    return accumulator.freeze()
+
+
+def extract_enhancement_features(
+    enhancements: Iterable[Enhancement],
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON
+) -> EnhancementFeatures:
+    """Extract features over enhancements."""
+    accumulator = EnhancementAccumulator(automaton)
+    for enhancement in enhancements:
+        accumulator.add(enhancement)
+    return accumulator.freeze()
+
+
+def extract_document_features(
+    concept_document: ConceptDocument,
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON
+) -> Dict[str, Any]:
+    """Extract the document-level (non-collection) fields of ConceptFeatures."""
+
+    description = concept_document.concept_description.lower()
+
+    return dict(
+        concept_name=concept_document.concept_name,
+        concept_maturity=concept_document.concept_maturity,
+        narrative_confidence=concept_document.narrative_confidence,
+        validation_level=concept_document.validation_level.value,
+        technical_complexity=concept_document.technical_complexity,
+        has_differentiation=bool(concept_document.competitive_differentiation),
+        differentiation_words=len(concept_document.competitive_differentiation.split()),
+        success_metric_count=len(concept_document.success_metrics),
+        concept_text=concept_document.concept_description,
+        concept_tokens=frozenset(description.split()),
+        concept_innovation_keywords=automaton.scan(description)["innovation"]
+    )
+
+
+def extract_concept_features(
+    concept_document: ConceptDocument,
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON
+) -> ConceptFeatures:
+    """Walk a concept document once and return its immutable feature set."""
+
+    return ConceptFeatures(
+        **extract_document_features(concept_document, automaton),
+        stakeholders=extract_stakeholder_features(concept_document.stakeholders.all()),
+        core_stories=extract_core_story_features(concept_document.core_stories, automaton),
+        challenges=extract_challenge_features(concept_document.challenges_resolved, automaton),
+        enhancements=extract_enhancement_features(concept_document.enhancements, automaton)
+    )
+
+
+__all__ = [
+    "ConceptFeatures",
+    "StakeholderFeatures",
+    "CoreStoryFeatures",
+    "ChallengeFeatures",
+    "EnhancementFeatures",
+    "StakeholderAccumulator",
+    "CoreStoryAccumulator",
+    "ChallengeAccumulator",
+    "EnhancementAccumulator",
+    "extract_document_features",
+    "extract_concept_features"
+]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Decision History
+
+Lazily paged, read-only view of stored adaptive decisions. Decision ids come
+from the decision log index; decisions themselves are only parsed when a page
+containing them is accessed, so engines can be constructed (and health checked)
+without materializing the whole history.
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Union
+
+import structlog
+
+from .models import AdaptiveDecision
+from .decision_log import DecisionLog
+
+logger = structlog.get_logger(__name__)
+
+
+# Decisions parsed together when any of them is accessed
+DEFAULT_PAGE_SIZE = 256
+
+# Parsed pages kept in memory
+DEFAULT_CACHED_PAGES = 8
+
+
+class DecisionHistory:
+    """
+    Sequence of historical decisions, oldest first, paged in on demand.
+
+    Decisions still stored as legacy one-file-per-decision JSON (not yet
+    migrated into the decision log) come first, followed by logged decisions in
+    write order. The view follows the log: decisions stored later appear
+    without reloading.
+    """
+
+    def __init__(
+        self,
+        log_provider: Callable[[], DecisionLog],
+        legacy_directory: Optional[Path] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        cached_pages: int = DEFAULT_CACHED_PAGES
+    ):
+        self._log_provider = log_provider
+        self.legacy_directory = legacy_directory
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.logger = logger.bind(component="DecisionHistory")
+
+        self._legacy_files: Optional[Dict[str, Path]] = None
+        self._ids: List[str] = []
+        self._ids_revision: Optional[int] = None
+        # Pages stay aligned with ids; unreadable decisions are None
+        self._pages: "OrderedDict[int, List[Optional[AdaptiveDecision]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.ids())
+
+    def __iter__(self) -> Iterator[AdaptiveDecision]:
+        ids = self.ids()
+        for page in range((len(ids) + self.page_size - 1) // self.page_size):
+            for decision in self._page(page):
+                if decision is not None:
+                    yield decision
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Optional[AdaptiveDecision], List[Optional[AdaptiveDecision]]]:
+        """Decision at a history position; None if its record is unreadable."""
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("decision history index out of range")
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def ids(self) -> List[str]:
+        """Decision ids in history order."""
+
+        decision_log = self._log_provider()
+        if self._ids_revision != decision_log.revision:
+            legacy_ids = [
+                decision_id for decision_id in self._legacy()
+                if decision_id not in decision_log
+            ]
+            self._ids = legacy_ids + decision_log.decision_ids()
+            self._ids_revision = decision_log.revision
+            self._pages.clear()
+        return self._ids
+
+    def refresh(self):
+        """Forget discovered legacy files and parsed pages, e.g. after decisions were removed."""
+        self._legacy_files = None
+        self._ids_revision = None
+        self._pages.clear()
+
+    def get(self, decision_id: str) -> Optional[AdaptiveDecision]:
+        """Load a single decision by id."""
+
+        decision = self._log_provider().get(decision_id)
+        if decision is None and decision_id in self._legacy():
+            decision = self._load_legacy(self._legacy()[decision_id])
+        return decision
+
+    def _legacy(self) -> Dict[str, Path]:
+        """Legacy decision files by decision id, discovered on first access."""
+
+        if self._legacy_files is None:
+            self._legacy_files = {}
+            if self.legacy_directory is not None and self.legacy_directory.exists():
+                for decision_file in sorted(self.legacy_directory.glob("*.json")):
+                    self._legacy_files[decision_file.stem] = decision_file
+            if self._legacy_files:
+                self.logger.warning(
+                    "Legacy decision files found, run 'aid-genesis storage migrate-decisions'",
+                    legacy_decisions=len(self._legacy_files)
+                )
+        return self._legacy_files
+
+    def _load_legacy(self, decision_file: Path) -> Optional[AdaptiveDecision]:
+        try:
+            with open(decision_file, 'r') as f:
+                return AdaptiveDecision(**json.load(f))
+        except Exception as e:
+            self.logger.warning("Failed to load decision", file=str(decision_file), error=str(e))
+            return None
+
+    def _page(self, page: int) -> List[Optional[AdaptiveDecision]]:
+        """Parse (or reuse) one page of decisions."""
+
+        ids = self.ids()
+        decisions = self._pages.get(page)
+        if decisions is not None:
+            self._pages.move_to_end(page)
+            return decisions
+
+        decisions = []
+        for decision_id in ids[page * self.page_size:(page + 1) * self.page_size]:
+            try:
+                decision = self.get(decision_id)
+            except Exception as e:
+                self.logger.warning("Failed to load decision", decision_id=decision_id, error=str(e))
+                decision = None
+            decisions.append(decision)
+
+        self._pages[page] = decisions
+        while len(self._pages) > self.cached_pages:
+            self._pages.popitem(last=False)
+        return decisions
+
+
+__all__ = [
+    "DecisionHistory"
+]
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Incremental Analysis
+
+Live complexity feedback for concepts under development. Each analysis
+dimension declares the ConceptDocument fields it reads; when a change event
+arrives only the affected collection features are updated and only the
+dependent dimensions and the weighted total are recomputed.
+"""
+
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Set, Tuple
+
+import structlog
+
+from .features import (
+    ConceptFeatures,
+    StakeholderAccumulator,
+    CoreStoryAccumulator,
+    ChallengeAccumulator,
+    EnhancementAccumulator,
+    extract_document_features
+)
+from .models import ComplexityAnalysis
+from ..conceptcraft.models import ConceptDocument, StakeholderStory, ChallengeResolution, Enhancement
+
+if TYPE_CHECKING:
+    from .core import AdaptiveIntelligenceEngine
+
+logger = structlog.get_logger(__name__)
+
+
+# ConceptDocument fields each analysis output depends on
+DIMENSION_DEPENDENCIES: Dict[str, FrozenSet[str]] = {
+    "stakeholder_complexity": frozenset({"stakeholders", "challenges_resolved", "core_stories"}),
+    "technical_complexity": frozenset({"concept_maturity", "enhancements", "core_stories"}),
+    "business_complexity": frozenset({
+        "core_stories", "competitive_differentiation", "success_metrics", "challenges_resolved"
+    }),
+    "integration_complexity": frozenset({"core_stories", "enhancements", "challenges_resolved"}),
+    "story_richness": frozenset({"core_stories"}),
+    "narrative_coherence": frozenset({"stakeholders", "core_stories", "concept_description"}),
+    "stakeholder_alignment": frozenset({"core_stories", "challenges_resolved"}),
+    "uncertainty_level": frozenset({
+        "concept_maturity", "challenges_resolved", "narrative_confidence", "core_stories"
+    }),
+    "risk_factors": frozenset({
+        "stakeholders", "technical_complexity", "competitive_differentiation", "challenges_resolved",
+        "success_metrics", "concept_description", "core_stories", "enhancements"
+    }),
+    "analysis_confidence": frozenset({
+        "core_stories", "concept_maturity", "validation_level", "challenges_resolved", "narrative_confidence"
+    })
+}
+
+# Engine method computing each dimension from ConceptFeatures
+DIMENSION_ANALYZERS: Dict[str, str] = {
+    "stakeholder_complexity": "_analyze_stakeholder_complexity",
+    "technical_complexity": "_estimate_technical_complexity",
+    "business_complexity": "_analyze_business_complexity",
+    "integration_complexity": "_estimate_integration_complexity",
+    "story_richness": "_analyze_story_richness",
+    "narrative_coherence": "_analyze_narrative_coherence",
+    "stakeholder_alignment": "_analyze_stakeholder_alignment",
+    "uncertainty_level": "_analyze_uncertainty_level",
+    "risk_factors": "_identify_risk_factors"
+}
+
+# Collections backed by incremental feature accumulators
+COLLECTION_FIELDS = ("stakeholders", "core_stories", "challenges_resolved", "enhancements")
+
+# Stakeholder tiers in StakeholderEcosystem.all() order
+TIERS = ("primary", "secondary", "tertiary")
+
+
+@dataclass(frozen=True)
+class ConceptChangeEvent:
+    """
+    A change to one ConceptDocument field.
+
+    For collection fields, ``added`` lists items appended to the collection;
+    an event without added items means the field was replaced or edited in
+    place and is re-read from the document.
+    """
+
+    field: str
+    added: Tuple[Any, ...] = ()
+
+
+def affected_dimensions(fields: Iterable[str]) -> Set[str]:
+    """Return the analysis outputs depending on any of the given fields."""
+    fields = set(fields)
+    return {dimension for dimension, dependencies in DIMENSION_DEPENDENCIES.items() if dependencies & fields}
+
+
+class IncrementalComplexityAnalysis:
+    """
+    Complexity analysis of a concept kept current under change events.
+
+    The analysis always equals a full analyze_concept_complexity() run on the
+    current document, but appended stories, challenges and enhancements are
+    scanned once and unaffected dimensions are never recomputed.
+    """
+
+    def __init__(self, engine: "AdaptiveIntelligenceEngine", concept_document: ConceptDocument):
+        self.engine = engine
+        self.concept_document = concept_document
+        self.logger = logger.bind(component="IncrementalComplexityAnalysis")
+
+        automaton = engine.keyword_automaton
+        self._accumulators = {
+            "stakeholders": StakeholderAccumulator(),
+            "core_stories": CoreStoryAccumulator(automaton),
+            "challenges_resolved": ChallengeAccumulator(automaton),
+            "enhancements": EnhancementAccumulator(automaton)
+        }
+        for field in COLLECTION_FIELDS:
+            for item in self._collection_items(field):
+                self._accumulators[field].add(item)
+
+        self.features = ConceptFeatures(
+            **extract_document_features(concept_document, automaton),
+            **self._frozen_collections(COLLECTION_FIELDS)
+        )
+
+        self.dimensions: Dict[str, Any] = {}
+        self._recompute(set(DIMENSION_DEPENDENCIES))
+
+    @property
+    def analysis(self) -> ComplexityAnalysis:
+        """Current complexity analysis of the concept."""
+        return self._analysis
+
+    def apply(self, *events: ConceptChangeEvent) -> ComplexityAnalysis:
+        """Update features from change events and recompute affected dimensions."""
+
+        changed_fields = set()
+        changed_collections = []
+
+        for event in events:
+            changed_fields.add(event.field)
+            if event.field not in COLLECTION_FIELDS:
+                continue
+
+            if event.added:
+                for item in event.added:
+                    self._accumulators[event.field].add(item)
+            else:
+                self._rebuild_accumulator(event.field)
+
+            if event.field not in changed_collections:
+                changed_collections.append(event.field)
+
+        updates = self._frozen_collections(changed_collections)
+        if changed_fields - set(COLLECTION_FIELDS):
+            updates.update(extract_document_features(self.concept_document, self.engine.keyword_automaton))
+        self.features = replace(self.features, **updates)
+
+        dimensions = affected_dimensions(changed_fields)
+        if dimensions:
+            self._recompute(dimensions)
+
+        self.logger.debug(
+            "Incremental complexity update",
+            changed_fields=sorted(changed_fields),
+            recomputed=sorted(dimensions),
+            complexity_score=self._analysis.complexity_score
+        )
+
+        return self._analysis
+
+    def add_stakeholder(self, story: StakeholderStory, tier: str = "primary") -> ComplexityAnalysis:
+        """Append a stakeholder story to the primary, secondary or tertiary tier."""
+        stakeholders = self.concept_document.stakeholders
+        getattr(stakeholders, f"{tier}_stakeholders").append(story)
+
+        # Features follow stakeholders.all() order; a story landing before later tiers is re-read in place
+        later_tiers = TIERS[TIERS.index(tier) + 1:]
+        if any(getattr(stakeholders, f"{later}_stakeholders") for later in later_tiers):
+            return self.apply(ConceptChangeEvent("stakeholders"))
+        return self.apply(ConceptChangeEvent("stakeholders", (story,)))
+
+    def add_core_story(self, story: StakeholderStory) -> ComplexityAnalysis:
+        """Append a core stakeholder story."""
+        self.concept_document.core_stories.append(story)
+        return self.apply(ConceptChangeEvent("core_stories", (story,)))
+
+    def add_challenge(self, challenge: ChallengeResolution) -> ComplexityAnalysis:
+        """Append a resolved challenge."""
+        self.concept_document.challenges_resolved.append(challenge)
+        return self.apply(ConceptChangeEvent("challenges_resolved", (challenge,)))
+
+    def add_enhancement(self, enhancement: Enhancement) -> ComplexityAnalysis:
+        """Append an enhancement opportunity."""
+        self.concept_document.enhancements.append(enhancement)
+        return self.apply(ConceptChangeEvent("enhancements", (enhancement,)))
+
+    def update_field(self, field: str, value: Any) -> ComplexityAnalysis:
+        """Set a ConceptDocument field and recompute dependent dimensions."""
+        setattr(self.concept_document, field, value)
+        return self.apply(ConceptChangeEvent(field))
+
+    def _collection_items(self, field: str) -> Iterable[Any]:
+        if field == "stakeholders":
+            return self.concept_document.stakeholders.all()
+        return getattr(self.concept_document, field)
+
+    def _rebuild_accumulator(self, field: str):
+        accumulator = type(self._accumulators[field])
+        if field == "stakeholders":
+            self._accumulators[field] = accumulator()
+        else:
+            self._accumulators[field] = accumulator(self.engine.keyword_automaton)
+        for item in self._collection_items(field):
+            self._accumulators[field].add(item)
+
+    def _frozen_collections(self, fields: Iterable[str]) -> Dict[str, Any]:
+        feature_names = {
+            "stakeholders": "stakeholders",
+            "core_stories": "core_stories",
+            "challenges_resolved": "challenges",
+            "enhancements": "enhancements"
+        }
+        return {feature_names[field]: self._accumulators[field].freeze() for field in fields}
+
+    def _recompute(self, dimensions: Set[str]):
+        """Recompute the given dimensions, the weighted total and the analysis."""
+
+        engine = self.engine
+        features = self.features
+
+        for dimension, analyzer in DIMENSION_ANALYZERS.items():
+            if dimension in dimensions:
+                self.dimensions[dimension] = getattr(engine, analyzer)(features)
+
+        if "analysis_confidence" in dimensions:
+            self.dimensions["analysis_confidence"] = engine._calculate_analysis_confidence(
+                features, self.dimensions["stakeholder_complexity"], self.dimensions["story_richness"]
+            )
+
+        # Same accumulation order as the full analysis
+        weights = engine.complexity_weights
+        complexity_score = (
+            self.dimensions["stakeholder_complexity"] * weights["stakeholder_complexity"] +
+            self.dimensions["technical_complexity"] * weights["technical_complexity"] +
+            self.dimensions["business_complexity"] * weights["business_complexity"] +
+            self.dimensions["integration_complexity"] * weights["integration_complexity"] +
+            self.dimensions["uncertainty_level"] * weights["uncertainty_level"]
+        )
+
+        self._analysis = ComplexityAnalysis(
+            complexity_score=complexity_score,
+            **self.dimensions
+        )
+
+
+__all__ = [
+    "DIMENSION_DEPENDENCIES",
+    "ConceptChangeEvent",
+    "IncrementalComplexityAnalysis",
+    "affected_dimensions"
+]
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Streaming Concept Ingestion
+
+Feature extraction from ConceptDocument JSON too large to materialize, such as
+imported concepts with research transcripts and thousands of stakeholder
+stories. The document is scanned incrementally in fixed-size chunks; each
+stakeholder story, challenge and enhancement is validated on its own, fed to
+the feature accumulators and dropped, and narrative coherence is accumulated
+from hashed story vectors instead of retained story texts. Peak memory is
+bounded by the largest single record plus one read chunk.
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Union
+
+from .lexicon import KeywordAutomaton, DEFAULT_AUTOMATON
+from .narrative import NarrativeAccumulator
+from .features import (
+    ConceptFeatures,
+    StakeholderAccumulator,
+    CoreStoryAccumulator,
+    ChallengeAccumulator,
+    EnhancementAccumulator,
+    extract_document_features
+)
+from ..conceptcraft.models import (
+    ConceptDocument,
+    StakeholderStory,
+    ChallengeResolution,
+    Enhancement
+)
+
+
+# Bytes read from the source at a time
+STREAM_CHUNK_BYTES = 1 << 20
+
+# StakeholderEcosystem story lists
+STAKEHOLDER_GROUPS = ("primary_stakeholders", "secondary_stakeholders", "tertiary_stakeholders")
+
+# Primary stakeholders that stand in for core stories when a document has none (see ConceptDocument)
+DEFAULT_CORE_STORIES = 3
+
+_WHITESPACE = re.compile(rb"[ \t\r\n]*")
+_CONTAINER_SPECIAL = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb"[,\]}\s]")
+
+_QUOTE, _BACKSLASH, _COLON, _COMMA = ord('"'), ord("\\"), ord(":"), ord(",")
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_ARRAY, _CLOSE_ARRAY = ord("["), ord("]")
+
+
+class JSONStream:
+    """
+    Incremental reader of one JSON document from a binary stream.
+
+    Containers are walked with iter_object() and iter_array(); any other value
+    is read whole with read_value() or passed over with skip_value(). Only the
+    value being read (and the rest of the current chunk) is held in memory.
+    Structural characters are ASCII and never occur inside multi-byte UTF-8
+    sequences, so scanning works on raw bytes.
+    """
+
+    def __init__(self, source: BinaryIO, chunk_bytes: int = STREAM_CHUNK_BYTES):
+        self._source = source
+        self._chunk_bytes = chunk_bytes
+        self._buffer = bytearray()
+        self._position = 0
+
+    def iter_object(self) -> Iterator[str]:
+        """Yield the keys of the next object; each value must be consumed before the next key."""
+
+        self._expect(_OPEN_OBJECT)
+        if self._peek() == _CLOSE_OBJECT:
+            self._position += 1
+            return
+        while True:
+            if self._peek() != _QUOTE:
+                raise ValueError(f"Expected an object key at byte {self._position}")
+            key = json.loads(self.read_value())
+            self._expect(_COLON)
+            yield key
+            if self._closes(_CLOSE_OBJECT):
+                return
+
+    def iter_array(self) -> Iterator[int]:
+        """Yield the index of each element of the next array; each must be consumed before the next."""
+
+        self._expect(_OPEN_ARRAY)
+        if self._peek() == _CLOSE_ARRAY:
+            self._position += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            if self._closes(_CLOSE_ARRAY):
+                return
+
+    def read_value(self) -> bytes:
+        """Raw bytes of the next value."""
+        self._peek()
+        end = self._value_end()
+        value = bytes(self._buffer[self._position:end])
+        self._position = end
+        return value
+
+    def skip_value(self):
+        """Pass over the next value without copying it."""
+        self._peek()
+        self._position = self._value_end()
+
+    def finish(self):
+        """Check that nothing but whitespace follows the document."""
+        if self._peek(required=False) is not None:
+            raise ValueError(f"Unexpected data after JSON document at byte {self._position}")
+
+    def _more(self, required: bool = True) -> Optional[int]:
+        """
+        Read another chunk, dropping the bytes before the current position.
+
+        Returns how far buffer indices shifted, or None at the end of input
+        unless required.
+        """
+
+        chunk = self._source.read(self._chunk_bytes)
+        if not chunk:
+            if required:
+                raise ValueError("Unexpected end of JSON input")
+            return None
+        shift = self._position
+        if shift:
+            del self._buffer[:shift]
+            self._position = 0
+        self._buffer += chunk
+        return shift
+
+    def _peek(self, required: bool = True) -> Optional[int]:
+        """Skip whitespace and return the next byte without consuming it."""
+
+        while True:
+            self._position = _WHITESPACE.match(self._buffer, self._position).end()
+            if self._position < len(self._buffer):
+                return self._buffer[self._position]
+            if self._more(required) is None:
+                return None
+
+    def _expect(self, byte: int):
+        if self._peek() != byte:
+            raise ValueError(f"Expected {chr(byte)!r} at byte {self._position}")
+        self._position += 1
+
+    def _closes(self, closing: int) -> bool:
+        """Consume the comma or closing bracket after an item; returns whether the container closed."""
+        byte = self._peek()
+        if byte != _COMMA and byte != closing:
+            raise ValueError(f"Expected ',' or {chr(closing)!r} at byte {self._position}")
+        self._position += 1
+        return byte == closing
+
+    def _value_end(self) -> int:
+        """Index just past the value at the current position, reading input as needed."""
+
+        first = self._buffer[self._position]
+        if first == _QUOTE:
+            return self._string_end(self._position + 1)
+        if first == _OPEN_OBJECT or first == _OPEN_ARRAY:
+            return self._container_end()
+
+        index = self._position
+        while True:
+            match = _SCALAR_END.search(self._buffer, index)
+            if match is not None:
+                return match.start()
+            index = len(self._buffer)
+            shift = self._more(required=False)
+            if shift is None:
+                return index
+            index -= shift
+
+    def _string_end(self, index: int) -> int:
+        """Index just past the closing quote of a string whose content starts at index."""
+
+        while True:
+            quote = self._buffer.find(b'"', index)
+            if quote < 0:
+                index = len(self._buffer) - self._more()
+                continue
+            # A quote after an odd number of backslashes is escaped; the run
+            # cannot pass the opening quote, which stays in the buffer
+            backslash = quote - 1
+            while self._buffer[backslash] == _BACKSLASH:
+                backslash -= 1
+            if (quote - backslash) % 2:
+                return quote + 1
+            index = quote + 1
+
+    def _container_end(self) -> int:
+        depth = 0
+        index = self._position
+        while True:
+            while index >= len(self._buffer):
+                index -= self._more()
+            match = _CONTAINER_SPECIAL.search(self._buffer, index)
+            if match is None:
+                index = len(self._buffer)
+                continue
+            byte = self._buffer[match.start()]
+            if byte == _QUOTE:
+                index = self._string_end(match.end())
+                continue
+            depth += 1 if byte == _OPEN_OBJECT or byte == _OPEN_ARRAY else -1
+            index = match.end()
+            if depth == 0:
+                return index
+
+
+def stream_concept_features(
+    source: Union[str, Path, BinaryIO],
+    automaton: KeywordAutomaton = DEFAULT_AUTOMATON,
+    chunk_bytes: int = STREAM_CHUNK_BYTES
+) -> ConceptFeatures:
+    """
+    Extract concept features from ConceptDocument JSON without materializing it.
+
+    The result matches extract_concept_features() of the parsed document,
+    except that story texts are not retained: narrative coherence is computed
+    while streaming and carried as ConceptFeatures.narrative_score.
+
+    Args:
+        source: Path of a ConceptDocument JSON file, or a binary file object
+        automaton: Keyword automaton of the analyzing engine
+        chunk_bytes: Bytes read at a time
+
+    Returns:
+        ConceptFeatures of the document
+    """
+
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as f:
+            return stream_concept_features(f, automaton, chunk_bytes)
+
+    stream = JSONStream(source, chunk_bytes)
+    stakeholder_narrative = NarrativeAccumulator()
+    core_narrative = NarrativeAccumulator()
+    stakeholders = StakeholderAccumulator(narrative=stakeholder_narrative)
+    core_stories = CoreStoryAccumulator(automaton, narrative=core_narrative)
+    default_core_stories = CoreStoryAccumulator(automaton)
+    challenges = ChallengeAccumulator(automaton)
+    enhancements = EnhancementAccumulator(automaton)
+    document_fields: Dict[str, Any] = {}
+
+    for key in stream.iter_object():
+        if key == "stakeholders":
+            for group in stream.iter_object():
+                if group not in STAKEHOLDER_GROUPS:
+                    stream.skip_value()
+                    continue
+                for index in stream.iter_array():
+                    story = StakeholderStory.model_validate_json(stream.read_value())
+                    stakeholders.add(story)
+                    if group == "primary_stakeholders" and index < DEFAULT_CORE_STORIES:
+                        default_core_stories.add(story)
+        elif key == "core_stories":
+            for _ in stream.iter_array():
+                core_stories.add(StakeholderStory.model_validate_json(stream.read_value()))
+        elif key == "challenges_resolved":
+            for _ in stream.iter_array():
+                challenges.add(ChallengeResolution.model_validate_json(stream.read_value()))
+        elif key == "enhancements":
+            for _ in stream.iter_array():
+                enhancements.add(Enhancement.model_validate_json(stream.read_value()))
+        else:
+            document_fields[key] = json.loads(stream.read_value())
+    stream.finish()
+
+    # Validates the document-level fields; the streamed collections stay empty
+    document = ConceptDocument.model_validate(document_fields)
+    stakeholder_features = stakeholders.freeze()
+
+    # Narrative coherence compares all stakeholders, or the core stories without any
+    narrative = stakeholder_narrative if stakeholder_features.stakeholder_count else core_narrative
+
+    return ConceptFeatures(
+        **extract_document_features(document, automaton),
+        stakeholders=stakeholder_features,
+        core_stories=(core_stories if core_stories.story_confidences else default_core_stories).freeze(),
+        challenges=challenges.freeze(),
+        enhancements=enhancements.freeze(),
+        narrative_score=narrative.score(document.concept_description)
+    )
+
+
+__all__ = [
+    "STREAM_CHUNK_BYTES",
+    "JSONStream",
+    "stream_concept_features"
+]
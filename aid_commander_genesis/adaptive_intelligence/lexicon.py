@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Keyword Lexicons
+
+Compiled multi-lexicon keyword matching for complexity signals. Matching runs
+inside the interpreter's C string and regex engines: plain matching is one
+substring search per distinct keyword, and word-boundary matching is a single
+compiled alternation over every lexicon, so a text field is scanned once
+however many lexicons are configured.
+"""
+
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+# Default keyword lexicons used as complexity signals
+KEYWORD_LEXICONS: Dict[str, Tuple[str, ...]] = {
+    "integration": (
+        "api", "integration", "connect", "sync", "import", "export",
+        "third-party", "platform", "system", "database", "crm", "erp"
+    ),
+    "novelty": ("new", "novel", "innovative", "first", "revolutionary", "breakthrough"),
+    "innovation": (
+        "new", "novel", "innovative", "first", "revolutionary", "breakthrough",
+        "disrupted", "transform", "reinvent", "unprecedented"
+    ),
+    "technology": ("ai", "machine learning", "real-time", "api", "integration"),
+    "business": ("business model", "revenue", "pricing", "market", "competition"),
+    "conflict": ("conflict", "disagree", "oppose", "resist", "against")
+}
+
+# Default location of user lexicon overrides
+LEXICON_CONFIG_PATH = Path.home() / ".aid_genesis" / "lexicons.json"
+
+# Texts longer than this are scanned once per distinct token
+LONG_TEXT_THRESHOLD = 64 * 1024
+
+
+def _is_word_char(character: str) -> bool:
+    return character.isalnum() or character == "_"
+
+
+def _can_overlap(first: str, second: str, word_boundaries: bool) -> bool:
+    """Whether an occurrence of second can start inside an occurrence of first."""
+
+    for offset in range(len(first)):
+        if offset and word_boundaries and _is_word_char(first[offset - 1]) and _is_word_char(second[0]):
+            continue
+        tail = first[offset:]
+        if tail.startswith(second) or second.startswith(tail):
+            return True
+    return False
+
+
+class KeywordAutomaton:
+    """
+    Compiled keyword matcher over several keyword lexicons.
+
+    Matching is case-sensitive on the compiled (lowercased) keywords, so callers
+    pass lowercased text. With word_boundaries enabled a keyword only matches
+    when it is not embedded in a longer word ("api" does not match "capital").
+
+    Word-boundary matching scans the text once with an alternation of all
+    keywords, longest first. The scan reports non-overlapping matches, so
+    keywords that can overlap another keyword ("real" and "real-time") are
+    confirmed with their own pattern when the scan misses them.
+
+    Long texts such as pasted interview transcripts are dominated by repeated
+    words. A keyword without whitespace can only occur inside one
+    whitespace-delimited token, so above LONG_TEXT_THRESHOLD matching runs
+    over the distinct tokens only and multi-word phrases are searched directly.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]], word_boundaries: bool = False):
+        self.word_boundaries = word_boundaries
+        self.lexicons: Dict[str, Tuple[str, ...]] = {
+            name: tuple(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+            for name, keywords in lexicons.items()
+        }
+
+        # Each distinct keyword is compiled once and mapped back to its lexicons
+        self.keywords: List[str] = []
+        self.keyword_lexicons: List[Tuple[str, ...]] = []
+        keyword_ids: Dict[str, int] = {}
+        for name, keywords in self.lexicons.items():
+            for keyword in keywords:
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.keyword_lexicons.append(())
+                keyword_id = keyword_ids[keyword]
+                self.keyword_lexicons[keyword_id] += (name,)
+        self._keyword_ids = keyword_ids
+
+        self._compile()
+
+    def _keyword_pattern(self, keywords: Iterable[str]) -> "re.Pattern[str]":
+        body = "|".join(re.escape(keyword) for keyword in keywords)
+        if self.word_boundaries:
+            return re.compile(r"(?<!\w)(?:" + body + r")(?!\w)")
+        return re.compile(body)
+
+    def _compile(self):
+        """Compile the keyword alternation and the patterns of overlapping keywords."""
+
+        # Longest first, so the alternation prefers "real-time" over "real"
+        self._pattern = self._keyword_pattern(sorted(self.keywords, key=len, reverse=True))
+
+        self._overlap_patterns: List[Tuple[int, "re.Pattern[str]"]] = []
+        if self.word_boundaries:
+            overlapping = {
+                keyword_id
+                for keyword_id, keyword in enumerate(self.keywords)
+                for other in self.keywords
+                if other != keyword and (
+                    _can_overlap(other, keyword, True) or _can_overlap(keyword, other, True)
+                )
+            }
+            self._overlap_patterns = [
+                (keyword_id, self._keyword_pattern([self.keywords[keyword_id]]))
+                for keyword_id in sorted(overlapping)
+            ]
+
+        # Multi-word phrases cannot be found within single tokens
+        self._phrase_patterns = [
+            (keyword_id, self._keyword_pattern([keyword]))
+            for keyword_id, keyword in enumerate(self.keywords)
+            if any(character.isspace() for character in keyword)
+        ]
+
+    def find_keywords(self, text: str) -> Set[int]:
+        """Return ids of keywords occurring in text."""
+
+        if len(text) < LONG_TEXT_THRESHOLD:
+            return self._run(text)
+
+        # Newline separators count as word boundaries and never occur inside a match
+        found = self._run("\n".join(set(text.split())))
+        for keyword_id, pattern in self._phrase_patterns:
+            if keyword_id not in found and pattern.search(text):
+                found.add(keyword_id)
+        return found
+
+    def _run(self, text: str) -> Set[int]:
+        """Match every keyword against text."""
+
+        if not self.word_boundaries:
+            return {keyword_id for keyword_id, keyword in enumerate(self.keywords) if keyword in text}
+
+        keyword_ids = self._keyword_ids
+        found = {keyword_ids[keyword] for keyword in self._pattern.findall(text)}
+        for keyword_id, pattern in self._overlap_patterns:
+            if keyword_id not in found and pattern.search(text):
+                found.add(keyword_id)
+        return found
+
+    def scan(self, text: str) -> Dict[str, FrozenSet[str]]:
+        """Return the distinct keywords of every lexicon found in text."""
+
+        hits: Dict[str, Set[str]] = {name: set() for name in self.lexicons}
+        for keyword_id in self.find_keywords(text):
+            keyword = self.keywords[keyword_id]
+            for name in self.keyword_lexicons[keyword_id]:
+                hits[name].add(keyword)
+        return {name: frozenset(keywords) for name, keywords in hits.items()}
+
+    def hit_counts(self, text: str) -> Dict[str, int]:
+        """Return the number of distinct keywords of every lexicon found in text."""
+        return {name: len(keywords) for name, keywords in self.scan(text).items()}
+
+    def fingerprint(self) -> str:
+        """Stable digest of the compiled lexicons and matching mode."""
+        payload = json.dumps(
+            {"lexicons": self.lexicons, "word_boundaries": self.word_boundaries},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def load_lexicon_config(config_path: Optional[Path] = None) -> Tuple[Dict[str, Tuple[str, ...]], bool]:
+    """
+    Load lexicons merged with user overrides.
+
+    The config file is JSON of the form
+    {"word_boundaries": false, "lexicons": {"integration": ["api", ...]}};
+    listed lexicons replace the defaults of the same name and new names are added.
+    """
+
+    lexicons = dict(KEYWORD_LEXICONS)
+    word_boundaries = False
+    config_path = config_path or LEXICON_CONFIG_PATH
+
+    if config_path.exists():
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+            for name, keywords in config.get("lexicons", {}).items():
+                lexicons[name] = tuple(keywords)
+            word_boundaries = bool(config.get("word_boundaries", False))
+        except Exception as e:
+            logger.warning("Failed to load lexicon config, using defaults", file=str(config_path), error=str(e))
+
+    return lexicons, word_boundaries
+
+
+def build_keyword_automaton(config_path: Optional[Path] = None) -> KeywordAutomaton:
+    """Compile the default lexicons plus any user overrides."""
+    lexicons, word_boundaries = load_lexicon_config(config_path)
+    return KeywordAutomaton(lexicons, word_boundaries=word_boundaries)
+
+
+# Shared automaton over the default lexicons
+DEFAULT_AUTOMATON = KeywordAutomaton(KEYWORD_LEXICONS)
+
+
+__all__ = [
+    "KEYWORD_LEXICONS",
+    "LEXICON_CONFIG_PATH",
+    "LONG_TEXT_THRESHOLD",
+    "KeywordAutomaton",
+    "DEFAULT_AUTOMATON",
+    "load_lexicon_config",
+    "build_keyword_automaton"
+]
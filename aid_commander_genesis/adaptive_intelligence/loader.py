@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Bulk History Loader
+
+Cold-start loading of the complete decision and pattern history for training
+and analytics jobs. Record reads and validation are fanned out over a process
+pool in chunks; each record is validated straight from its raw JSON bytes with
+pydantic's native parser instead of json.load followed by model construction.
+Chunks are merged in submission order, so results are identical to a serial
+load regardless of worker scheduling, and the cyclic garbage collector is
+paused while the history is materialized.
+
+Returning full models from workers costs about as much to unpickle as to
+parse, so jobs that only need derived values (feature rows, labels) should
+pass a transform; it runs in the workers and only its result is shipped back.
+"""
+
+import gc
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import structlog
+from pydantic import BaseModel
+
+from .models import AdaptiveDecision, CrossProjectPattern
+from .decision_log import DecisionLog, read_record_payload
+
+logger = structlog.get_logger(__name__)
+
+
+# Records validated per worker task
+DEFAULT_CHUNK_SIZE = 512
+
+# Model types a load task may produce
+LOADABLE_MODELS: Dict[str, Type[BaseModel]] = {
+    "AdaptiveDecision": AdaptiveDecision,
+    "CrossProjectPattern": CrossProjectPattern
+}
+
+# (model name, file path, record offset in a decision log segment or None for a whole JSON file)
+LoadTask = Tuple[str, str, Optional[int]]
+
+
+@dataclass
+class HistoryLoadResult:
+    """Decisions and patterns from a bulk load, with throughput figures."""
+
+    # Decisions, or transform results when a transform was given
+    decisions: List[Any] = field(default_factory=list)
+    patterns: List[CrossProjectPattern] = field(default_factory=list)
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+    workers: int = 1
+    chunks: int = 0
+
+    @property
+    def records(self) -> int:
+        """Records read, including failed ones."""
+        return len(self.decisions) + len(self.patterns) + self.failed
+
+    @property
+    def records_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.records / self.elapsed_seconds
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "decisions": len(self.decisions),
+            "patterns": len(self.patterns),
+            "failed": self.failed,
+            "workers": self.workers,
+            "chunks": self.chunks,
+            "elapsed_seconds": round(self.elapsed_seconds, 4),
+            "records_per_second": round(self.records_per_second, 1)
+        }
+
+
+def _load_chunk(
+    tasks: Sequence[LoadTask],
+    transform: Optional[Callable[[AdaptiveDecision], Any]] = None
+) -> List[Tuple[Any, Optional[str]]]:
+    """Read and validate one chunk of records; runs in worker processes."""
+
+    results: List[Tuple[Any, Optional[str]]] = []
+    segment_path = None
+    segment_file = None
+
+    try:
+        for model_name, path, offset in tasks:
+            try:
+                if offset is None:
+                    with open(path, 'rb') as f:
+                        payload = f.read()
+                else:
+                    # Log records of a chunk are mostly in one segment; keep it open
+                    if segment_path != path:
+                        if segment_file is not None:
+                            segment_file.close()
+                        segment_path, segment_file = path, open(path, 'rb')
+                    payload = read_record_payload(segment_file, offset)
+                    if payload is None:
+                        results.append((None, "record unreadable"))
+                        continue
+
+                # Fast path: parse and validate the raw bytes in one native call
+                record = LOADABLE_MODELS[model_name].model_validate_json(payload)
+                if transform is not None and model_name == "AdaptiveDecision":
+                    record = transform(record)
+                results.append((record, None))
+            except Exception as e:
+                results.append((None, str(e)))
+    finally:
+        if segment_file is not None:
+            segment_file.close()
+
+    return results
+
+
+def _chunked(tasks: Sequence[LoadTask], chunk_size: int) -> List[Sequence[LoadTask]]:
+    return [tasks[start:start + chunk_size] for start in range(0, len(tasks), chunk_size)]
+
+
+def _run_chunks(
+    chunks: List[Sequence[LoadTask]],
+    workers: int,
+    transform: Optional[Callable[[AdaptiveDecision], Any]]
+) -> List[List[Tuple[Any, Optional[str]]]]:
+    """Process chunks in a pool (or inline for one worker or chunk), keeping chunk order."""
+
+    if workers > 1 and len(chunks) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+                # map() yields in submission order, which makes the merge deterministic
+                return list(executor.map(_load_chunk, chunks, [transform] * len(chunks)))
+        except Exception as e:
+            logger.warning("Process pool unavailable, loading history serially", error=str(e))
+
+    return [_load_chunk(chunk, transform) for chunk in chunks]
+
+
+def _merge(
+    tasks: Sequence[LoadTask],
+    decision_ids: Sequence[str],
+    decision_tasks: int,
+    chunk_results: List[List[Tuple[Any, Optional[str]]]],
+    decision_log: Optional[DecisionLog],
+    transform: Optional[Callable[[AdaptiveDecision], Any]]
+) -> HistoryLoadResult:
+    """Combine chunk results in task order."""
+
+    result = HistoryLoadResult()
+    patterns: Dict[str, CrossProjectPattern] = {}
+
+    position = 0
+    for chunk_result in chunk_results:
+        for record, error in chunk_result:
+            model_name, path, offset = tasks[position]
+
+            if record is None and offset is not None and decision_log is not None:
+                # Segment rewritten by compaction since the task list was built
+                try:
+                    record = decision_log.get(decision_ids[position])
+                    if record is not None and transform is not None:
+                        record = transform(record)
+                except Exception as e:
+                    error = str(e)
+
+            if record is None:
+                result.failed += 1
+                logger.warning("Failed to load history record", model=model_name, file=path, error=error)
+            elif position < decision_tasks:
+                result.decisions.append(record)
+            else:
+                # Replaced in place, like AdaptiveIntelligenceEngine.add_pattern()
+                patterns[record.pattern_id] = record
+            position += 1
+
+    result.patterns = list(patterns.values())
+    return result
+
+
+def load_history(
+    decision_log: Optional[DecisionLog] = None,
+    legacy_directory: Optional[Path] = None,
+    pattern_directory: Optional[Path] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    transform: Optional[Callable[[AdaptiveDecision], Any]] = None
+) -> HistoryLoadResult:
+    """
+    Load all stored decisions and patterns in parallel.
+
+    Decisions are returned in history order (unmigrated legacy JSON files by
+    file name, then logged decisions in write order), patterns in file name
+    order with later files replacing earlier ones of the same pattern_id,
+    matching the lazy loaders. Unreadable records are counted as failed; log
+    records moved by a concurrent compaction are re-read through the log.
+
+    Args:
+        decision_log: Decision log to read live records from
+        legacy_directory: Directory of one-file-per-decision JSON files
+        pattern_directory: Directory of cross-project pattern JSON files
+        workers: Worker processes (defaults to the CPU count)
+        chunk_size: Records per worker task
+        transform: Module-level function applied to each decision in the workers
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    # Build the task list in merge order
+    tasks: List[LoadTask] = []
+    decision_ids: List[str] = []
+
+    logged = decision_log.live_records() if decision_log is not None else []
+    if legacy_directory is not None and legacy_directory.exists():
+        for decision_file in sorted(legacy_directory.glob("*.json")):
+            if decision_log is None or decision_file.stem not in decision_log:
+                tasks.append(("AdaptiveDecision", str(decision_file), None))
+                decision_ids.append(decision_file.stem)
+    for decision_id, segment_path, offset in logged:
+        tasks.append(("AdaptiveDecision", str(segment_path), offset))
+        decision_ids.append(decision_id)
+
+    decision_tasks = len(tasks)
+    if pattern_directory is not None and pattern_directory.exists():
+        for pattern_file in sorted(pattern_directory.glob("*.json")):
+            tasks.append(("CrossProjectPattern", str(pattern_file), None))
+
+    chunks = _chunked(tasks, chunk_size)
+
+    # Every retained model is a GC-tracked container and collections triggered
+    # while the history grows would rescan all of it; pause the collector instead
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        chunk_results = _run_chunks(chunks, workers, transform)
+        result = _merge(tasks, decision_ids, decision_tasks, chunk_results, decision_log, transform)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    result.workers = min(workers, len(chunks)) or 1
+    result.chunks = len(chunks)
+    result.elapsed_seconds = time.perf_counter() - started
+
+    logger.info("History bulk loaded", **result.summary())
+    return result
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "HistoryLoadResult",
+    "load_history"
+]
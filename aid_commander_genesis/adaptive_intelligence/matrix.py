@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Decision Matrix
+
+Columnar, in-memory representation of the decision history for cross-project
+learning. Each decision becomes one fixed-size row of a NumPy structured array:
+execution modes, outcomes and categorical preferences are small integer codes,
+stakeholder types are a bitmask, and strings are interned into UTF-8 tables
+stored as one byte buffer plus offsets. Matrices can be saved to a directory of
+.npy files and memory-mapped back, and aggregations such as success rate by
+mode and complexity band run as vector operations over the columns.
+
+Memory budget: a row takes DECISION_RECORD_DTYPE.itemsize (159) bytes and a
+36 character decision id 44 bytes of string table, so one million decisions
+with UUID ids occupy about 194 MiB, within DECISION_MATRIX_BUDGET_BYTES
+(256 MiB). The equivalent list of AdaptiveDecision models takes several KB per
+decision.
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from .models import AdaptiveDecision, ExecutionMode, ProjectComplexity
+from .scoring import MODE_ORDER
+from ..conceptcraft.models import StakeholderType
+
+logger = structlog.get_logger(__name__)
+
+
+# Code of each execution mode in mode columns (position in MODE_ORDER)
+MODE_CODES: Dict[ExecutionMode, int] = {mode: code for code, mode in enumerate(MODE_ORDER)}
+
+# Mode code for an unset mode (e.g. no preferred mode)
+NO_MODE = 255
+
+# Codes of the project_success column
+OUTCOME_UNKNOWN = -1
+OUTCOME_FAILURE = 0
+OUTCOME_SUCCESS = 1
+
+# Complexity bands and their upper bounds, matching ComplexityAnalysis.complexity_level
+COMPLEXITY_BANDS: Tuple[ProjectComplexity, ...] = tuple(ProjectComplexity)
+COMPLEXITY_BAND_EDGES = np.array([3.0, 6.0, 8.0])
+
+# Stakeholder types with fixed bits; other types get the following bits per matrix
+STAKEHOLDER_TYPES: Tuple[str, ...] = tuple(stakeholder_type.value for stakeholder_type in StakeholderType)
+
+# Bit shared by all stakeholder types beyond the 64 a mask can hold
+OTHER_STAKEHOLDER_BIT = 63
+
+# Columns holding codes into a string table of the same name
+STRING_COLUMNS = (
+    "decision_id", "project_name", "project_type",
+    "time_constraints", "budget_constraints", "validation_level"
+)
+
+# Fixed-size row layout; floats read by the mode scoring rules stay float64 so
+# thresholds compare exactly as they do on the models
+DECISION_RECORD_DTYPE = np.dtype([
+    # String table codes
+    ("decision_id", np.uint32),
+    ("project_name", np.uint32),
+    ("project_type", np.uint16),
+    ("time_constraints", np.uint8),
+    ("budget_constraints", np.uint8),
+    ("validation_level", np.uint8),
+    # Mode codes and outcome
+    ("recommended_mode", np.uint8),
+    ("user_choice", np.uint8),
+    ("preferred_mode", np.uint8),
+    ("project_success", np.int8),
+    ("complexity_level", np.uint8),
+    # Small integer preferences and context
+    ("ai_experience_level", np.uint8),
+    ("technical_expertise", np.uint8),
+    ("project_management_experience", np.uint8),
+    ("context_technical_complexity", np.uint8),
+    ("learning_mode", np.bool_),
+    ("stakeholder_types", np.uint64),
+    ("stakeholder_count", np.uint32),
+    ("team_size", np.uint32),
+    ("similar_projects_count", np.uint32),
+    # Timing
+    ("decision_timestamp", "M8[s]"),
+    ("project_completion", "M8[s]"),
+    # Scoring inputs
+    ("complexity_score", np.float64),
+    ("uncertainty_level", np.float64),
+    ("speed_vs_quality", np.float64),
+    ("risk_tolerance", np.float64),
+    ("confidence_threshold", np.float64),
+    ("experimentation_willingness", np.float64),
+    ("innovation_level", np.float64),
+    # Remaining analysis and outcome measures
+    ("stakeholder_complexity", np.float32),
+    ("technical_complexity", np.float32),
+    ("business_complexity", np.float32),
+    ("integration_complexity", np.float32),
+    ("story_richness", np.float32),
+    ("narrative_coherence", np.float32),
+    ("stakeholder_alignment", np.float32),
+    ("analysis_confidence", np.float32),
+    ("confidence_score", np.float32),
+    ("disruption_potential", np.float32),
+    ("previous_success_rate", np.float32)
+])
+
+# Memory budget for one million decisions (records plus string tables)
+DECISION_MATRIX_BUDGET_BYTES = 256 * 1024 * 1024
+
+# Matrix columns backing the fields referenced by mode scoring rules
+SCORING_FIELD_COLUMNS: Dict[str, str] = {
+    "analysis.complexity_score": "complexity_score",
+    "analysis.uncertainty_level": "uncertainty_level",
+    "preferences.speed_vs_quality": "speed_vs_quality",
+    "preferences.ai_experience_level": "ai_experience_level",
+    "preferences.team_size": "team_size",
+    "preferences.validation_level": "validation_level",
+    "preferences.confidence_threshold": "confidence_threshold",
+    "preferences.time_constraints": "time_constraints",
+    "preferences.budget_constraints": "budget_constraints",
+    "preferences.risk_tolerance": "risk_tolerance",
+    "preferences.experimentation_willingness": "experimentation_willingness",
+    "preferences.learning_mode": "learning_mode",
+    "context.stakeholder_count": "stakeholder_count",
+    "context.innovation_level": "innovation_level"
+}
+
+# Version of the on-disk matrix layout
+MATRIX_FORMAT_VERSION = 1
+
+# Rows converted per structured array chunk while building
+BUILD_CHUNK_ROWS = 65536
+
+
+class StringTable:
+    """
+    Append-only table of UTF-8 strings addressed by integer code.
+
+    Strings are stored as one byte buffer plus an offsets array, so the table
+    costs its encoded length plus 8 bytes per string and can be memory-mapped.
+    The value-to-code dictionary is only built when a lookup needs it.
+    """
+
+    def __init__(self, data: Optional[np.ndarray] = None, offsets: Optional[np.ndarray] = None):
+        self._data = data if data is not None else np.zeros(0, dtype=np.uint8)
+        self._offsets = offsets if offsets is not None else np.zeros(1, dtype=np.int64)
+        self._pending: List[bytes] = []
+        self._codes: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1 + len(self._pending)
+
+    def __getitem__(self, code: int) -> str:
+        self._flush()
+        return bytes(self._data[self._offsets[code]:self._offsets[code + 1]]).decode("utf-8")
+
+    def append(self, value: str) -> int:
+        """Add a string without deduplication (e.g. unique ids); returns its code."""
+        code = len(self)
+        self._pending.append(value.encode("utf-8"))
+        if self._codes is not None:
+            self._codes[value] = code
+        return code
+
+    def intern(self, value: str) -> int:
+        """Return the code of a string, adding it on first use."""
+        code = self._index().get(value)
+        if code is None:
+            code = self.append(value)
+        return code
+
+    def code(self, value: str) -> Optional[int]:
+        """Code of a string, or None if it is not in the table."""
+        return self._index().get(value)
+
+    def values(self) -> List[str]:
+        return [self[code] for code in range(len(self))]
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Vectorized decode of a code column into an object array of strings."""
+        return np.array(self.values() or [""], dtype=object)[codes]
+
+    @property
+    def nbytes(self) -> int:
+        self._flush()
+        return self._data.nbytes + self._offsets.nbytes
+
+    def save(self, prefix: Path):
+        self._flush()
+        np.save(f"{prefix}.data.npy", self._data)
+        np.save(f"{prefix}.offsets.npy", self._offsets)
+
+    @classmethod
+    def load(cls, prefix: Path, mmap: bool = False) -> "StringTable":
+        mmap_mode = "r" if mmap else None
+        return cls(
+            np.load(f"{prefix}.data.npy", mmap_mode=mmap_mode),
+            np.load(f"{prefix}.offsets.npy", mmap_mode=mmap_mode)
+        )
+
+    def _index(self) -> Dict[str, int]:
+        if self._codes is None:
+            self._codes = {value: code for code, value in enumerate(self.values())}
+        return self._codes
+
+    def _flush(self):
+        """Move pending strings into the byte buffer."""
+
+        if not self._pending:
+            return
+        lengths = np.fromiter((len(value) for value in self._pending), dtype=np.int64, count=len(self._pending))
+        offsets = self._offsets[-1] + np.cumsum(lengths)
+        self._data = np.concatenate([self._data, np.frombuffer(b"".join(self._pending), dtype=np.uint8)])
+        self._offsets = np.concatenate([self._offsets, offsets])
+        self._pending = []
+
+
+def _seconds(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime for datetime64 columns."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def outcome_code(success: Optional[bool]) -> int:
+    """project_success column code of a decision outcome."""
+    return OUTCOME_UNKNOWN if success is None else (OUTCOME_SUCCESS if success else OUTCOME_FAILURE)
+
+
+def decision_row(decision: AdaptiveDecision) -> Tuple[Any, ...]:
+    """
+    Flatten a decision into a tuple of plain values.
+
+    Module-level and picklable, so it can run as a bulk loader transform in
+    worker processes; DecisionMatrix.from_rows() encodes the tuples.
+    """
+
+    context = decision.project_context
+    preferences = decision.user_preferences
+    analysis = decision.complexity_analysis
+    recommendation = decision.recommendation
+
+    return (
+        decision.decision_id,
+        context.project_name,
+        context.project_type,
+        preferences.time_constraints,
+        preferences.budget_constraints,
+        preferences.validation_level,
+        recommendation.recommended_mode,
+        decision.user_choice,
+        preferences.preferred_mode,
+        decision.project_success,
+        analysis.complexity_level,
+        preferences.ai_experience_level,
+        preferences.technical_expertise,
+        preferences.project_management_experience,
+        context.technical_complexity,
+        preferences.learning_mode,
+        tuple(context.stakeholder_types),
+        context.stakeholder_count,
+        preferences.team_size,
+        context.similar_projects_count,
+        _seconds(decision.decision_timestamp),
+        _seconds(decision.project_completion),
+        analysis.complexity_score,
+        analysis.uncertainty_level,
+        preferences.speed_vs_quality,
+        preferences.risk_tolerance,
+        preferences.confidence_threshold,
+        preferences.experimentation_willingness,
+        context.innovation_level,
+        analysis.stakeholder_complexity,
+        analysis.technical_complexity,
+        analysis.business_complexity,
+        analysis.integration_complexity,
+        analysis.story_richness,
+        analysis.narrative_coherence,
+        analysis.stakeholder_alignment,
+        analysis.analysis_confidence,
+        recommendation.confidence_score,
+        context.disruption_potential,
+        context.previous_success_rate
+    )
+
+
+def grouped_success_rate(groups: np.ndarray, outcomes: np.ndarray, group_count: int) -> Dict[str, np.ndarray]:
+    """
+    Decision, outcome and success counts per group code.
+
+    Rows with a negative group code are ignored; success_rate is NaN for
+    groups without a known outcome.
+    """
+
+    included = groups >= 0
+    groups = groups[included].astype(np.int64)
+    outcomes = outcomes[included]
+    known = outcomes != OUTCOME_UNKNOWN
+
+    decisions = np.bincount(groups, minlength=group_count)
+    outcome_counts = np.bincount(groups[known], minlength=group_count)
+    successes = np.bincount(groups[outcomes == OUTCOME_SUCCESS], minlength=group_count)
+    success_rate = np.divide(
+        successes, outcome_counts,
+        out=np.full(group_count, np.nan),
+        where=outcome_counts > 0
+    )
+
+    return {
+        "decisions": decisions,
+        "outcomes": outcome_counts,
+        "successes": successes,
+        "success_rate": success_rate
+    }
+
+
+class DecisionMatrix:
+    """
+    Column store of adaptive decisions.
+
+    Rows keep the order they were built in (history order when built by the
+    engine). Matrices are immutable once built; select() returns a matrix over
+    a subset of rows sharing the string tables.
+    """
+
+    def __init__(
+        self,
+        records: np.ndarray,
+        strings: Dict[str, StringTable],
+        stakeholder_types: Sequence[str] = STAKEHOLDER_TYPES
+    ):
+        if records.dtype != DECISION_RECORD_DTYPE:
+            raise ValueError("records must use DECISION_RECORD_DTYPE")
+
+        self.records = records
+        self.strings = strings
+        self.stakeholder_types = list(stakeholder_types)
+        self.logger = logger.bind(component="DecisionMatrix")
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the records and string tables."""
+        return self.records.nbytes + sum(table.nbytes for table in self.strings.values())
+
+    @classmethod
+    def from_decisions(cls, decisions: Iterable[AdaptiveDecision]) -> "DecisionMatrix":
+        return cls.from_rows(decision_row(decision) for decision in decisions)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[Any, ...]]) -> "DecisionMatrix":
+        """Build a matrix from decision_row() tuples."""
+
+        strings = {column: StringTable() for column in STRING_COLUMNS}
+        stakeholder_bits: Dict[str, int] = {name: bit for bit, name in enumerate(STAKEHOLDER_TYPES)}
+        stakeholder_types = list(STAKEHOLDER_TYPES)
+
+        decision_ids = strings["decision_id"]
+        interned = [strings[column] for column in STRING_COLUMNS[1:]]
+
+        def mode_code(mode: Optional[ExecutionMode]) -> int:
+            return NO_MODE if mode is None else MODE_CODES[ExecutionMode(mode)]
+
+        def stakeholder_mask(types: Sequence[str]) -> int:
+            mask = 0
+            for stakeholder_type in types:
+                bit = stakeholder_bits.get(stakeholder_type)
+                if bit is None:
+                    if len(stakeholder_types) < OTHER_STAKEHOLDER_BIT:
+                        bit = len(stakeholder_types)
+                        stakeholder_types.append(stakeholder_type)
+                    else:
+                        bit = OTHER_STAKEHOLDER_BIT
+                    stakeholder_bits[stakeholder_type] = bit
+                mask |= 1 << bit
+            return mask
+
+        complexity_codes = {level: code for code, level in enumerate(COMPLEXITY_BANDS)}
+
+        chunks: List[np.ndarray] = []
+        encoded: List[Tuple[Any, ...]] = []
+        for row in rows:
+            encoded.append((
+                decision_ids.append(row[0]),
+                *(table.intern(value) for table, value in zip(interned, row[1:6])),
+                mode_code(row[6]),
+                mode_code(row[7]),
+                mode_code(row[8]),
+                outcome_code(row[9]),
+                complexity_codes[ProjectComplexity(row[10])],
+                *row[11:16],
+                stakeholder_mask(row[16]),
+                *row[17:]
+            ))
+            if len(encoded) == BUILD_CHUNK_ROWS:
+                chunks.append(cls._encode_chunk(encoded, strings))
+                encoded = []
+        if encoded or not chunks:
+            chunks.append(cls._encode_chunk(encoded, strings))
+
+        records = chunks[0] if len(chunks) == 1 else np.concatenate(chunks)
+        for table in strings.values():
+            table._flush()
+        return cls(records, strings, stakeholder_types)
+
+    @staticmethod
+    def _encode_chunk(encoded: List[Tuple[Any, ...]], strings: Dict[str, StringTable]) -> np.ndarray:
+        # Categorical codes are narrow columns; fail loudly instead of wrapping
+        for column in STRING_COLUMNS:
+            limit = np.iinfo(DECISION_RECORD_DTYPE[column]).max
+            if len(strings[column]) > limit + 1:
+                raise ValueError(f"Too many distinct {column} values for the matrix layout: {len(strings[column])}")
+        return np.array(encoded, dtype=DECISION_RECORD_DTYPE)
+
+    def column(self, name: str) -> np.ndarray:
+        """Raw column (codes for string, mode and outcome columns)."""
+        return self.records[name]
+
+    def decoded(self, name: str) -> np.ndarray:
+        """String column decoded into an object array."""
+        return self.strings[name].decode(self.records[name])
+
+    def decision_id(self, row: int) -> str:
+        return self.strings["decision_id"][int(self.records["decision_id"][row])]
+
+    def row_of(self, decision_id: str) -> Optional[int]:
+        """Row of a decision id, or None."""
+        code = self.strings["decision_id"].code(decision_id)
+        if code is None:
+            return None
+        rows = np.flatnonzero(self.records["decision_id"] == code)
+        return int(rows[0]) if len(rows) else None
+
+    def mode_mask(self, mode: ExecutionMode, column: str = "user_choice") -> np.ndarray:
+        return self.records[column] == MODE_CODES[mode]
+
+    def stakeholder_type_mask(self, *stakeholder_types: str) -> np.ndarray:
+        """Rows whose project has any of the given stakeholder types."""
+
+        bits = np.uint64(0)
+        for stakeholder_type in stakeholder_types:
+            if stakeholder_type in self.stakeholder_types:
+                bits |= np.uint64(1 << self.stakeholder_types.index(stakeholder_type))
+        return (self.records["stakeholder_types"] & bits) != 0
+
+    def complexity_bands(self) -> np.ndarray:
+        """Complexity band code per row (index into COMPLEXITY_BANDS)."""
+        return np.searchsorted(COMPLEXITY_BAND_EDGES, self.records["complexity_score"], side="left")
+
+    def select(self, mask: np.ndarray) -> "DecisionMatrix":
+        """Matrix of the rows selected by a boolean mask or index array."""
+        return DecisionMatrix(self.records[mask], self.strings, self.stakeholder_types)
+
+    def mode_counts(self, column: str = "user_choice") -> np.ndarray:
+        """Decisions per mode in MODE_ORDER."""
+        modes = self.records[column]
+        return np.bincount(modes[modes != NO_MODE], minlength=len(MODE_ORDER))
+
+    def success_rate_by_mode(self, column: str = "user_choice") -> Dict[str, Any]:
+        """Decision, outcome and success counts per mode."""
+
+        modes = self.records[column].astype(np.int64)
+        modes[modes == NO_MODE] = -1
+        rates = grouped_success_rate(modes, self.records["project_success"], len(MODE_ORDER))
+        return {"modes": [mode.value for mode in MODE_ORDER], **rates}
+
+    def success_rate_by_mode_and_band(self, column: str = "user_choice") -> Dict[str, Any]:
+        """
+        Decision, outcome and success counts per mode and complexity band.
+
+        Count arrays have shape (modes, bands) in MODE_ORDER and
+        COMPLEXITY_BANDS order.
+        """
+
+        band_count = len(COMPLEXITY_BANDS)
+        modes = self.records[column].astype(np.int64)
+        groups = modes * band_count + self.complexity_bands()
+        groups[modes == NO_MODE] = -1
+
+        rates = grouped_success_rate(groups, self.records["project_success"], len(MODE_ORDER) * band_count)
+        return {
+            "modes": [mode.value for mode in MODE_ORDER],
+            "bands": [band.value for band in COMPLEXITY_BANDS],
+            **{name: values.reshape(len(MODE_ORDER), band_count) for name, values in rates.items()}
+        }
+
+    def scoring_columns(self, fields: Iterable[str]) -> Dict[str, np.ndarray]:
+        """Columns for CompiledModeScoring.score_columns(), equal to gather_columns() on the models."""
+
+        columns = {}
+        for field in fields:
+            column = SCORING_FIELD_COLUMNS.get(field)
+            if column is None:
+                raise KeyError(f"Decision matrix has no column for scoring field: {field}")
+            columns[field] = self.decoded(column) if column in self.strings else self.records[column]
+        return columns
+
+    def save(self, directory: Path):
+        """Write the matrix as .npy files that load() can memory-map."""
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        np.save(directory / "records.npy", self.records)
+        for column, table in self.strings.items():
+            table.save(directory / column)
+        with open(directory / "matrix.json", 'w') as f:
+            json.dump({
+                "format_version": MATRIX_FORMAT_VERSION,
+                "rows": len(self.records),
+                "stakeholder_types": self.stakeholder_types
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "DecisionMatrix":
+        """Load a saved matrix, memory-mapping its arrays read-only by default."""
+
+        directory = Path(directory)
+        with open(directory / "matrix.json", 'r') as f:
+            metadata = json.load(f)
+        if metadata.get("format_version") != MATRIX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported decision matrix format: {metadata.get('format_version')}")
+
+        records = np.load(directory / "records.npy", mmap_mode="r" if mmap else None)
+        strings = {column: StringTable.load(directory / column, mmap=mmap) for column in STRING_COLUMNS}
+        return cls(records, strings, metadata["stakeholder_types"])
+
+
+__all__ = [
+    "COMPLEXITY_BANDS",
+    "DECISION_MATRIX_BUDGET_BYTES",
+    "DECISION_RECORD_DTYPE",
+    "MODE_CODES",
+    "NO_MODE",
+    "OUTCOME_FAILURE",
+    "OUTCOME_SUCCESS",
+    "OUTCOME_UNKNOWN",
+    "DecisionMatrix",
+    "StringTable",
+    "decision_row",
+    "grouped_success_rate",
+    "outcome_code"
+]
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Pattern Mining
+
+Incremental discovery of cross-project patterns from decisions. Decision
+feature vectors are clustered with MiniBatchKMeans; every batch of new
+decisions is folded in with partial_fit and its cluster assignments update
+running per-cluster outcome statistics, so an update costs time proportional
+to the new decisions rather than to the whole history. Each cluster and chosen
+execution mode with enough known outcomes becomes a CrossProjectPattern.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import structlog
+from sklearn.cluster import MiniBatchKMeans
+
+from .models import CrossProjectPattern
+from .matrix import COMPLEXITY_BANDS, COMPLEXITY_BAND_EDGES, OUTCOME_SUCCESS, OUTCOME_UNKNOWN, DecisionMatrix
+from .scoring import MODE_ORDER
+
+logger = structlog.get_logger(__name__)
+
+
+# Clustered decision columns and the value range each is scaled from
+PATTERN_FEATURES: Tuple[Tuple[str, float, float], ...] = (
+    ("complexity_score", 0.0, 10.0),
+    ("stakeholder_complexity", 0.0, 10.0),
+    ("technical_complexity", 0.0, 10.0),
+    ("business_complexity", 0.0, 10.0),
+    ("integration_complexity", 0.0, 10.0),
+    ("uncertainty_level", 0.0, 10.0),
+    ("innovation_level", 0.0, 1.0),
+    ("speed_vs_quality", 0.0, 1.0),
+    ("risk_tolerance", 0.0, 1.0),
+    ("team_size", 1.0, 20.0)
+)
+
+# Number of decision clusters
+DEFAULT_PATTERN_CLUSTERS = 8
+
+# Known outcomes a cluster and mode need before they become a pattern
+MIN_PATTERN_SAMPLE_SIZE = 5
+
+# Mini-batch size for partial fits
+MINING_BATCH_SIZE = 1024
+
+# Stored decisions queued before the engine re-mines patterns on its own
+PATTERN_UPDATE_DECISIONS = 64
+
+# Success rates at or above / at or below which a pattern is a success / failure pattern
+SUCCESS_PATTERN_RATE = 0.7
+FAILURE_PATTERN_RATE = 0.4
+
+# Share of a cluster's decisions that must involve a stakeholder type for the pattern to list it
+STAKEHOLDER_TYPE_SHARE = 0.5
+
+# z value of the 95% confidence interval
+CONFIDENCE_Z = 1.96
+
+
+def pattern_features(matrix: DecisionMatrix) -> np.ndarray:
+    """(N, len(PATTERN_FEATURES)) feature matrix scaled to [0, 1]."""
+
+    features = np.empty((len(matrix), len(PATTERN_FEATURES)), dtype=np.float64)
+    for index, (column, low, high) in enumerate(PATTERN_FEATURES):
+        features[:, index] = (matrix.column(column).astype(np.float64) - low) / (high - low)
+    return np.clip(features, 0.0, 1.0, out=features)
+
+
+def wilson_interval(successes: int, trials: int, z: float = CONFIDENCE_Z) -> List[float]:
+    """Wilson score interval of a success rate."""
+
+    if trials <= 0:
+        return [0.0, 1.0]
+    rate = successes / trials
+    denominator = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / denominator
+    half_width = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / denominator
+    return [max(0.0, center - half_width), min(1.0, center + half_width)]
+
+
+@dataclass
+class _Batch:
+    """Decisions awaiting clustering, as columns."""
+
+    decision_ids: np.ndarray
+    features: np.ndarray
+    modes: np.ndarray
+    outcomes: np.ndarray
+    complexity: np.ndarray
+    stakeholder_types: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.decision_ids)
+
+    @staticmethod
+    def concatenate(batches: Sequence["_Batch"], type_count: int) -> "_Batch":
+        def padded(types: np.ndarray) -> np.ndarray:
+            return np.pad(types, ((0, 0), (0, type_count - types.shape[1])))
+
+        return _Batch(
+            np.concatenate([batch.decision_ids for batch in batches]),
+            np.concatenate([batch.features for batch in batches]),
+            np.concatenate([batch.modes for batch in batches]),
+            np.concatenate([batch.outcomes for batch in batches]),
+            np.concatenate([batch.complexity for batch in batches]),
+            np.concatenate([padded(batch.stakeholder_types) for batch in batches])
+        )
+
+
+class IncrementalPatternMiner:
+    """
+    Clusters decisions incrementally and keeps outcome statistics per cluster.
+
+    Decisions observed again (e.g. re-stored after their outcome became known)
+    keep their cluster and replace their earlier contribution instead of being
+    counted twice.
+    """
+
+    def __init__(
+        self,
+        n_clusters: int = DEFAULT_PATTERN_CLUSTERS,
+        min_sample_size: int = MIN_PATTERN_SAMPLE_SIZE,
+        batch_size: int = MINING_BATCH_SIZE,
+        random_state: int = 0
+    ):
+        self.n_clusters = n_clusters
+        self.min_sample_size = min_sample_size
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=batch_size, n_init=1, random_state=random_state)
+        self.fitted = False
+        self.logger = logger.bind(component="IncrementalPatternMiner")
+
+        mode_count = len(MODE_ORDER)
+        self.decisions = np.zeros(n_clusters, dtype=np.int64)
+        self.mode_outcomes = np.zeros((n_clusters, mode_count), dtype=np.int64)
+        self.mode_successes = np.zeros((n_clusters, mode_count), dtype=np.int64)
+        self.complexity_min = np.full((n_clusters, mode_count), np.inf)
+        self.complexity_max = np.full((n_clusters, mode_count), -np.inf)
+        self.stakeholder_type_names: List[str] = []
+        self.stakeholder_type_counts = np.zeros((n_clusters, 0), dtype=np.int64)
+
+        # decision_id -> (cluster, mode, outcome, stakeholder type indexes)
+        self._contributions: Dict[str, Tuple[int, int, int, Tuple[int, ...]]] = {}
+        self._backlog: List[_Batch] = []
+
+    @property
+    def observed(self) -> int:
+        """Decisions folded into the cluster statistics."""
+        return len(self._contributions)
+
+    def observe(self, matrix: DecisionMatrix) -> int:
+        """
+        Fold the decisions of a matrix into the clustering.
+
+        Returns the number of decisions added to the statistics; until the
+        first partial fit has n_clusters decisions they are held back.
+        """
+
+        if not len(matrix):
+            return 0
+
+        batch = self._unique(self._batch(matrix))
+        seen = np.fromiter((decision_id in self._contributions for decision_id in batch.decision_ids), dtype=bool, count=len(batch))
+
+        # Re-observed decisions keep their cluster and only update statistics
+        clusters = np.empty(len(batch), dtype=np.int64)
+        for row in np.flatnonzero(seen):
+            clusters[row] = self._retract(batch.decision_ids[row])
+        if seen.any():
+            self._accumulate(self._select(batch, seen), clusters[seen])
+
+        new_rows = ~seen
+        if not new_rows.any():
+            return int(seen.sum())
+
+        batch = self._select(batch, new_rows)
+        if not self.fitted:
+            self._backlog.append(batch)
+            if sum(len(pending) for pending in self._backlog) < self.n_clusters:
+                return int(seen.sum())
+            batch = self._unique(_Batch.concatenate(self._backlog, len(self.stakeholder_type_names)))
+            if len(batch) < self.n_clusters:
+                self._backlog = [batch]
+                return int(seen.sum())
+            self._backlog = []
+
+        self.model.partial_fit(batch.features)
+        self.fitted = True
+        self._accumulate(batch, self.model.predict(batch.features))
+
+        return int(seen.sum()) + len(batch)
+
+    def patterns(self) -> List[CrossProjectPattern]:
+        """Patterns for every cluster and mode with enough known outcomes."""
+
+        patterns = []
+        for cluster, mode_index in zip(*np.nonzero(self.mode_outcomes >= self.min_sample_size)):
+            patterns.append(self._pattern(int(cluster), int(mode_index)))
+        return patterns
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "fitted": self.fitted,
+            "clusters": self.n_clusters,
+            "observed_decisions": self.observed,
+            "pending_decisions": sum(len(batch) for batch in self._backlog),
+            "patterns": int((self.mode_outcomes >= self.min_sample_size).sum())
+        }
+
+    def _batch(self, matrix: DecisionMatrix) -> _Batch:
+        """Columns of a matrix with stakeholder types mapped to miner-wide indexes."""
+
+        masks = matrix.column("stakeholder_types")
+        type_columns = []
+        for bit, name in enumerate(matrix.stakeholder_types):
+            present = (masks >> np.uint64(bit)) & np.uint64(1)
+            if not present.any():
+                continue
+            if name not in self.stakeholder_type_names:
+                self.stakeholder_type_names.append(name)
+            type_columns.append((self.stakeholder_type_names.index(name), present.astype(bool)))
+
+        type_count = len(self.stakeholder_type_names)
+        if self.stakeholder_type_counts.shape[1] < type_count:
+            self.stakeholder_type_counts = np.pad(
+                self.stakeholder_type_counts, ((0, 0), (0, type_count - self.stakeholder_type_counts.shape[1]))
+            )
+        stakeholder_types = np.zeros((len(matrix), type_count), dtype=bool)
+        for index, present in type_columns:
+            stakeholder_types[:, index] = present
+
+        return _Batch(
+            matrix.decoded("decision_id"),
+            pattern_features(matrix),
+            matrix.column("user_choice").astype(np.int64),
+            matrix.column("project_success").astype(np.int64),
+            matrix.column("complexity_score").astype(np.float64),
+            stakeholder_types
+        )
+
+    @classmethod
+    def _unique(cls, batch: _Batch) -> _Batch:
+        """Drop repeated decision ids, keeping the latest occurrence."""
+        _, last = np.unique(batch.decision_ids[::-1], return_index=True)
+        if len(last) == len(batch):
+            return batch
+        return cls._select(batch, np.sort(len(batch) - 1 - last))
+
+    @staticmethod
+    def _select(batch: _Batch, rows: np.ndarray) -> _Batch:
+        return _Batch(
+            batch.decision_ids[rows], batch.features[rows], batch.modes[rows],
+            batch.outcomes[rows], batch.complexity[rows], batch.stakeholder_types[rows]
+        )
+
+    def _accumulate(self, batch: _Batch, clusters: np.ndarray):
+        """Add a batch's contributions to the cluster statistics."""
+
+        mode_count = len(MODE_ORDER)
+        cells = clusters * mode_count + batch.modes
+        known = batch.outcomes != OUTCOME_UNKNOWN
+        size = self.n_clusters * mode_count
+
+        self.decisions += np.bincount(clusters, minlength=self.n_clusters)
+        self.mode_outcomes += np.bincount(cells[known], minlength=size).reshape(self.n_clusters, mode_count)
+        self.mode_successes += np.bincount(
+            cells[batch.outcomes == OUTCOME_SUCCESS], minlength=size
+        ).reshape(self.n_clusters, mode_count)
+        np.minimum.at(self.complexity_min.reshape(-1), cells, batch.complexity)
+        np.maximum.at(self.complexity_max.reshape(-1), cells, batch.complexity)
+
+        type_count = batch.stakeholder_types.shape[1]
+        if type_count:
+            np.add.at(self.stakeholder_type_counts[:, :type_count], clusters, batch.stakeholder_types.astype(np.int64))
+
+        for decision_id, cluster, mode, outcome, types in zip(
+            batch.decision_ids, clusters, batch.modes, batch.outcomes, batch.stakeholder_types
+        ):
+            self._contributions[decision_id] = (int(cluster), int(mode), int(outcome), tuple(np.flatnonzero(types)))
+
+    def _retract(self, decision_id: str) -> int:
+        """Remove a decision's contribution (complexity ranges are kept); returns its cluster."""
+
+        cluster, mode, outcome, types = self._contributions.pop(decision_id)
+        self.decisions[cluster] -= 1
+        if outcome != OUTCOME_UNKNOWN:
+            self.mode_outcomes[cluster, mode] -= 1
+        if outcome == OUTCOME_SUCCESS:
+            self.mode_successes[cluster, mode] -= 1
+        for index in types:
+            self.stakeholder_type_counts[cluster, index] -= 1
+        return cluster
+
+    def _pattern(self, cluster: int, mode_index: int) -> CrossProjectPattern:
+        mode = MODE_ORDER[mode_index]
+        outcomes = int(self.mode_outcomes[cluster, mode_index])
+        successes = int(self.mode_successes[cluster, mode_index])
+        success_rate = successes / outcomes
+        low = float(self.complexity_min[cluster, mode_index])
+        high = float(self.complexity_max[cluster, mode_index])
+
+        if success_rate >= SUCCESS_PATTERN_RATE:
+            pattern_type = "success"
+        elif success_rate <= FAILURE_PATTERN_RATE:
+            pattern_type = "failure"
+        else:
+            pattern_type = "approach"
+
+        band = COMPLEXITY_BANDS[int(np.searchsorted(COMPLEXITY_BAND_EDGES, (low + high) / 2, side="left"))]
+        stakeholder_types = [
+            name for index, name in enumerate(self.stakeholder_type_names)
+            if self.stakeholder_type_counts[cluster, index] >= STAKEHOLDER_TYPE_SHARE * self.decisions[cluster]
+        ]
+
+        return CrossProjectPattern(
+            pattern_id=f"mined-{cluster}-{mode.value}",
+            pattern_name=f"{mode.value.replace('_', ' ').title()} mode on {band.value} projects",
+            pattern_description=(
+                f"{successes} of {outcomes} projects with complexity {low:.1f}-{high:.1f} "
+                f"succeeded in {mode.value} mode"
+            ),
+            pattern_type=pattern_type,
+            complexity_range=[low, high],
+            stakeholder_types=stakeholder_types,
+            success_rate=success_rate,
+            sample_size=outcomes,
+            confidence_interval=wilson_interval(successes, outcomes),
+            applicable_modes=[mode]
+        )
+
+
+__all__ = [
+    "DEFAULT_PATTERN_CLUSTERS",
+    "MIN_PATTERN_SAMPLE_SIZE",
+    "PATTERN_UPDATE_DECISIONS",
+    "PATTERN_FEATURES",
+    "IncrementalPatternMiner",
+    "pattern_features",
+    "wilson_interval"
+]
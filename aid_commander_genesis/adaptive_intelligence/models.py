@@ -102,7 +102,7 @@ class ComplexityAnalysis(BaseModel):
     
     # Overall scores
     complexity_score: float = Field(..., ge=0.0, le=10.0, description="Overall complexity 0-10")
-    complexity_level: ProjectComplexity = Field(..., description="Categorized complexity level")
+    complexity_level: ProjectComplexity = Field(default=ProjectComplexity.SIMPLE, description="Categorized complexity level")
     
     # Dimensional analysis
     stakeholder_complexity: float = Field(..., ge=0.0, le=10.0, description="Stakeholder ecosystem complexity")
@@ -121,11 +121,11 @@ class ComplexityAnalysis(BaseModel):
     
     # Confidence and recommendations
     analysis_confidence: float = Field(..., ge=0.0, le=1.0, description="Confidence in this analysis")
-    confidence_level: ConfidenceLevel = Field(..., description="Categorized confidence level")
+    confidence_level: ConfidenceLevel = Field(default=ConfidenceLevel.LOW, description="Categorized confidence level")
     
     # Metadata
     analysis_timestamp: datetime = Field(default_factory=datetime.now)
-    analysis_version: str = Field(default="1.0.0", description="Analysis algorithm version")
+    analysis_version: str = Field(default="1.1.0", description="Analysis algorithm version")
     
     @validator('complexity_level', always=True)
     def set_complexity_level(cls, v, values):
@@ -173,6 +173,7 @@ class DevelopmentRecommendation(BaseModel):
     # Execution details
     validation_requirements: List[str] = Field(default_factory=list, description="Required validation steps")
     estimated_timeline: Optional[str] = Field(default=None, description="Estimated timeline")
+    timeline_forecast: Dict[str, float] = Field(default_factory=dict, description="Timeline percentiles in days (p50, p80, p95)")
     resource_requirements: List[str] = Field(default_factory=list, description="Required resources")
     
     # Risk and mitigation
@@ -190,7 +191,7 @@ class DevelopmentRecommendation(BaseModel):
     
     # Metadata
     recommendation_timestamp: datetime = Field(default_factory=datetime.now)
-    recommender_version: str = Field(default="1.0.0", description="Recommendation engine version")
+    recommender_version: str = Field(default="1.1.0", description="Recommendation engine version")
     
     def get_summary(self) -> Dict[str, Any]:
         """Get recommendation summary for display."""
@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Distribution Monitoring
+
+Distributions of complexity_score, uncertainty_level and analysis_confidence
+per recommended execution mode, kept as KLL quantile sketches plus exact
+counters per fixed time window, instead of storing the analyses themselves.
+Recording an analysis is a constant-time sketch update in memory; each process
+periodically folds what it recorded into the window's file under the file's
+lock on a background thread, and once more when the interpreter exits, so
+windows hold the merged view of every worker process.
+
+Drift is measured per mode and metric as the Kolmogorov-Smirnov distance
+between the current window and the windows before it, and as the total
+variation distance between their shares of recommended modes.
+"""
+
+import json
+import time
+import atexit
+import weakref
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+
+from .models import ExecutionMode, ComplexityAnalysis
+from .sketch import DEFAULT_SKETCH_K, KLLSketch, ks_distance
+from ..storage import update_json
+
+logger = structlog.get_logger(__name__)
+
+
+# Directory of per-window distribution files
+DISTRIBUTION_PATH = Path.home() / ".aid_genesis" / "distributions"
+
+# Version of the window file layout
+DISTRIBUTION_FORMAT_VERSION = 1
+
+# ComplexityAnalysis fields whose distributions are sketched
+MONITORED_METRICS = ("complexity_score", "uncertainty_level", "analysis_confidence")
+
+# ComplexityAnalysis category fields counted per mode
+COUNTED_LEVELS = ("complexity_level", "confidence_level")
+
+# Length of a window in seconds (windows align to the Unix epoch, i.e. UTC days)
+DEFAULT_WINDOW_SECONDS = 86400
+
+# Seconds between folds of recorded analyses into the window files
+DEFAULT_FLUSH_SECONDS = 60
+
+# Windows before the current one that form the drift baseline
+DEFAULT_BASELINE_WINDOWS = 7
+
+# Monitors flushed when the interpreter exits
+_live_monitors: "weakref.WeakSet[DistributionMonitor]" = weakref.WeakSet()
+
+# Kolmogorov-Smirnov distance (and total variation distance of mode shares) that raises an alert
+DRIFT_THRESHOLD = 0.2
+
+# Analyses the current window and the baseline each need before they are compared
+MIN_DRIFT_SAMPLES = 100
+
+# Quantiles reported per metric
+SUMMARY_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def window_start(timestamp: float, window_seconds: int = DEFAULT_WINDOW_SECONDS) -> int:
+    """Unix time at which the window containing a timestamp starts."""
+    return int(timestamp // window_seconds) * window_seconds
+
+
+class ModeDistribution:
+    """Sketches and counters of the analyses recommended one mode."""
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K):
+        self.count = 0
+        self.levels: Dict[str, Dict[str, int]] = {level: {} for level in COUNTED_LEVELS}
+        self.sketches = {metric: KLLSketch(k) for metric in MONITORED_METRICS}
+
+    def update(self, analysis: ComplexityAnalysis):
+        self.count += 1
+        for level, counts in self.levels.items():
+            value = getattr(analysis, level).value
+            counts[value] = counts.get(value, 0) + 1
+        for metric, sketch in self.sketches.items():
+            sketch.update(getattr(analysis, metric))
+
+    def merge(self, other: "ModeDistribution"):
+        self.count += other.count
+        for level, counts in other.levels.items():
+            merged = self.levels.setdefault(level, {})
+            for value, count in counts.items():
+                merged[value] = merged.get(value, 0) + count
+        for metric, sketch in other.sketches.items():
+            if metric in self.sketches:
+                self.sketches[metric].merge(sketch)
+            else:
+                self.sketches[metric] = KLLSketch.from_dict(sketch.to_dict())
+
+    def summary(self, quantiles: Sequence[float] = SUMMARY_QUANTILES) -> Dict[str, Any]:
+        """Counts and per-metric quantiles, mean and extremes."""
+
+        metrics = {}
+        for metric, sketch in self.sketches.items():
+            values = dict(zip((f"p{round(q * 100):02d}" for q in quantiles), sketch.quantiles(quantiles)))
+            metrics[metric] = {**values, "mean": sketch.mean, "min": sketch.minimum, "max": sketch.maximum}
+        return {"count": self.count, "levels": self.levels, "metrics": metrics}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "levels": self.levels,
+            "sketches": {metric: sketch.to_dict() for metric, sketch in self.sketches.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ModeDistribution":
+        distribution = cls()
+        distribution.count = int(data["count"])
+        distribution.levels = {level: dict(counts) for level, counts in data["levels"].items()}
+        distribution.sketches = {metric: KLLSketch.from_dict(sketch) for metric, sketch in data["sketches"].items()}
+        return distribution
+
+
+class WindowDistribution:
+    """Mode distributions of one time window."""
+
+    def __init__(self, start: int, window_seconds: int = DEFAULT_WINDOW_SECONDS, k: int = DEFAULT_SKETCH_K):
+        self.start = start
+        self.window_seconds = window_seconds
+        self.k = k
+        self.modes: Dict[ExecutionMode, ModeDistribution] = {}
+
+    @property
+    def started_at(self) -> datetime:
+        return datetime.fromtimestamp(self.start, timezone.utc)
+
+    @property
+    def count(self) -> int:
+        return sum(distribution.count for distribution in self.modes.values())
+
+    def update(self, mode: ExecutionMode, analysis: ComplexityAnalysis):
+        distribution = self.modes.get(mode)
+        if distribution is None:
+            distribution = self.modes[mode] = ModeDistribution(self.k)
+        distribution.update(analysis)
+
+    def merge(self, other: "WindowDistribution"):
+        for mode, distribution in other.modes.items():
+            if mode in self.modes:
+                self.modes[mode].merge(distribution)
+            else:
+                self.modes[mode] = ModeDistribution.from_dict(distribution.to_dict())
+
+    def mode_shares(self) -> Dict[ExecutionMode, float]:
+        total = self.count
+        return {mode: distribution.count / total for mode, distribution in self.modes.items()} if total else {}
+
+    def summary(self, quantiles: Sequence[float] = SUMMARY_QUANTILES) -> Dict[str, Any]:
+        return {
+            "window_start": self.started_at.isoformat(),
+            "window_seconds": self.window_seconds,
+            "count": self.count,
+            "modes": {mode.value: distribution.summary(quantiles) for mode, distribution in self.modes.items()}
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": DISTRIBUTION_FORMAT_VERSION,
+            "window_start": self.start,
+            "window_seconds": self.window_seconds,
+            "modes": {mode.value: distribution.to_dict() for mode, distribution in self.modes.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], k: int = DEFAULT_SKETCH_K) -> "WindowDistribution":
+        if data.get("format_version") != DISTRIBUTION_FORMAT_VERSION:
+            raise ValueError(f"unsupported format {data.get('format_version')}")
+        window = cls(int(data["window_start"]), int(data["window_seconds"]), k)
+        window.modes = {
+            ExecutionMode(mode): ModeDistribution.from_dict(distribution)
+            for mode, distribution in data["modes"].items()
+        }
+        return window
+
+
+@dataclass(frozen=True)
+class DriftAlert:
+    """A metric (or the mode mix, metric "mode_share") whose current distribution moved away from the baseline."""
+
+    metric: str
+    mode: Optional[ExecutionMode]
+    distance: float
+    threshold: float
+    window_start: datetime
+    samples: int
+    baseline_samples: int
+    baseline_windows: int
+    median: Optional[float] = None
+    baseline_median: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "metric": self.metric,
+            "mode": self.mode.value if self.mode is not None else None,
+            "distance": round(self.distance, 4),
+            "threshold": self.threshold,
+            "window_start": self.window_start.isoformat(),
+            "samples": self.samples,
+            "baseline_samples": self.baseline_samples,
+            "baseline_windows": self.baseline_windows,
+            "median": self.median,
+            "baseline_median": self.baseline_median
+        }
+
+
+class DistributionMonitor:
+    """
+    Per-window analysis distributions shared by all processes on a host.
+
+    record() only touches memory; recorded analyses are folded into the window
+    files by flush(). Once flush_seconds have passed, record() hands a flush to
+    a background writer thread, so file locks and rewrites stay off the request
+    path; whatever is still pending is flushed when the interpreter exits. A
+    failed flush keeps the analyses for the next one.
+    """
+
+    def __init__(
+        self,
+        directory: Path = DISTRIBUTION_PATH,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        flush_seconds: float = DEFAULT_FLUSH_SECONDS,
+        k: int = DEFAULT_SKETCH_K
+    ):
+        self.logger = logger.bind(component="DistributionMonitor")
+        self.directory = Path(directory)
+        self.window_seconds = window_seconds
+        self.flush_seconds = flush_seconds
+        self.k = k
+
+        self._lock = threading.Lock()
+        self._pending: Dict[int, WindowDistribution] = {}
+        self._last_flush = time.monotonic()
+        self._recorded = 0
+        self._flushed = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="distribution-writer")
+        self._scheduled: Optional[Future] = None
+
+        _live_monitors.add(self)
+
+    def window_path(self, start: int) -> Path:
+        stamp = datetime.fromtimestamp(start, timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        return self.directory / f"window-{self.window_seconds}-{stamp}.json"
+
+    def record(self, mode: ExecutionMode, analysis: ComplexityAnalysis, timestamp: Optional[float] = None):
+        """Add one recommended analysis to the window containing timestamp (default now)."""
+
+        start = window_start(time.time() if timestamp is None else timestamp, self.window_seconds)
+        with self._lock:
+            window = self._pending.get(start)
+            if window is None:
+                window = self._pending[start] = WindowDistribution(start, self.window_seconds, self.k)
+            window.update(mode, analysis)
+            self._recorded += 1
+            due = time.monotonic() - self._last_flush >= self.flush_seconds
+            if due and self._scheduled is not None and not self._scheduled.done():
+                due = False
+            if due:
+                self._last_flush = time.monotonic()
+
+        if due:
+            try:
+                self._scheduled = self._executor.submit(self.flush)
+            except RuntimeError:
+                # Interpreter shutdown has begun; the exit hook flushes instead
+                pass
+
+    def flush(self) -> int:
+        """Fold recorded analyses into their window files; returns how many were written."""
+
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        written = 0
+        failed: Dict[int, WindowDistribution] = {}
+        for start, window in pending.items():
+            try:
+                update_json(self.window_path(start), lambda saved: self._merged(saved, window).to_dict())
+                written += window.count
+            except Exception as e:
+                self.logger.warning("Failed to flush analysis distributions", window_start=start, error=str(e))
+                failed[start] = window
+
+        with self._lock:
+            self._flushed += written
+            # Keep unwritten analyses, including any recorded meanwhile, for the next flush
+            for start, window in failed.items():
+                recorded = self._pending.get(start)
+                if recorded is not None:
+                    window.merge(recorded)
+                self._pending[start] = window
+        return written
+
+    def _merged(self, saved: Optional[Dict[str, Any]], window: WindowDistribution) -> WindowDistribution:
+        """A window file's content with window folded in; unreadable content starts over."""
+
+        merged = WindowDistribution(window.start, window.window_seconds, self.k)
+        if saved is not None:
+            try:
+                merged = WindowDistribution.from_dict(saved, self.k)
+            except Exception as e:
+                self.logger.warning("Replacing unreadable distribution window", window_start=window.start, error=str(e))
+        merged.merge(window)
+        return merged
+
+    def load_window(self, start: int) -> WindowDistribution:
+        """A window as saved by every process plus what this process has not flushed yet."""
+
+        path = self.window_path(start)
+        window = WindowDistribution(start, self.window_seconds, self.k)
+        if path.exists():
+            try:
+                with open(path, 'r') as f:
+                    window = WindowDistribution.from_dict(json.load(f), self.k)
+            except Exception as e:
+                self.logger.warning("Failed to load distribution window", path=str(path), error=str(e))
+
+        with self._lock:
+            pending = self._pending.get(start)
+            if pending is not None:
+                window.merge(pending)
+        return window
+
+    def recent_windows(self, count: int, now: Optional[float] = None) -> List[WindowDistribution]:
+        """The count windows up to and including the current one, oldest first (empty ones included)."""
+
+        current = window_start(time.time() if now is None else now, self.window_seconds)
+        return [
+            self.load_window(current - offset * self.window_seconds)
+            for offset in reversed(range(count))
+        ]
+
+    def summary(self, windows: int = 1, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Dashboard view of recent windows: per-mode counts and metric quantiles."""
+        return [window.summary() for window in self.recent_windows(windows, now)]
+
+    def check_drift(
+        self,
+        baseline_windows: int = DEFAULT_BASELINE_WINDOWS,
+        threshold: float = DRIFT_THRESHOLD,
+        min_samples: int = MIN_DRIFT_SAMPLES,
+        now: Optional[float] = None
+    ) -> List[DriftAlert]:
+        """Compare the current window with the merged windows before it and log an alert per drifted metric."""
+
+        *previous, current = self.recent_windows(baseline_windows + 1, now)
+        baseline = WindowDistribution(current.start, self.window_seconds, self.k)
+        for window in previous:
+            baseline.merge(window)
+
+        alerts = []
+        if current.count >= min_samples and baseline.count >= min_samples:
+            current_shares = current.mode_shares()
+            baseline_shares = baseline.mode_shares()
+            share_distance = 0.5 * sum(
+                abs(current_shares.get(mode, 0.0) - baseline_shares.get(mode, 0.0))
+                for mode in set(current_shares) | set(baseline_shares)
+            )
+            if share_distance >= threshold:
+                alerts.append(DriftAlert(
+                    metric="mode_share",
+                    mode=None,
+                    distance=share_distance,
+                    threshold=threshold,
+                    window_start=current.started_at,
+                    samples=current.count,
+                    baseline_samples=baseline.count,
+                    baseline_windows=len(previous)
+                ))
+
+        for mode, distribution in current.modes.items():
+            reference = baseline.modes.get(mode)
+            if reference is None or distribution.count < min_samples or reference.count < min_samples:
+                continue
+            for metric, sketch in distribution.sketches.items():
+                reference_sketch = reference.sketches.get(metric)
+                distance = ks_distance(sketch, reference_sketch) if reference_sketch is not None else None
+                if distance is None or distance < threshold:
+                    continue
+                alerts.append(DriftAlert(
+                    metric=metric,
+                    mode=mode,
+                    distance=distance,
+                    threshold=threshold,
+                    window_start=current.started_at,
+                    samples=distribution.count,
+                    baseline_samples=reference.count,
+                    baseline_windows=len(previous),
+                    median=sketch.quantile(0.5),
+                    baseline_median=reference_sketch.quantile(0.5)
+                ))
+
+        for alert in alerts:
+            self.logger.warning("Distribution drift detected", **alert.to_dict())
+        return alerts
+
+    def _flush_at_exit(self):
+        self._executor.shutdown(wait=True)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = sum(window.count for window in self._pending.values())
+        return {
+            "window_seconds": self.window_seconds,
+            "recorded": self._recorded,
+            "flushed": self._flushed,
+            "pending": pending
+        }
+
+
+@atexit.register
+def _flush_live_monitors():
+    for monitor in list(_live_monitors):
+        try:
+            monitor._flush_at_exit()
+        except Exception as e:
+            logger.error("Failed to flush analysis distributions at exit", error=str(e))
+
+
+__all__ = [
+    "DISTRIBUTION_PATH",
+    "MONITORED_METRICS",
+    "DriftAlert",
+    "DistributionMonitor",
+    "ModeDistribution",
+    "WindowDistribution",
+    "window_start"
+]
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Narrative Coherence
+
+Story coherence across a whole stakeholder ecosystem. Every stakeholder story
+and the concept description become L2-normalized hashed term vectors in one
+sparse matrix, so story-to-story and story-to-concept cosine similarities are
+sparse matrix products and hundreds of stakeholders cost a single pass over
+their text. The pairwise similarity matrix is kept for downstream use.
+
+The score itself is always computed from the running sum of story vectors
+kept by NarrativeAccumulator, so documents too large to hold every story,
+which stream their stories into an accumulator, score bit for bit the same
+as documents analyzed in memory.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from ..conceptcraft.models import StakeholderStory
+
+
+# Width of hashed term vectors; collisions are negligible at story vocabulary sizes
+HASHED_TERM_FEATURES = 2 ** 18
+
+# Story fields whose text describes the value a stakeholder receives
+NARRATIVE_STORY_FIELDS = ("value_delivered", "enhanced_experience", "goals")
+
+# Coherence when there are fewer than two stories to compare
+SINGLE_STORY_COHERENCE = 5.0
+
+# Coherence when no story has any terms
+EMPTY_STORY_COHERENCE = 3.0
+
+# Stateless, so one instance serves every analysis
+_TERM_VECTORIZER = HashingVectorizer(
+    n_features=HASHED_TERM_FEATURES,
+    alternate_sign=False,
+    norm="l2",
+    dtype=np.float64
+)
+
+
+def narrative_text(story: StakeholderStory) -> str:
+    """Text of a story compared for coherence (see NARRATIVE_STORY_FIELDS)."""
+    return " ".join([story.value_delivered, story.enhanced_experience, *story.goals])
+
+
+def hashed_term_vectors(texts: Sequence[str]) -> sparse.csr_matrix:
+    """L2-normalized hashed term frequency vectors, one row per text."""
+
+    texts = list(texts)
+    if not texts:
+        return sparse.csr_matrix((0, HASHED_TERM_FEATURES), dtype=np.float64)
+    return _TERM_VECTORIZER.transform(texts)
+
+
+def _coherence_score(story_coherence: float, concept_alignment: float) -> float:
+    """Average of story-to-story and story-to-concept similarity, scaled to 0-10."""
+    return min(max((story_coherence + concept_alignment) / 2.0 * 10.0, 0.0), 10.0)
+
+
+@dataclass(frozen=True)
+class NarrativeCoherence:
+    """
+    Story similarity structure of a concept.
+
+    story_similarity is the sparse (N, N) cosine similarity of the stakeholder
+    stories in stakeholder_names order; concept_similarity holds each story's
+    similarity to the concept description. score is the 0-10 coherence the
+    complexity analysis reports.
+    """
+
+    stakeholder_names: Tuple[str, ...]
+    story_similarity: sparse.csr_matrix
+    concept_similarity: np.ndarray
+    story_coherence: float
+    concept_alignment: float
+    score: float
+
+    def similarities_of(self, stakeholder_name: str) -> Dict[str, float]:
+        """Similarity of one stakeholder's story to every other story."""
+
+        row = self.stakeholder_names.index(stakeholder_name)
+        similarities = self.story_similarity.getrow(row).toarray().ravel()
+        return {
+            name: float(similarities[column])
+            for column, name in enumerate(self.stakeholder_names)
+            if column != row
+        }
+
+
+def analyze_narrative_coherence(
+    stakeholder_names: Sequence[str],
+    story_texts: Sequence[str],
+    concept_text: str
+) -> NarrativeCoherence:
+    """
+    Pairwise and story-to-concept similarity of stakeholder stories.
+
+    The score averages the mean pairwise story similarity (how consistent the
+    stories are with each other) and the mean story-to-concept similarity (how
+    well they reflect the concept), scaled to 0-10.
+    """
+
+    vectors = hashed_term_vectors(story_texts)
+    concept = hashed_term_vectors([concept_text])
+
+    story_similarity = (vectors @ vectors.T).tocsr()
+    concept_similarity = (vectors @ concept.T).toarray().ravel()
+
+    # Scored like a stream of the same stories, so both paths agree exactly
+    accumulator = NarrativeAccumulator()
+    accumulator.add_vectors(vectors)
+    story_coherence, concept_alignment, score = accumulator.coherence(concept)
+
+    return NarrativeCoherence(
+        stakeholder_names=tuple(stakeholder_names),
+        story_similarity=story_similarity,
+        concept_similarity=concept_similarity,
+        story_coherence=story_coherence,
+        concept_alignment=concept_alignment,
+        score=score
+    )
+
+
+class NarrativeAccumulator:
+    """
+    Narrative coherence score of a stream of stories without keeping them.
+
+    Story vectors are L2-normalized, so the sum of all off-diagonal pairwise
+    similarities is the squared norm of the summed vectors minus the number of
+    stories with terms, and the summed story-to-concept similarity is the
+    summed vector's product with the concept vector. Only that sum is kept.
+    """
+
+    def __init__(self):
+        self.story_count = 0
+        self.term_story_count = 0
+        self._vector_sum: Optional[np.ndarray] = None
+
+    def add(self, text: str):
+        self.add_vectors(hashed_term_vectors([text]))
+
+    def add_vectors(self, vectors: sparse.csr_matrix):
+        """Add stories already converted by hashed_term_vectors(), one per row."""
+
+        for row in range(vectors.shape[0]):
+            start, end = vectors.indptr[row], vectors.indptr[row + 1]
+            self.story_count += 1
+            if end > start:
+                if self._vector_sum is None:
+                    self._vector_sum = np.zeros(HASHED_TERM_FEATURES, dtype=np.float64)
+                self._vector_sum[vectors.indices[start:end]] += vectors.data[start:end]
+                self.term_story_count += 1
+
+    def coherence(self, concept: sparse.csr_matrix) -> Tuple[float, float, float]:
+        """Story coherence, concept alignment and score against a hashed concept vector."""
+
+        concept_alignment = 0.0
+        if self._vector_sum is not None:
+            concept_alignment = float(self._vector_sum[concept.indices] @ concept.data) / self.story_count
+
+        if self.story_count < 2:
+            return 0.0, concept_alignment, SINGLE_STORY_COHERENCE
+        if not self.term_story_count:
+            return 0.0, concept_alignment, EMPTY_STORY_COHERENCE
+
+        off_diagonal = float(self._vector_sum @ self._vector_sum) - self.term_story_count
+        story_coherence = off_diagonal / (self.story_count * (self.story_count - 1))
+        return story_coherence, concept_alignment, _coherence_score(story_coherence, concept_alignment)
+
+    def score(self, concept_text: str) -> float:
+        """Coherence score analyze_narrative_coherence() reports for the same stories."""
+        return self.coherence(hashed_term_vectors([concept_text]))[2]
+
+
+__all__ = [
+    "HASHED_TERM_FEATURES",
+    "NarrativeAccumulator",
+    "NarrativeCoherence",
+    "analyze_narrative_coherence",
+    "hashed_term_vectors",
+    "narrative_text"
+]
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Pattern Index
+
+Indexed retrieval of cross-project patterns. Each execution mode keeps an
+interval tree over pattern complexity ranges, pattern attributes are kept as
+bitsets for cheap filtering, and the most successful matches are selected with
+a bounded heap instead of sorting every match.
+"""
+
+import heapq
+import random
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import structlog
+
+from .models import ExecutionMode, CrossProjectPattern
+
+logger = structlog.get_logger(__name__)
+
+
+class _IntervalNode:
+    """Treap node keyed by (low, slot) and augmented with the subtree maximum high."""
+
+    __slots__ = ("low", "high", "slot", "priority", "max_high", "left", "right")
+
+    def __init__(self, low: float, high: float, slot: int, priority: float):
+        self.low = low
+        self.high = high
+        self.slot = slot
+        self.priority = priority
+        self.max_high = high
+        self.left: Optional["_IntervalNode"] = None
+        self.right: Optional["_IntervalNode"] = None
+
+    def update(self):
+        max_high = self.high
+        if self.left is not None and self.left.max_high > max_high:
+            max_high = self.left.max_high
+        if self.right is not None and self.right.max_high > max_high:
+            max_high = self.right.max_high
+        self.max_high = max_high
+
+
+class IntervalTree:
+    """
+    Dynamic interval tree supporting insertion, deletion and stabbing queries.
+
+    Intervals are closed ([low, high]) and identified by an integer slot. A
+    randomized treap keeps the tree balanced under incremental updates, so a
+    stabbing query costs O(log n + matches).
+    """
+
+    def __init__(self, seed: int = 0):
+        self._root: Optional[_IntervalNode] = None
+        self._random = random.Random(seed)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def insert(self, low: float, high: float, slot: int):
+        """Insert interval [low, high] for slot."""
+        self._root = self._insert(self._root, _IntervalNode(low, high, slot, self._random.random()))
+        self._size += 1
+
+    def remove(self, low: float, slot: int) -> bool:
+        """Remove the interval starting at low for slot; returns whether it existed."""
+        size = self._size
+        self._root = self._remove(self._root, (low, slot))
+        return self._size < size
+
+    def stab(self, point: float) -> List[int]:
+        """Return slots of all intervals containing point."""
+
+        slots: List[int] = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is None or node.max_high < point:
+                continue
+            stack.append(node.left)
+            if node.low <= point:
+                if point <= node.high:
+                    slots.append(node.slot)
+                # Right subtree starts at or after node.low
+                stack.append(node.right)
+        return slots
+
+    def _insert(self, node: Optional[_IntervalNode], new: _IntervalNode) -> _IntervalNode:
+        if node is None:
+            return new
+        if (new.low, new.slot) < (node.low, node.slot):
+            node.left = self._insert(node.left, new)
+            if node.left.priority > node.priority:
+                node = self._rotate_right(node)
+        else:
+            node.right = self._insert(node.right, new)
+            if node.right.priority > node.priority:
+                node = self._rotate_left(node)
+        node.update()
+        return node
+
+    def _remove(self, node: Optional[_IntervalNode], key) -> Optional[_IntervalNode]:
+        if node is None:
+            return None
+        node_key = (node.low, node.slot)
+        if key < node_key:
+            node.left = self._remove(node.left, key)
+        elif key > node_key:
+            node.right = self._remove(node.right, key)
+        else:
+            if node.left is None:
+                self._size -= 1
+                return node.right
+            if node.right is None:
+                self._size -= 1
+                return node.left
+            # Rotate the higher priority child up and continue below it
+            if node.left.priority > node.right.priority:
+                node = self._rotate_right(node)
+                node.right = self._remove(node.right, key)
+            else:
+                node = self._rotate_left(node)
+                node.left = self._remove(node.left, key)
+        node.update()
+        return node
+
+    @staticmethod
+    def _rotate_right(node: _IntervalNode) -> _IntervalNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        node.update()
+        pivot.update()
+        return pivot
+
+    @staticmethod
+    def _rotate_left(node: _IntervalNode) -> _IntervalNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        node.update()
+        pivot.update()
+        return pivot
+
+
+def _bits_to_mask(bits: int, size: int) -> np.ndarray:
+    """Expand an integer bitset into a boolean array of the given length."""
+    packed = np.frombuffer(bits.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder="little")[:size].astype(bool)
+
+
+class PatternIndex:
+    """
+    Incrementally maintained index over cross-project patterns.
+
+    Patterns occupy stable slots in insertion order; re-adding a pattern with
+    the same pattern_id replaces it in place. Queries return the same patterns,
+    in the same order, as a linear scan followed by a stable sort on
+    success_rate.
+    """
+
+    def __init__(self, patterns: Iterable[CrossProjectPattern] = ()):
+        self.logger = logger.bind(component="PatternIndex")
+
+        self._patterns: List[Optional[CrossProjectPattern]] = []
+        self._slots: Dict[str, int] = {}
+        self._success_rates: List[float] = []
+        # Indexed attributes per slot, kept so later edits to a pattern cannot desync removal
+        self._entries: List[Optional[Tuple]] = []
+
+        self._trees: Dict[ExecutionMode, IntervalTree] = {mode: IntervalTree(seed=index) for index, mode in enumerate(ExecutionMode)}
+
+        # Attribute bitsets: bit n is set when the pattern in slot n has the attribute
+        self._live = 0
+        self._untyped = 0
+        self._stakeholder_types: Dict[str, int] = {}
+        self._required_conditions: Dict[str, int] = {}
+        self._contraindications: Dict[str, int] = {}
+
+        for pattern in patterns:
+            self.add(pattern)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, pattern_id: str) -> bool:
+        return pattern_id in self._slots
+
+    def add(self, pattern: CrossProjectPattern) -> bool:
+        """
+        Add or replace a pattern.
+
+        Returns False when the pattern cannot be indexed (malformed complexity
+        range); such patterns never match a complexity score.
+        """
+
+        complexity_range = pattern.complexity_range
+        if len(complexity_range) < 2 or complexity_range[0] != complexity_range[0] or complexity_range[1] != complexity_range[1]:
+            self.logger.warning("Skipping pattern with invalid complexity range", pattern_id=pattern.pattern_id)
+            self.remove(pattern.pattern_id)
+            return False
+
+        slot = self._slots.get(pattern.pattern_id)
+        if slot is None:
+            slot = len(self._patterns)
+            self._patterns.append(None)
+            self._success_rates.append(0.0)
+            self._entries.append(None)
+            self._slots[pattern.pattern_id] = slot
+        else:
+            self._unlink(slot)
+
+        low, high = complexity_range[0], complexity_range[1]
+        modes = tuple(dict.fromkeys(pattern.applicable_modes))
+        for mode in modes:
+            self._trees[mode].insert(low, high, slot)
+
+        bit = 1 << slot
+        self._live |= bit
+        if not pattern.stakeholder_types:
+            self._untyped |= bit
+        for stakeholder_type in pattern.stakeholder_types:
+            self._stakeholder_types[stakeholder_type] = self._stakeholder_types.get(stakeholder_type, 0) | bit
+        for condition in pattern.required_conditions:
+            self._required_conditions[condition] = self._required_conditions.get(condition, 0) | bit
+        for contraindication in pattern.contraindications:
+            self._contraindications[contraindication] = self._contraindications.get(contraindication, 0) | bit
+
+        self._patterns[slot] = pattern
+        self._success_rates[slot] = pattern.success_rate
+        self._entries[slot] = (
+            low,
+            modes,
+            tuple(pattern.stakeholder_types),
+            tuple(pattern.required_conditions),
+            tuple(pattern.contraindications)
+        )
+        return True
+
+    def remove(self, pattern_id: str) -> bool:
+        """Remove a pattern; returns whether it was indexed."""
+
+        slot = self._slots.pop(pattern_id, None)
+        if slot is None:
+            return False
+        self._unlink(slot)
+        self._patterns[slot] = None
+        self._entries[slot] = None
+        return True
+
+    def query(
+        self,
+        complexity_score: float,
+        mode: ExecutionMode,
+        k: int = 3,
+        stakeholder_types: Optional[Iterable[str]] = None,
+        satisfied_conditions: Optional[Iterable[str]] = None,
+        present_contraindications: Optional[Iterable[str]] = None
+    ) -> List[CrossProjectPattern]:
+        """
+        Return the k most successful patterns for a complexity score and mode.
+
+        Args:
+            complexity_score: Score that must lie within the pattern complexity range
+            mode: Execution mode the pattern must apply to
+            k: Number of patterns to return
+            stakeholder_types: If given, keep patterns for any of these types or for no specific type
+            satisfied_conditions: If given, drop patterns requiring any other condition
+            present_contraindications: Drop patterns with any of these contraindications
+        """
+
+        slots = self._trees[mode].stab(complexity_score)
+        if not slots:
+            return []
+
+        keep = self._filter_bits(stakeholder_types, satisfied_conditions, present_contraindications)
+        if keep is not None:
+            mask = _bits_to_mask(keep, len(self._patterns))
+            slots = [slot for slot in slots if mask[slot]]
+
+        success_rates = self._success_rates
+        # Ties keep insertion order, like a stable descending sort
+        top_slots = heapq.nlargest(k, slots, key=lambda slot: (success_rates[slot], -slot))
+        return [self._patterns[slot] for slot in top_slots]
+
+    def stats(self) -> Dict[str, int]:
+        """Index sizes for health checks."""
+        return {
+            "patterns": len(self._slots),
+            "indexed_intervals": sum(len(tree) for tree in self._trees.values()),
+            "stakeholder_types": len(self._stakeholder_types),
+            "required_conditions": len(self._required_conditions),
+            "contraindications": len(self._contraindications)
+        }
+
+    def _filter_bits(
+        self,
+        stakeholder_types: Optional[Iterable[str]],
+        satisfied_conditions: Optional[Iterable[str]],
+        present_contraindications: Optional[Iterable[str]]
+    ) -> Optional[int]:
+        """Bitset of slots passing the attribute filters, or None without filters."""
+
+        if stakeholder_types is None and satisfied_conditions is None and not present_contraindications:
+            return None
+
+        keep = self._live
+
+        if stakeholder_types is not None:
+            allowed = self._untyped
+            for stakeholder_type in stakeholder_types:
+                allowed |= self._stakeholder_types.get(stakeholder_type, 0)
+            keep &= allowed
+
+        if satisfied_conditions is not None:
+            satisfied: Set[str] = set(satisfied_conditions)
+            for condition, bits in self._required_conditions.items():
+                if condition not in satisfied:
+                    keep &= ~bits
+
+        for contraindication in present_contraindications or ():
+            keep &= ~self._contraindications.get(contraindication, 0)
+
+        return keep
+
+    def _unlink(self, slot: int):
+        """Remove a slot's pattern from the trees and bitsets."""
+
+        entry = self._entries[slot]
+        if entry is None:
+            return
+
+        low, modes, stakeholder_types, required_conditions, contraindications = entry
+        for mode in modes:
+            self._trees[mode].remove(low, slot)
+
+        clear = ~(1 << slot)
+        self._live &= clear
+        self._untyped &= clear
+        for bitsets, values in (
+            (self._stakeholder_types, stakeholder_types),
+            (self._required_conditions, required_conditions),
+            (self._contraindications, contraindications)
+        ):
+            for value in values:
+                bits = bitsets.get(value, 0) & clear
+                if bits:
+                    bitsets[value] = bits
+                else:
+                    bitsets.pop(value, None)
+
+
+__all__ = [
+    "IntervalTree",
+    "PatternIndex"
+]
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Decision Persister
+
+Write-behind persistence for adaptive decisions. Request handlers enqueue
+decisions on a bounded asyncio queue and return; a background writer drains the
+queue in batches onto a dedicated thread, appends each batch to the decision
+log and fsyncs once enough records or enough time have accumulated. A full
+queue makes submitters wait (backpressure), and queued decisions are written
+and synced when the writer is closed, cancelled at event loop shutdown, or the
+interpreter exits. A batch the log rejects is kept and written again ahead of
+newer decisions; flush() raises while any decision remains unwritten.
+"""
+
+import time
+import atexit
+import asyncio
+import weakref
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import structlog
+
+from .models import AdaptiveDecision
+from .decision_log import DecisionLog
+
+logger = structlog.get_logger(__name__)
+
+
+# Decisions that may wait for the writer before submit() blocks
+DEFAULT_QUEUE_SIZE = 1024
+
+# Largest batch written at once; also the unsynced record count that forces an fsync
+DEFAULT_SYNC_RECORDS = 256
+
+# Longest time in seconds a written record stays unsynced
+DEFAULT_SYNC_INTERVAL = 0.5
+
+# Persisters flushed when the interpreter exits
+_live_persisters: "weakref.WeakSet[DecisionPersister]" = weakref.WeakSet()
+
+
+class DecisionPersister:
+    """
+    Bounded write-behind queue in front of a DecisionLog.
+
+    All log writes and fsyncs run on one writer thread, so decisions reach the
+    log in submission order and disk latency never blocks the event loop. The
+    queue is bound to the event loop that first submits to it; when a later
+    submission comes from a different loop, leftovers of the previous one are
+    written first.
+    """
+
+    def __init__(
+        self,
+        decision_log: Callable[[], DecisionLog],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        sync_records: int = DEFAULT_SYNC_RECORDS,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL
+    ):
+        self._decision_log = decision_log
+        self.queue_size = queue_size
+        self.sync_records = sync_records
+        self.sync_interval = sync_interval
+        self.logger = logger.bind(component="DecisionPersister")
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._sync_timer: Optional[asyncio.TimerHandle] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="decision-writer")
+
+        # Writer thread state
+        self._state_lock = threading.Lock()
+        self._unsynced = 0
+        self._unsynced_since: Optional[float] = None
+        # Decisions of failed writes, retried ahead of the next batch
+        self._failed: List[AdaptiveDecision] = []
+        self._last_error: Optional[Exception] = None
+
+        self.submitted = 0
+        self.written = 0
+        self.syncs = 0
+        self.batches = 0
+        self.backpressure_waits = 0
+        self.write_errors = 0
+
+        _live_persisters.add(self)
+
+    @property
+    def pending(self) -> int:
+        """Decisions queued but not yet handed to the writer."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def unwritten(self) -> int:
+        """Decisions whose write failed, waiting to be written again."""
+        return len(self._failed)
+
+    async def submit(self, decision: AdaptiveDecision):
+        """Queue a decision for writing; waits while the queue is full."""
+
+        queue = self._ensure_writer()
+        if queue.full():
+            self.backpressure_waits += 1
+        await queue.put(decision)
+        self.submitted += 1
+
+    async def flush(self):
+        """
+        Wait until every submitted decision is written and synced.
+
+        Raises:
+            RuntimeError: If decisions are still unwritten or unsynced after
+                retrying; they stay queued for the next attempt
+        """
+
+        if self._queue is not None:
+            if self._loop is asyncio.get_running_loop():
+                await self._queue.join()
+            else:
+                self._drain(self._queue)
+        await asyncio.wrap_future(self._executor.submit(self._retry))
+        if self._failed or self._unsynced:
+            raise RuntimeError(
+                f"{len(self._failed)} decisions unwritten and {self._unsynced} unsynced in the decision log"
+            ) from self._last_error
+
+    async def close(self):
+        """Flush and stop the background writer; a later submit() restarts it."""
+
+        try:
+            await self.flush()
+        finally:
+            task = self._task
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "submitted": self.submitted,
+            "written": self.written,
+            "unsynced": self._unsynced,
+            "unwritten": len(self._failed),
+            "batches": self.batches,
+            "syncs": self.syncs,
+            "backpressure_waits": self.backpressure_waits,
+            "write_errors": self.write_errors
+        }
+
+    def _ensure_writer(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop and self._task is not None and not self._task.done():
+            return self._queue
+
+        if self._queue is not None and self._loop is not loop:
+            # The previous event loop ended without closing the writer
+            self._drain(self._queue)
+            self._queue = None
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.queue_size)
+            self._loop = loop
+        self._task = loop.create_task(self._run(self._queue), name="decision-persister")
+        return self._queue
+
+    async def _run(self, queue: asyncio.Queue):
+        """Background writer: batch queued decisions onto the writer thread."""
+
+        try:
+            while True:
+                batch = [await queue.get()]
+                while len(batch) < self.sync_records and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                try:
+                    # Shielded so cancellation never drops a batch handed to the writer thread
+                    await asyncio.shield(asyncio.wrap_future(self._executor.submit(self._write, batch)))
+                finally:
+                    for _ in batch:
+                        queue.task_done()
+                self._schedule_sync()
+        except asyncio.CancelledError:
+            # Event loop shutdown cancels the writer; nothing queued may be lost
+            self._drain(queue)
+            raise
+
+    def _schedule_sync(self):
+        """Arm a timer that syncs written records once the sync interval elapses."""
+
+        if self._unsynced == 0 or (self._sync_timer is not None and not self._sync_timer.cancelled()):
+            return
+        self._sync_timer = self._loop.call_later(self.sync_interval, self._sync_due)
+
+    def _sync_due(self):
+        self._sync_timer = None
+        self._executor.submit(self._sync)
+
+    def _drain(self, queue: asyncio.Queue, on_writer_thread: bool = True):
+        """
+        Synchronously write and sync everything left in a queue.
+
+        At interpreter exit the writer thread has already been joined, so the
+        caller's thread writes instead.
+        """
+
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+
+        remaining: List[AdaptiveDecision] = []
+        while not queue.empty():
+            remaining.append(queue.get_nowait())
+            queue.task_done()
+
+        if not on_writer_thread:
+            self._write(remaining)
+            self._sync()
+        else:
+            # Queued behind any batch still being written, which keeps submission order
+            self._executor.submit(self._write, remaining).result()
+            self._executor.submit(self._sync).result()
+        if remaining:
+            self.logger.info("Decision queue drained", decisions=len(remaining))
+
+    def _write(self, batch: List[AdaptiveDecision]):
+        """
+        Append a batch to the log (writer thread), syncing on the size or time threshold.
+
+        Decisions of an earlier failed write go first; if this write fails too,
+        all of them are kept for the next one.
+        """
+
+        batch = self._failed + batch
+        if not batch:
+            return
+
+        try:
+            self._decision_log().append_batch(batch)
+        except Exception as e:
+            self.write_errors += 1
+            self._failed = batch
+            self._last_error = e
+            self.logger.error("Failed to write decisions, keeping them for retry", decisions=len(batch), error=str(e))
+            return
+        self._failed = []
+
+        with self._state_lock:
+            self.written += len(batch)
+            self.batches += 1
+            if self._unsynced_since is None:
+                self._unsynced_since = time.monotonic()
+            self._unsynced += len(batch)
+            due = (
+                self._unsynced >= self.sync_records
+                or time.monotonic() - self._unsynced_since >= self.sync_interval
+            )
+        if due:
+            self._sync()
+
+    def _sync(self):
+        """fsync written records (writer thread)."""
+
+        with self._state_lock:
+            if not self._unsynced:
+                return
+            records = self._unsynced
+            self._unsynced = 0
+            self._unsynced_since = None
+
+        try:
+            self._decision_log().sync()
+            self.syncs += 1
+        except Exception as e:
+            self.write_errors += 1
+            self._last_error = e
+            self.logger.error("Failed to sync decisions", decisions=records, error=str(e))
+            # Synced by the next attempt
+            with self._state_lock:
+                self._unsynced += records
+                if self._unsynced_since is None:
+                    self._unsynced_since = time.monotonic()
+
+    def _retry(self):
+        """Write failed decisions again and sync (writer thread)."""
+        self._write([])
+        self._sync()
+
+    def _flush_at_exit(self):
+        self._executor.shutdown(wait=True)
+        if self._queue is not None:
+            self._drain(self._queue, on_writer_thread=False)
+        else:
+            self._retry()
+        if self._failed:
+            self.logger.error("Decisions lost at exit", decisions=len(self._failed), error=str(self._last_error))
+
+
+@atexit.register
+def _flush_live_persisters():
+    for persister in list(_live_persisters):
+        try:
+            persister._flush_at_exit()
+        except Exception as e:
+            logger.error("Failed to flush decisions at exit", error=str(e))
+
+
+__all__ = [
+    "DEFAULT_QUEUE_SIZE",
+    "DEFAULT_SYNC_INTERVAL",
+    "DEFAULT_SYNC_RECORDS",
+    "DecisionPersister"
+]
@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Compiled Mode Policy
+
+Lookup tables of execution mode scores compiled from the mode scoring rules.
+Every rule compares one field against a constant, so a field only matters
+through the cell of its value between those constants: numeric fields split at
+each threshold (below, exactly at, between, above), categorical fields into
+each compared literal plus everything else. Scoring one representative value
+per cell is therefore exact for every input, not an approximation.
+
+Each mode's score depends on a handful of fields, so the table holds one dense
+grid per mode (tens of thousands of cells in all) rather than a joint grid over
+every field, which would run to over a hundred million. A lookup places each
+field in its cell once, then reads four scores. Tables are saved as a .npy
+array, which worker processes memory-map read-only and so share through the
+page cache, next to a JSON layout. Both are named by a fingerprint of the
+rules, so tables compiled for other thresholds are never mistaken for the
+current ones.
+"""
+
+import io
+import json
+import hashlib
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from operator import attrgetter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .models import ExecutionMode, ComplexityAnalysis, UserPreferences, ProjectContext
+from .scoring import (
+    CONDITION_SOURCES,
+    MODE_ORDER,
+    MODE_SCORING_RULES,
+    CompiledModeScoring,
+    ModeScoringTable
+)
+from ..storage import atomic_write_bytes, atomic_write_json
+
+logger = structlog.get_logger(__name__)
+
+
+# Directory of compiled mode policy tables, one per rule fingerprint
+MODE_POLICY_PATH = Path.home() / ".aid_genesis" / "mode_policy"
+
+# Version of the table layout
+MODE_POLICY_FORMAT_VERSION = 1
+
+# Scorer of one mode given (analysis, preferences, context), e.g. the engine's _score_*_mode methods
+ModeScorer = Callable[[ComplexityAnalysis, UserPreferences, ProjectContext], float]
+
+
+@dataclass(frozen=True)
+class FieldAxis:
+    """
+    Cells of one rule input field.
+
+    A numeric field with breakpoints b0 < b1 < ... has cell 2i + 1 for exactly
+    bi and cell 2i for the open interval below bi (above the previous one), the
+    last cell being everything above the highest breakpoint. A categorical
+    field has one cell per literal and a final cell for any other value.
+    """
+
+    field: str
+    breakpoints: Tuple[Any, ...] = ()
+    literals: Tuple[Any, ...] = ()
+
+    @property
+    def source(self) -> str:
+        return self.field.partition(".")[0]
+
+    @property
+    def attribute(self) -> str:
+        return self.field.partition(".")[2]
+
+    @property
+    def size(self) -> int:
+        if self.literals:
+            return len(self.literals) + 1
+        return 2 * len(self.breakpoints) + 1
+
+    def cell(self, value: Any) -> Optional[int]:
+        """Cell of a value, or None for NaN (which no threshold comparison holds for)."""
+
+        if self.literals:
+            for index, literal in enumerate(self.literals):
+                if value == literal:
+                    return index
+            return len(self.literals)
+
+        if value != value:
+            return None
+        # Both bisections give i strictly between breakpoints; exactly at bi they give i and i + 1
+        return bisect_left(self.breakpoints, value) + bisect_right(self.breakpoints, value)
+
+    def representatives(self) -> List[Any]:
+        """One value inside each cell, in cell order."""
+
+        if self.literals:
+            if all(isinstance(literal, bool) for literal in self.literals):
+                other = not self.literals[0]
+            else:
+                # Longer than every literal, so equal to none of them
+                other = "".join(map(str, self.literals)) + "*"
+            return list(self.literals) + [other]
+
+        values = []
+        previous = self.breakpoints[0] - 1
+        for breakpoint in self.breakpoints:
+            values.append((previous + breakpoint) / 2 if values else previous)
+            values.append(breakpoint)
+            previous = breakpoint
+        values.append(previous + 1)
+        return values
+
+    def to_dict(self) -> Dict[str, Any]:
+        if self.literals:
+            return {"field": self.field, "literals": list(self.literals)}
+        return {"field": self.field, "breakpoints": list(self.breakpoints)}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FieldAxis":
+        return cls(
+            field=data["field"],
+            breakpoints=tuple(data.get("breakpoints", ())),
+            literals=tuple(data.get("literals", ()))
+        )
+
+
+def mode_fields(table: ModeScoringTable) -> Tuple[str, ...]:
+    """Fields one mode's rules read, in name order."""
+    return tuple(sorted({condition.field for rule in table.rules for condition in rule.any_of}))
+
+
+def policy_axes(tables: Mapping[ExecutionMode, ModeScoringTable] = MODE_SCORING_RULES) -> Tuple[FieldAxis, ...]:
+    """
+    Axes of every field the rules read, in name order.
+
+    A field's breakpoints are those of all modes together, so each field is
+    placed in its cell once per lookup and every mode's grid indexes by it.
+    """
+
+    constants: Dict[str, List[Any]] = {}
+    operators: Dict[str, set] = {}
+    for mode in MODE_ORDER:
+        for rule in tables[mode].rules:
+            for condition in rule.any_of:
+                values = condition.value if condition.op == "between" else (condition.value,)
+                constants.setdefault(condition.field, []).extend(values)
+                operators.setdefault(condition.field, set()).add(condition.op)
+
+    axes = []
+    for field in sorted(constants):
+        values = constants[field]
+        if any(isinstance(value, (str, bool)) for value in values):
+            if operators[field] != {"eq"}:
+                raise ValueError(f"Categorical field {field} can only be compared with eq")
+            axes.append(FieldAxis(field, literals=tuple(dict.fromkeys(values))))
+        else:
+            axes.append(FieldAxis(field, breakpoints=tuple(sorted(set(values)))))
+    return tuple(axes)
+
+
+def rules_fingerprint(tables: Mapping[ExecutionMode, ModeScoringTable] = MODE_SCORING_RULES) -> str:
+    """Content hash of rule tables; tables compiled from equal rules share it."""
+
+    description = repr([(mode.value, tables[mode]) for mode in MODE_ORDER])
+    return hashlib.sha256(f"{MODE_POLICY_FORMAT_VERSION}:{description}".encode("utf-8")).hexdigest()[:16]
+
+
+class ModePolicyTable:
+    """
+    Mode scores per cell of every mode's input grid.
+
+    scores is flat: each mode's grid in MODE_ORDER, row-major over the axes of
+    its fields (mode_fields order).
+    """
+
+    def __init__(
+        self,
+        fingerprint: str,
+        axes: Tuple[FieldAxis, ...],
+        fields: Mapping[ExecutionMode, Tuple[str, ...]],
+        scores: np.ndarray
+    ):
+        self.fingerprint = fingerprint
+        self.axes = tuple(sorted(axes, key=lambda axis: axis.field))
+        self.fields = {mode: tuple(fields[mode]) for mode in MODE_ORDER}
+        self.scores = scores
+
+        # Scalar lookups read through a memoryview, which indexes a memory map without numpy overhead
+        self._values = memoryview(np.ascontiguousarray(scores))
+
+        # Per source: one getter of all its fields (axes sort by field name, so a source's fields are adjacent)
+        self._getters = []
+        for source, source_axes in groupby(self.axes, key=lambda axis: axis.source):
+            attributes = [axis.attribute for axis in source_axes]
+            self._getters.append((CONDITION_SOURCES.index(source), attrgetter(*attributes), len(attributes) == 1))
+
+        # Per mode: grid offset and (axis position, stride) per field
+        positions = {axis.field: position for position, axis in enumerate(self.axes)}
+        self._grids: List[Tuple[ExecutionMode, int, Tuple[Tuple[int, int], ...]]] = []
+        offset = 0
+        for mode in MODE_ORDER:
+            mode_positions = [positions[field] for field in self.fields[mode]]
+            shape = [self.axes[position].size for position in mode_positions]
+            strides = [int(np.prod(shape[index + 1:], dtype=np.int64)) for index in range(len(shape))]
+            self._grids.append((mode, offset, tuple(zip(mode_positions, strides))))
+            offset += int(np.prod(shape, dtype=np.int64))
+
+        # A cell's additions to the four mode indexes are packed into one integer, mode i in bits
+        # [i * width, (i + 1) * width); no index reaches 2 ** width, so the fields never carry
+        width = max(offset, 1).bit_length()
+        self._shifts = tuple(width * index for index in range(len(MODE_ORDER)))
+        self._mask = (1 << width) - 1
+        self._start = sum(mode_offset << shift for (_, mode_offset, _), shift in zip(self._grids, self._shifts))
+
+        mode_strides = [dict(strides) for _, _, strides in self._grids]
+        self._steps = []
+        for position, axis in enumerate(self.axes):
+            steps = [
+                sum((strides.get(position, 0) * cell) << shift for strides, shift in zip(mode_strides, self._shifts))
+                for cell in range(axis.size)
+            ]
+            if axis.literals:
+                # Categorical: steps by literal, and the step of the other-value cell
+                self._steps.append((dict(zip(axis.literals, steps)), steps[-1], ()))
+            else:
+                self._steps.append((None, steps, axis.breakpoints))
+
+        if scores.shape != (offset,):
+            raise ValueError(f"Mode policy table has shape {scores.shape}, its layout needs ({offset},)")
+
+    @property
+    def cells(self) -> int:
+        return len(self.scores)
+
+    def mode_shape(self, mode: ExecutionMode) -> Tuple[int, ...]:
+        """Grid shape of one mode."""
+        return tuple(self.axes[position].size for position, _ in self._grids[MODE_ORDER.index(mode)][2])
+
+    def mode_scores(
+        self,
+        complexity_analysis: ComplexityAnalysis,
+        user_preferences: UserPreferences,
+        project_context: ProjectContext
+    ) -> Optional[Dict[ExecutionMode, float]]:
+        """Score of every mode in MODE_ORDER, or None if an input has no cell (NaN)."""
+
+        sources = (complexity_analysis, user_preferences, project_context)
+        values: List[Any] = []
+        for source, getter, single in self._getters:
+            if single:
+                values.append(getter(sources[source]))
+            else:
+                values.extend(getter(sources[source]))
+
+        # FieldAxis.cell, inlined, mapped straight to each mode's index contribution
+        contributions = []
+        for value, (literals, steps, breakpoints) in zip(values, self._steps):
+            if literals is not None:
+                contributions.append(literals.get(value, steps))
+            elif value != value:
+                return None
+            else:
+                contributions.append(steps[bisect_left(breakpoints, value) + bisect_right(breakpoints, value)])
+
+        packed = sum(contributions, self._start)
+        mask = self._mask
+        return dict(zip(MODE_ORDER, [self._values[(packed >> shift) & mask] for shift in self._shifts]))
+
+    def recommend(
+        self,
+        complexity_analysis: ComplexityAnalysis,
+        user_preferences: UserPreferences,
+        project_context: ProjectContext
+    ) -> Optional[Tuple[ExecutionMode, float]]:
+        """Recommended mode and its confidence score, ties resolved in MODE_ORDER like max()."""
+
+        mode_scores = self.mode_scores(complexity_analysis, user_preferences, project_context)
+        if mode_scores is None:
+            return None
+        recommended_mode = max(mode_scores, key=mode_scores.get)
+        return recommended_mode, mode_scores[recommended_mode]
+
+    def verify(self, scorers: Mapping[ExecutionMode, ModeScorer]) -> int:
+        """Score a representative of every cell with reference scorers; returns the number of disagreements."""
+
+        mismatches = 0
+        for mode, offset, strides in self._grids:
+            axes = [self.axes[position] for position, _ in strides]
+            representatives = [axis.representatives() for axis in axes]
+            for index, cells in enumerate(np.ndindex(*self.mode_shape(mode))):
+                values = {source: {} for source in CONDITION_SOURCES}
+                for axis, cell, choices in zip(axes, cells, representatives):
+                    values[axis.source][axis.attribute] = choices[cell]
+                expected = scorers[mode](*(SimpleNamespace(**values[source]) for source in CONDITION_SOURCES))
+                if expected != self._values[offset + index]:
+                    mismatches += 1
+        return mismatches
+
+    def layout(self) -> Dict[str, Any]:
+        """JSON description of the table saved next to its scores."""
+        return {
+            "format_version": MODE_POLICY_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "compiled_at": datetime.now().isoformat(),
+            "cells": self.cells,
+            "axes": [axis.to_dict() for axis in self.axes],
+            "modes": {mode.value: list(self.fields[mode]) for mode in MODE_ORDER}
+        }
+
+
+def compile_mode_policy(tables: Mapping[ExecutionMode, ModeScoringTable] = MODE_SCORING_RULES) -> ModePolicyTable:
+    """Evaluate rule tables over every cell of each mode's input grid."""
+
+    scoring = CompiledModeScoring(dict(tables))
+    axes = {axis.field: axis for axis in policy_axes(tables)}
+    fields = {mode: mode_fields(tables[mode]) for mode in MODE_ORDER}
+
+    def column(axis: FieldAxis, values: List[Any]) -> np.ndarray:
+        return np.array(values, dtype=object if axis.literals else np.float64)
+
+    # Fields another mode reads only affect its column, which is discarded, so they stay at any one value
+    fixed = {field: column(axis, axis.representatives()[0]) for field, axis in axes.items()}
+
+    grids = []
+    for mode_index, mode in enumerate(MODE_ORDER):
+        shape = tuple(axes[field].size for field in fields[mode])
+        columns = dict(fixed)
+        for position, field in enumerate(fields[mode]):
+            values = column(axes[field], axes[field].representatives())
+            columns[field] = values.reshape([-1 if dimension == position else 1 for dimension in range(len(shape))])
+        grids.append(scoring.score_columns(columns, shape)[..., mode_index].ravel())
+
+    return ModePolicyTable(rules_fingerprint(tables), tuple(axes.values()), fields, np.concatenate(grids))
+
+
+def _policy_paths(fingerprint: str, directory: Path) -> Tuple[Path, Path]:
+    base = Path(directory) / f"mode-policy-{fingerprint}"
+    return base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+def save_mode_policy(table: ModePolicyTable, directory: Path = MODE_POLICY_PATH) -> Path:
+    """Write a table's scores and layout; returns the path of the scores."""
+
+    scores_path, layout_path = _policy_paths(table.fingerprint, directory)
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(table.scores, dtype=np.float64))
+
+    # Scores first: a layout is only visible once its scores are complete
+    atomic_write_bytes(scores_path, buffer.getvalue())
+    atomic_write_json(layout_path, table.layout(), indent=2)
+
+    logger.info("Mode policy saved", fingerprint=table.fingerprint, cells=table.cells, path=str(scores_path))
+    return scores_path
+
+
+def load_mode_policy(
+    tables: Mapping[ExecutionMode, ModeScoringTable] = MODE_SCORING_RULES,
+    directory: Path = MODE_POLICY_PATH
+) -> Optional[ModePolicyTable]:
+    """Memory-map the compiled table of rule tables, or None if none was compiled."""
+
+    fingerprint = rules_fingerprint(tables)
+    scores_path, layout_path = _policy_paths(fingerprint, directory)
+    if not layout_path.exists():
+        return None
+
+    try:
+        with open(layout_path, 'r') as f:
+            layout = json.load(f)
+        if layout.get("format_version") != MODE_POLICY_FORMAT_VERSION:
+            raise ValueError(f"unsupported format {layout.get('format_version')}")
+        if layout.get("fingerprint") != fingerprint:
+            raise ValueError(f"layout is for rules {layout.get('fingerprint')}")
+
+        axes = tuple(FieldAxis.from_dict(axis) for axis in layout["axes"])
+        fields = {ExecutionMode(mode): tuple(names) for mode, names in layout["modes"].items()}
+        # The fingerprint names the rules, the layout must also be the one they produce
+        if axes != policy_axes(tables) or any(fields.get(mode) != mode_fields(tables[mode]) for mode in MODE_ORDER):
+            raise ValueError("layout does not match the rules")
+
+        scores = np.load(scores_path, mmap_mode="r")
+        if scores.dtype != np.float64:
+            raise ValueError(f"unexpected dtype {scores.dtype}")
+        return ModePolicyTable(fingerprint, axes, fields, scores)
+    except Exception as e:
+        logger.warning("Failed to load mode policy", path=str(layout_path), error=str(e))
+        return None
+
+
+__all__ = [
+    "MODE_POLICY_PATH",
+    "FieldAxis",
+    "ModePolicyTable",
+    "compile_mode_policy",
+    "load_mode_policy",
+    "mode_fields",
+    "policy_axes",
+    "rules_fingerprint",
+    "save_mode_policy"
+]
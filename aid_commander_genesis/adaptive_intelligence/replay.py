@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Counterfactual Replay
+
+Re-scores the stored decision history under a candidate scoring configuration
+to show how many past recommendations would change before the configuration
+ships. Nothing is re-analyzed: the complexity analysis, preferences and context
+stored with each decision are read from the columnar decision matrix, and the
+compiled mode scoring rules run over row chunks in parallel. The result is a
+confusion matrix of recorded versus replayed recommended mode.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .models import ExecutionMode
+from .scoring import MODE_ORDER, CompiledModeScoring
+from .matrix import NO_MODE, OUTCOME_FAILURE, OUTCOME_SUCCESS, DecisionMatrix
+from .calibration import WEIGHTED_DIMENSIONS, complexity_scores, weight_vector
+
+logger = structlog.get_logger(__name__)
+
+
+# Decisions re-scored per parallel chunk
+DEFAULT_REPLAY_CHUNK = 65536
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    """
+    Recorded versus replayed recommendations of a decision history.
+
+    confusion[i, j] counts decisions recorded as MODE_ORDER[i] and replayed as
+    MODE_ORDER[j]; flipped_rows are the matrix rows off its diagonal, and
+    flipped_outcomes counts their known successes and failures.
+    """
+
+    confusion: np.ndarray
+    flipped_rows: np.ndarray
+    flipped_outcomes: Dict[str, int]
+    elapsed_seconds: float
+
+    @property
+    def decisions(self) -> int:
+        return int(self.confusion.sum())
+
+    @property
+    def flipped(self) -> int:
+        return len(self.flipped_rows)
+
+    @property
+    def flip_rate(self) -> float:
+        return self.flipped / self.decisions if self.decisions else 0.0
+
+    def transitions(self) -> Dict[Tuple[ExecutionMode, ExecutionMode], int]:
+        """Non-zero counts of recommendations that change mode."""
+
+        return {
+            (MODE_ORDER[old], MODE_ORDER[new]): int(self.confusion[old, new])
+            for old, new in zip(*np.nonzero(self.confusion))
+            if old != new
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "modes": [mode.value for mode in MODE_ORDER],
+            "confusion": self.confusion.tolist(),
+            "decisions": self.decisions,
+            "flipped": self.flipped,
+            "flip_rate": self.flip_rate,
+            "flipped_outcomes": self.flipped_outcomes,
+            "elapsed_seconds": self.elapsed_seconds
+        }
+
+
+def _replay_chunk(
+    matrix: DecisionMatrix,
+    scoring: CompiledModeScoring,
+    weights: Optional[np.ndarray],
+    start: int,
+    stop: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Confusion counts and flipped rows of one row range."""
+
+    chunk = matrix.select(slice(start, stop))
+    records = chunk.records
+    columns = chunk.scoring_columns(scoring.fields)
+
+    if weights is not None and "analysis.complexity_score" in columns:
+        dimensions = np.column_stack([records[dimension].astype(np.float64) for dimension in WEIGHTED_DIMENSIONS])
+        columns["analysis.complexity_score"] = complexity_scores(dimensions, weights)[:, 0]
+
+    replayed = np.argmax(scoring.score_columns(columns, len(records)), axis=1)
+    recorded = records["recommended_mode"].astype(np.int64)
+    known = recorded != NO_MODE
+
+    mode_count = len(MODE_ORDER)
+    confusion = np.bincount(
+        recorded[known] * mode_count + replayed[known],
+        minlength=mode_count * mode_count
+    ).reshape(mode_count, mode_count)
+    flipped = start + np.flatnonzero(known & (recorded != replayed))
+    return confusion, flipped
+
+
+def replay_decisions(
+    matrix: DecisionMatrix,
+    scoring: CompiledModeScoring,
+    complexity_weights: Optional[Mapping[str, float]] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = DEFAULT_REPLAY_CHUNK
+) -> ReplayResult:
+    """
+    Replay every decision of a matrix under candidate scoring rules.
+
+    Recorded complexity scores are used unless complexity_weights is given, in
+    which case scores are recomputed from the stored dimension scores (float32
+    precision). Chunks are scored on a thread pool; NumPy releases the GIL for
+    the column arithmetic, and results are merged in row order.
+    """
+
+    started = time.perf_counter()
+    weights = weight_vector(complexity_weights) if complexity_weights is not None else None
+    bounds = [(start, min(start + chunk_size, len(matrix))) for start in range(0, len(matrix), chunk_size)]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(bounds) or 1))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="decision-replay") as executor:
+        results = list(executor.map(
+            lambda bound: _replay_chunk(matrix, scoring, weights, *bound),
+            bounds
+        ))
+
+    mode_count = len(MODE_ORDER)
+    confusion = np.zeros((mode_count, mode_count), dtype=np.int64)
+    flipped_parts: List[np.ndarray] = [np.zeros(0, dtype=np.int64)]
+    for chunk_confusion, chunk_flipped in results:
+        confusion += chunk_confusion
+        flipped_parts.append(chunk_flipped)
+    flipped_rows = np.concatenate(flipped_parts)
+
+    outcomes = matrix.records["project_success"][flipped_rows]
+    result = ReplayResult(
+        confusion=confusion,
+        flipped_rows=flipped_rows,
+        flipped_outcomes={
+            "success": int(np.sum(outcomes == OUTCOME_SUCCESS)),
+            "failure": int(np.sum(outcomes == OUTCOME_FAILURE))
+        },
+        elapsed_seconds=time.perf_counter() - started
+    )
+
+    logger.info(
+        "Decision history replayed",
+        decisions=result.decisions,
+        flipped=result.flipped,
+        workers=workers,
+        chunks=len(bounds),
+        elapsed_seconds=result.elapsed_seconds
+    )
+    return result
+
+
+__all__ = [
+    "DEFAULT_REPLAY_CHUNK",
+    "ReplayResult",
+    "replay_decisions"
+]
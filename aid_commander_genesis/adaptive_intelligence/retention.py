@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Decision Retention
+
+Keeps full AdaptiveDecision records for a configurable window and rolls older
+ones into compact aggregates, so decision storage and history load time stay
+bounded as the history grows. Each aggregate bucket is one month, chosen
+execution mode and complexity band, holding decision, known outcome and
+success counts plus sums of the dimension scores, from which success rates and
+mean scores follow. Buckets add exactly, so success rates by mode and band
+over retained decisions plus aggregates equal those of the full history.
+
+Rolled-up decisions are tombstoned in the decision log (legacy JSON files are
+removed) and the log is compacted. A watermark records how far history has
+been rolled up, so a retention run interrupted after saving aggregates never
+counts a decision twice.
+"""
+
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import structlog
+
+from .scoring import MODE_ORDER
+from .decision_log import DecisionLog
+from .matrix import (
+    COMPLEXITY_BANDS,
+    NO_MODE,
+    OUTCOME_SUCCESS,
+    OUTCOME_UNKNOWN,
+    DecisionMatrix
+)
+from ..storage import atomic_write_json, file_lock
+
+logger = structlog.get_logger(__name__)
+
+
+# Default file of rolled-up decision aggregates
+DECISION_AGGREGATES_PATH = Path.home() / ".aid_genesis" / "decision_aggregates.json"
+
+# Days of full decision records kept by default
+DEFAULT_RETENTION_DAYS = 365
+
+# Version of the aggregate file layout
+AGGREGATES_FORMAT_VERSION = 1
+
+# Decision columns whose sums (and so means) are kept per bucket
+AGGREGATED_SCORES: Tuple[str, ...] = (
+    "complexity_score",
+    "stakeholder_complexity",
+    "technical_complexity",
+    "business_complexity",
+    "integration_complexity",
+    "uncertainty_level",
+    "innovation_level",
+    "analysis_confidence",
+    "confidence_score"
+)
+
+# Aggregate bucket key: (month "YYYY-MM", chosen mode, complexity band)
+BucketKey = Tuple[str, str, str]
+
+
+@dataclass
+class AggregateBucket:
+    """Counts and score sums of the rolled-up decisions of one bucket."""
+
+    decisions: int = 0
+    outcomes: int = 0
+    successes: int = 0
+    score_sums: Optional[Dict[str, float]] = None
+
+    def __post_init__(self):
+        if self.score_sums is None:
+            self.score_sums = {score: 0.0 for score in AGGREGATED_SCORES}
+
+    @property
+    def success_rate(self) -> Optional[float]:
+        return self.successes / self.outcomes if self.outcomes else None
+
+    def mean_scores(self) -> Dict[str, float]:
+        return {score: total / self.decisions for score, total in self.score_sums.items()} if self.decisions else {}
+
+    def merge(self, other: "AggregateBucket"):
+        self.decisions += other.decisions
+        self.outcomes += other.outcomes
+        self.successes += other.successes
+        for score, total in other.score_sums.items():
+            self.score_sums[score] = self.score_sums.get(score, 0.0) + total
+
+
+class DecisionAggregates:
+    """
+    Rolled-up decision statistics, persisted as one JSON file.
+
+    rolled_up_through is the decision timestamp below which every decision has
+    been aggregated; it only moves forward.
+    """
+
+    def __init__(self, path: Path = DECISION_AGGREGATES_PATH):
+        self.path = Path(path)
+        self.logger = logger.bind(component="DecisionAggregates")
+        self.buckets: Dict[BucketKey, AggregateBucket] = {}
+        self.rolled_up_through: Optional[datetime] = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.buckets)
+
+    @property
+    def decisions(self) -> int:
+        return sum(bucket.decisions for bucket in self.buckets.values())
+
+    def add_matrix(self, matrix: DecisionMatrix) -> int:
+        """Aggregate every decision of a matrix; returns the number added."""
+
+        records = matrix.records
+        modes = records["user_choice"].astype(np.int64)
+        rows = modes != NO_MODE
+        if not rows.any():
+            return 0
+
+        months = records["decision_timestamp"][rows].astype("M8[M]")
+        month_codes = (months - np.datetime64("1970-01", "M")).astype(np.int64)
+        cells = (modes[rows] * len(COMPLEXITY_BANDS) + matrix.complexity_bands()[rows]).astype(np.int64)
+        keys, inverse = np.unique(np.column_stack([month_codes, cells]), axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        outcomes = records["project_success"][rows]
+        decisions = np.bincount(inverse, minlength=len(keys))
+        outcome_counts = np.bincount(inverse[outcomes != OUTCOME_UNKNOWN], minlength=len(keys))
+        successes = np.bincount(inverse[outcomes == OUTCOME_SUCCESS], minlength=len(keys))
+        score_sums = {
+            score: np.bincount(inverse, weights=records[score][rows].astype(np.float64), minlength=len(keys))
+            for score in AGGREGATED_SCORES
+        }
+
+        for index, (month_code, cell) in enumerate(keys):
+            mode, band = divmod(int(cell), len(COMPLEXITY_BANDS))
+            key = (
+                str(np.datetime64("1970-01", "M") + np.timedelta64(int(month_code), "M")),
+                MODE_ORDER[mode].value,
+                COMPLEXITY_BANDS[band].value
+            )
+            self.buckets.setdefault(key, AggregateBucket()).merge(AggregateBucket(
+                decisions=int(decisions[index]),
+                outcomes=int(outcome_counts[index]),
+                successes=int(successes[index]),
+                score_sums={score: float(sums[index]) for score, sums in score_sums.items()}
+            ))
+
+        return int(rows.sum())
+
+    def success_rate_by_mode_and_band(self) -> Dict[str, Any]:
+        """Counts per mode and band in DecisionMatrix.success_rate_by_mode_and_band() layout."""
+
+        shape = (len(MODE_ORDER), len(COMPLEXITY_BANDS))
+        counts = {name: np.zeros(shape, dtype=np.int64) for name in ("decisions", "outcomes", "successes")}
+        mode_index = {mode.value: index for index, mode in enumerate(MODE_ORDER)}
+        band_index = {band.value: index for index, band in enumerate(COMPLEXITY_BANDS)}
+
+        for (_, mode, band), bucket in self.buckets.items():
+            cell = (mode_index[mode], band_index[band])
+            counts["decisions"][cell] += bucket.decisions
+            counts["outcomes"][cell] += bucket.outcomes
+            counts["successes"][cell] += bucket.successes
+
+        return {
+            "modes": [mode.value for mode in MODE_ORDER],
+            "bands": [band.value for band in COMPLEXITY_BANDS],
+            **counts,
+            "success_rate": success_rates(counts["successes"], counts["outcomes"])
+        }
+
+    def save(self):
+        """Write the aggregates atomically (temporary file plus rename)."""
+
+        atomic_write_json(
+            self.path,
+            {
+                "format_version": AGGREGATES_FORMAT_VERSION,
+                "rolled_up_through": self.rolled_up_through.isoformat() if self.rolled_up_through else None,
+                "buckets": [
+                    {
+                        "period": period,
+                        "mode": mode,
+                        "band": band,
+                        "decisions": bucket.decisions,
+                        "outcomes": bucket.outcomes,
+                        "successes": bucket.successes,
+                        "score_sums": bucket.score_sums
+                    }
+                    for (period, mode, band), bucket in sorted(self.buckets.items())
+                ]
+            },
+            indent=2
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "buckets": len(self.buckets),
+            "decisions": self.decisions,
+            "rolled_up_through": self.rolled_up_through.isoformat() if self.rolled_up_through else None
+        }
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            if data.get("format_version") != AGGREGATES_FORMAT_VERSION:
+                raise ValueError(f"unsupported format {data.get('format_version')}")
+            if data.get("rolled_up_through"):
+                self.rolled_up_through = datetime.fromisoformat(data["rolled_up_through"])
+            for entry in data.get("buckets", []):
+                self.buckets[(entry["period"], entry["mode"], entry["band"])] = AggregateBucket(
+                    decisions=entry["decisions"],
+                    outcomes=entry["outcomes"],
+                    successes=entry["successes"],
+                    score_sums=dict(entry["score_sums"])
+                )
+        except Exception as e:
+            self.logger.error("Failed to load decision aggregates", path=str(self.path), error=str(e))
+            raise
+
+
+def success_rates(successes: np.ndarray, outcomes: np.ndarray) -> np.ndarray:
+    """Success rate per cell, NaN where no outcome is known."""
+    return np.divide(successes, outcomes, out=np.full(outcomes.shape, np.nan), where=outcomes > 0)
+
+
+@dataclass(frozen=True)
+class RetentionResult:
+    """What one retention run rolled up and removed."""
+
+    cutoff: datetime
+    expired: int
+    aggregated: int
+    deleted_records: int
+    deleted_files: int
+    compacted_records: int
+    buckets: int
+
+
+class RetentionPolicy:
+    """
+    Rolls decisions older than the retention window into aggregates.
+
+    The window is measured on decision_timestamp. Outcomes recorded for a
+    decision after it was rolled up are not counted, so windows should exceed
+    the time projects take to report an outcome.
+    """
+
+    def __init__(
+        self,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        aggregates_path: Path = DECISION_AGGREGATES_PATH
+    ):
+        if retention_days < 0:
+            raise ValueError("retention_days must not be negative")
+        self.retention_days = retention_days
+        self.aggregates_path = Path(aggregates_path)
+        self.logger = logger.bind(component="RetentionPolicy")
+        self._aggregates: Optional[DecisionAggregates] = None
+
+    @property
+    def aggregates(self) -> DecisionAggregates:
+        """Rolled-up statistics, loaded on first use."""
+        if self._aggregates is None:
+            self._aggregates = DecisionAggregates(self.aggregates_path)
+        return self._aggregates
+
+    def stats(self) -> Dict[str, Any]:
+        """Window and, once loaded, aggregate statistics for health checks."""
+        return {
+            "retention_days": self.retention_days,
+            "aggregates": self._aggregates.stats() if self._aggregates is not None else None
+        }
+
+    def cutoff(self, now: Optional[datetime] = None, retention_days: Optional[int] = None) -> datetime:
+        """Decision timestamp below which records are rolled up."""
+        days = self.retention_days if retention_days is None else retention_days
+        return (now or datetime.now()) - timedelta(days=days)
+
+    def apply(
+        self,
+        matrix: DecisionMatrix,
+        decision_log: DecisionLog,
+        legacy_directory: Optional[Path] = None,
+        now: Optional[datetime] = None,
+        retention_days: Optional[int] = None
+    ) -> RetentionResult:
+        """
+        Roll up and remove the decisions of a matrix older than the window.
+
+        The matrix must hold the stored history (legacy files and log);
+        retention_days overrides the policy's window for this run. Aggregates
+        are saved before any record is removed, and runs in concurrent
+        processes serialize on the aggregates lock.
+        """
+
+        cutoff = self.cutoff(now, retention_days)
+        timestamps = matrix.records["decision_timestamp"]
+        expired = timestamps < np.datetime64(cutoff, "s")
+
+        with file_lock(self.aggregates_path):
+            # Other processes may have rolled up since the aggregates were loaded
+            self._aggregates = None
+            aggregates = self.aggregates
+            pending = expired
+            if aggregates.rolled_up_through is not None:
+                # Left behind by an interrupted run or another process; already counted
+                pending = expired & (timestamps >= np.datetime64(aggregates.rolled_up_through, "s"))
+
+            aggregated = aggregates.add_matrix(matrix.select(pending)) if pending.any() else 0
+            if aggregates.rolled_up_through is None or cutoff > aggregates.rolled_up_through:
+                aggregates.rolled_up_through = cutoff
+            aggregates.save()
+
+            expired_ids = matrix.decoded("decision_id")[expired].tolist() if expired.any() else []
+            deleted_records = decision_log.delete_batch(expired_ids)
+
+            deleted_files = 0
+            if legacy_directory is not None:
+                for decision_id in expired_ids:
+                    legacy_file = Path(legacy_directory) / f"{decision_id}.json"
+                    if legacy_file.exists():
+                        legacy_file.unlink()
+                        deleted_files += 1
+
+            compacted_records = decision_log.compact(seal_active=True) if deleted_records else 0
+
+        result = RetentionResult(
+            cutoff=cutoff,
+            expired=int(expired.sum()),
+            aggregated=aggregated,
+            deleted_records=deleted_records,
+            deleted_files=deleted_files,
+            compacted_records=compacted_records,
+            buckets=len(aggregates)
+        )
+        self.logger.info(
+            "Decision retention applied",
+            cutoff=cutoff.isoformat(),
+            expired=result.expired,
+            aggregated=aggregated,
+            deleted_records=deleted_records,
+            deleted_files=deleted_files
+        )
+        return result
+
+
+__all__ = [
+    "DECISION_AGGREGATES_PATH",
+    "DEFAULT_RETENTION_DAYS",
+    "AggregateBucket",
+    "DecisionAggregates",
+    "RetentionPolicy",
+    "RetentionResult",
+    "success_rates"
+]
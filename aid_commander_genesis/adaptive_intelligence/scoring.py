@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Mode Scoring Rules
+
+Declarative rule table for execution mode scoring. Each rule maps a predicate
+over complexity analysis, user preference or project context fields to a score
+delta. The table compiles to NumPy masks so all four modes are scored for many
+(analysis, preferences, context) triples in one vectorized evaluation.
+
+The engine's _score_*_mode methods remain the reference implementation; rules
+are applied in the same order so vectorized scores match them exactly.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .models import ExecutionMode, ComplexityAnalysis, UserPreferences, ProjectContext
+
+
+# Column order of vectorized mode scores (matches recommendation tie-breaking)
+MODE_ORDER: Tuple[ExecutionMode, ...] = (
+    ExecutionMode.LIGHTWEIGHT,
+    ExecutionMode.KNOWLEDGE_GRAPH,
+    ExecutionMode.HYBRID,
+    ExecutionMode.CREATIVE
+)
+
+# Objects a condition field can be read from
+CONDITION_SOURCES = ("analysis", "preferences", "context")
+
+# Supported comparison operators
+CONDITION_OPERATORS = ("lt", "le", "gt", "ge", "eq", "between")
+
+
+@dataclass(frozen=True)
+class Condition:
+    """Comparison of one field, e.g. Condition("preferences.team_size", "le", 3)."""
+
+    field: str
+    op: str
+    value: Any
+
+    def __post_init__(self):
+        source, _, attribute = self.field.partition(".")
+        if source not in CONDITION_SOURCES or not attribute:
+            raise ValueError(f"Condition field must be <source>.<attribute> with source in {CONDITION_SOURCES}: {self.field}")
+        if self.op not in CONDITION_OPERATORS:
+            raise ValueError(f"Unsupported condition operator: {self.op}")
+
+    def evaluate(self, values: np.ndarray) -> np.ndarray:
+        """Evaluate the condition over a column of field values."""
+
+        if self.op == "lt":
+            return values < self.value
+        if self.op == "le":
+            return values <= self.value
+        if self.op == "gt":
+            return values > self.value
+        if self.op == "ge":
+            return values >= self.value
+        if self.op == "eq":
+            return values == self.value
+        low, high = self.value
+        return (values >= low) & (values <= high)
+
+
+@dataclass(frozen=True)
+class ScoringRule:
+    """
+    Add delta to a mode score when any condition holds.
+
+    Rules sharing a group behave like an if/elif chain: only the first matching
+    rule of the group applies. A rule without conditions always matches, which
+    makes it the else branch when placed last in its group.
+    """
+
+    any_of: Tuple[Condition, ...]
+    delta: float
+    group: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ModeScoringTable:
+    """Base score and ordered rules of one execution mode."""
+
+    base_score: float
+    rules: Tuple[ScoringRule, ...]
+
+
+def when(field: str, op: str, value: Any) -> Tuple[Condition, ...]:
+    """Single-condition shorthand for rule tables."""
+    return (Condition(field, op, value),)
+
+
+# Complexity band boundaries of the default rules (the engine's mode_thresholds max_complexity)
+DEFAULT_LIGHTWEIGHT_MAX_COMPLEXITY = 4.0
+DEFAULT_HYBRID_MAX_COMPLEXITY = 7.0
+
+
+def mode_scoring_rules(
+    lightweight_max_complexity: float = DEFAULT_LIGHTWEIGHT_MAX_COMPLEXITY,
+    hybrid_max_complexity: float = DEFAULT_HYBRID_MAX_COMPLEXITY
+) -> Dict[ExecutionMode, ModeScoringTable]:
+    """
+    Declarative equivalent of the engine's _score_*_mode methods.
+
+    The complexity band boundaries are parameters so calibrated thresholds
+    apply to vectorized and scalar scoring alike.
+    """
+
+    return {
+        ExecutionMode.LIGHTWEIGHT: ModeScoringTable(0.5, (
+            # Favor for low complexity
+            ScoringRule(when("analysis.complexity_score", "le", lightweight_max_complexity), 0.3, group="complexity"),
+            ScoringRule(when("analysis.complexity_score", "le", 6.0), 0.1, group="complexity"),
+            ScoringRule((), -0.2, group="complexity"),
+            # Favor for speed preference
+            ScoringRule(when("preferences.speed_vs_quality", "gt", 0.6), 0.2),
+            # Favor for high user experience
+            ScoringRule(when("preferences.ai_experience_level", "ge", 7), 0.1),
+            # Favor for small teams
+            ScoringRule(when("preferences.team_size", "le", 3), 0.1),
+            # Penalty for high uncertainty
+            ScoringRule(when("analysis.uncertainty_level", "gt", 7.0), -0.2)
+        )),
+        ExecutionMode.KNOWLEDGE_GRAPH: ModeScoringTable(0.3, (
+            # Strong favor for high complexity
+            ScoringRule(when("analysis.complexity_score", "ge", hybrid_max_complexity), 0.4, group="complexity"),
+            ScoringRule(when("analysis.complexity_score", "ge", 5.0), 0.2, group="complexity"),
+            # Favor for enterprise validation needs
+            ScoringRule(when("preferences.validation_level", "eq", "enterprise"), 0.3, group="validation"),
+            ScoringRule(when("preferences.validation_level", "eq", "high"), 0.2, group="validation"),
+            # Favor for high confidence requirements
+            ScoringRule(when("preferences.confidence_threshold", "ge", 0.9), 0.2),
+            # Favor for quality over speed
+            ScoringRule(when("preferences.speed_vs_quality", "lt", 0.4), 0.2),
+            # Favor for many stakeholders
+            ScoringRule(when("context.stakeholder_count", "ge", 5), 0.2),
+            # Penalty for tight time constraints
+            ScoringRule(when("preferences.time_constraints", "eq", "tight"), -0.2)
+        )),
+        ExecutionMode.HYBRID: ModeScoringTable(0.6, (
+            # Favor for moderate complexity
+            ScoringRule(when("analysis.complexity_score", "between", (lightweight_max_complexity, hybrid_max_complexity)), 0.3),
+            # Favor for balanced preferences
+            ScoringRule(when("preferences.speed_vs_quality", "between", (0.3, 0.7)), 0.2),
+            # Favor for moderate team size
+            ScoringRule(when("preferences.team_size", "between", (2, 5)), 0.1),
+            # Favor for standard validation needs
+            ScoringRule(when("preferences.validation_level", "eq", "standard"), 0.1),
+            # Favor for moderate risk tolerance
+            ScoringRule(when("preferences.risk_tolerance", "between", (0.3, 0.7)), 0.1)
+        )),
+        ExecutionMode.CREATIVE: ModeScoringTable(0.2, (
+            # Strong favor for high innovation
+            ScoringRule(when("context.innovation_level", "ge", 0.7), 0.4, group="innovation"),
+            ScoringRule(when("context.innovation_level", "ge", 0.5), 0.2, group="innovation"),
+            # Favor for experimentation willingness
+            ScoringRule(when("preferences.experimentation_willingness", "ge", 0.7), 0.3),
+            # Favor for learning mode
+            ScoringRule(when("preferences.learning_mode", "eq", True), 0.2),
+            # Favor for high risk tolerance
+            ScoringRule(when("preferences.risk_tolerance", "ge", 0.7), 0.2),
+            # Favor for solo developers (more flexibility)
+            ScoringRule(when("preferences.team_size", "eq", 1), 0.1),
+            # Penalty for tight constraints
+            ScoringRule((
+                Condition("preferences.time_constraints", "eq", "tight"),
+                Condition("preferences.budget_constraints", "eq", "tight")
+            ), -0.2)
+        ))
+    }
+
+
+# Rule tables at the default complexity band boundaries
+MODE_SCORING_RULES: Dict[ExecutionMode, ModeScoringTable] = mode_scoring_rules()
+
+
+class CompiledModeScoring:
+    """
+    Rule tables compiled for vectorized evaluation.
+
+    Compilation resolves the fields each table reads so that evaluation only
+    gathers those columns once, then applies every rule as a masked delta.
+    """
+
+    def __init__(self, tables: Dict[ExecutionMode, ModeScoringTable] = MODE_SCORING_RULES):
+        missing = [mode for mode in MODE_ORDER if mode not in tables]
+        if missing:
+            raise ValueError(f"Scoring rules missing for modes: {[mode.value for mode in missing]}")
+
+        self.tables = tables
+        self.fields = tuple(sorted({
+            condition.field
+            for table in tables.values()
+            for rule in table.rules
+            for condition in rule.any_of
+        }))
+
+    def gather_columns(
+        self,
+        analyses: Sequence[ComplexityAnalysis],
+        preferences: Sequence[UserPreferences],
+        contexts: Sequence[ProjectContext]
+    ) -> Dict[str, np.ndarray]:
+        """Collect the referenced fields of N triples into NumPy columns."""
+
+        if not len(analyses) == len(preferences) == len(contexts):
+            raise ValueError("analyses, preferences and contexts must have the same length")
+
+        sources = {"analysis": analyses, "preferences": preferences, "context": contexts}
+        columns = {}
+        for field in self.fields:
+            source, _, attribute = field.partition(".")
+            columns[field] = np.array([getattr(item, attribute) for item in sources[source]])
+        return columns
+
+    def score_columns(self, columns: Dict[str, np.ndarray], count: Union[int, Tuple[int, ...]]) -> np.ndarray:
+        """
+        Score all modes from pre-gathered columns; returns an (N, 4) array.
+
+        count may also be a grid shape, in which case columns only need to
+        broadcast to it (scalars for fixed fields, one axis per varied field)
+        and the result has shape (*count, 4).
+        """
+
+        shape = (count,) if isinstance(count, (int, np.integer)) else tuple(count)
+        scores = np.empty(shape + (len(MODE_ORDER),), dtype=np.float64)
+
+        for mode_index, mode in enumerate(MODE_ORDER):
+            table = self.tables[mode]
+            score = np.full(shape, table.base_score, dtype=np.float64)
+            group_matched: Dict[str, np.ndarray] = {}
+
+            for rule in table.rules:
+                mask = np.zeros(shape, dtype=bool) if rule.any_of else np.ones(shape, dtype=bool)
+                for condition in rule.any_of:
+                    mask |= condition.evaluate(columns[condition.field])
+
+                if rule.group is not None:
+                    matched = group_matched.get(rule.group)
+                    if matched is None:
+                        matched = np.zeros(shape, dtype=bool)
+                    mask &= ~matched
+                    group_matched[rule.group] = matched | mask
+
+                # Adding 0.0 where the rule does not apply keeps sums identical to the if-chains
+                score += np.where(mask, rule.delta, 0.0)
+
+            scores[..., mode_index] = np.maximum(np.minimum(score, 1.0), 0.0)
+
+        return scores
+
+    def score(
+        self,
+        analyses: Sequence[ComplexityAnalysis],
+        preferences: Sequence[UserPreferences],
+        contexts: Sequence[ProjectContext]
+    ) -> np.ndarray:
+        """Score all four modes for N (analysis, preferences, context) triples."""
+        columns = self.gather_columns(analyses, preferences, contexts)
+        return self.score_columns(columns, len(analyses))
+
+
+def best_modes(scores: np.ndarray) -> List[ExecutionMode]:
+    """Highest scoring mode per row, ties resolved in MODE_ORDER like max()."""
+    return [MODE_ORDER[index] for index in np.argmax(scores, axis=1)]
+
+
+__all__ = [
+    "DEFAULT_HYBRID_MAX_COMPLEXITY",
+    "DEFAULT_LIGHTWEIGHT_MAX_COMPLEXITY",
+    "MODE_ORDER",
+    "MODE_SCORING_RULES",
+    "Condition",
+    "ScoringRule",
+    "ModeScoringTable",
+    "CompiledModeScoring",
+    "best_modes",
+    "mode_scoring_rules"
+]
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Analysis Session
+
+Request-scoped memoization for one planning flow. A session is bound to one
+revision of a concept document, whose content hash it computes once, and keeps
+the intermediate results of that flow: concept features, innovation level,
+complexity analysis, project contexts and recommendations. Engine entry points
+that share a session compute each of them exactly once.
+"""
+
+from collections import Counter
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import structlog
+
+from .cache import content_hash
+from ..conceptcraft.models import ConceptDocument
+
+logger = structlog.get_logger(__name__)
+
+
+class AnalysisSession:
+    """
+    Memoized analysis results for one concept document revision.
+
+    The document is expected to stay unchanged while the session is in use;
+    after editing it, call refresh(), which drops all results if the content
+    changed. Results are shared, not copied, between the calls of a session.
+    """
+
+    def __init__(self, concept_document: ConceptDocument):
+        self.concept_document = concept_document
+        self.revision = content_hash(concept_document)
+        self.logger = logger.bind(component="AnalysisSession")
+
+        self._results: Dict[Tuple[str, Hashable], Any] = {}
+        self.computed: Counter = Counter()
+        self.reused: Counter = Counter()
+
+    def covers(self, concept_document: ConceptDocument) -> bool:
+        """Whether this session's results apply to a concept document."""
+        if concept_document is self.concept_document:
+            return True
+        return content_hash(concept_document) == self.revision
+
+    def refresh(self) -> bool:
+        """Re-read the document revision, dropping results if it changed; returns whether it did."""
+
+        revision = content_hash(self.concept_document)
+        if revision == self.revision:
+            return False
+        self.revision = revision
+        self._results.clear()
+        self.logger.info("Analysis session invalidated", revision=revision)
+        return True
+
+    def get(self, name: str, key: Hashable = None) -> Optional[Any]:
+        """Memoized result, or None if it was not computed in this session."""
+
+        value = self._results.get((name, key))
+        if value is not None:
+            self.reused[name] += 1
+        return value
+
+    def put(self, name: str, value: Any, key: Hashable = None) -> Any:
+        """Record a computed result and return it."""
+
+        self._results[(name, key)] = value
+        self.computed[name] += 1
+        return value
+
+    def memoize(self, name: str, compute: Callable[[], Any], key: Hashable = None) -> Any:
+        """Return the memoized result, computing it on first use."""
+
+        value = self.get(name, key)
+        if value is None:
+            value = self.put(name, compute(), key)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "revision": self.revision,
+            "computed": dict(self.computed),
+            "reused": dict(self.reused)
+        }
+
+
+__all__ = [
+    "AnalysisSession"
+]
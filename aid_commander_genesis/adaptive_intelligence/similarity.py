@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Similar Project Index
+
+Nearest-neighbour search over the complexity dimension vectors of past
+decisions. Small histories are searched exactly with a brute-force NumPy scan;
+above a size threshold a k-d tree answers (1 + eps)-approximate queries, with
+projects added since the last tree build scanned exactly until the tree is
+rebuilt. The engine uses the neighbours to fill ProjectContext's
+similar_projects_count and previous_success_rate.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+from scipy.spatial import cKDTree
+
+from .models import ComplexityAnalysis
+from .matrix import OUTCOME_SUCCESS, OUTCOME_UNKNOWN, DecisionMatrix
+
+logger = structlog.get_logger(__name__)
+
+
+# ComplexityAnalysis dimensions compared between projects (all on a 0-10 scale)
+SIMILARITY_DIMENSIONS = (
+    "stakeholder_complexity",
+    "technical_complexity",
+    "business_complexity",
+    "integration_complexity",
+    "story_richness",
+    "narrative_coherence",
+    "stakeholder_alignment",
+    "uncertainty_level"
+)
+
+# Indexed projects up to which queries use an exact brute-force scan
+EXACT_SEARCH_THRESHOLD = 10_000
+
+# Approximation bound of tree queries: neighbours are within (1 + eps) of the true distance
+APPROXIMATE_SEARCH_EPS = 0.5
+
+# Share of projects added since the last tree build that triggers a rebuild
+TREE_REBUILD_FRACTION = 0.1
+
+# Neighbours considered when filling project context history fields
+DEFAULT_SIMILAR_PROJECTS = 10
+
+# Largest Euclidean distance over the dimensions at which a past project counts as similar
+SIMILARITY_RADIUS = 3.0
+
+# Initial row capacity of the vector store
+INITIAL_CAPACITY = 1024
+
+
+def complexity_vector(analysis: ComplexityAnalysis) -> np.ndarray:
+    return np.array([getattr(analysis, dimension) for dimension in SIMILARITY_DIMENSIONS], dtype=np.float64)
+
+
+class SimilarProjectIndex:
+    """
+    Incrementally maintained k-nearest-neighbour index of past projects.
+
+    Rows are keyed by decision id; adding a decision again updates its vector
+    and outcome in place. Results are ordered by distance, ties by insertion
+    order.
+    """
+
+    def __init__(
+        self,
+        exact_threshold: int = EXACT_SEARCH_THRESHOLD,
+        eps: float = APPROXIMATE_SEARCH_EPS
+    ):
+        self.exact_threshold = exact_threshold
+        self.eps = eps
+        self.logger = logger.bind(component="SimilarProjectIndex")
+
+        self._vectors = np.zeros((INITIAL_CAPACITY, len(SIMILARITY_DIMENSIONS)), dtype=np.float64)
+        self._outcomes = np.zeros(INITIAL_CAPACITY, dtype=np.int8)
+        self._projects = np.zeros(INITIAL_CAPACITY, dtype=np.int64)
+        self._size = 0
+
+        self._decision_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._project_codes: Dict[str, int] = {}
+        self._project_rows: Counter = Counter()
+
+        # Rows [0, _tree_size) are in the tree; later rows are scanned exactly
+        self._tree: Optional[cKDTree] = None
+        self._tree_size = 0
+        self.tree_builds = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, decision_id: str, vector: np.ndarray, outcome: int = OUTCOME_UNKNOWN, project_name: str = ""):
+        """Index or update one past project."""
+        self.add_batch([decision_id], np.asarray(vector, dtype=np.float64).reshape(1, -1), np.array([outcome]), [project_name])
+
+    def add_batch(
+        self,
+        decision_ids: Sequence[str],
+        vectors: np.ndarray,
+        outcomes: np.ndarray,
+        project_names: Sequence[str]
+    ):
+        """Index or update many past projects."""
+
+        new_rows = []
+        for position, decision_id in enumerate(decision_ids):
+            row = self._rows.get(decision_id)
+            if row is None:
+                row = self._size + len(new_rows)
+                self._rows[decision_id] = row
+                self._decision_ids.append(decision_id)
+                new_rows.append(position)
+                continue
+
+            # In-place update; a moved vector invalidates the tree
+            if row < self._tree_size and not np.array_equal(self._vectors[row], vectors[position]):
+                self._tree = None
+                self._tree_size = 0
+            self._project_rows[self._projects[row]] -= 1
+            self._store(row, vectors[position], outcomes[position], project_names[position])
+
+        if not new_rows:
+            return
+
+        self._reserve(self._size + len(new_rows))
+        for offset, position in enumerate(new_rows):
+            self._store(self._size + offset, vectors[position], outcomes[position], project_names[position])
+        self._size += len(new_rows)
+
+    def add_matrix(self, matrix: DecisionMatrix):
+        """Index all decisions of a decision matrix."""
+
+        vectors = np.column_stack([matrix.column(dimension).astype(np.float64) for dimension in SIMILARITY_DIMENSIONS])
+        self.add_batch(
+            list(matrix.decoded("decision_id")),
+            vectors,
+            matrix.column("project_success"),
+            list(matrix.decoded("project_name"))
+        )
+
+    def query(
+        self,
+        vector: np.ndarray,
+        k: int = DEFAULT_SIMILAR_PROJECTS,
+        exclude_project: Optional[str] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rows and distances of the k nearest indexed projects.
+
+        Args:
+            vector: Complexity dimension vector (see SIMILARITY_DIMENSIONS)
+            k: Number of neighbours
+            exclude_project: Skip past decisions made for this project name
+        """
+
+        vector = np.asarray(vector, dtype=np.float64)
+        excluded_code = self._project_codes.get(exclude_project) if exclude_project is not None else None
+
+        if self._size <= self.exact_threshold:
+            return self._exact(vector, k, 0, self._size, excluded_code)
+
+        self._ensure_tree()
+
+        # Ask the tree for enough extra rows to survive project exclusion
+        extra = self._project_rows[excluded_code] if excluded_code is not None else 0
+        tree_k = min(k + extra, self._tree_size)
+        distances, rows = self._tree.query(vector, k=tree_k, eps=self.eps)
+        distances = np.atleast_1d(distances)
+        rows = np.atleast_1d(rows)
+        if excluded_code is not None:
+            keep = self._projects[rows] != excluded_code
+            rows, distances = rows[keep], distances[keep]
+
+        tail_rows, tail_distances = self._exact(vector, k, self._tree_size, self._size, excluded_code)
+        return self._nearest(np.concatenate([rows, tail_rows]), np.concatenate([distances, tail_distances]), k)
+
+    def similar_projects(
+        self,
+        analysis: ComplexityAnalysis,
+        k: int = DEFAULT_SIMILAR_PROJECTS,
+        radius: float = SIMILARITY_RADIUS,
+        exclude_project: Optional[str] = None
+    ) -> Dict[str, object]:
+        """
+        Past projects similar to an analysis and how they turned out.
+
+        Returns the neighbours within radius among the k nearest, their count
+        and the success rate of those with a known outcome (0.0 without any).
+        """
+
+        rows, distances = self.query(complexity_vector(analysis), k, exclude_project)
+        within = distances <= radius
+        rows, distances = rows[within], distances[within]
+
+        outcomes = self._outcomes[rows]
+        known = outcomes != OUTCOME_UNKNOWN
+        success_rate = float((outcomes[known] == OUTCOME_SUCCESS).mean()) if known.any() else 0.0
+
+        return {
+            "count": int(len(rows)),
+            "success_rate": success_rate,
+            "decision_ids": [self._decision_ids[row] for row in rows],
+            "distances": distances.tolist()
+        }
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "projects": self._size,
+            "tree_projects": self._tree_size,
+            "tree_builds": self.tree_builds,
+            "exact_threshold": self.exact_threshold
+        }
+
+    def _store(self, row: int, vector: np.ndarray, outcome: int, project_name: str):
+        code = self._project_codes.setdefault(project_name, len(self._project_codes))
+        self._vectors[row] = vector
+        self._outcomes[row] = outcome
+        self._projects[row] = code
+        self._project_rows[code] += 1
+
+    def _reserve(self, size: int):
+        capacity = len(self._outcomes)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        self._vectors = np.resize(self._vectors, (capacity, self._vectors.shape[1]))
+        self._outcomes = np.resize(self._outcomes, capacity)
+        self._projects = np.resize(self._projects, capacity)
+
+    def _ensure_tree(self):
+        """Build the tree, or rebuild it once enough projects were added after the last build."""
+
+        if self._tree is not None and self._size - self._tree_size <= TREE_REBUILD_FRACTION * self._tree_size:
+            return
+        self._tree = cKDTree(self._vectors[:self._size].copy())
+        self._tree_size = self._size
+        self.tree_builds += 1
+        self.logger.debug("Similar project tree built", projects=self._tree_size)
+
+    def _exact(
+        self,
+        vector: np.ndarray,
+        k: int,
+        start: int,
+        stop: int,
+        excluded_code: Optional[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Brute-force k nearest among rows [start, stop)."""
+
+        if stop <= start:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        differences = self._vectors[start:stop] - vector
+        distances = np.sqrt(np.einsum("ij,ij->i", differences, differences))
+        rows = np.arange(start, stop)
+        if excluded_code is not None:
+            keep = self._projects[start:stop] != excluded_code
+            rows, distances = rows[keep], distances[keep]
+        return self._nearest(rows, distances, k)
+
+    @staticmethod
+    def _nearest(rows: np.ndarray, distances: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """k smallest distances, ordered by distance then row."""
+
+        if len(rows) > k:
+            candidates = np.argpartition(distances, k - 1)[:k]
+            # Rows tied with the k-th distance may lie outside the partition
+            cutoff = distances[candidates].max()
+            candidates = np.flatnonzero(distances <= cutoff)
+            rows, distances = rows[candidates], distances[candidates]
+        order = np.lexsort((rows, distances))[:k]
+        return rows[order], distances[order]
+
+
+__all__ = [
+    "DEFAULT_SIMILAR_PROJECTS",
+    "EXACT_SEARCH_THRESHOLD",
+    "SIMILARITY_DIMENSIONS",
+    "SimilarProjectIndex",
+    "complexity_vector"
+]
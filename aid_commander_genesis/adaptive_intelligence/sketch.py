@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Quantile Sketches
+
+KLL quantile sketches (Karnin, Lang and Liberty) for distributions of analysis
+scores over unbounded streams. A sketch keeps a stack of compactors: values
+enter level 0, and a full level is sorted and every other value (odd or even
+positions, chosen at random) is promoted one level up with twice the weight.
+Capacities shrink geometrically towards the lower levels, so a sketch retains
+O(k) values however many it has seen, updates in amortized constant time and
+answers any quantile within a rank error of roughly 1.7 / k.
+
+Sketches merge by concatenating their levels and compacting, which is how
+sketches built in separate worker processes or time windows combine. Counts,
+minimum, maximum and sum are kept exactly.
+"""
+
+import math
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# Default accuracy parameter: rank error is about 1.7 / k, retained values about 3k
+DEFAULT_SKETCH_K = 200
+
+# Smallest supported accuracy parameter
+MIN_SKETCH_K = 8
+
+# Capacity ratio between a level and the one above it
+SKETCH_DECAY = 2.0 / 3.0
+
+
+class KLLSketch:
+    """Mergeable streaming quantile sketch of float values."""
+
+    def __init__(self, k: int = DEFAULT_SKETCH_K, seed: Optional[int] = None):
+        if k < MIN_SKETCH_K:
+            raise ValueError(f"Sketch k must be at least {MIN_SKETCH_K}")
+
+        self.k = k
+        self.count = 0
+        self.total = 0.0
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self._levels: List[List[float]] = [[]]
+        self._retained = 0
+        self._max_retained = self._capacity(0)
+        self._random = random.Random(seed)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def retained(self) -> int:
+        """Values held by the sketch."""
+        return self._retained
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def update(self, value: float):
+        """Add one value; NaN has no rank and is ignored."""
+
+        value = float(value)
+        if value != value:
+            return
+
+        self._levels[0].append(value)
+        self._retained += 1
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+        if self._retained >= self._max_retained:
+            self._compress()
+
+    def merge(self, other: "KLLSketch"):
+        """Fold another sketch into this one."""
+
+        if not other.count:
+            return
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for level, values in enumerate(other._levels):
+            self._levels[level].extend(values)
+
+        self.count += other.count
+        self.total += other.total
+        self.minimum = other.minimum if self.minimum is None else min(self.minimum, other.minimum)
+        self.maximum = other.maximum if self.maximum is None else max(self.maximum, other.maximum)
+
+        self._retained = sum(map(len, self._levels))
+        while self._retained >= self._max_retained:
+            self._compress()
+
+    def quantiles(self, fractions: Sequence[float]) -> List[Optional[float]]:
+        """Values at rank fractions in [0, 1]; the extremes are exact."""
+
+        if not self.count:
+            return [None] * len(fractions)
+
+        values, cumulative = self._sorted_weights()
+        result = []
+        for fraction in fractions:
+            if fraction <= 0.0:
+                result.append(self.minimum)
+            elif fraction >= 1.0:
+                result.append(self.maximum)
+            else:
+                position = int(np.searchsorted(cumulative, fraction * self.count, side="left"))
+                result.append(float(values[min(position, len(values) - 1)]))
+        return result
+
+    def quantile(self, fraction: float) -> Optional[float]:
+        return self.quantiles([fraction])[0]
+
+    def cdf(self, points: Sequence[float]) -> np.ndarray:
+        """Estimated fraction of values at or below each point."""
+
+        points = np.asarray(points, dtype=np.float64)
+        if not self.count:
+            return np.zeros(points.shape)
+        values, cumulative = self._sorted_weights()
+        positions = np.searchsorted(values, points, side="right")
+        return np.concatenate(([0], cumulative))[positions] / self.count
+
+    def _sorted_weights(self):
+        """Retained values in ascending order with their cumulative weights."""
+
+        values = np.concatenate([np.asarray(level, dtype=np.float64) for level in self._levels])
+        weights = np.concatenate([
+            np.full(len(level), 1 << height, dtype=np.int64)
+            for height, level in enumerate(self._levels)
+        ])
+        order = np.argsort(values, kind="stable")
+        return values[order], np.cumsum(weights[order])
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(int(math.ceil(self.k * SKETCH_DECAY ** depth)), 2)
+
+    def _grow(self):
+        self._levels.append([])
+        self._max_retained = sum(self._capacity(level) for level in range(len(self._levels)))
+
+    def _compress(self):
+        """Compact full levels from the bottom up until the sketch is within capacity."""
+
+        for level in range(len(self._levels)):
+            if len(self._levels[level]) < self._capacity(level):
+                continue
+            if level + 1 == len(self._levels):
+                self._grow()
+
+            values = sorted(self._levels[level])
+            # An odd value out stays behind; promoted values carry the weight of the ones dropped
+            kept = [values.pop()] if len(values) % 2 else []
+            self._levels[level] = kept
+            self._levels[level + 1].extend(values[self._random.getrandbits(1)::2])
+
+            self._retained = sum(map(len, self._levels))
+            if self._retained < self._max_retained:
+                break
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "k": self.k,
+            "count": self.count,
+            "total": self.total,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+            "levels": [list(level) for level in self._levels]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "KLLSketch":
+        sketch = cls(k=int(data["k"]))
+        sketch.count = int(data["count"])
+        sketch.total = float(data["total"])
+        sketch.minimum = data["minimum"]
+        sketch.maximum = data["maximum"]
+        sketch._levels = [[float(value) for value in level] for level in data["levels"]] or [[]]
+        sketch._max_retained = sum(sketch._capacity(level) for level in range(len(sketch._levels)))
+        sketch._retained = sum(map(len, sketch._levels))
+        return sketch
+
+
+def ks_distance(first: KLLSketch, second: KLLSketch) -> Optional[float]:
+    """Largest gap between two sketches' distribution functions (Kolmogorov-Smirnov statistic)."""
+
+    if not first.count or not second.count:
+        return None
+    points = np.unique(np.concatenate([
+        np.concatenate([np.asarray(level, dtype=np.float64) for level in sketch._levels])
+        for sketch in (first, second)
+    ]))
+    return float(np.max(np.abs(first.cdf(points) - second.cdf(points))))
+
+
+__all__ = [
+    "DEFAULT_SKETCH_K",
+    "KLLSketch",
+    "ks_distance"
+]
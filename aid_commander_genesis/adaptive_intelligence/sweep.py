@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Adaptive Intelligence Preference Sweep
+
+What-if evaluation of execution mode scores over a grid of user preference
+values. The concept is analyzed once; every preference combination is then
+scored in a single broadcast pass of the compiled mode scoring rules, giving a
+decision surface with one axis per swept preference that renders directly as a
+heatmap.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .models import ExecutionMode, ComplexityAnalysis, UserPreferences, ProjectContext
+from .scoring import MODE_ORDER, CompiledModeScoring
+
+
+# Preferences swept when no grid is given; rounded so grid points equal the literals rules compare against
+DEFAULT_SWEEP_GRID: Dict[str, np.ndarray] = {
+    "speed_vs_quality": np.round(np.linspace(0.0, 1.0, 21), 2),
+    "risk_tolerance": np.round(np.linspace(0.0, 1.0, 21), 2),
+    "team_size": np.arange(1, 11),
+    "confidence_threshold": np.round(np.linspace(0.5, 1.0, 11), 2)
+}
+
+
+@dataclass(frozen=True)
+class DecisionSurface:
+    """
+    Mode scores over a grid of preference values.
+
+    scores has shape (*shape, 4) with modes in MODE_ORDER column order; axis i
+    of the grid varies parameters[i] over axes[i].
+    """
+
+    parameters: Tuple[str, ...]
+    axes: Tuple[np.ndarray, ...]
+    scores: np.ndarray
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        return self.scores.shape[:-1]
+
+    @property
+    def modes(self) -> np.ndarray:
+        """Recommended mode per grid point as MODE_ORDER indexes, ties resolved like max()."""
+        return np.argmax(self.scores, axis=-1)
+
+    @property
+    def confidence(self) -> np.ndarray:
+        """Confidence score (the winning mode's score) per grid point."""
+        return self.scores.max(axis=-1)
+
+    def select(self, **values: Any) -> "DecisionSurface":
+        """Sub-surface with some parameters fixed to one of their grid values."""
+
+        index = []
+        parameters, axes = [], []
+        for parameter, axis in zip(self.parameters, self.axes):
+            if parameter not in values:
+                index.append(slice(None))
+                parameters.append(parameter)
+                axes.append(axis)
+                continue
+            positions = np.flatnonzero(axis == values.pop(parameter))
+            if not len(positions):
+                raise ValueError(f"{parameter} has no grid point at the requested value")
+            index.append(int(positions[0]))
+
+        if values:
+            raise ValueError(f"Parameters not swept: {sorted(values)}")
+        return DecisionSurface(tuple(parameters), tuple(axes), self.scores[tuple(index)])
+
+    def mode_at(self, **values: Any) -> ExecutionMode:
+        """Recommended mode at one grid point; every parameter must be given."""
+
+        point = self.select(**values)
+        if point.parameters:
+            raise ValueError(f"Missing values for parameters: {list(point.parameters)}")
+        return MODE_ORDER[int(point.modes)]
+
+    def mode_shares(self) -> Dict[ExecutionMode, float]:
+        """Fraction of grid points recommending each mode."""
+
+        counts = np.bincount(self.modes.ravel(), minlength=len(MODE_ORDER))
+        total = max(int(counts.sum()), 1)
+        return {mode: float(counts[index] / total) for index, mode in enumerate(MODE_ORDER)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable surface for heatmap rendering."""
+
+        return {
+            "parameters": list(self.parameters),
+            "axes": {parameter: axis.tolist() for parameter, axis in zip(self.parameters, self.axes)},
+            "mode_order": [mode.value for mode in MODE_ORDER],
+            "modes": self.modes.tolist(),
+            "confidence": self.confidence.tolist()
+        }
+
+
+def validated_axis(user_preferences: UserPreferences, parameter: str, values: Sequence[Any]) -> np.ndarray:
+    """Grid values of one preference, validated and coerced like UserPreferences fields."""
+
+    if parameter not in UserPreferences.model_fields:
+        raise ValueError(f"Unknown user preference: {parameter}")
+    if not len(values):
+        raise ValueError(f"Sweep values for {parameter} are empty")
+
+    base = user_preferences.model_dump()
+    coerced = [
+        getattr(UserPreferences.model_validate({**base, parameter: value}), parameter)
+        for value in values
+    ]
+    return np.asarray(coerced)
+
+
+def sweep_mode_scores(
+    scoring: CompiledModeScoring,
+    complexity_analysis: ComplexityAnalysis,
+    user_preferences: UserPreferences,
+    project_context: ProjectContext,
+    grid: Mapping[str, Sequence[Any]]
+) -> DecisionSurface:
+    """
+    Score all modes at every point of a preference grid.
+
+    Swept preferences become broadcast axes and every other field stays a
+    scalar, so memory grows with the grid only through the score array. Scores
+    equal scoring each grid point's UserPreferences individually.
+    """
+
+    parameters = tuple(grid)
+    axes = tuple(validated_axis(user_preferences, parameter, grid[parameter]) for parameter in parameters)
+    shape = tuple(len(axis) for axis in axes)
+
+    sources = {"analysis": complexity_analysis, "preferences": user_preferences, "context": project_context}
+    columns = {}
+    for field in scoring.fields:
+        source, _, attribute = field.partition(".")
+        if source == "preferences" and attribute in grid:
+            position = parameters.index(attribute)
+            broadcast_shape = [1] * len(shape)
+            broadcast_shape[position] = shape[position]
+            columns[field] = axes[position].reshape(broadcast_shape)
+        else:
+            columns[field] = np.asarray(getattr(sources[source], attribute))
+
+    return DecisionSurface(parameters, axes, scoring.score_columns(columns, shape))
+
+
+__all__ = [
+    "DEFAULT_SWEEP_GRID",
+    "DecisionSurface",
+    "sweep_mode_scores"
+]
@@ -9,6 +9,7 @@ idea-to-deployment workflow with adaptive intelligence.
 import asyncio
 import sys
 import json
+import math
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -25,10 +26,11 @@ from rich.syntax import Syntax
 
 # Genesis component imports
 from ..conceptcraft import ConceptCraftAI, ConceptDocument
-from ..adaptive_intelligence import AdaptiveIntelligenceEngine, ExecutionMode
+from ..adaptive_intelligence import AdaptiveIntelligenceEngine, ExecutionMode, UserPreferences
 from ..story_engine import StoryEnhancedPRDEngine
 from ..unified_validation import UnifiedValidationSystem
 from ..cross_project_learning import CrossProjectLearningEngine
+from ..storage import update_json
 
 console = Console()
 logger = structlog.get_logger(__name__)
@@ -95,11 +97,33 @@ class GenesisCommandLine:
         
         return default_config
     
-    def _save_config(self):
-        """Save current configuration."""
-        self.config_dir.mkdir(exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(self.config, f, indent=2)
+    def _user_preferences(self) -> UserPreferences:
+        """User preferences for adaptive planning, derived from Genesis settings."""
+        settings = self.config.get("settings", {})
+        preferences = {
+            key: value for key, value in settings.items()
+            if key in UserPreferences.model_fields
+        }
+        if "default_validation_level" in settings:
+            preferences.setdefault("validation_level", settings["default_validation_level"])
+        return UserPreferences(**preferences)
+    
+    def _save_config(self, **updates):
+        """
+        Save configuration updates.
+        
+        Other processes may have saved the configuration since it was loaded, so
+        updates are applied on top of the saved file under its lock and written
+        atomically; keys only known in memory (e.g. new defaults) are kept.
+        """
+        def apply(saved: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            config = dict(self.config)
+            if isinstance(saved, dict):
+                config.update(saved)
+            config.update(updates)
+            return config
+        
+        self.config = update_json(self.config_file, apply, indent=2)
     
     @property
     def conceptcraft_ai(self) -> ConceptCraftAI:
@@ -112,7 +136,7 @@ class GenesisCommandLine:
     def adaptive_intelligence(self) -> AdaptiveIntelligenceEngine:
         """Lazy load Adaptive Intelligence Engine."""
         if self._adaptive_intelligence is None:
-            self._adaptive_intelligence = AdaptiveIntelligenceEngine()
+            self._adaptive_intelligence = AdaptiveIntelligenceEngine(persist_cache=True)
         return self._adaptive_intelligence
     
     @property
@@ -150,9 +174,10 @@ class GenesisCommandLine:
             
             try:
                 # Update config
-                self.config["genesis_mode"] = mode
-                self.config["last_initialized"] = datetime.now().isoformat()
-                self._save_config()
+                self._save_config(
+                    genesis_mode=mode,
+                    last_initialized=datetime.now().isoformat()
+                )
                 
                 progress.update(init_task, description="✅ Genesis core initialized")
                 
@@ -241,14 +266,21 @@ class GenesisCommandLine:
         ))
         
         try:
+            # Index similar past projects and mine stored decisions before recommending
+            await self.adaptive_intelligence.initialize()
+            
+            # One session so the concept is analyzed once for the whole flow
+            session = self.adaptive_intelligence.create_analysis_session(concept_document)
+            
             # Analyze concept complexity
-            analysis = await self.adaptive_intelligence.analyze_concept_complexity(concept_document)
+            analysis = await self.adaptive_intelligence.analyze_concept_complexity(concept_document, session=session)
             
             # Determine execution mode
             execution_mode = await self.adaptive_intelligence.determine_execution_mode(
                 concept_document=concept_document,
-                user_preferences=self.config.get("settings", {}),
-                project_constraints={}
+                user_preferences=self._user_preferences(),
+                project_constraints={},
+                session=session
             )
             
             # Display recommendation
@@ -267,7 +299,7 @@ class GenesisCommandLine:
             recommendation_table.add_row("Stakeholder Count", str(len(concept_document.stakeholders.all())))
             recommendation_table.add_row("Story Richness", f"{analysis.story_richness:.1f}/10")
             recommendation_table.add_row("Recommended Mode", mode_descriptions[execution_mode])
-            recommendation_table.add_row("Confidence Level", f"{analysis.confidence_level:.1%}")
+            recommendation_table.add_row("Confidence Level", f"{analysis.analysis_confidence:.1%}")
             
             self.console.print(recommendation_table)
             
@@ -515,6 +547,286 @@ def develop_prd(ctx):
     asyncio.run(run_prd_generation())
 
 
+@main.group()
+def storage():
+    """Manage Genesis storage under ~/.aid_genesis."""
+    pass
+
+
+@storage.command("migrate-decisions")
+@click.option("--remove-source", is_flag=True, help="Delete migrated JSON files after a successful migration")
+@click.pass_context
+def storage_migrate_decisions(ctx, remove_source):
+    """Migrate one-file-per-decision JSON storage into the decision log."""
+    from ..adaptive_intelligence.decision_log import DecisionLog, migrate_json_directory
+    
+    source_directory = Path.home() / ".aid_genesis" / "adaptive_decisions"
+    if not source_directory.exists():
+        console.print("[yellow]No legacy decision directory found[/yellow]")
+        return
+    
+    decision_log = DecisionLog()
+    try:
+        results = migrate_json_directory(source_directory, decision_log, remove_source=remove_source)
+    finally:
+        decision_log.close()
+    
+    migration_table = Table(title="Decision Migration")
+    migration_table.add_column("Result", style="cyan")
+    migration_table.add_column("Files", style="white")
+    for result, count in results.items():
+        migration_table.add_row(result.title(), str(count))
+    console.print(migration_table)
+    
+    console.print(f"\nDecision log: {decision_log.directory}")
+
+
+@storage.command("load-history")
+@click.option("--workers", type=int, default=None, help="Worker processes (defaults to the CPU count)")
+@click.option("--chunk-size", type=int, default=512, help="Records validated per worker task")
+@click.pass_context
+def storage_load_history(ctx, workers, chunk_size):
+    """Bulk load all decisions and patterns and report throughput."""
+    from ..adaptive_intelligence.decision_log import DecisionLog
+    from ..adaptive_intelligence.loader import load_history
+    
+    genesis_directory = Path.home() / ".aid_genesis"
+    decision_log = DecisionLog(background_compaction=False)
+    try:
+        result = load_history(
+            decision_log,
+            genesis_directory / "adaptive_decisions",
+            genesis_directory / "cross_project_patterns",
+            workers=workers,
+            chunk_size=chunk_size
+        )
+    finally:
+        decision_log.close()
+    
+    load_table = Table(title="History Load")
+    load_table.add_column("Metric", style="cyan")
+    load_table.add_column("Value", style="white")
+    for metric, value in result.summary().items():
+        load_table.add_row(metric.replace("_", " ").title(), str(value))
+    console.print(load_table)
+
+
+@storage.command("retain")
+@click.option("--days", type=int, default=None, help="Days of full decision records to keep (defaults to 365)")
+@click.pass_context
+def storage_retain(ctx, days):
+    """Roll decisions older than the retention window into aggregates."""
+    
+    async def run_retention():
+        engine = AdaptiveIntelligenceEngine()
+        try:
+            result = await engine.apply_retention(retention_days=days)
+        finally:
+            await engine.shutdown()
+        
+        retention_table = Table(title="Decision Retention")
+        retention_table.add_column("Metric", style="cyan")
+        retention_table.add_column("Value", style="white")
+        retention_table.add_row("Cutoff", result.cutoff.isoformat(timespec="seconds"))
+        retention_table.add_row("Expired Decisions", str(result.expired))
+        retention_table.add_row("Aggregated Decisions", str(result.aggregated))
+        retention_table.add_row("Deleted Log Records", str(result.deleted_records))
+        retention_table.add_row("Deleted Legacy Files", str(result.deleted_files))
+        retention_table.add_row("Aggregate Buckets", str(result.buckets))
+        console.print(retention_table)
+    
+    asyncio.run(run_retention())
+
+
+@main.command("outcome")
+@click.argument("decision_id", required=False)
+@click.option("--project", default=None, help="Record the outcome of this project's latest decision instead")
+@click.option("--success/--failure", required=True, help="Whether the project succeeded")
+@click.option("--metric", "metrics", multiple=True, help="Measured success metric as name=value (repeatable)")
+@click.option("--lesson", "lessons", multiple=True, help="Lesson learned (repeatable)")
+@click.pass_context
+def outcome(ctx, decision_id, project, success, metrics, lessons):
+    """Record the outcome of a past decision so calibration and learning can use it."""
+    
+    if (decision_id is None) == (project is None):
+        raise click.UsageError("Give either a decision id or --project")
+    
+    measured = {}
+    for metric in metrics:
+        name, _, value = metric.partition("=")
+        try:
+            measured[name.strip()] = float(value)
+        except ValueError:
+            raise click.BadParameter(f"expected name=value, got {metric!r}", param_hint="--metric")
+    
+    async def run_outcome():
+        engine = AdaptiveIntelligenceEngine()
+        try:
+            target = decision_id or await engine.latest_decision_id(project)
+            if target is None:
+                console.print(f"[yellow]No stored decision for project {project}[/yellow]")
+                return
+            decision = await engine.record_outcome(target, success, measured, list(lessons))
+        except ValueError as e:
+            console.print(f"[yellow]{e}[/yellow]")
+            return
+        finally:
+            await engine.shutdown()
+        
+        result = "succeeded" if success else "failed"
+        console.print(
+            f"[green]Recorded that {decision.project_context.project_name} {result} "
+            f"(decision {decision.decision_id}, recommended {decision.recommendation.recommended_mode.value})[/green]"
+        )
+    
+    asyncio.run(run_outcome())
+
+
+@main.command("calibrate")
+@click.option("--candidates", type=int, default=4096, help="Candidate weight vectors to evaluate")
+@click.option("--seed", type=int, default=None, help="Random seed for candidate sampling")
+@click.option("--dry-run", is_flag=True, help="Report the fit without saving a calibration artifact")
+@click.pass_context
+def calibrate(ctx, candidates, seed, dry_run):
+    """Fit complexity weights and mode thresholds to recorded decision outcomes."""
+    
+    async def run_calibration():
+        engine = AdaptiveIntelligenceEngine()
+        previous_weights = dict(engine.complexity_weights)
+        try:
+            result = await engine.calibrate(candidates=candidates, seed=seed, save=not dry_run)
+        except ValueError as e:
+            console.print(f"[yellow]{e}[/yellow]")
+            return
+        finally:
+            await engine.shutdown()
+        
+        weights_table = Table(title="Complexity Weights")
+        weights_table.add_column("Dimension", style="cyan")
+        weights_table.add_column("Current", style="white")
+        weights_table.add_column("Fitted", style="green")
+        for dimension, weight in result.complexity_weights.items():
+            weights_table.add_row(dimension.replace("_", " ").title(), f"{previous_weights[dimension]:.2f}", f"{weight:.2f}")
+        console.print(weights_table)
+        
+        console.print(
+            f"\nThresholds: lightweight ≤ {result.lightweight_max_complexity:.2f}, "
+            f"hybrid ≤ {result.hybrid_max_complexity:.2f}"
+        )
+        console.print(
+            f"Outcome agreement: {result.baseline_agreement:.1%} → {result.agreement:.1%} "
+            f"over {result.decisions} decisions ({result.candidates} configurations in {result.elapsed_seconds:.2f}s)"
+        )
+        if not result.improved:
+            console.print("[yellow]No configuration improved on the current one[/yellow]")
+        elif dry_run:
+            console.print("[yellow]Dry run: calibration not saved[/yellow]")
+        else:
+            console.print(f"[green]Saved calibration version {engine.calibration_version}[/green]")
+    
+    asyncio.run(run_calibration())
+
+
+@main.command("compile-policy")
+@click.pass_context
+def compile_policy(ctx):
+    """Compile mode scoring into a lookup table that worker processes memory-map."""
+    
+    engine = AdaptiveIntelligenceEngine()
+    try:
+        table = engine.compile_mode_policy()
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+    
+    policy_table = Table(title="Mode Policy")
+    policy_table.add_column("Mode", style="cyan")
+    policy_table.add_column("Fields", style="white")
+    policy_table.add_column("Cells", style="white")
+    for mode, fields in table.fields.items():
+        policy_table.add_row(mode.value, ", ".join(fields), str(math.prod(table.mode_shape(mode))))
+    console.print(policy_table)
+    
+    console.print(
+        f"\n[green]Compiled {table.cells} cells for rules {table.fingerprint} "
+        f"(calibration version {engine.calibration_version or 'default'}), verified against the reference scorers[/green]"
+    )
+
+
+@main.command("drift")
+@click.option("--baseline-windows", type=int, default=7, help="Preceding windows merged into the drift baseline")
+@click.option("--threshold", type=float, default=0.2, help="Distribution distance that raises an alert")
+@click.pass_context
+def drift(ctx, baseline_windows, threshold):
+    """Show analysis distributions of the current window and check them for drift."""
+    
+    engine = AdaptiveIntelligenceEngine()
+    window = engine.analysis_distributions()[0]
+    
+    distribution_table = Table(title=f"Analyses since {window['window_start']}")
+    distribution_table.add_column("Mode", style="cyan")
+    distribution_table.add_column("Analyses", style="white")
+    for metric in ("complexity_score", "uncertainty_level", "analysis_confidence"):
+        distribution_table.add_column(f"{metric.replace('_', ' ').title()} p05 / p50 / p95", style="white")
+    for mode, distribution in window["modes"].items():
+        distribution_table.add_row(mode, str(distribution["count"]), *(
+            " / ".join(f"{quantiles[name]:.2f}" for name in ("p05", "p50", "p95"))
+            for quantiles in distribution["metrics"].values()
+        ))
+    console.print(distribution_table)
+    
+    alerts = engine.check_distribution_drift(baseline_windows=baseline_windows, threshold=threshold)
+    if not alerts:
+        console.print("[green]No drift from the preceding windows[/green]")
+    for alert in alerts:
+        subject = alert.metric if alert.mode is None else f"{alert.mode.value} {alert.metric}"
+        console.print(
+            f"[yellow]Drift in {subject}: distance {alert.distance:.2f} over {alert.samples} analyses "
+            f"vs {alert.baseline_samples} in {alert.baseline_windows} windows[/yellow]"
+        )
+
+
+@main.command("replay")
+@click.option("--calibration", "calibration_file", type=click.Path(exists=True, dir_okay=False), default=None,
+              help="Calibration artifact to replay instead of the current configuration")
+@click.option("--workers", type=int, default=None, help="Parallel replay workers (defaults to the CPU count)")
+@click.pass_context
+def replay(ctx, calibration_file, workers):
+    """Count historical recommendations that would change under a scoring configuration."""
+    
+    calibration = None
+    if calibration_file:
+        with open(calibration_file, 'r') as f:
+            calibration = json.load(f)
+    
+    async def run_replay():
+        engine = AdaptiveIntelligenceEngine()
+        try:
+            result = await engine.replay_decisions(calibration=calibration, workers=workers)
+        finally:
+            await engine.shutdown()
+        
+        summary = result.to_dict()
+        confusion_table = Table(title="Recorded (rows) vs Replayed (columns) Mode")
+        confusion_table.add_column("Recorded", style="cyan")
+        for mode in summary["modes"]:
+            confusion_table.add_column(mode, style="white")
+        for mode, counts in zip(summary["modes"], summary["confusion"]):
+            confusion_table.add_row(mode, *(str(count) for count in counts))
+        console.print(confusion_table)
+        
+        console.print(
+            f"\nFlipped: {result.flipped} of {result.decisions} decisions ({result.flip_rate:.1%}) "
+            f"in {result.elapsed_seconds:.2f}s"
+        )
+        console.print(
+            f"Known outcomes of flipped decisions: {result.flipped_outcomes['success']} succeeded, "
+            f"{result.flipped_outcomes['failure']} failed"
+        )
+    
+    asyncio.run(run_replay())
+
+
 @main.command("info")
 @click.pass_context
 def info(ctx):
@@ -8,7 +8,6 @@ Implements the 3-level process: Foundation → Stress-Testing → Enhancement.
 
 import asyncio
 import uuid
-import json
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
@@ -30,6 +29,7 @@ from .models import (
     Enhancement,
     ValidationLevel
 )
+from ..storage import atomic_write_json
 
 logger = structlog.get_logger(__name__)
 
@@ -731,8 +731,7 @@ class ConceptCraftAI:
                 "saved_at": datetime.now().isoformat()
             }
             
-            with open(session_file, 'w') as f:
-                json.dump(session_data, f, indent=2, default=str)
+            atomic_write_json(session_file, session_data, indent=2, default=str)
                 
             self.logger.info("Session saved", session_id=conversation_state.session_id)
             
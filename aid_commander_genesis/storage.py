@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+AID Commander Genesis Storage Primitives
+
+Multi-process-safe file writes for the ~/.aid_genesis tree, which many worker
+processes on one host share. Whole files are replaced atomically (written to a
+unique temporary file in the same directory, fsynced, then renamed over the
+target), read-modify-write cycles serialize on advisory locks, and log records
+are appended through O_APPEND descriptors with one write per batch.
+
+Locks are POSIX flock() locks: they are released when the holding process
+exits, so a crashed writer never leaves a stale lock behind. On platforms
+without fcntl, locks only serialize threads of the current process.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+
+PathLike = Union[str, Path]
+
+# Suffix of the lock file guarding a path
+LOCK_SUFFIX = ".lock"
+
+# Permissions of files created by this module (before the umask)
+FILE_MODE = 0o644
+
+# Serializes lock holders within this process where flock() is unavailable
+_process_lock = threading.RLock()
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once: reading the umask briefly changes it for every thread
+_UMASK = _read_umask()
+
+
+def lock_path(path: PathLike) -> Path:
+    """Lock file guarding a path."""
+    path = Path(path)
+    return path.with_name(path.name + LOCK_SUFFIX)
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename; not all platforms can open directories."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_all(fd: int, data: bytes):
+    """Write all of data to a descriptor (regular files take it in one write)."""
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def atomic_write_bytes(path: PathLike, data: bytes, overwrite: bool = True, durable: bool = True):
+    """
+    Replace a file's content atomically.
+
+    Readers see either the old or the new content, never a partial write.
+    With overwrite=False the file is published with link() instead of
+    rename(), which raises FileExistsError if another writer got there first.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                # mkstemp() creates owner-only files
+                os.fchmod(fd, FILE_MODE & ~_UMASK)
+            write_all(fd, data)
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        if overwrite:
+            os.replace(temporary, path)
+        else:
+            os.link(temporary, path)
+            os.unlink(temporary)
+    except BaseException:
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+        raise
+    if durable:
+        _fsync_directory(path.parent)
+
+
+def atomic_write_json(path: PathLike, data: Any, overwrite: bool = True, durable: bool = True, **dump_options):
+    """Serialize data as JSON and replace a file with it atomically."""
+    atomic_write_bytes(path, json.dumps(data, **dump_options).encode("utf-8"), overwrite=overwrite, durable=durable)
+
+
+@contextmanager
+def file_lock(path: PathLike, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on a path for the duration of a block.
+
+    The lock lives on a separate lock file next to the path, so the guarded
+    file itself can be replaced atomically while the lock is held.
+    """
+
+    lock_file = lock_path(path)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, FILE_MODE)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            yield
+        else:
+            with _process_lock:
+                yield
+    finally:
+        # Closing the descriptor releases the flock
+        os.close(fd)
+
+
+def try_lock(fd: int) -> bool:
+    """Take an exclusive lock on an open descriptor without blocking."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def open_append(path: PathLike, create: bool = True, exclusive: bool = False) -> int:
+    """
+    Open a descriptor whose writes always land at the end of the file.
+
+    Each os.write() through it is appended atomically with respect to other
+    O_APPEND writers, so a batch of records written in one call never
+    interleaves with another process's records. exclusive fails if the file
+    already exists; without create, if it does not.
+    """
+
+    flags = os.O_WRONLY | os.O_APPEND
+    if create:
+        flags |= os.O_CREAT
+    if exclusive:
+        flags |= os.O_EXCL
+    return os.open(path, flags, FILE_MODE)
+
+
+def update_json(
+    path: PathLike,
+    update: Callable[[Any], Any],
+    default: Optional[Callable[[], Any]] = None,
+    **dump_options
+) -> Any:
+    """
+    Read-modify-write a JSON file under its lock and return the new content.
+
+    update receives the current content (default() if the file is missing or
+    unreadable) and returns the content to write; concurrent updates from other
+    processes are applied one after another instead of overwriting each other.
+    """
+
+    path = Path(path)
+    with file_lock(path):
+        try:
+            with open(path, 'r') as f:
+                current = json.load(f)
+        except (OSError, ValueError):
+            current = default() if default is not None else None
+        updated = update(current)
+        atomic_write_json(path, updated, **dump_options)
+    return updated
+
+
+__all__ = [
+    "atomic_write_bytes",
+    "atomic_write_json",
+    "file_lock",
+    "lock_path",
+    "open_append",
+    "try_lock",
+    "update_json",
+    "write_all"
+]
@@ -383,6 +383,1997 @@ async def test_integration_workflow():
                  "Debug component interfaces and data flow")
         return False
 
+def build_sample_concepts() -> List[Any]:
+    """Build a small set of concept documents with varying complexity."""
+    from aid_commander_genesis.conceptcraft.models import (
+        ConceptDocument, StakeholderStory, StakeholderType, StakeholderEcosystem,
+        ChallengeResolution, Enhancement, ValidationLevel
+    )
+    
+    def story(name: str, stakeholder_type: StakeholderType, experience: str, value: str, confidence: float):
+        return StakeholderStory(
+            stakeholder_name=name,
+            stakeholder_type=stakeholder_type,
+            role_description=f"{name} using the platform",
+            current_situation="Manual spreadsheets and disconnected tools slow everything down",
+            pain_points=["Duplicate data entry", "No visibility"],
+            enhanced_experience=experience,
+            value_delivered=value,
+            success_indicators=["Hours saved per week"],
+            story_confidence=confidence
+        )
+    
+    concepts = [
+        ConceptDocument(
+            concept_id="sample-simple",
+            concept_name="Simple Tracker",
+            concept_description="A tracker for personal habits",
+            validation_level=ValidationLevel.FOUNDATION
+        )
+    ]
+    
+    for index, confidence in enumerate([0.9, 0.6]):
+        concepts.append(ConceptDocument(
+            concept_id=f"sample-platform-{index}",
+            concept_name=f"Partner Platform {index}",
+            concept_description="A new platform that connects suppliers and retailers in real-time",
+            stakeholders=StakeholderEcosystem(
+                primary_stakeholders=[
+                    story("Retailer", StakeholderType.PRIMARY,
+                          "Real-time API sync with their ERP and CRM", "faster restocking and revenue", confidence),
+                    story("Supplier", StakeholderType.PRIMARY,
+                          "A novel AI forecast of demand", "faster restocking with less waste", confidence)
+                ],
+                secondary_stakeholders=[
+                    story("Logistics", StakeholderType.SECONDARY,
+                          "Import delivery schedules automatically", "fewer missed deliveries", 0.7)
+                ]
+            ),
+            challenges_resolved=[
+                ChallengeResolution(
+                    challenge_id=f"challenge-{index}-{n}",
+                    challenge_scenario="Suppliers resist sharing data with competitors",
+                    solution_approach="Pricing tiers and an anonymized market benchmark",
+                    concept_evolution="Added a database of anonymized signals"
+                )
+                for n in range(index + 1)
+            ],
+            enhancements=[
+                Enhancement(
+                    enhancement_id=f"enhancement-{index}",
+                    enhancement_type="network effects",
+                    description="Breakthrough shared demand signals across the network",
+                    implementation_approach="Third-party platform integration",
+                    success_amplification="Every new retailer improves forecasts"
+                )
+            ],
+            validation_level=ValidationLevel.STRESS_TESTED,
+            competitive_differentiation="Only platform combining supplier and retailer demand signals",
+            success_metrics=["Stockouts reduced", "Waste reduced"],
+            concept_maturity=0.6
+        ))
+    
+    return concepts
+
+async def test_batch_complexity_analysis():
+    """Test that batch complexity analysis matches single-document analysis"""
+    print("\n🧪 Testing Batch Complexity Analysis...")
+    
+    try:
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        
+        engine = AdaptiveIntelligenceEngine()
+        concepts = build_sample_concepts()
+        
+        single_results = [await engine.analyze_concept_complexity(concept) for concept in concepts]
+        batch_results = await engine.analyze_concepts_batch(concepts)
+        
+        mismatches = [
+            concept.concept_id
+            for concept, single, batch in zip(concepts, single_results, batch_results)
+            if single.dict(exclude={"analysis_timestamp"}) != batch.dict(exclude={"analysis_timestamp"})
+        ]
+        
+        if len(batch_results) == len(concepts) and not mismatches:
+            log_test("Batch Complexity Analysis", "PASS",
+                    f"{len(concepts)} concepts scored identically to single-document path")
+        else:
+            log_test("Batch Complexity Analysis", "FAIL", f"Mismatched concepts: {mismatches}")
+        
+        return not mismatches
+        
+    except Exception as e:
+        log_test("Batch Complexity Analysis", "FAIL", "Batch analysis failed", str(e))
+        return False
+
+async def test_incremental_analysis():
+    """Test that incremental analysis under random edits matches a full analysis"""
+    print("\n🧪 Testing Incremental Analysis...")
+    
+    try:
+        import random
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        from aid_commander_genesis.conceptcraft.models import (
+            StakeholderStory, StakeholderType, ChallengeResolution, Enhancement
+        )
+        
+        engine = AdaptiveIntelligenceEngine()
+        rng = random.Random(5)
+        words = ["real-time", "api", "sync", "revenue", "novel", "forecast", "waste", "team", "pricing", "data"]
+        
+        def text(length):
+            return " ".join(rng.choice(words) for _ in range(length))
+        
+        def story(index):
+            tier = rng.choice(["primary", "secondary", "tertiary"])
+            return tier, StakeholderStory(
+                stakeholder_name=f"Stakeholder {index}",
+                stakeholder_type=StakeholderType(tier),
+                role_description=text(3),
+                current_situation=text(5),
+                goals=[text(3) for _ in range(rng.randint(0, 2))],
+                enhanced_experience=text(6),
+                value_delivered=text(4),
+                story_confidence=rng.uniform(0.3, 1.0)
+            )
+        
+        mismatched = 0
+        edits = 0
+        for document_index in range(40):
+            concept = build_sample_concepts()[1 + document_index % 2].model_copy(deep=True)
+            incremental = engine.create_incremental_analysis(concept)
+            for edit in range(6):
+                choice = rng.randrange(5)
+                if choice == 0:
+                    incremental.add_stakeholder(*reversed(story(edit)))
+                elif choice == 1:
+                    incremental.add_core_story(story(edit)[1])
+                elif choice == 2:
+                    incremental.add_challenge(ChallengeResolution(
+                        challenge_id=f"random-{document_index}-{edit}",
+                        challenge_scenario=text(6), solution_approach=text(5), concept_evolution=text(4)
+                    ))
+                elif choice == 3:
+                    incremental.add_enhancement(Enhancement(
+                        enhancement_id=f"random-{document_index}-{edit}", enhancement_type="network effects",
+                        description=text(6), implementation_approach=text(4), success_amplification=text(3)
+                    ))
+                else:
+                    incremental.update_field("concept_description", text(8))
+                edits += 1
+            
+            full = await engine.analyze_concept_complexity(concept)
+            if incremental.analysis.dict(exclude={"analysis_timestamp"}) != full.dict(exclude={"analysis_timestamp"}):
+                mismatched += 1
+        
+        if not mismatched:
+            log_test("Incremental Analysis", "PASS", f"40 documents after {edits} random edits match full analyses exactly")
+        else:
+            log_test("Incremental Analysis", "FAIL", f"{mismatched} of 40 edited documents differ from a full analysis")
+        
+        return not mismatched
+        
+    except Exception as e:
+        log_test("Incremental Analysis", "FAIL", "Incremental analysis failed", str(e))
+        return False
+
+async def test_streamed_concept_analysis():
+    """Test that streamed concept analysis matches in-memory analysis exactly"""
+    print("\n🧪 Testing Streamed Concept Analysis...")
+    
+    try:
+        import io
+        import random
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        from aid_commander_genesis.conceptcraft.models import ConceptDocument, StakeholderStory, StakeholderType
+        
+        engine = AdaptiveIntelligenceEngine()
+        rng = random.Random(23)
+        words = ["real-time", "api", "sync", "revenue", "novel", "forecast", "waste", "team", "pricing", "\u00e9t\u00e9", "\"quoted\"", "a\\b"]
+        
+        def text(length):
+            return " ".join(rng.choice(words) for _ in range(length))
+        
+        concepts = []
+        for index in range(200):
+            concept = build_sample_concepts()[index % 3].model_copy(deep=True)
+            concept.concept_description = text(rng.randint(0, 12))
+            for tier in ("primary", "secondary", "tertiary"):
+                for number in range(rng.randint(0, 4)):
+                    getattr(concept.stakeholders, f"{tier}_stakeholders").append(StakeholderStory(
+                        stakeholder_name=f"{tier} {number}",
+                        stakeholder_type=StakeholderType(tier),
+                        role_description=text(3),
+                        current_situation=text(4),
+                        goals=[text(3) for _ in range(rng.randint(0, 3))],
+                        enhanced_experience=text(rng.randint(0, 8)),
+                        value_delivered=text(rng.randint(0, 6)),
+                        story_confidence=rng.uniform(0.2, 1.0)
+                    ))
+            concepts.append(concept)
+        
+        mismatched = []
+        for index, concept in enumerate(concepts):
+            payload = concept.model_dump_json().encode("utf-8")
+            # Parsing fills defaults such as core stories, exactly as streaming does
+            parsed = ConceptDocument.model_validate_json(payload)
+            expected = (await engine.analyze_concept_complexity(parsed)).dict(exclude={"analysis_timestamp"})
+            # Tiny chunks split tokens, escapes and multi-byte characters across reads
+            for chunk_bytes in (7, 64, 1 << 16):
+                streamed = await engine.analyze_concept_stream(io.BytesIO(payload), chunk_bytes=chunk_bytes)
+                if streamed.dict(exclude={"analysis_timestamp"}) != expected:
+                    mismatched.append((index, chunk_bytes))
+        
+        if not mismatched:
+            log_test("Streamed Concept Analysis", "PASS",
+                    f"{len(concepts)} documents streamed in 7, 64 and 65536 byte chunks match in-memory analyses exactly")
+        else:
+            log_test("Streamed Concept Analysis", "FAIL", f"{len(mismatched)} mismatched analyses, first {mismatched[:3]}")
+        
+        return not mismatched
+        
+    except Exception as e:
+        log_test("Streamed Concept Analysis", "FAIL", "Streamed concept analysis failed", str(e))
+        return False
+
+async def test_keyword_lexicons():
+    """Test keyword lexicon matching, word boundaries and lexicons.json overrides"""
+    print("\n🧪 Testing Keyword Lexicons...")
+    
+    try:
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.lexicon import (
+            KEYWORD_LEXICONS, LONG_TEXT_THRESHOLD, KeywordAutomaton, build_keyword_automaton, load_lexicon_config
+        )
+        
+        failures = []
+        lexicons = {"tech": ["API", "real", "real-time", "machine learning"], "plan": ["time", "plan"]}
+        plain = KeywordAutomaton(lexicons)
+        bounded = KeywordAutomaton(lexicons, word_boundaries=True)
+        
+        text = "our capital plans need real-time machine learning"
+        if plain.scan(text) != {"tech": {"api", "real", "real-time", "machine learning"}, "plan": {"time", "plan"}}:
+            failures.append(f"plain scan: {plain.scan(text)}")
+        # Overlapping keywords are all reported; embedded ones are not
+        if bounded.scan(text) != {"tech": {"real", "real-time", "machine learning"}, "plan": {"time"}}:
+            failures.append(f"bounded scan: {bounded.scan(text)}")
+        if bounded.hit_counts("api_key and the api") != {"tech": 1, "plan": 0}:
+            failures.append(f"bounded underscore: {bounded.hit_counts('api_key and the api')}")
+        if bounded.hit_counts("api_key") != {"tech": 0, "plan": 0}:
+            failures.append("word characters include underscores")
+        
+        # Long texts match per distinct token, with phrases searched in the full text
+        long_text = "capital planning " * (LONG_TEXT_THRESHOLD // 16) + "machine\nlearning real-time"
+        if bounded.scan(long_text) != {"tech": {"real", "real-time"}, "plan": {"time"}}:
+            failures.append(f"long bounded scan: {bounded.scan(long_text)}")
+        if plain.scan(long_text) != {"tech": {"api", "real", "real-time"}, "plan": {"time", "plan"}}:
+            failures.append(f"long plain scan: {plain.scan(long_text)}")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            config_path = Path(directory) / "lexicons.json"
+            config_path.write_text(json.dumps({
+                "word_boundaries": True,
+                "lexicons": {"integration": ["API", "webhook"], "compliance": ["hipaa", "gdpr"]}
+            }))
+            loaded, word_boundaries = load_lexicon_config(config_path)
+            if not word_boundaries or loaded["integration"] != ("API", "webhook") or loaded["compliance"] != ("hipaa", "gdpr"):
+                failures.append(f"config not applied: {loaded}, {word_boundaries}")
+            if loaded["novelty"] != KEYWORD_LEXICONS["novelty"]:
+                failures.append("unlisted lexicons should keep their defaults")
+            
+            automaton = build_keyword_automaton(config_path)
+            if automaton.hit_counts("gdpr webhooks for the api")["integration"] != 1 or not automaton.word_boundaries:
+                failures.append(f"configured automaton: {automaton.hit_counts('gdpr webhooks for the api')}")
+            if automaton.fingerprint() == KeywordAutomaton(loaded).fingerprint():
+                failures.append("fingerprint ignores word boundaries")
+            
+            config_path.write_text("{not json")
+            if load_lexicon_config(config_path) != (dict(KEYWORD_LEXICONS), False):
+                failures.append("invalid config should fall back to the defaults")
+        
+        if not failures:
+            log_test("Keyword Lexicons", "PASS", "Plain, word-boundary and long-text matching agree; lexicons.json overrides load")
+        else:
+            log_test("Keyword Lexicons", "FAIL", "; ".join(failures))
+        
+        return not failures
+        
+    except Exception as e:
+        log_test("Keyword Lexicons", "FAIL", "Keyword lexicon matching failed", str(e))
+        return False
+
+async def test_mode_scoring_rules():
+    """Test that the compiled mode scoring rule table matches the reference scorers"""
+    print("\n🧪 Testing Mode Scoring Rule Table...")
+    
+    try:
+        import random
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        from aid_commander_genesis.adaptive_intelligence.models import ComplexityAnalysis, UserPreferences, ProjectContext
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER
+        
+        engine = AdaptiveIntelligenceEngine()
+        rng = random.Random(42)
+        
+        # Include exact threshold values so boundary comparisons are exercised
+        def pick(boundaries, low, high):
+            return rng.choice(boundaries) if rng.random() < 0.3 else rng.uniform(low, high)
+        
+        analyses, preferences, contexts = [], [], []
+        for _ in range(500):
+            analyses.append(ComplexityAnalysis(
+                complexity_score=pick([4.0, 5.0, 6.0, 7.0], 0.0, 10.0),
+                stakeholder_complexity=0.0, technical_complexity=0.0, business_complexity=0.0,
+                integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,
+                stakeholder_alignment=0.0, uncertainty_level=pick([7.0], 0.0, 10.0),
+                analysis_confidence=rng.random()
+            ))
+            preferences.append(UserPreferences(
+                risk_tolerance=pick([0.3, 0.7], 0.0, 1.0),
+                speed_vs_quality=pick([0.3, 0.4, 0.6, 0.7], 0.0, 1.0),
+                ai_experience_level=rng.randint(1, 10),
+                time_constraints=rng.choice(["tight", "moderate", "flexible"]),
+                budget_constraints=rng.choice(["tight", "moderate", "flexible"]),
+                team_size=rng.randint(1, 8),
+                validation_level=rng.choice(["standard", "high", "enterprise"]),
+                confidence_threshold=pick([0.9], 0.0, 1.0),
+                learning_mode=rng.random() < 0.5,
+                experimentation_willingness=pick([0.7], 0.0, 1.0)
+            ))
+            contexts.append(ProjectContext(
+                project_name="Rule table sample",
+                project_description="Randomized scoring inputs",
+                stakeholder_count=rng.randint(1, 8),
+                innovation_level=pick([0.5, 0.7], 0.0, 1.0)
+            ))
+        
+        scorers = {
+            mode: getattr(engine, f"_score_{mode.value}_mode")
+            for mode in MODE_ORDER
+        }
+        
+        batch_scores = engine.score_modes_batch(analyses, preferences, contexts)
+        
+        mismatches = 0
+        for row, (analysis, preference, context) in enumerate(zip(analyses, preferences, contexts)):
+            for column, mode in enumerate(MODE_ORDER):
+                if scorers[mode](analysis, preference, context) != batch_scores[row, column]:
+                    mismatches += 1
+        
+        if batch_scores.shape == (len(analyses), len(MODE_ORDER)) and not mismatches:
+            log_test("Mode Scoring Rule Table", "PASS",
+                    f"{len(analyses)} triples x {len(MODE_ORDER)} modes match reference scorers exactly")
+        else:
+            log_test("Mode Scoring Rule Table", "FAIL", f"{mismatches} mismatched scores")
+        
+        return not mismatches
+        
+    except Exception as e:
+        log_test("Mode Scoring Rule Table", "FAIL", "Rule table scoring failed", str(e))
+        return False
+
+async def test_mode_policy_table():
+    """Test the compiled mode policy lookup table against the reference scorers"""
+    print("\n🧪 Testing Mode Policy Table...")
+    
+    try:
+        import random
+        import tempfile
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        from aid_commander_genesis.adaptive_intelligence.models import ComplexityAnalysis, UserPreferences, ProjectContext
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER, mode_scoring_rules
+        from aid_commander_genesis.adaptive_intelligence.policy import (
+            compile_mode_policy, load_mode_policy, save_mode_policy
+        )
+        
+        engine = AdaptiveIntelligenceEngine()
+        scorers = {
+            mode: getattr(engine, f"_score_{mode.value}_mode")
+            for mode in MODE_ORDER
+        }
+        
+        # Every cell of every mode grid must agree with the reference scorers
+        table = compile_mode_policy(engine.mode_scoring.tables)
+        cell_mismatches = table.verify(scorers)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            save_mode_policy(table, directory)
+            loaded = load_mode_policy(engine.mode_scoring.tables, directory)
+            memory_mapped = loaded is not None and isinstance(loaded.scores, np.memmap)
+            
+            # Tables compiled for other thresholds are never picked up
+            other_rules = load_mode_policy(mode_scoring_rules(3.5, 6.5), directory)
+            
+            rng = random.Random(7)
+            
+            def pick(boundaries, low, high):
+                return rng.choice(boundaries) if rng.random() < 0.3 else rng.uniform(low, high)
+            
+            mismatches = 0
+            for _ in range(500):
+                analysis = ComplexityAnalysis(
+                    complexity_score=pick([4.0, 5.0, 6.0, 7.0], 0.0, 10.0),
+                    stakeholder_complexity=0.0, technical_complexity=0.0, business_complexity=0.0,
+                    integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,
+                    stakeholder_alignment=0.0, uncertainty_level=pick([7.0], 0.0, 10.0),
+                    analysis_confidence=rng.random()
+                )
+                preference = UserPreferences(
+                    risk_tolerance=pick([0.3, 0.7], 0.0, 1.0),
+                    speed_vs_quality=pick([0.3, 0.4, 0.6, 0.7], 0.0, 1.0),
+                    ai_experience_level=rng.randint(1, 10),
+                    time_constraints=rng.choice(["tight", "moderate", "flexible"]),
+                    budget_constraints=rng.choice(["tight", "moderate", "flexible"]),
+                    team_size=rng.randint(1, 8),
+                    validation_level=rng.choice(["standard", "high", "enterprise", "custom"]),
+                    confidence_threshold=pick([0.9], 0.0, 1.0),
+                    learning_mode=rng.random() < 0.5,
+                    experimentation_willingness=pick([0.7], 0.0, 1.0)
+                )
+                context = ProjectContext(
+                    project_name="Policy table sample",
+                    project_description="Randomized scoring inputs",
+                    stakeholder_count=rng.randint(1, 8),
+                    innovation_level=pick([0.5, 0.7], 0.0, 1.0)
+                )
+                
+                expected = {mode: scorers[mode](analysis, preference, context) for mode in MODE_ORDER}
+                recommended_mode = max(expected, key=expected.get)
+                if loaded.mode_scores(analysis, preference, context) != expected:
+                    mismatches += 1
+                elif loaded.recommend(analysis, preference, context) != (recommended_mode, expected[recommended_mode]):
+                    mismatches += 1
+        
+        if not cell_mismatches and not mismatches and memory_mapped and other_rules is None:
+            log_test("Mode Policy Table", "PASS",
+                    f"{table.cells} cells verified; 500 lookups from the memory-mapped table match reference scorers")
+        else:
+            log_test("Mode Policy Table", "FAIL",
+                    f"{cell_mismatches} cell and {mismatches} lookup mismatches, memory mapped: {memory_mapped}")
+        
+        return not cell_mismatches and not mismatches
+        
+    except Exception as e:
+        log_test("Mode Policy Table", "FAIL", "Mode policy table failed", str(e))
+        return False
+
+async def test_distribution_monitoring():
+    """Test quantile sketch accuracy, cross-process window merging and drift alerts"""
+    print("\n🧪 Testing Distribution Monitoring...")
+    
+    try:
+        import random
+        import subprocess
+        import tempfile
+        import time
+        from aid_commander_genesis.adaptive_intelligence.models import ComplexityAnalysis, ExecutionMode
+        from aid_commander_genesis.adaptive_intelligence.sketch import KLLSketch
+        from aid_commander_genesis.adaptive_intelligence.monitoring import DistributionMonitor, window_start
+        
+        rng = random.Random(11)
+        
+        # Sketches of two halves merged answer like one sketch of the whole stream
+        values = [rng.gauss(5.0, 1.5) for _ in range(50000)]
+        first, second = KLLSketch(seed=1), KLLSketch(seed=2)
+        for index, value in enumerate(values):
+            (first if index % 2 else second).update(value)
+        first.merge(second)
+        ordered = sorted(values)
+        rank_error = max(
+            abs(sum(1 for value in ordered if value <= first.quantile(q)) / len(values) - q)
+            for q in (0.05, 0.5, 0.95)
+        )
+        
+        def analysis(center):
+            return ComplexityAnalysis(
+                complexity_score=min(max(rng.gauss(center, 1.0), 0.0), 10.0),
+                stakeholder_complexity=0.0, technical_complexity=0.0, business_complexity=0.0,
+                integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,
+                stakeholder_alignment=0.0, uncertainty_level=rng.uniform(0.0, 10.0),
+                analysis_confidence=rng.uniform(0.5, 1.0)
+            )
+        
+        with tempfile.TemporaryDirectory() as directory:
+            now = time.time()
+            day = 86400
+            current = window_start(now, day)
+            
+            # Two monitors stand in for worker processes sharing the window files
+            workers = [DistributionMonitor(directory, window_seconds=day) for _ in range(2)]
+            for worker in workers:
+                for days_ago in range(1, 4):
+                    for _ in range(100):
+                        worker.record(ExecutionMode.HYBRID, analysis(4.0), current - days_ago * day)
+                for _ in range(100):
+                    worker.record(ExecutionMode.HYBRID, analysis(7.0), current)
+                worker.flush()
+            
+            monitor = DistributionMonitor(directory, window_seconds=day)
+            windows = monitor.summary(4, now)
+            alerts = monitor.check_drift(baseline_windows=3, now=now)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            # A due flush runs on the writer thread, not inside record()
+            background = DistributionMonitor(directory, window_seconds=day, flush_seconds=0)
+            background.record(ExecutionMode.LIGHTWEIGHT, analysis(2.0), now)
+            background._scheduled.result(timeout=10)
+            background_flushed = DistributionMonitor(directory, window_seconds=day).load_window(current).count == 1
+            
+            # A process that exits without flushing still writes its analyses
+            script = (
+                "import sys\n"
+                "from aid_commander_genesis.adaptive_intelligence.models import ComplexityAnalysis, ExecutionMode\n"
+                "from aid_commander_genesis.adaptive_intelligence.monitoring import DistributionMonitor\n"
+                "monitor = DistributionMonitor(sys.argv[1], window_seconds=86400)\n"
+                "analysis = ComplexityAnalysis(complexity_score=5.0, stakeholder_complexity=0.0, technical_complexity=0.0,\n"
+                "    business_complexity=0.0, integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,\n"
+                "    stakeholder_alignment=0.0, uncertainty_level=5.0, analysis_confidence=0.8)\n"
+                "for _ in range(5):\n"
+                "    monitor.record(ExecutionMode.HYBRID, analysis, float(sys.argv[2]))\n"
+            )
+            subprocess.run([sys.executable, "-c", script, directory, str(now)], check=True, capture_output=True, timeout=60,
+                           cwd=Path(__file__).resolve().parent)
+            exit_flushed = DistributionMonitor(directory, window_seconds=day).load_window(current).count == 6
+        
+        merged_counts = [window["count"] for window in windows] == [200, 200, 200, 200]
+        drifted = {alert.metric for alert in alerts}
+        passed = rank_error < 0.02 and merged_counts and drifted == {"complexity_score"} and background_flushed and exit_flushed
+        
+        if passed:
+            log_test("Distribution Monitoring", "PASS",
+                    f"merged sketch rank error {rank_error:.4f}; 2 workers merged per window; complexity drift alerted; "
+                    "flushed in the background and at exit")
+        else:
+            log_test("Distribution Monitoring", "FAIL",
+                    f"rank error {rank_error:.4f}, window counts {[window['count'] for window in windows]}, alerts {sorted(drifted)}, "
+                    f"background flush {background_flushed}, exit flush {exit_flushed}")
+        
+        return passed
+        
+    except Exception as e:
+        log_test("Distribution Monitoring", "FAIL", "Distribution monitoring failed", str(e))
+        return False
+
+async def test_timeline_forecast():
+    """Test Monte Carlo timeline forecasts: speed, percentile order, determinism and descriptions"""
+    print("\n🧪 Testing Timeline Forecast...")
+    
+    try:
+        import time
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine, UserPreferences
+        from aid_commander_genesis.adaptive_intelligence.forecast import (
+            DEFAULT_FORECAST_DRAWS, forecast_timeline, median_timeline_days, timeline_description
+        )
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER
+        
+        failures = []
+        
+        # Shared draws are generated once; time forecasts after that
+        forecast_timeline(MODE_ORDER[0], 5.0, 5.0, 3)
+        elapsed = []
+        for _ in range(5):
+            started = time.perf_counter()
+            forecast_timeline(MODE_ORDER[3], 8.0, 7.0, 12)
+            elapsed.append(time.perf_counter() - started)
+        if min(elapsed) >= 0.05:
+            failures.append(f"{DEFAULT_FORECAST_DRAWS} draws took {min(elapsed) * 1000:.1f} ms")
+        
+        for mode in MODE_ORDER:
+            for complexity_score in (1.0, 5.0, 9.5):
+                for uncertainty_level in (0.0, 4.0, 10.0):
+                    for stakeholder_count in (1, 8, 30):
+                        forecast = forecast_timeline(mode, complexity_score, uncertainty_level, stakeholder_count)
+                        median = median_timeline_days(mode, complexity_score, stakeholder_count)
+                        case = f"{mode.value}/{complexity_score}/{uncertainty_level}/{stakeholder_count}"
+                        if not forecast.p50 <= forecast.p80 <= forecast.p95 or forecast.draws != DEFAULT_FORECAST_DRAWS:
+                            failures.append(f"{case}: percentiles out of order")
+                        if forecast != forecast_timeline(mode, complexity_score, uncertainty_level, stakeholder_count):
+                            failures.append(f"{case}: not deterministic")
+                        if forecast.description != timeline_description(forecast.p50):
+                            failures.append(f"{case}: description not of the median")
+                        # Disruptions only add delay; without any the median is the deterministic estimate
+                        if forecast.p50 < median * (1 - 1e-9) or (uncertainty_level == 0.0 and abs(forecast.p50 - median) > 1e-9 * median):
+                            failures.append(f"{case}: median {forecast.p50:.2f} vs estimate {median:.2f}")
+        
+        # Recommendations describe the median of the forecast they carry
+        engine = AdaptiveIntelligenceEngine()
+        for concept in build_sample_concepts():
+            recommendation = await engine.generate_development_recommendation(concept, UserPreferences())
+            if recommendation.estimated_timeline != timeline_description(recommendation.timeline_forecast["p50"]):
+                failures.append(f"{concept.concept_name}: estimated timeline not the forecast median")
+        
+        if not failures:
+            log_test("Timeline Forecast", "PASS",
+                    f"{DEFAULT_FORECAST_DRAWS} draws in {min(elapsed) * 1000:.1f} ms; 108 forecasts ordered, "
+                    "deterministic and described by their median")
+        else:
+            log_test("Timeline Forecast", "FAIL", "; ".join(failures[:5]))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Timeline Forecast", "FAIL", "Timeline forecast test failed", str(e))
+        return False
+
+def build_sample_decisions(count: int, seed: int = 0) -> List[Any]:
+    """Build adaptive decisions with randomized contexts and outcomes."""
+    import random
+    import uuid
+    from aid_commander_genesis.adaptive_intelligence.models import (
+        AdaptiveDecision, ComplexityAnalysis, DevelopmentRecommendation, ProjectContext, UserPreferences
+    )
+    from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER
+    
+    rng = random.Random(seed)
+    decisions = []
+    for _ in range(count):
+        decisions.append(AdaptiveDecision(
+            decision_id=str(uuid.UUID(int=rng.getrandbits(128))),
+            project_context=ProjectContext(
+                project_name=f"Project {rng.randint(1, 50)}",
+                project_description="Sample decision",
+                stakeholder_count=rng.randint(1, 9)
+            ),
+            user_preferences=UserPreferences(team_size=rng.randint(1, 8)),
+            complexity_analysis=ComplexityAnalysis(
+                complexity_score=rng.uniform(0.0, 10.0),
+                stakeholder_complexity=0.0, technical_complexity=0.0, business_complexity=0.0,
+                integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,
+                stakeholder_alignment=0.0, uncertainty_level=rng.uniform(0.0, 10.0),
+                analysis_confidence=rng.random()
+            ),
+            recommendation=DevelopmentRecommendation(
+                recommended_mode=rng.choice(MODE_ORDER), confidence_score=rng.random(), rationale="sample"
+            ),
+            user_choice=rng.choice(MODE_ORDER),
+            decision_rationale="sample",
+            project_success=rng.choice([None, True, False])
+        ))
+    return decisions
+
+def _storage_worker(directory: str, worker: int, iterations: int):
+    """Concurrently update a shared JSON counter and append records to a shared file."""
+    import os
+    import random
+    from aid_commander_genesis.storage import open_append, update_json, write_all
+    
+    rng = random.Random(worker)
+    
+    def increment(content):
+        content["count"] += 1
+        content["workers"][str(worker)] = content["workers"].get(str(worker), 0) + 1
+        return content
+    
+    fd = open_append(Path(directory) / "records.log")
+    try:
+        for iteration in range(iterations):
+            update_json(Path(directory) / "counter.json", increment, default=lambda: {"count": 0, "workers": {}})
+            # Records well above PIPE_BUF, sometimes several per write
+            batch = b"".join(
+                f"{worker}:{iteration}:{part}:".encode() + b"x" * rng.randint(1, 20000) + b"\n"
+                for part in range(rng.randint(1, 3))
+            )
+            write_all(fd, batch)
+    finally:
+        os.close(fd)
+
+async def test_concurrent_storage():
+    """Test that concurrent processes lose no JSON updates and tear no appended records"""
+    print("\n🧪 Testing Concurrent Storage...")
+    
+    try:
+        import multiprocessing
+        import tempfile
+        
+        workers, iterations = 4, 150
+        with tempfile.TemporaryDirectory() as directory:
+            context = multiprocessing.get_context("spawn")
+            processes = [
+                context.Process(target=_storage_worker, args=(directory, worker, iterations))
+                for worker in range(workers)
+            ]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join(timeout=300)
+            exit_codes = [process.exitcode for process in processes]
+            
+            counter = json.loads((Path(directory) / "counter.json").read_text())
+            records = (Path(directory) / "records.log").read_bytes().split(b"\n")
+        
+        failures = []
+        if exit_codes != [0] * workers:
+            failures.append(f"worker exit codes {exit_codes}")
+        if counter["count"] != workers * iterations or counter["workers"] != {str(worker): iterations for worker in range(workers)}:
+            failures.append(f"lost updates: {counter}")
+        
+        # Every record is whole: its prefix is followed only by padding
+        seen = {}
+        torn = 0
+        for record in records[:-1]:
+            worker, iteration, part, padding = record.split(b":", 3)
+            if padding.strip(b"x"):
+                torn += 1
+            seen.setdefault((int(worker), int(iteration)), set()).add(int(part))
+        if records[-1] or torn or len(seen) != workers * iterations:
+            failures.append(f"{torn} torn records, {len(seen)} of {workers * iterations} batches present")
+        if any(parts != set(range(len(parts))) for parts in seen.values()):
+            failures.append("records of a batch were lost")
+        
+        if not failures:
+            log_test("Concurrent Storage", "PASS",
+                    f"{workers} processes x {iterations} JSON updates and appends: no lost updates, no torn records")
+        else:
+            log_test("Concurrent Storage", "FAIL", "; ".join(failures))
+        
+        return not failures
+        
+    except Exception as e:
+        log_test("Concurrent Storage", "FAIL", "Concurrent storage test failed", str(e))
+        return False
+
+async def test_decision_log():
+    """Test decision log random access, tombstones, compaction, torn-record recovery and migration"""
+    print("\n🧪 Testing Decision Log...")
+    
+    try:
+        import random
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.decision_log import DecisionLog, migrate_json_directory
+        
+        rng = random.Random(3)
+        decisions = build_sample_decisions(200, seed=3)
+        failures = []
+        
+        def same(first, second):
+            return first is not None and second is not None and first.model_dump() == second.model_dump()
+        
+        with tempfile.TemporaryDirectory() as directory:
+            log = DecisionLog(Path(directory) / "log", segment_max_bytes=64 * 1024, background_compaction=False)
+            log.append_batch(decisions[:150])
+            for decision in decisions[150:]:
+                log.append(decision)
+            
+            # Random access by id
+            if not all(same(log.get(decision.decision_id), decision) for decision in rng.sample(decisions, 50)):
+                failures.append("random access returned a different decision")
+            if log.get("missing-id") is not None or "missing-id" in log or len(log) != 200:
+                failures.append("unknown ids must be absent")
+            
+            # Re-appends supersede, tombstones delete; compaction keeps only the latest live records
+            updated = [decision.model_copy(update={"project_success": True}) for decision in decisions[:30]]
+            log.append_batch(updated)
+            deleted = [decision.decision_id for decision in decisions[30:60]]
+            if log.delete_batch(deleted + ["missing-id"]) != 30 or log.delete(deleted[0]):
+                failures.append("delete counts only existing decisions")
+            dropped = log.compact(seal_active=True)
+            stats = log.stats()
+            if dropped != 30 + 30 + 30 or stats["dead_records"] != 0 or stats["decisions"] != 170:
+                failures.append(f"compaction dropped {dropped}, stats {stats}")
+            expected_ids = [decision.decision_id for decision in decisions[60:]] + [decision.decision_id for decision in updated]
+            log.close()
+            log.sync()
+            
+            reopened = DecisionLog(Path(directory) / "log", segment_max_bytes=64 * 1024, background_compaction=False)
+            if sorted(reopened.decision_ids()) != sorted(expected_ids):
+                failures.append("reopened log has the wrong live decisions")
+            if not all(same(reopened.get(decision.decision_id), decision) for decision in updated):
+                failures.append("superseded decisions came back after compaction")
+            if any(decision_id in reopened for decision_id in deleted):
+                failures.append("tombstoned decisions came back after compaction")
+            
+            # A crash mid-write leaves a torn record and a torn index entry at the tail
+            reopened.append_batch(decisions[30:40])
+            reopened.close()
+            segment = max(Path(directory, "log").glob("segment-*.log"))
+            index = segment.with_suffix(".idx")
+            intact_size = segment.stat().st_size
+            with open(segment, 'ab') as f:
+                f.write(b"\x10\x00\x00\x00torn")
+            with open(index, 'r+b') as f:
+                f.truncate(index.stat().st_size - 3)
+            
+            recovered = DecisionLog(Path(directory) / "log", segment_max_bytes=64 * 1024, background_compaction=False)
+            if segment.stat().st_size != intact_size:
+                failures.append("torn record was not truncated")
+            if len(recovered) != 180 or not all(same(recovered.get(decision.decision_id), decision) for decision in decisions[30:40]):
+                failures.append(f"recovery lost decisions: {len(recovered)} live")
+            recovered.append(decisions[40])
+            if not same(recovered.get(decisions[40].decision_id), decisions[40]):
+                failures.append("appending after recovery failed")
+            recovered.close()
+            
+            # Migrating one-file-per-decision storage twice only appends once
+            source = Path(directory) / "json"
+            source.mkdir()
+            for decision in decisions[:20]:
+                (source / f"{decision.decision_id}.json").write_text(decision.model_dump_json())
+            (source / "corrupt.json").write_text("{")
+            target = DecisionLog(Path(directory) / "migrated", background_compaction=False)
+            first = migrate_json_directory(source, target)
+            second = migrate_json_directory(source, target, remove_source=True)
+            if first != {"migrated": 20, "skipped": 0, "failed": 1} or second != {"migrated": 0, "skipped": 20, "failed": 1}:
+                failures.append(f"migration counts {first}, {second}")
+            if len(target) != 20 or sorted(path.name for path in source.iterdir()) != ["corrupt.json"]:
+                failures.append("migration appended duplicates or removed the wrong files")
+            target.close()
+        
+        if not failures:
+            log_test("Decision Log", "PASS",
+                    "random access, tombstones with compaction, torn-record recovery and idempotent migration")
+        else:
+            log_test("Decision Log", "FAIL", "; ".join(failures))
+        
+        return not failures
+        
+    except Exception as e:
+        log_test("Decision Log", "FAIL", "Decision log test failed", str(e))
+        return False
+
+async def test_decision_persister():
+    """Test write-behind decision persistence: backpressure, batching, write retries and flushing on shutdown"""
+    print("\n🧪 Testing Decision Persister...")
+    
+    try:
+        import subprocess
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.decision_log import DecisionLog
+        from aid_commander_genesis.adaptive_intelligence.persister import DecisionPersister
+        
+        decisions = build_sample_decisions(300, seed=15)
+        failures = []
+        
+        with tempfile.TemporaryDirectory() as directory:
+            # A small queue makes submitters wait; the writer takes whatever is queued as one batch
+            log = DecisionLog(Path(directory) / "batched", background_compaction=False)
+            persister = DecisionPersister(lambda: log, queue_size=8, sync_records=16)
+            for decision in decisions[:100]:
+                await persister.submit(decision)
+            await persister.flush()
+            stats = persister.stats()
+            if log.decision_ids() != [decision.decision_id for decision in decisions[:100]]:
+                failures.append("decisions missing or out of submission order")
+            if stats["written"] != 100 or stats["unsynced"] or not stats["syncs"] or stats["pending"]:
+                failures.append(f"flush left work behind: {stats}")
+            if not stats["backpressure_waits"] or stats["batches"] >= 100:
+                failures.append(f"no backpressure or batching: {stats}")
+            await persister.close()
+            log.close()
+            
+            # Writes the log rejects are kept and retried ahead of newer decisions
+            class FailingLog:
+                def __init__(self, log, failures):
+                    self.log = log
+                    self.failures = failures
+                
+                def append_batch(self, batch):
+                    if self.failures:
+                        self.failures -= 1
+                        raise OSError("disk full")
+                    return self.log.append_batch(batch)
+                
+                def sync(self):
+                    self.log.sync()
+            
+            retried = build_sample_decisions(40, seed=16)
+            failing_log = FailingLog(DecisionLog(Path(directory) / "failing", background_compaction=False), 2)
+            failing_persister = DecisionPersister(lambda: failing_log, queue_size=8, sync_records=4)
+            for decision in retried[:20]:
+                await failing_persister.submit(decision)
+            await failing_persister.flush()
+            if failing_log.log.decision_ids() != [decision.decision_id for decision in retried[:20]]:
+                failures.append("retried decisions missing or out of submission order")
+            
+            # A log that keeps failing makes flush() raise without losing anything
+            failing_log.failures = 1000
+            for decision in retried[20:]:
+                await failing_persister.submit(decision)
+            try:
+                await failing_persister.flush()
+                failures.append("flush succeeded while the log rejected writes")
+            except RuntimeError:
+                pass
+            unwritten = failing_persister.stats()["unwritten"]
+            failing_log.failures = 0
+            await failing_persister.close()
+            if unwritten != 20 or failing_log.log.decision_ids() != [decision.decision_id for decision in retried]:
+                failures.append(f"failed writes not recovered: {unwritten} unwritten, {len(failing_log.log)} of 40 written")
+            failing_log.log.close()
+            
+            # Event loop shutdown cancels the writer with the queue still full
+            shutdown_log = DecisionLog(Path(directory) / "shutdown", background_compaction=False)
+            shutdown_persister = DecisionPersister(lambda: shutdown_log, queue_size=256, sync_records=8)
+            
+            async def fill_and_exit():
+                for decision in decisions[100:200]:
+                    await shutdown_persister.submit(decision)
+                return shutdown_persister.pending
+            
+            pending = await asyncio.get_running_loop().run_in_executor(None, lambda: asyncio.run(fill_and_exit()))
+            if not pending:
+                failures.append("writer finished before loop shutdown")
+            if shutdown_log.decision_ids() != [decision.decision_id for decision in decisions[100:200]]:
+                failures.append(f"loop shutdown lost decisions: {len(shutdown_log)} of 100 written")
+            shutdown_log.close()
+            
+            # The interpreter exits while the loop still has the writer and queue pending
+            script = (
+                "import asyncio, sys\n"
+                "from pathlib import Path\n"
+                "from test_genesis_system import build_sample_decisions\n"
+                "from aid_commander_genesis.adaptive_intelligence.decision_log import DecisionLog\n"
+                "from aid_commander_genesis.adaptive_intelligence.persister import DecisionPersister\n"
+                "log = DecisionLog(Path(sys.argv[1]), background_compaction=False)\n"
+                "persister = DecisionPersister(lambda: log, queue_size=256)\n"
+                "async def fill():\n"
+                "    for decision in build_sample_decisions(300, seed=15)[200:]:\n"
+                "        await persister.submit(decision)\n"
+                "asyncio.new_event_loop().run_until_complete(fill())\n"
+            )
+            subprocess.run([sys.executable, "-c", script, str(Path(directory) / "exit")],
+                           check=True, capture_output=True, timeout=120, cwd=Path(__file__).resolve().parent)
+            exit_log = DecisionLog(Path(directory) / "exit", background_compaction=False)
+            if exit_log.decision_ids() != [decision.decision_id for decision in decisions[200:]]:
+                failures.append(f"interpreter exit lost decisions: {len(exit_log)} of 100 written")
+            exit_log.close()
+        
+        if not failures:
+            log_test("Decision Persister", "PASS",
+                    f"{stats['backpressure_waits']} backpressure waits, 100 decisions in {stats['batches']} batches; "
+                    "failed writes retried in order; queues drained at loop shutdown and interpreter exit")
+        else:
+            log_test("Decision Persister", "FAIL", "; ".join(failures))
+        
+        return not failures
+        
+    except Exception as e:
+        log_test("Decision Persister", "FAIL", "Decision persister test failed", str(e))
+        return False
+
+async def test_decision_matrix():
+    """Test columnar decision matrix aggregations, persistence and memory budget"""
+    print("\n🧪 Testing Decision Matrix...")
+    
+    try:
+        import random
+        import tempfile
+        import tracemalloc
+        import uuid
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence.models import (
+            AdaptiveDecision, ComplexityAnalysis, DevelopmentRecommendation, ExecutionMode,
+            ProjectContext, UserPreferences
+        )
+        from aid_commander_genesis.adaptive_intelligence.matrix import (
+            COMPLEXITY_BANDS, DECISION_MATRIX_BUDGET_BYTES, DecisionMatrix, StringTable, decision_row
+        )
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER, CompiledModeScoring
+        
+        rng = random.Random(7)
+        decisions = []
+        for _ in range(2000):
+            decisions.append(AdaptiveDecision(
+                decision_id=str(uuid.UUID(int=rng.getrandbits(128))),
+                project_context=ProjectContext(
+                    project_name=f"Project {rng.randint(1, 50)}",
+                    project_description="Decision matrix sample",
+                    stakeholder_count=rng.randint(1, 9),
+                    stakeholder_types=rng.sample(["primary", "secondary", "tertiary", "regulator"], rng.randint(0, 3)),
+                    innovation_level=rng.random()
+                ),
+                user_preferences=UserPreferences(
+                    team_size=rng.randint(1, 8),
+                    speed_vs_quality=rng.choice([0.4, 0.6, rng.random()]),
+                    validation_level=rng.choice(["standard", "high", "enterprise"]),
+                    time_constraints=rng.choice(["tight", "moderate", "flexible"]),
+                    learning_mode=rng.random() < 0.5
+                ),
+                complexity_analysis=ComplexityAnalysis(
+                    complexity_score=rng.choice([3.0, 6.0, 8.0, rng.uniform(0.0, 10.0)]),
+                    stakeholder_complexity=0.0, technical_complexity=0.0, business_complexity=0.0,
+                    integration_complexity=0.0, story_richness=0.0, narrative_coherence=0.0,
+                    stakeholder_alignment=0.0, uncertainty_level=rng.uniform(0.0, 10.0),
+                    analysis_confidence=rng.random()
+                ),
+                recommendation=DevelopmentRecommendation(
+                    recommended_mode=rng.choice(MODE_ORDER), confidence_score=rng.random(), rationale="sample"
+                ),
+                user_choice=rng.choice(MODE_ORDER),
+                decision_rationale="sample",
+                project_success=rng.choice([None, True, False])
+            ))
+        
+        matrix = DecisionMatrix.from_decisions(decisions)
+        failures = []
+        
+        # Vectorized success rates against a per-decision loop
+        rates = matrix.success_rate_by_mode_and_band()
+        expected = np.zeros((len(MODE_ORDER), len(COMPLEXITY_BANDS), 2), dtype=np.int64)
+        for decision in decisions:
+            if decision.project_success is not None:
+                cell = expected[MODE_ORDER.index(decision.user_choice), COMPLEXITY_BANDS.index(decision.complexity_analysis.complexity_level)]
+                cell += (1, int(decision.project_success))
+        if not (np.array_equal(rates["outcomes"], expected[..., 0]) and np.array_equal(rates["successes"], expected[..., 1])):
+            failures.append("success rate by mode and band")
+        
+        # Matrix columns score exactly like the models
+        scoring = CompiledModeScoring()
+        model_columns = scoring.gather_columns(
+            [decision.complexity_analysis for decision in decisions],
+            [decision.user_preferences for decision in decisions],
+            [decision.project_context for decision in decisions]
+        )
+        if not np.array_equal(scoring.score_columns(matrix.scoring_columns(scoring.fields), len(matrix)),
+                              scoring.score_columns(model_columns, len(decisions))):
+            failures.append("scoring columns")
+        
+        if matrix.stakeholder_type_mask("regulator").sum() != sum("regulator" in d.project_context.stakeholder_types for d in decisions):
+            failures.append("stakeholder type mask")
+        
+        # Memory-mapped round trip
+        with tempfile.TemporaryDirectory() as directory:
+            matrix.save(Path(directory))
+            loaded = DecisionMatrix.load(Path(directory))
+            if not (isinstance(loaded.records, np.memmap)
+                    and loaded.records.tobytes() == matrix.records.tobytes()
+                    and loaded.decision_id(1234) == decisions[1234].decision_id):
+                failures.append("memory-mapped round trip")
+            del loaded
+        
+        # Memory budget: retained bytes per decision, and a one million row matrix
+        rows = [decision_row(decision) for decision in decisions]
+        tracemalloc.start()
+        budget_matrix = DecisionMatrix.from_rows(rows)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        million = 1_000_000
+        id_length = 36
+        million_matrix = DecisionMatrix(
+            np.resize(budget_matrix.records, million),
+            {
+                **budget_matrix.strings,
+                "decision_id": StringTable(
+                    np.zeros(million * id_length, dtype=np.uint8),
+                    np.arange(million + 1, dtype=np.int64) * id_length
+                )
+            },
+            budget_matrix.stakeholder_types
+        )
+        if retained / len(budget_matrix) * million > DECISION_MATRIX_BUDGET_BYTES:
+            failures.append(f"retained {retained / len(budget_matrix):.0f} bytes per decision")
+        if million_matrix.nbytes > DECISION_MATRIX_BUDGET_BYTES:
+            failures.append(f"one million decisions take {million_matrix.nbytes / 2**20:.0f} MiB")
+        
+        if not failures:
+            log_test("Decision Matrix", "PASS",
+                    f"{len(matrix)} decisions, {retained / len(budget_matrix):.0f} B/decision, "
+                    f"1M decisions in {million_matrix.nbytes / 2**20:.0f} MiB")
+        else:
+            log_test("Decision Matrix", "FAIL", "; ".join(failures))
+        
+        return not failures
+
+    except Exception as e:
+        log_test("Decision Matrix", "FAIL", "Decision matrix test failed", str(e))
+        return False
+
+def build_isolated_engine(directory: Path):
+    """Adaptive intelligence engine keeping its history under a directory instead of ~/.aid_genesis."""
+    from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+    from aid_commander_genesis.adaptive_intelligence.decision_log import DecisionLog
+    from aid_commander_genesis.adaptive_intelligence.history import DecisionHistory
+    from aid_commander_genesis.adaptive_intelligence.monitoring import DistributionMonitor
+    from aid_commander_genesis.adaptive_intelligence.retention import RetentionPolicy
+    
+    engine = AdaptiveIntelligenceEngine()
+    engine.decision_storage = directory / "adaptive_decisions"
+    engine.pattern_storage = directory / "cross_project_patterns"
+    engine.pattern_storage.mkdir(parents=True, exist_ok=True)
+    engine._decision_log = DecisionLog(directory / "decision_log", background_compaction=False)
+    engine.decisions = DecisionHistory(lambda: engine.decision_log, engine.decision_storage)
+    engine.retention_policy = RetentionPolicy(aggregates_path=directory / "decision_aggregates.json")
+    engine.distribution_monitor = DistributionMonitor(directory / "distributions")
+    return engine
+
+def build_calibration_decisions(count: int, seed: int = 0) -> List[Any]:
+    """Sample decisions choosing band-selected modes, with random complexity dimension scores."""
+    import random
+    from aid_commander_genesis.adaptive_intelligence.calibration import BAND_MODES, WEIGHTED_DIMENSIONS
+    
+    rng = random.Random(seed)
+    return [
+        decision.model_copy(update={
+            "user_choice": rng.choice(BAND_MODES),
+            "complexity_analysis": decision.complexity_analysis.model_copy(update={
+                dimension: rng.uniform(0.0, 10.0) for dimension in WEIGHTED_DIMENSIONS
+            })
+        })
+        for decision in build_sample_decisions(count, seed=seed)
+    ]
+
+async def test_weight_calibration():
+    """Test the vectorized calibration search against the scalar reference"""
+    print("\n🧪 Testing Weight Calibration...")
+    
+    try:
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence.calibration import (
+            THRESHOLD_GRID, WEIGHTED_DIMENSIONS, calibration_data, candidate_weights, complexity_scores,
+            fit_calibration, outcome_agreement, threshold_agreement
+        )
+        from aid_commander_genesis.adaptive_intelligence.matrix import OUTCOME_FAILURE, OUTCOME_SUCCESS, DecisionMatrix
+        
+        current = {
+            "stakeholder_complexity": 0.30,
+            "technical_complexity": 0.25,
+            "business_complexity": 0.20,
+            "integration_complexity": 0.15,
+            "uncertainty_level": 0.10
+        }
+        failures = []
+        
+        # Candidates are distinct, sum to one and start with the current weights
+        weights = candidate_weights(current, 256, np.random.default_rng(18))
+        if not np.allclose(weights.sum(axis=1), 1.0):
+            failures.append("candidate weights do not sum to 1")
+        if not np.array_equal(weights[0], [current[dimension] for dimension in WEIGHTED_DIMENSIONS]):
+            failures.append("current weights are not the first candidate")
+        if len(np.unique(weights, axis=0)) != len(weights):
+            failures.append("duplicate candidates")
+        
+        # Every candidate and threshold pair agrees with the scalar reference
+        matrix = DecisionMatrix.from_decisions(build_calibration_decisions(400, seed=18))
+        matrix.records["project_success"] = np.where(
+            np.random.default_rng(5).random(len(matrix)) < 0.5, OUTCOME_SUCCESS, OUTCOME_FAILURE
+        )
+        dimensions, bands, success = calibration_data(matrix)
+        checked = weights[:12]
+        agreement = threshold_agreement(dimensions, bands, success, checked)
+        mismatches = 0
+        pairs = 0
+        for candidate, candidate_weight in enumerate(checked):
+            scores = complexity_scores(dimensions, candidate_weight)[:, 0]
+            for lightweight, lightweight_threshold in enumerate(THRESHOLD_GRID):
+                for hybrid, hybrid_threshold in enumerate(THRESHOLD_GRID):
+                    if lightweight_threshold >= hybrid_threshold:
+                        mismatches += agreement[candidate, lightweight, hybrid] != -1
+                        continue
+                    pairs += 1
+                    mismatches += agreement[candidate, lightweight, hybrid] != outcome_agreement(
+                        scores, bands, success, lightweight_threshold, hybrid_threshold
+                    )
+        if mismatches:
+            failures.append(f"{mismatches} threshold agreements differ from outcome_agreement")
+        
+        # An improved fit agrees with the reference; a fit no candidate beats keeps the current configuration
+        fitted = fit_calibration(matrix, current, 4.0, 7.0, candidates=256, seed=18)
+        fitted_agreement = outcome_agreement(
+            complexity_scores(dimensions, np.array([fitted.complexity_weights[dimension] for dimension in WEIGHTED_DIMENSIONS]))[:, 0],
+            bands, success, fitted.lightweight_max_complexity, fitted.hybrid_max_complexity
+        )
+        if not fitted.improved or fitted_agreement != round(fitted.agreement * len(dimensions)):
+            failures.append(f"fitted agreement {fitted.agreement:.3f} not reproduced ({fitted_agreement} decisions)")
+        
+        implied = np.searchsorted([4.0, 7.0], complexity_scores(dimensions, weights[0])[:, 0], side="left")
+        matrix.records["project_success"] = np.where(implied == bands, OUTCOME_SUCCESS, OUTCOME_FAILURE)
+        kept = fit_calibration(matrix, current, 4.0, 7.0, candidates=256, seed=18)
+        if kept.improved or kept.agreement != 1.0 or kept.complexity_weights != current or (
+            kept.lightweight_max_complexity, kept.hybrid_max_complexity
+        ) != (4.0, 7.0):
+            failures.append("a perfectly agreeing configuration was replaced")
+        
+        if not failures:
+            log_test("Weight Calibration", "PASS",
+                    f"{pairs} candidate threshold pairs match outcome_agreement; "
+                    f"fit {fitted.baseline_agreement:.1%} → {fitted.agreement:.1%}, perfect baseline kept")
+        else:
+            log_test("Weight Calibration", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Weight Calibration", "FAIL", "Weight calibration test failed", str(e))
+        return False
+
+async def test_analysis_session():
+    """Test that one planning flow computes each intermediate result once"""
+    print("\n🧪 Testing Analysis Session...")
+    
+    try:
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.models import UserPreferences
+        
+        concept = build_sample_concepts()[1]
+        preferences = UserPreferences()
+        failures = []
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_isolated_engine(Path(directory))
+            
+            # The CLI planning flow followed by the full recommendation
+            session = engine.create_analysis_session(concept)
+            await engine.analyze_concept_complexity(concept, session=session)
+            mode = await engine.determine_execution_mode(concept, preferences, {}, session=session)
+            recommendation = await engine.generate_development_recommendation(concept, preferences, {}, session=session)
+            
+            computed = session.stats()["computed"]
+            for name in ("features", "complexity", "context", "recommendation"):
+                if computed.get(name) != 1:
+                    failures.append(f"{name} computed {computed.get(name, 0)} times")
+            if not session.stats()["reused"]:
+                failures.append("no results reused within the session")
+            if recommendation.recommended_mode != mode:
+                failures.append(f"determined {mode.value} but recommended {recommendation.recommended_mode.value}")
+            
+            # An edited concept is analyzed again after refresh()
+            concept.concept_description += " with offline support"
+            if not session.refresh():
+                failures.append("edited concept not detected")
+            await engine.analyze_concept_complexity(concept, session=session)
+            if session.stats()["computed"].get("complexity") != 2:
+                failures.append("edited concept not re-analyzed")
+            
+            await engine.shutdown()
+            engine.decision_log.close()
+        
+        if not failures:
+            log_test("Analysis Session", "PASS",
+                    f"features, complexity, context and recommendation computed once; reused {session.stats()['reused']}")
+        else:
+            log_test("Analysis Session", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Analysis Session", "FAIL", "Analysis session test failed", str(e))
+        return False
+
+def _decision_origin(decision) -> Any:
+    """Load transform recording which process validated a decision."""
+    import os
+    return os.getpid(), decision.decision_id
+
+async def test_history_loader():
+    """Test that parallel history loading matches a serial load"""
+    print("\n🧪 Testing History Loader...")
+    
+    try:
+        import os
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.decision_log import DecisionLog
+        from aid_commander_genesis.adaptive_intelligence.loader import load_history
+        from aid_commander_genesis.adaptive_intelligence.models import CrossProjectPattern, ExecutionMode
+        
+        decisions = build_sample_decisions(60, seed=10)
+        failures = []
+        
+        def pattern(pattern_id: str, success_rate: float):
+            return CrossProjectPattern(
+                pattern_id=pattern_id,
+                pattern_name=pattern_id,
+                pattern_description="Bulk loaded pattern",
+                pattern_type="success",
+                complexity_range=[2.0, 6.0],
+                success_rate=success_rate,
+                sample_size=10,
+                confidence_interval=[0.0, 1.0],
+                applicable_modes=[ExecutionMode.HYBRID]
+            )
+        
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            decision_log = DecisionLog(root / "decision_log", background_compaction=False)
+            decision_log.append_batch(decisions[15:])
+            decision_log.sync()
+            
+            # Unmigrated legacy files, one unreadable and one shadowed by its logged record
+            legacy_directory = root / "adaptive_decisions"
+            legacy_directory.mkdir()
+            for decision in decisions[:15] + decisions[-1:]:
+                (legacy_directory / f"{decision.decision_id}.json").write_text(decision.model_dump_json())
+            (legacy_directory / "corrupt.json").write_text('{"decision_id": "corrupt"')
+            
+            # A later file replaces an earlier pattern with the same id
+            pattern_directory = root / "cross_project_patterns"
+            pattern_directory.mkdir()
+            for index in range(5):
+                (pattern_directory / f"pattern_{index}.json").write_text(pattern(f"pattern-{index}", 0.5).model_dump_json())
+            (pattern_directory / "pattern_9.json").write_text(pattern("pattern-2", 0.9).model_dump_json())
+            (pattern_directory / "pattern_broken.json").write_text("not json")
+            
+            sources = {
+                "decision_log": decision_log,
+                "legacy_directory": legacy_directory,
+                "pattern_directory": pattern_directory
+            }
+            serial = load_history(workers=1, **sources)
+            parallel = load_history(workers=2, chunk_size=7, **sources)
+            
+            # Legacy files in file name order, then logged decisions in write order
+            expected_ids = sorted(decision.decision_id for decision in decisions[:15])
+            expected_ids += [decision.decision_id for decision in decisions[15:]]
+            for name, result in (("serial", serial), ("parallel", parallel)):
+                if [decision.decision_id for decision in result.decisions] != expected_ids:
+                    failures.append(f"{name} load returned decisions out of history order")
+                if [(p.pattern_id, p.success_rate) for p in result.patterns] != [
+                    ("pattern-0", 0.5), ("pattern-1", 0.5), ("pattern-2", 0.9), ("pattern-3", 0.5), ("pattern-4", 0.5)
+                ]:
+                    failures.append(f"{name} load did not replace patterns by pattern_id")
+                if result.failed != 2 or result.records != len(decisions) + 5 + 2:
+                    failures.append(f"{name} load counted {result.failed} failed of {result.records} records")
+            
+            if [d.model_dump() for d in parallel.decisions] != [d.model_dump() for d in serial.decisions]:
+                failures.append("parallel decisions differ from the serial load")
+            if parallel.chunks != -(-(len(decisions) + 1 + 6) // 7) or serial.chunks != 1:
+                failures.append(f"loaded in {parallel.chunks} and {serial.chunks} chunks")
+            
+            # Validation really runs in worker processes, still merged in order
+            origins = load_history(workers=2, chunk_size=7, transform=_decision_origin, **sources)
+            if [decision_id for _, decision_id in origins.decisions] != expected_ids:
+                failures.append("transformed decisions out of history order")
+            if {pid for pid, _ in origins.decisions} & {os.getpid()}:
+                failures.append("decisions validated in the calling process")
+            
+            decision_log.close()
+        
+        if not failures:
+            log_test("History Loader", "PASS",
+                    f"workers=2 over {parallel.chunks} chunks matched workers=1: {len(parallel.decisions)} decisions, "
+                    f"{len(parallel.patterns)} patterns, {parallel.failed} corrupt files counted as failed")
+        else:
+            log_test("History Loader", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("History Loader", "FAIL", "History loader test failed", str(e))
+        return False
+
+async def test_analysis_cache():
+    """Test analysis cache eviction, invalidation and persistence"""
+    print("\n🧪 Testing Analysis Cache...")
+    
+    try:
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.cache import AnalysisCache
+        from aid_commander_genesis.adaptive_intelligence.models import ComplexityAnalysis
+        
+        concepts = build_sample_concepts()
+        failures = []
+        
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = Path(directory) / "analysis_cache"
+            engine = build_isolated_engine(Path(directory))
+            engine.analysis_cache = AnalysisCache(max_entries=3, persist_path=cache_path)
+            analyses = [await engine.analyze_concept_complexity(concept) for concept in concepts]
+            
+            # A second analysis of an unchanged concept is served from the cache
+            repeated = await engine.analyze_concept_complexity(concepts[0])
+            stats = engine.health_check()["analysis_cache"]
+            if (stats["hits"], stats["misses"]) != (1, len(concepts)):
+                failures.append(f"{stats['hits']} hits and {stats['misses']} misses after one repeat")
+            if repeated.model_dump(exclude={"created_at"}) != analyses[0].model_dump(exclude={"created_at"}):
+                failures.append("cached analysis differs from the computed one")
+            
+            # Least recently used entries go first, on disk too
+            cache = AnalysisCache(max_entries=2, persist_path=Path(directory) / "lru_cache")
+            cache.validate("lru")
+            cache.put("a", analyses[0])
+            cache.put("b", analyses[1])
+            cache.get("a")
+            cache.put("c", analyses[2])
+            if cache.get("b") is not None or cache.get("a") is None or cache.get("c") is None:
+                failures.append("LRU eviction removed the wrong entry")
+            if sorted(path.stem for path in (Path(directory) / "lru_cache" / "lru").glob("*.json")) != ["a", "c"]:
+                failures.append("evicted entry still persisted")
+            if cache.stats()["evictions"] != 1:
+                failures.append(f"{cache.stats()['evictions']} evictions counted")
+            
+            # A new process with the same configuration reads the persisted entries
+            fingerprint = engine.analysis_cache.fingerprint
+            reopened = build_isolated_engine(Path(directory))
+            reopened.analysis_cache = AnalysisCache(max_entries=3, persist_path=cache_path)
+            restored = await reopened.analyze_concept_complexity(concepts[1])
+            stats = reopened.health_check()["analysis_cache"]
+            if (stats["hits"], stats["misses"], stats["entries"]) != (1, 0, 3):
+                failures.append(f"persisted entries not reused: {stats}")
+            if restored.model_dump() != analyses[1].model_dump():
+                failures.append("persisted analysis did not round trip")
+            
+            # Changed weights or a new analysis version invalidate every entry
+            reopened.complexity_weights = {
+                dimension: weight * 2 for dimension, weight in reopened.complexity_weights.items()
+            }
+            await reopened.analyze_concept_complexity(concepts[1])
+            version_field = ComplexityAnalysis.model_fields["analysis_version"]
+            original_version = version_field.default
+            version_field.default = f"{original_version}-next"
+            try:
+                await reopened.analyze_concept_complexity(concepts[1])
+            finally:
+                version_field.default = original_version
+            stats = reopened.health_check()["analysis_cache"]
+            if (stats["invalidations"], stats["hits"], stats["misses"]) != (2, 1, 2):
+                failures.append(f"cache not invalidated by weights and analysis version: {stats}")
+            
+            # The first configuration's entries are kept for processes still using it
+            if not (cache_path / fingerprint).is_dir() or len(list(cache_path.iterdir())) != 3:
+                failures.append("entries of other configurations removed while in use")
+            
+            for closing in (engine, reopened):
+                await closing.shutdown()
+                closing.decision_log.close()
+        
+        if not failures:
+            log_test("Analysis Cache", "PASS",
+                    "LRU eviction, persisted round trip, invalidation on weights and analysis version, "
+                    "hit/miss counters in health_check()")
+        else:
+            log_test("Analysis Cache", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Analysis Cache", "FAIL", "Analysis cache test failed", str(e))
+        return False
+
+async def test_preference_sweep():
+    """Test that sweep grid points agree with individual recommendations"""
+    print("\n🧪 Testing Preference Sweep...")
+    
+    try:
+        import random
+        import tempfile
+        from aid_commander_genesis.adaptive_intelligence.models import UserPreferences
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER
+        
+        rng = random.Random(14)
+        baseline = UserPreferences()
+        failures = []
+        checked = 0
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_isolated_engine(Path(directory))
+            for concept in build_sample_concepts():
+                surface = await engine.sweep_user_preferences(concept, baseline)
+                if surface.shape != tuple(len(axis) for axis in surface.axes):
+                    failures.append(f"{concept.concept_name}: surface shape {surface.shape}")
+                
+                # Grid corners plus random interior points
+                points = [tuple(0 for _ in surface.shape), tuple(size - 1 for size in surface.shape)]
+                points += [tuple(rng.randrange(size) for size in surface.shape) for _ in range(25)]
+                for point in points:
+                    values = {
+                        parameter: axis[position].item()
+                        for parameter, axis, position in zip(surface.parameters, surface.axes, point)
+                    }
+                    recommendation = await engine.generate_development_recommendation(
+                        concept, baseline.model_copy(update=values)
+                    )
+                    mode = MODE_ORDER[int(surface.modes[point])]
+                    confidence = float(surface.confidence[point])
+                    checked += 1
+                    if mode != recommendation.recommended_mode or abs(confidence - recommendation.confidence_score) > 1e-9:
+                        failures.append(
+                            f"{concept.concept_name} at {values}: sweep {mode.value} {confidence:.4f}, "
+                            f"recommendation {recommendation.recommended_mode.value} {recommendation.confidence_score:.4f}"
+                        )
+                    if surface.mode_at(**values) != mode:
+                        failures.append(f"{concept.concept_name}: mode_at disagrees at {values}")
+            
+            await engine.shutdown()
+            engine.decision_log.close()
+        
+        if not failures:
+            log_test("Preference Sweep", "PASS",
+                    f"{checked} sampled grid points match generate_development_recommendation mode and confidence")
+        else:
+            log_test("Preference Sweep", "FAIL", "; ".join(failures[:3]))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Preference Sweep", "FAIL", "Preference sweep test failed", str(e))
+        return False
+
+async def test_pattern_index():
+    """Test that indexed pattern retrieval matches a linear scan followed by a stable sort"""
+    print("\n🧪 Testing Pattern Index...")
+    
+    try:
+        import random
+        from aid_commander_genesis.adaptive_intelligence.models import CrossProjectPattern, ExecutionMode
+        from aid_commander_genesis.adaptive_intelligence.patterns import PatternIndex
+        
+        rng = random.Random(7)
+        modes = list(ExecutionMode)
+        stakeholder_types = ["business", "technical", "end_user"]
+        conditions = ["budget", "team", "timeline"]
+        failures = []
+        
+        def random_pattern(pattern_id):
+            # Coarse values so complexity bounds and success rates often tie
+            low = rng.randint(0, 8)
+            return CrossProjectPattern(
+                pattern_id=pattern_id,
+                pattern_name=pattern_id,
+                pattern_description="Randomized pattern",
+                pattern_type="success",
+                complexity_range=[float(low), float(rng.randint(low, 10))],
+                stakeholder_types=rng.sample(stakeholder_types, rng.randint(0, 2)),
+                success_rate=rng.choice([0.4, 0.6, 0.8]),
+                sample_size=5,
+                confidence_interval=[0.0, 1.0],
+                applicable_modes=rng.sample(modes, rng.randint(1, len(modes))),
+                required_conditions=rng.sample(conditions, rng.randint(0, 1)),
+                contraindications=rng.sample(conditions, rng.randint(0, 1))
+            )
+        
+        def linear_scan(patterns, score, mode, k, types, satisfied, present):
+            """The retrieval PatternIndex replaced: filter every pattern, then stable sort."""
+            relevant = []
+            for pattern in patterns.values():
+                if not (pattern.complexity_range[0] <= score <= pattern.complexity_range[1] and mode in pattern.applicable_modes):
+                    continue
+                if types is not None and pattern.stakeholder_types and not set(pattern.stakeholder_types) & set(types):
+                    continue
+                if satisfied is not None and not set(pattern.required_conditions) <= set(satisfied):
+                    continue
+                if set(pattern.contraindications) & set(present or ()):
+                    continue
+                relevant.append(pattern)
+            relevant.sort(key=lambda p: p.success_rate, reverse=True)
+            return relevant[:k]
+        
+        index = PatternIndex()
+        # pattern_id -> pattern in insertion order; replacement keeps the position
+        reference = {}
+        queries = replaced = removed = 0
+        for step in range(1500):
+            action = rng.random()
+            if action < 0.45 or not reference:
+                pattern_id = f"pattern-{rng.randint(0, 150)}"
+                replaced += pattern_id in reference
+                pattern = random_pattern(pattern_id)
+                index.add(pattern)
+                reference[pattern_id] = pattern
+            elif action < 0.6:
+                pattern_id = rng.choice(list(reference))
+                index.remove(pattern_id)
+                del reference[pattern_id]
+                removed += 1
+            
+            filtered = rng.random() < 0.5
+            arguments = (
+                float(rng.randint(0, 20)) / 2,
+                rng.choice(modes),
+                rng.randint(1, 6),
+                rng.sample(stakeholder_types, rng.randint(0, 2)) if filtered else None,
+                rng.sample(conditions, rng.randint(0, 2)) if filtered else None,
+                rng.sample(conditions, rng.randint(0, 1)) if filtered else None
+            )
+            expected = [pattern.pattern_id for pattern in linear_scan(reference, *arguments)]
+            actual = [pattern.pattern_id for pattern in index.query(*arguments)]
+            queries += 1
+            if actual != expected:
+                failures.append(f"step {step}: {actual} != {expected}")
+                break
+        
+        if len(index) != len(reference):
+            failures.append(f"{len(index)} indexed patterns for {len(reference)} added")
+        
+        if not failures:
+            log_test("Pattern Index", "PASS",
+                    f"{queries} queries matched the linear scan across {replaced} replacements and {removed} removals")
+        else:
+            log_test("Pattern Index", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Pattern Index", "FAIL", "Pattern index test failed", str(e))
+        return False
+
+async def test_pattern_mining():
+    """Test that incremental pattern mining replaces re-observed decisions and gates patterns on sample size"""
+    print("\n🧪 Testing Pattern Mining...")
+    
+    try:
+        import random
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence.matrix import DecisionMatrix
+        from aid_commander_genesis.adaptive_intelligence.mining import IncrementalPatternMiner
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER
+        
+        rng = random.Random(12)
+        decisions = build_sample_decisions(300, seed=12)
+        failures = []
+        
+        def expected_counts(miner, latest):
+            """Per cluster and mode outcome counts recomputed from each decision's latest version."""
+            outcomes = np.zeros((miner.n_clusters, len(MODE_ORDER)), dtype=np.int64)
+            successes = np.zeros_like(outcomes)
+            for decision in latest.values():
+                cluster = miner._contributions[decision.decision_id][0]
+                mode = MODE_ORDER.index(decision.user_choice)
+                if decision.project_success is not None:
+                    outcomes[cluster, mode] += 1
+                    successes[cluster, mode] += decision.project_success
+            return outcomes, successes
+        
+        miner = IncrementalPatternMiner(n_clusters=4, min_sample_size=5)
+        # Decisions are held back until the first fit has a full set of clusters
+        held_back = miner.observe(DecisionMatrix.from_decisions(decisions[:3]))
+        if held_back or miner.stats()["pending_decisions"] != 3:
+            failures.append(f"{held_back} decisions observed before the first fit")
+        for start in range(3, len(decisions), 50):
+            miner.observe(DecisionMatrix.from_decisions(decisions[start:start + 50]))
+        latest = {decision.decision_id: decision for decision in decisions}
+        
+        # Outcomes reported later re-observe decisions, some twice in one batch
+        for _ in range(3):
+            updated = []
+            for decision in rng.sample(decisions, 80):
+                decision = latest[decision.decision_id].model_copy(deep=True)
+                decision.update_outcome(rng.random() < 0.5, {}, [])
+                latest[decision.decision_id] = decision
+                updated.append(decision)
+            updated += [latest[decision.decision_id] for decision in updated[:10]]
+            observed = miner.observe(DecisionMatrix.from_decisions(updated))
+            if observed != 80:
+                failures.append(f"{observed} of 80 re-observed decisions counted")
+        
+        outcomes, successes = expected_counts(miner, latest)
+        if miner.observed != len(decisions) or miner.decisions.sum() != len(decisions):
+            failures.append(f"{miner.decisions.sum()} decisions counted for {len(decisions)} observed")
+        if not np.array_equal(miner.mode_outcomes, outcomes) or not np.array_equal(miner.mode_successes, successes):
+            failures.append("re-observed decisions counted twice")
+        
+        # Only cluster and mode cells with enough known outcomes become patterns
+        patterns = miner.patterns()
+        expected_ids = {
+            f"mined-{cluster}-{MODE_ORDER[mode].value}"
+            for cluster, mode in zip(*np.nonzero(outcomes >= miner.min_sample_size))
+        }
+        if {pattern.pattern_id for pattern in patterns} != expected_ids or not patterns:
+            failures.append("patterns do not match the cells with min_sample_size outcomes")
+        if any(pattern.sample_size < miner.min_sample_size for pattern in patterns):
+            failures.append("pattern below min_sample_size")
+        miner.min_sample_size = int(outcomes.max()) + 1
+        if miner.patterns():
+            failures.append("patterns returned without enough outcomes")
+        
+        if not failures:
+            log_test("Pattern Mining", "PASS",
+                    f"240 re-observed decisions replaced their contributions; {len(patterns)} patterns "
+                    "from cells with at least 5 outcomes")
+        else:
+            log_test("Pattern Mining", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Pattern Mining", "FAIL", "Pattern mining test failed", str(e))
+        return False
+
+async def test_similar_projects():
+    """Test similar project queries above the exact search threshold against a brute-force scan"""
+    print("\n🧪 Testing Similar Projects...")
+    
+    try:
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence.similarity import SIMILARITY_DIMENSIONS, SimilarProjectIndex
+        
+        rng = np.random.default_rng(13)
+        count = 3000
+        vectors = rng.uniform(0.0, 10.0, (count, len(SIMILARITY_DIMENSIONS)))
+        projects = [f"Project {index % 40}" for index in range(count)]
+        outcomes = rng.integers(-1, 2, count)
+        failures = []
+        
+        exact = SimilarProjectIndex(exact_threshold=500, eps=0.0)
+        approximate = SimilarProjectIndex(exact_threshold=500)
+        for index in (exact, approximate):
+            # The tree covers the first batch; the rest is scanned exactly until a rebuild
+            index.add_batch([str(row) for row in range(2800)], vectors[:2800], outcomes[:2800], projects[:2800])
+            index.query(vectors[0])
+            index.add_batch([str(row) for row in range(2800, count)], vectors[2800:], outcomes[2800:], projects[2800:])
+        # Moving indexed projects invalidates the tree of the approximate index
+        original = vectors.copy()
+        moved = rng.choice(count, 50, replace=False)
+        vectors[moved] = rng.uniform(0.0, 10.0, (len(moved), len(SIMILARITY_DIMENSIONS)))
+        for row in moved:
+            approximate.add(str(row), vectors[row], int(outcomes[row]), projects[row])
+        
+        checked = 0
+        for query in rng.uniform(0.0, 10.0, (60, len(SIMILARITY_DIMENSIONS))):
+            excluded = f"Project {rng.integers(0, 40)}" if checked % 2 else None
+            for index, stored in ((exact, original), (approximate, vectors)):
+                distances = np.sqrt(((stored - query) ** 2).sum(axis=1))
+                keep = np.array([project != excluded for project in projects])
+                rows = np.flatnonzero(keep)
+                order = np.lexsort((rows, distances[rows]))[:10]
+                expected_rows, expected_distances = rows[order], distances[rows][order]
+                
+                result_rows, result_distances = index.query(query, k=10, exclude_project=excluded)
+                if excluded is not None and any(projects[row] == excluded for row in result_rows):
+                    failures.append(f"excluded project {excluded} returned")
+                if index is exact and (
+                    not np.array_equal(result_rows, expected_rows) or not np.allclose(result_distances, expected_distances)
+                ):
+                    failures.append(f"exact tree query {checked} differs from brute force")
+                if index is approximate and (
+                    len(result_rows) != 10 or np.any(result_distances > (1 + approximate.eps) * expected_distances + 1e-9)
+                ):
+                    failures.append(f"approximate query {checked} outside the eps bound")
+            checked += 1
+        
+        if exact.tree_builds != 1 or approximate.tree_builds < 2:
+            failures.append(f"tree builds {exact.tree_builds}/{approximate.tree_builds}, expected an unchanged and a rebuilt tree")
+        
+        if not failures:
+            log_test("Similar Projects", "PASS",
+                    f"{checked} queries over {count} projects with tree and tail rows match brute force, "
+                    "with and without project exclusion")
+        else:
+            log_test("Similar Projects", "FAIL", "; ".join(failures[:5]))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Similar Projects", "FAIL", "Similar project test failed", str(e))
+        return False
+
+async def test_decision_outcomes():
+    """Test recording outcomes of stored decisions and calibrating on them"""
+    print("\n🧪 Testing Decision Outcomes...")
+    
+    try:
+        import random
+        import tempfile
+        
+        rng = random.Random(18)
+        decisions = [
+            decision.model_copy(update={"project_success": None})
+            for decision in build_calibration_decisions(60, seed=18)
+        ]
+        failures = []
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_isolated_engine(Path(directory))
+            for decision in decisions:
+                await engine._store_decision(decision)
+            
+            # Stored decisions have no outcome yet, so there is nothing to calibrate on
+            try:
+                await engine.calibrate(save=False)
+                failures.append("calibrated without known outcomes")
+            except ValueError:
+                pass
+            
+            outcomes = {}
+            for decision in decisions:
+                outcomes[decision.decision_id] = rng.random() < 0.6
+                await engine.record_outcome(
+                    decision.decision_id, outcomes[decision.decision_id], {"velocity": rng.random()}, ["sample lesson"]
+                )
+            result = await engine.calibrate(save=False)
+            if result.decisions != len(decisions):
+                failures.append(f"calibrated on {result.decisions} of {len(decisions)} decisions")
+            
+            # Outcomes replace the stored records instead of adding to them
+            if len(engine.decision_log) != len(decisions):
+                failures.append(f"{len(engine.decision_log)} records after recording outcomes")
+            recorded = [engine.decision_log.get(decision.decision_id) for decision in decisions]
+            if [decision.project_success for decision in recorded] != [outcomes[decision.decision_id] for decision in decisions]:
+                failures.append("recorded outcomes differ from the stored decisions")
+            if any(decision.lessons_learned != ["sample lesson"] or decision.project_completion is None for decision in recorded):
+                failures.append("lessons or completion time not stored")
+            
+            latest = await engine.latest_decision_id(decisions[0].project_context.project_name)
+            if engine.decision_log.get(latest).project_context.project_name != decisions[0].project_context.project_name:
+                failures.append("latest decision of a project not found")
+            
+            try:
+                await engine.record_outcome("missing", True)
+                failures.append("recorded the outcome of an unknown decision")
+            except ValueError:
+                pass
+            
+            await engine.shutdown()
+            engine.decision_log.close()
+        
+        if not failures:
+            log_test("Decision Outcomes", "PASS",
+                    f"{len(decisions)} outcomes recorded in place; calibrated on them "
+                    f"(agreement {result.baseline_agreement:.1%} → {result.agreement:.1%})")
+        else:
+            log_test("Decision Outcomes", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Decision Outcomes", "FAIL", "Decision outcome test failed", str(e))
+        return False
+
+async def test_decision_retention():
+    """Test that retention keeps full-history statistics and never counts a decision twice"""
+    print("\n🧪 Testing Decision Retention...")
+    
+    try:
+        import random
+        import tempfile
+        from datetime import datetime, timedelta
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence.matrix import DecisionMatrix
+        
+        rng = random.Random(21)
+        now = datetime(2026, 6, 1, 12, 0, 0)
+        decisions = [
+            decision.model_copy(update={"decision_timestamp": now - timedelta(days=rng.uniform(0, 900))})
+            for decision in build_sample_decisions(300, seed=21)
+        ]
+        failures = []
+        
+        def same_statistics(first, second):
+            return all(np.array_equal(first[name], second[name]) for name in ("decisions", "outcomes", "successes"))
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_isolated_engine(Path(directory))
+            # Some history is still stored as legacy one-file-per-decision JSON
+            engine.decision_storage.mkdir(parents=True, exist_ok=True)
+            for decision in decisions[:20]:
+                (engine.decision_storage / f"{decision.decision_id}.json").write_text(decision.model_dump_json())
+            for decision in decisions[20:]:
+                await engine._store_decision(decision)
+            await engine.flush_decisions()
+            engine.decisions.refresh()
+            
+            full_history = engine.decision_statistics()
+            original_matrix = DecisionMatrix.from_decisions(decisions)
+            cutoff = now - timedelta(days=365)
+            expired = sum(decision.decision_timestamp < cutoff for decision in decisions)
+            retained_records = sum(decision.decision_timestamp >= cutoff for decision in decisions[20:])
+            expired_files = sum(decision.decision_timestamp < cutoff for decision in decisions[:20])
+            
+            result = await engine.apply_retention(now=now)
+            if result.expired != expired or result.aggregated != expired:
+                failures.append(f"rolled up {result.aggregated} of {expired} expired decisions")
+            if len(engine.decision_log) != retained_records or result.deleted_files != expired_files:
+                failures.append(f"{len(engine.decision_log)} records retained, {result.deleted_files} legacy files removed")
+            if not same_statistics(engine.decision_statistics(), full_history):
+                failures.append("statistics changed by retention")
+            
+            # A repeated run, and one that still sees the removed records, count nothing again
+            repeated = await engine.apply_retention(now=now)
+            stale = engine.retention_policy.apply(original_matrix, engine.decision_log, now=now)
+            if repeated.aggregated or stale.aggregated or not same_statistics(engine.decision_statistics(), full_history):
+                failures.append(f"decisions counted twice ({repeated.aggregated} repeated, {stale.aggregated} stale)")
+            
+            # A later window rolls up more without changing the totals
+            later = await engine.apply_retention(now=now + timedelta(days=120))
+            if not later.aggregated or not same_statistics(engine.decision_statistics(), full_history):
+                failures.append(f"later window changed statistics after rolling up {later.aggregated}")
+            
+            await engine.shutdown()
+            engine.decision_log.close()
+        
+        if not failures:
+            log_test("Decision Retention", "PASS",
+                    f"{expired} of {len(decisions)} decisions rolled up, {later.aggregated} more in a later window; "
+                    "statistics equal the full history and repeated runs count nothing twice")
+        else:
+            log_test("Decision Retention", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Decision Retention", "FAIL", "Decision retention test failed", str(e))
+        return False
+
+async def test_decision_replay():
+    """Test counterfactual replay against per-decision reference scoring"""
+    print("\n🧪 Testing Decision Replay...")
+    
+    try:
+        import random
+        import tempfile
+        import numpy as np
+        from aid_commander_genesis.adaptive_intelligence import AdaptiveIntelligenceEngine
+        from aid_commander_genesis.adaptive_intelligence.calibration import WEIGHTED_DIMENSIONS, complexity_scores
+        from aid_commander_genesis.adaptive_intelligence.replay import replay_decisions
+        from aid_commander_genesis.adaptive_intelligence.scoring import MODE_ORDER, CompiledModeScoring, mode_scoring_rules
+        
+        rng = random.Random(19)
+        failures = []
+        
+        def recommended(engine, analysis, preferences, context):
+            scores = engine._score_modes(analysis, preferences, context)
+            return max(scores, key=scores.get)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            engine = build_isolated_engine(Path(directory))
+            
+            # History recorded under the engine's own rules
+            decisions = []
+            for decision in build_calibration_decisions(500, seed=19):
+                preferences = decision.user_preferences.model_copy(update={
+                    "speed_vs_quality": rng.random(),
+                    "risk_tolerance": rng.random(),
+                    "experimentation_willingness": rng.random(),
+                    "ai_experience_level": rng.randint(1, 10),
+                    "time_constraints": rng.choice(["tight", "moderate", "flexible"]),
+                    "validation_level": rng.choice(["standard", "high", "enterprise"])
+                })
+                context = decision.project_context.model_copy(update={"innovation_level": rng.random()})
+                recommendation = decision.recommendation.model_copy(update={
+                    "recommended_mode": recommended(engine, decision.complexity_analysis, preferences, context)
+                })
+                decisions.append(decision.model_copy(update={
+                    "user_preferences": preferences, "project_context": context, "recommendation": recommendation
+                }))
+            for decision in decisions:
+                await engine._store_decision(decision)
+            
+            unchanged = await engine.replay_decisions(workers=2)
+            if unchanged.flipped or unchanged.decisions != len(decisions):
+                failures.append(f"{unchanged.flipped} of {unchanged.decisions} flipped under the recording rules")
+            
+            # A calibration artifact replayed equals scoring each decision with the artifact applied
+            artifact = {
+                "complexity_weights": dict(zip(WEIGHTED_DIMENSIONS, (0.1, 0.2, 0.3, 0.25, 0.15))),
+                "mode_thresholds": {"lightweight": {"max_complexity": 3.0}, "hybrid": {"max_complexity": 6.0}}
+            }
+            candidate = AdaptiveIntelligenceEngine()
+            candidate.apply_calibration(artifact)
+            weights = np.array([artifact["complexity_weights"][dimension] for dimension in WEIGHTED_DIMENSIONS])
+            
+            expected = np.zeros((len(MODE_ORDER), len(MODE_ORDER)), dtype=np.int64)
+            expected_outcomes = {"success": 0, "failure": 0}
+            for decision in decisions:
+                # The decision matrix stores dimension scores as float32
+                dimensions = np.array([[np.float32(getattr(decision.complexity_analysis, dimension)) for dimension in WEIGHTED_DIMENSIONS]])
+                analysis = decision.complexity_analysis.model_copy(update={
+                    "complexity_score": float(complexity_scores(dimensions.astype(np.float64), weights)[0, 0])
+                })
+                old = decision.recommendation.recommended_mode
+                new = recommended(candidate, analysis, decision.user_preferences, decision.project_context)
+                expected[MODE_ORDER.index(old), MODE_ORDER.index(new)] += 1
+                if old != new and decision.project_success is not None:
+                    expected_outcomes["success" if decision.project_success else "failure"] += 1
+            
+            replayed = await engine.replay_decisions(calibration=artifact)
+            chunked = replay_decisions(
+                engine.decision_matrix(),
+                CompiledModeScoring(mode_scoring_rules(3.0, 6.0)),
+                complexity_weights=artifact["complexity_weights"],
+                workers=3,
+                chunk_size=37
+            )
+            for name, result in (("engine", replayed), ("chunked", chunked)):
+                if not np.array_equal(result.confusion, expected) or result.flipped_outcomes != expected_outcomes:
+                    failures.append(f"{name} replay differs from per-decision scoring: {result.confusion.tolist()} vs {expected.tolist()}")
+            if not np.array_equal(np.sort(chunked.flipped_rows), chunked.flipped_rows) or chunked.flipped != replayed.flipped:
+                failures.append("chunked flipped rows out of order")
+            
+            await engine.shutdown()
+            engine.decision_log.close()
+        
+        if not failures:
+            log_test("Decision Replay", "PASS",
+                    f"no flips under the recording rules; calibration flips {replayed.flipped} of {replayed.decisions} "
+                    "exactly as per-decision scoring, in 1 and 14 chunks")
+        else:
+            log_test("Decision Replay", "FAIL", "; ".join(failures))
+        
+        return not failures
+    
+    except Exception as e:
+        log_test("Decision Replay", "FAIL", "Decision replay test failed", str(e))
+        return False
+
 async def test_file_structure():
     """Test Genesis file structure and organization"""
     print("\n🧪 Testing Genesis File Structure...")
@@ -499,6 +2490,29 @@ async def main():
         ("Unified Validation", test_unified_validation),
         ("Cross-Project Learning", test_cross_project_learning),
         ("CLI Interface", test_cli_interface),
+        ("Batch Complexity Analysis", test_batch_complexity_analysis),
+        ("Keyword Lexicons", test_keyword_lexicons),
+        ("Incremental Analysis", test_incremental_analysis),
+        ("Streamed Concept Analysis", test_streamed_concept_analysis),
+        ("Mode Scoring Rule Table", test_mode_scoring_rules),
+        ("Mode Policy Table", test_mode_policy_table),
+        ("Distribution Monitoring", test_distribution_monitoring),
+        ("Timeline Forecast", test_timeline_forecast),
+        ("Concurrent Storage", test_concurrent_storage),
+        ("Decision Log", test_decision_log),
+        ("Decision Persister", test_decision_persister),
+        ("Decision Matrix", test_decision_matrix),
+        ("Weight Calibration", test_weight_calibration),
+        ("Decision Outcomes", test_decision_outcomes),
+        ("Decision Retention", test_decision_retention),
+        ("Decision Replay", test_decision_replay),
+        ("Analysis Session", test_analysis_session),
+        ("History Loader", test_history_loader),
+        ("Analysis Cache", test_analysis_cache),
+        ("Preference Sweep", test_preference_sweep),
+        ("Pattern Index", test_pattern_index),
+        ("Pattern Mining", test_pattern_mining),
+        ("Similar Projects", test_similar_projects),
         ("Integration Workflow", test_integration_workflow)
     ]
     